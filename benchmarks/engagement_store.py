@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark do EngagementStore: 10M de atualizações de métricas
+
+Grava snapshots acumulados em lotes (como o polling do tracker), faz flush
+em partições dia/plataforma e mede as agregações por período: pelos rollups
+(intervalo alinhado), pela varredura das colunas (intervalo desalinhado e
+por hashtag) e o mesmo GROUP BY em SQLite como linha de base.
+
+Uso:
+    python benchmarks/engagement_store.py
+    python benchmarks/engagement_store.py --updates 2000000 --sqlite-rows 0
+"""
+
+import argparse
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.analytics.engagement_store import METRICS, EngagementStore
+
+DAY = 86400
+PLATFORMS = ("twitter", "instagram", "linkedin")
+TAGS = [f"#tag{i}" for i in range(500)]
+
+
+def timed(label: str, func, repeat: int = 1):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"   {label:<44} {best * 1000:10.1f} ms")
+    return result, best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do EngagementStore")
+    parser.add_argument("--updates", type=int, default=10_000_000)
+    parser.add_argument("--posts", type=int, default=200_000)
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--batch", type=int, default=100_000)
+    parser.add_argument("--sqlite-rows", type=int, default=10_000_000, help="0 desativa a linha de base")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    root = Path(tempfile.mkdtemp(prefix="engagement_bench_"))
+    store = EngagementStore(str(root))
+    start_ts = 19_700 * DAY
+    end_ts = start_ts + args.days * DAY
+
+    print(f"📊 {args.updates:,} atualizações, {args.posts:,} posts, {args.accounts} contas, {args.days} dias")
+
+    post_tags = rng.integers(0, len(TAGS), (args.posts, 3)).tolist()
+
+    def register():
+        for i, tags in enumerate(post_tags):
+            store.register_post(
+                str(i), PLATFORMS[i % 3], account=f"conta{i % args.accounts}",
+                hashtags=[TAGS[j] for j in tags], created_at=start_ts
+            )
+
+    timed("registrar posts", register)
+
+    totals = np.zeros((args.posts, len(METRICS)), dtype=np.int64)
+    batches = args.updates // args.batch
+    window = args.days * DAY // batches
+    sqlite_rows = []
+
+    def write():
+        for batch in range(batches):
+            codes = rng.choice(args.posts, args.batch, replace=False)
+            totals[codes] += rng.integers(0, 4, (args.batch, len(METRICS)))
+            timestamps = start_ts + batch * window + rng.integers(0, window, args.batch)
+            store.record_batch(codes, totals[codes], timestamps)
+            if sum(len(r[0]) for r in sqlite_rows) < args.sqlite_rows:
+                sqlite_rows.append((timestamps, codes))
+        store.flush()
+
+    _, write_time = timed(f"gravar {args.updates:,} snapshots (+ flush)", write)
+    print(f"   {'':<44} {args.updates / write_time:10,.0f} atualizações/s")
+    size = sum(p.stat().st_size for p in root.rglob("*") if p.is_file())
+    print(f"   {'disco':<44} {size / 2 ** 20:10.1f} MiB em {len(store._segments)} segmentos")
+
+    store = EngagementStore(str(root))
+    print("\n🔎 Agregações (melhor de 3)")
+    month = (end_ts - 30 * DAY, end_ts)
+    timed("30 dias por plataforma/dia (rollup)", lambda: store.aggregate(*month, by=("platform",), bucket="day"), 3)
+    timed("90 dias por conta/hora (rollup)", lambda: store.aggregate(start_ts, end_ts, by=("account",), bucket="hour"), 3)
+    timed("30 dias desalinhado por plataforma (varredura)",
+          lambda: store.aggregate(month[0] + 1, month[1], by=("platform",)), 3)
+    timed("7 dias top hashtags (varredura)",
+          lambda: store.aggregate(end_ts - 7 * DAY, end_ts, by=("hashtag",)).top("likes", 20), 3)
+    timed("90 dias top hashtags (varredura)",
+          lambda: store.aggregate(start_ts, end_ts, by=("hashtag",)).top("likes", 20), 3)
+
+    if args.sqlite_rows:
+        print(f"\n🐢 SQLite (linha de base, {args.sqlite_rows:,} linhas com os mesmos deltas)")
+        db = sqlite3.connect(str(root / "baseline.db"))
+        db.execute("CREATE TABLE metrics (ts INTEGER, post INTEGER, platform INTEGER, likes INTEGER, shares INTEGER)")
+        db.execute("CREATE INDEX ix_ts ON metrics (ts)")
+
+        def load():
+            post_platform = np.arange(args.posts) % 3
+            for timestamps, codes in sqlite_rows:
+                likes = rng.integers(0, 4, len(codes))
+                db.executemany(
+                    "INSERT INTO metrics VALUES (?, ?, ?, ?, ?)",
+                    zip(timestamps.tolist(), codes.tolist(), post_platform[codes].tolist(), likes.tolist(), likes.tolist())
+                )
+            db.commit()
+
+        timed("inserir", load)
+        query = "SELECT platform, ts / 86400, SUM(likes), SUM(shares) FROM metrics WHERE ts >= ? AND ts < ? GROUP BY 1, 2"
+        timed("30 dias por plataforma/dia (GROUP BY)", lambda: db.execute(query, month).fetchall(), 3)
+        db.close()
+
+    shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
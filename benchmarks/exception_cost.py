@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark do custo de criar, levantar e capturar exceções
+
+Compara a construção preguiçosa do ``SocialBotError`` com o comportamento
+anterior (traceback, timestamp e mensagem padrão formatados no
+``__init__``), reproduzido pela subclasse ``EagerRateLimitError``.
+
+O cenário ``em except`` levanta a exceção dentro do tratamento de outra,
+como num loop de retry: é onde ``traceback.format_exc()`` custava mais.
+
+Uso:
+    python benchmarks/exception_cost.py --iterations 200000
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.exceptions import RateLimitError
+
+
+class EagerRateLimitError(RateLimitError):
+    """Simula a captura imediata feita antes da mudança"""
+
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.traceback_str
+        self.timestamp
+        self.user_message
+
+
+def raise_and_catch(error_class) -> None:
+    try:
+        raise error_class("429 Too Many Requests", retry_after=30, platform="twitter")
+    except RateLimitError:
+        pass
+
+
+def raise_inside_handler(error_class) -> None:
+    try:
+        raise ConnectionError("connection reset")
+    except ConnectionError:
+        raise_and_catch(error_class)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Custo de raise/catch de SocialBotError")
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"⚡ {args.iterations:,} iterações por cenário\n")
+    for label, scenario in (("simples", raise_and_catch), ("em except", raise_inside_handler)):
+        results = {}
+        for name, error_class in (("antes", EagerRateLimitError), ("depois", RateLimitError)):
+            seconds = min(timeit.repeat(
+                lambda: scenario(error_class), number=args.iterations, repeat=3
+            ))
+            results[name] = seconds / args.iterations * 1e6
+        print(
+            f"   {label:<10} antes: {results['antes']:6.2f} µs | "
+            f"depois: {results['depois']:6.2f} µs | "
+            f"{results['antes'] / results['depois']:.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
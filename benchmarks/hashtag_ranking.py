@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark do ranking de hashtags em um vocabulário grande
+
+Gera posts sintéticos com hashtags em distribuição Zipf (poucas muito
+populares, cauda longa) agrupadas em tópicos, mede o refresh completo e o
+incremental do índice e a latência de ``generate()`` (p50/p99).
+
+Uso:
+    python benchmarks/hashtag_ranking.py --tags 100000 --posts 500000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ai.hashtag_generator import HashtagGenerator
+
+WORDS = ["python", "dados", "ia", "nuvem", "seguranca", "design", "marketing", "startup", "web", "mobile",
+         "jogos", "musica", "futebol", "viagem", "cafe", "receita", "saude", "cripto", "ciencia", "arte"]
+
+
+def tag_name(i: int) -> str:
+    first, second = WORDS[i % len(WORDS)], WORDS[(i // len(WORDS)) % len(WORDS)]
+    return f"#{first.capitalize()}{second.capitalize()}{i}"
+
+
+def synthetic_posts(tags: int, posts: int, seed: int = 0):
+    """
+    Posts com 2-8 hashtags: uma popular (Zipf) e vizinhas do mesmo tópico,
+    precedidos (seed 0) de um post por hashtag para o vocabulário ficar completo
+    """
+    rng = np.random.default_rng(seed)
+    names = [tag_name(i) for i in range(tags)]
+    if seed == 0:
+        for i in range(tags):
+            yield [names[i], names[(i + 1) % tags]], 0.0
+    heads = np.minimum(rng.zipf(1.3, size=posts) - 1, tags - 1)
+    sizes = rng.integers(2, 9, size=posts)
+    for head, size in zip(heads.tolist(), sizes.tolist()):
+        offsets = np.minimum(rng.zipf(1.5, size=size - 1), 500)
+        members = {head} | set(((head + offsets * rng.choice([-1, 1], size=size - 1)) % tags).tolist())
+        yield [names[i] for i in members], float(rng.exponential(20))
+
+
+def percentile_ms(samples, q: float) -> float:
+    return float(np.percentile(samples, q) * 1000)
+
+
+async def run(args) -> None:
+    generator = HashtagGenerator(default_hashtags=["#AI", "#tech"])
+
+    start = time.perf_counter()
+    for hashtags, engagement in synthetic_posts(args.tags, args.posts):
+        generator.observe_post(hashtags, engagement)
+    observe = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = await generator.refresh()
+    full = time.perf_counter() - start
+
+    for hashtags, engagement in synthetic_posts(args.tags, args.posts // 100, seed=1):
+        generator.observe_post(hashtags, engagement)
+    start = time.perf_counter()
+    index = await generator.refresh()
+    incremental = time.perf_counter() - start
+
+    rng = np.random.default_rng(2)
+    topics = [
+        " ".join(rng.choice(WORDS, size=2).tolist()) if i % 2 else index.tags[int(rng.integers(index.size))]
+        for i in range(args.queries)
+    ]
+    for topic in topics[:50]:
+        generator.generate(topic)
+
+    latencies = []
+    for topic in topics:
+        start = time.perf_counter()
+        generator.generate(topic, count=10)
+        latencies.append(time.perf_counter() - start)
+
+    print(f"#️⃣  {index.size:,} hashtags, {args.posts:,} posts, {index.nnz:,} arestas no índice de consulta\n")
+    print(f"   observe_post          {observe / (args.posts + args.tags) * 1e6:>8.2f} µs/post")
+    print(f"   refresh completo      {full * 1000:>8.0f} ms")
+    print(f"   refresh incremental   {incremental * 1000:>8.0f} ms  (+{args.posts // 100:,} posts)")
+    print(f"   generate() p50        {percentile_ms(latencies, 50):>8.3f} ms")
+    print(f"   generate() p99        {percentile_ms(latencies, 99):>8.3f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do ranking de hashtags")
+    parser.add_argument("--tags", type=int, default=100_000)
+    parser.add_argument("--posts", type=int, default=500_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark de micro-batching do pipeline Hugging Face em CPU
+
+Dispara N requisições concorrentes através do ``MicroBatcher`` para cada
+tamanho máximo de lote e reporta requisições/segundo. O tamanho 1 equivale
+ao comportamento anterior (uma chamada de pipeline por requisição).
+
+Uso:
+    python benchmarks/hf_batching.py --model distilgpt2 --requests 64
+    python benchmarks/hf_batching.py --batch-sizes 1 4 16 --window-ms 10
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ai.micro_batcher import MicroBatcher, build_huggingface_batch_fn, request_batch_key
+
+
+def build_prompt(request) -> str:
+    return f"Write a short {request.tone} post about {request.topic}:"
+
+
+async def run_round(process_batch, batch_size: int, total: int, window_ms: float) -> float:
+    """Executa uma rodada e retorna requisições/segundo"""
+    executor = ThreadPoolExecutor(max_workers=1)
+    batcher = MicroBatcher(
+        process_batch,
+        key_func=request_batch_key,
+        window_ms=window_ms,
+        max_batch_size=batch_size,
+        executor=executor
+    )
+    requests = [
+        SimpleNamespace(topic=f"tópico {i}", tone="casual", platform="twitter", max_length=120)
+        for i in range(total)
+    ]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(batcher.submit(request) for request in requests))
+    elapsed = time.perf_counter() - start
+
+    await batcher.close()
+    executor.shutdown()
+    return total / elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de micro-batching em CPU")
+    parser.add_argument("--model", default="distilgpt2")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--window-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    try:
+        import torch
+        from transformers import pipeline
+    except ImportError:
+        print("❌ transformers/torch não instalados: pip install -r requirements.txt")
+        return 1
+
+    torch.manual_seed(0)
+    generator = pipeline("text-generation", model=args.model, device=-1)
+    process_batch = build_huggingface_batch_fn(generator, build_prompt)
+
+    # Aquecimento para não contar o carregamento lazy de kernels
+    process_batch([SimpleNamespace(topic="warmup", tone="casual", platform="twitter", max_length=64)])
+
+    print(f"🤖 Modelo: {args.model} | requisições: {args.requests} | janela: {args.window_ms} ms")
+    print(f"{'batch':>6} | {'req/s':>8} | speedup")
+
+    baseline = None
+    for batch_size in args.batch_sizes:
+        throughput = asyncio.run(run_round(process_batch, batch_size, args.requests, args.window_ms))
+        baseline = baseline or throughput
+        print(f"{batch_size:>6} | {throughput:>8.2f} | {throughput / baseline:.2f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark de tempo de importação (cold start) do SocialBot AI
+
+Executa ``python -X importtime -c "import <módulo>"`` em um processo novo,
+soma o tempo cumulativo de cada pacote e lista os módulos mais lentos.
+Serve como regressão para garantir que ``import src`` continue leve
+(sem torch/transformers/spacy).
+
+Uso:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py src src.ai --budget-ms 150 --top 15
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULES = ["src", "src.ai", "src.bot", "src.utils", "src.analytics"]
+
+# Módulos que nunca devem ser carregados por um simples `import src`
+HEAVY_MODULES = ["torch", "transformers", "sentence_transformers", "spacy", "openai", "tweepy"]
+
+
+@dataclass
+class ImportRecord:
+    """Uma linha da saída de ``-X importtime``"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """
+    Faz o parse da saída de ``python -X importtime``
+
+    Args:
+        stderr: Saída de erro do processo
+
+    Returns:
+        Lista de registros na ordem em que aparecem
+    """
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        try:
+            self_us, cumulative_us, name = line.split("|", 2)
+            self_value = int(self_us.replace("import time:", "").strip())
+            cumulative_value = int(cumulative_us.strip())
+        except ValueError:
+            continue
+
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        records.append(ImportRecord(
+            module=name.strip(),
+            self_us=self_value,
+            cumulative_us=cumulative_value,
+            depth=depth
+        ))
+
+    return records
+
+
+def measure_import(module: str, python: Optional[str] = None) -> Dict[str, object]:
+    """
+    Mede o cold start de um módulo em um interpretador novo
+
+    Args:
+        module: Nome do módulo a importar (ex: ``src.ai``)
+        python: Executável Python (padrão: o atual)
+
+    Returns:
+        Dicionário com tempo total (ms), registros e módulos pesados carregados
+    """
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+
+    result = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    records = parse_importtime(result.stderr)
+    top_level = [r for r in records if r.module == module]
+
+    return {
+        "module": module,
+        "total_ms": (top_level[-1].cumulative_us if top_level else 0) / 1000,
+        "records": records,
+        "heavy_loaded": [m for m in result.stdout.strip().split(",") if m]
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Mede o tempo de importação dos pacotes do SocialBot AI")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--budget-ms", type=float, default=None, help="Falha se algum módulo exceder o orçamento")
+    parser.add_argument("--top", type=int, default=10, help="Quantidade de módulos mais lentos a listar")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        measurement = measure_import(module)
+        print(f"\n📦 {module}: {measurement['total_ms']:.2f} ms")
+
+        slowest = sorted(measurement["records"], key=lambda r: r.self_us, reverse=True)[:args.top]
+        for record in slowest:
+            print(f"   {record.self_us / 1000:8.2f} ms  {record.module}")
+
+        if measurement["heavy_loaded"]:
+            print(f"   ❌ Módulos pesados carregados: {', '.join(measurement['heavy_loaded'])}")
+            failed = True
+
+        if args.budget_ms is not None and measurement["total_ms"] > args.budget_ms:
+            print(f"   ❌ Orçamento de {args.budget_ms:.0f} ms excedido")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos backends de inferência em CPU (torch, int8, ONNX)
+
+Cada backend roda em um subprocesso próprio para que a memória (RSS) medida
+seja só a dele. Para cada um são reportados: tempo de carga (a primeira
+rodada ONNX inclui a exportação; a segunda usa o cache em disco), RSS após a
+carga, vazão e paridade com o PyTorch fp32.
+
+Tarefas:
+    sequence-classification  textos/s e diferença máxima de probabilidade
+    text-generation          tokens/s e % de saídas gulosas idênticas
+
+Uso:
+    python benchmarks/inference_backends.py
+    python benchmarks/inference_backends.py --task text-generation --model microsoft/DialoGPT-medium
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+TEXTS = [
+    "Adorei o novo recurso, parabéns à equipe!",
+    "O app travou de novo depois da atualização",
+    "Alguém sabe quando sai a próxima versão?",
+    "Atendimento rápido e educado, recomendo",
+    "Entrega atrasada e ninguém responde no suporte",
+    "Ok, vou testar amanhã",
+    "Melhor compra do ano",
+    "Péssima experiência, quero meu dinheiro de volta"
+]
+
+
+def rss_mb() -> float:
+    """RSS atual do processo em MB"""
+    try:
+        with open("/proc/self/status", encoding="utf-8") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_classification(args, output: Path) -> dict:
+    from src.ai.sentiment_analyzer import SentimentAnalyzer, TransformersSentimentBackend
+
+    backend = TransformersSentimentBackend(args.model, inference_backend=args.worker, cache_dir=args.cache_dir)
+    analyzer = SentimentAnalyzer(backend=backend, threads=1)
+    start = time.perf_counter()
+    analyzer.analyze_batch_sync(TEXTS[:1])
+    load = time.perf_counter() - start
+    memory = rss_mb()
+
+    texts = (TEXTS * (args.texts // len(TEXTS) + 1))[:args.texts]
+    start = time.perf_counter()
+    results = analyzer.analyze_batch_sync(texts)
+    elapsed = time.perf_counter() - start
+    analyzer.close()
+
+    labels = backend.labels
+    with open(output, "wb") as file:
+        np.save(file, np.array([[r["scores"][label] for label in labels] for r in results]))
+    return {"load_s": load, "rss_mb": memory, "throughput": len(texts) / elapsed, "unit": "textos/s"}
+
+
+def run_generation(args, output: Path) -> dict:
+    from src.ai.inference_backends import load_text_generation_pipeline
+
+    start = time.perf_counter()
+    generator = load_text_generation_pipeline(args.model, backend=args.worker, cache_dir=args.cache_dir)
+    load = time.perf_counter() - start
+    memory = rss_mb()
+
+    eos = generator.tokenizer.eos_token_id
+    outputs = []
+    start = time.perf_counter()
+    for text in TEXTS[:args.prompts]:
+        result = generator(text, max_new_tokens=args.new_tokens, do_sample=False, pad_token_id=eos, return_full_text=False)
+        outputs.append(result[0]["generated_text"])
+    elapsed = time.perf_counter() - start
+
+    output.write_text(json.dumps(outputs), encoding="utf-8")
+    return {"load_s": load, "rss_mb": memory, "throughput": len(outputs) * args.new_tokens / elapsed, "unit": "tokens/s"}
+
+
+def worker(args) -> int:
+    output = Path(args.output)
+    if args.task == "text-generation":
+        report = run_generation(args, output)
+    else:
+        report = run_classification(args, output)
+    print(json.dumps(report))
+    return 0
+
+
+def parity(task: str, baseline: Path, candidate: Path) -> str:
+    if task == "text-generation":
+        expected = json.loads(baseline.read_text(encoding="utf-8"))
+        actual = json.loads(candidate.read_text(encoding="utf-8"))
+        same = sum(a == b for a, b in zip(expected, actual))
+        return f"{same}/{len(expected)} saídas idênticas"
+    expected, actual = np.load(baseline), np.load(candidate)
+    agreement = np.mean(expected.argmax(axis=1) == actual.argmax(axis=1)) * 100
+    return f"Δmax {np.max(np.abs(expected - actual)):.2e}, rótulos {agreement:.0f}% iguais"
+
+
+def spawn(args, backend: str, output: Path) -> dict:
+    command = [
+        sys.executable, __file__, "--worker", backend, "--task", args.task, "--model", args.model,
+        "--cache-dir", args.cache_dir, "--texts", str(args.texts), "--prompts", str(args.prompts),
+        "--new-tokens", str(args.new_tokens), "--output", str(output)
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines() or ["erro desconhecido"]
+        return {"error": lines[-1]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark dos backends de inferência")
+    parser.add_argument("--task", choices=["sequence-classification", "text-generation"], default="sequence-classification")
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--backends", nargs="+", default=["torch", "quantized", "onnx", "onnx-int8"])
+    parser.add_argument("--cache-dir", default=None, help="Cache das exportações (padrão: temporário)")
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--prompts", type=int, default=4)
+    parser.add_argument("--new-tokens", type=int, default=32)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.model is None:
+        args.model = (
+            "microsoft/DialoGPT-medium" if args.task == "text-generation"
+            else "cardiffnlp/twitter-xlm-roberta-base-sentiment"
+        )
+    if args.worker:
+        return worker(args)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        args.cache_dir = args.cache_dir or str(Path(workdir) / "models")
+        backends = ["torch"] + [b for b in args.backends if b != "torch"]
+        print(f"⚙️  {args.model} ({args.task})\n")
+        print(f"   {'backend':<10} {'carga':>8} {'recarga':>8} {'RSS':>9} {'vazão':>16}   paridade")
+
+        for backend in backends:
+            output = Path(workdir) / f"{backend}.out"
+            first = spawn(args, backend, output)
+            if "error" in first:
+                print(f"   {backend:<10} falhou: {first['error']}")
+                continue
+            second = spawn(args, backend, output)  # ONNX: carrega do cache
+            baseline = Path(workdir) / "torch.out"
+            if backend == "torch":
+                match = "referência"
+            elif baseline.exists():
+                match = parity(args.task, baseline, output)
+            else:
+                match = "-"
+            print(
+                f"   {backend:<10} {first['load_s']:>7.1f}s {second['load_s']:>7.1f}s "
+                f"{second['rss_mb']:>6.0f} MB {second['throughput']:>8.1f} {second['unit']:<8}   {match}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória: N workers com modelo próprio vs. host compartilhado
+
+Sobe N processos worker que analisam textos e ficam vivos ao mesmo tempo:
+
+- ``local``: cada worker carrega o próprio modelo (comportamento anterior);
+- ``host``: um processo ``ModelHost`` carrega o modelo e os workers usam
+  ``RemoteSentimentAnalyzer`` pelo socket Unix.
+
+A memória é somada por PSS (``/proc/<pid>/smaps_rollup``), que divide as
+páginas compartilhadas entre os processos; sem PSS, usa RSS.
+
+O backend ``synthetic`` tem uma tabela de pesos float32 do tamanho pedido
+(``--weights-mb``); ``transformers`` usa o modelo de sentimento do Config.
+
+Uso:
+    python benchmarks/model_host_memory.py --workers 4 --weights-mb 500
+    python benchmarks/model_host_memory.py --backend transformers --workers 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ai.model_host import ModelHost, RemoteSentimentAnalyzer
+from src.ai.sentiment_analyzer import SentimentAnalyzer
+
+TEXTS = [
+    "adorei o novo recurso",
+    "o app travou de novo",
+    "quando sai a próxima versão?",
+    "suporte rápido e educado",
+    "entrega atrasada, ninguém responde"
+] * 20
+
+
+class SyntheticBackend:
+    """Bag-of-embeddings com uma tabela de pesos de tamanho configurável"""
+
+    labels = ["negative", "neutral", "positive"]
+    pad_token_id = 0
+
+    def __init__(self, weights_mb: int, hidden: int = 768):
+        rows = max(1, weights_mb * 1024 * 1024 // (hidden * 4))
+        rng = np.random.default_rng(0)
+        self.embeddings = rng.standard_normal((rows, hidden), dtype=np.float32)  # Páginas tocadas
+        self.classifier = rng.standard_normal((hidden, 3), dtype=np.float32)
+
+    def tokenize(self, texts):
+        rows = len(self.embeddings)
+        return [[hash(word) % (rows - 1) + 1 for word in text.split()] for text in texts]
+
+    def predict(self, input_ids, attention_mask):
+        return self.embeddings[input_ids].mean(axis=1) @ self.classifier
+
+
+def make_analyzer(args) -> SentimentAnalyzer:
+    if args.backend == "synthetic":
+        return SentimentAnalyzer(backend=SyntheticBackend(args.weights_mb), threads=1)
+    from src.utils.config import Config
+    return SentimentAnalyzer.from_config(Config())
+
+
+def process_memory_mb(pid: int) -> float:
+    """PSS do processo em MB (RSS se smaps_rollup não existir)"""
+    for path, field in ((f"/proc/{pid}/smaps_rollup", "Pss:"), (f"/proc/{pid}/status", "VmRSS:")):
+        try:
+            with open(path, encoding="utf-8") as file:
+                for line in file:
+                    if line.startswith(field):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            continue
+    return 0.0
+
+
+async def run_worker(args) -> None:
+    if args.socket:
+        analyzer = RemoteSentimentAnalyzer.connect(args.socket)
+    else:
+        analyzer = make_analyzer(args)
+    start = time.perf_counter()
+    await analyzer.analyze_batch(TEXTS)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"pid": os.getpid(), "seconds": elapsed}), flush=True)
+    await asyncio.get_running_loop().run_in_executor(None, sys.stdin.readline)  # Espera o fim da medição
+    analyzer.close()
+
+
+async def run_host(args) -> None:
+    analyzer = make_analyzer(args)
+    await analyzer.warmup()
+    host = ModelHost(args.socket, sentiment=analyzer)
+    await host.start()
+    print(json.dumps({"pid": os.getpid()}), flush=True)
+    await asyncio.get_running_loop().run_in_executor(None, sys.stdin.readline)
+    await host.close()
+    analyzer.close()
+
+
+def spawn(args, role: str, socket_path: str = "") -> subprocess.Popen:
+    command = [
+        sys.executable, __file__, "--role", role, "--backend", args.backend,
+        "--weights-mb", str(args.weights_mb), "--socket", socket_path
+    ]
+    return subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+
+
+def ready(process: subprocess.Popen) -> dict:
+    line = process.stdout.readline()
+    if not line:
+        raise RuntimeError(f"Processo {process.pid} terminou antes de ficar pronto")
+    return json.loads(line)
+
+
+def measure(args, mode: str, workdir: str) -> dict:
+    """Sobe host (se houver) e workers, mede a memória somada e encerra tudo"""
+    processes = []
+    socket_path = ""
+    host_memory = 0.0
+    try:
+        if mode == "host":
+            socket_path = str(Path(workdir) / "models.sock")
+            host = spawn(args, "host", socket_path)
+            processes.append(host)
+            ready(host)
+
+        workers = [spawn(args, "worker", socket_path) for _ in range(args.workers)]
+        processes.extend(workers)
+        latencies = [ready(worker)["seconds"] for worker in workers]
+
+        if mode == "host":
+            host_memory = process_memory_mb(host.pid)
+        worker_memory = [process_memory_mb(worker.pid) for worker in workers]
+        return {
+            "total": host_memory + sum(worker_memory),
+            "host": host_memory,
+            "worker": sum(worker_memory) / len(worker_memory),
+            "latency": sum(latencies) / len(latencies)
+        }
+    finally:
+        for process in reversed(processes):
+            process.stdin.close()
+        for process in processes:
+            process.wait(timeout=60)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Memória de N workers com e sem host de modelos")
+    parser.add_argument("--backend", choices=["synthetic", "transformers"], default="synthetic")
+    parser.add_argument("--weights-mb", type=int, default=500, help="Pesos do backend synthetic")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--role", choices=["worker", "host"], help=argparse.SUPPRESS)
+    parser.add_argument("--socket", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.role == "worker":
+        asyncio.run(run_worker(args))
+        return 0
+    if args.role == "host":
+        asyncio.run(run_host(args))
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="mhbench") as workdir:
+        print(f"🧠 {args.workers} workers, backend {args.backend}"
+              + (f" ({args.weights_mb} MB de pesos)" if args.backend == "synthetic" else "") + "\n")
+        before = measure(args, "local", workdir)
+        after = measure(args, "host", workdir)
+
+    print(f"   {'modo':<8} {'total':>10} {'host':>10} {'por worker':>12} {'lote de ' + str(len(TEXTS)):>14}")
+    for name, result in (("local", before), ("host", after)):
+        print(
+            f"   {name:<8} {result['total']:>7.0f} MB {result['host']:>7.0f} MB "
+            f"{result['worker']:>9.0f} MB {result['latency'] * 1000:>11.1f} ms"
+        )
+    print(f"\n   economia: {before['total'] - after['total']:,.0f} MB ({before['total'] / after['total']:.1f}x menos)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
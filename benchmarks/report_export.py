@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark da exportação de relatórios: pico de memória com 5M de linhas
+
+Grava um ano de atualizações no EngagementStore e exporta o relatório
+detalhado em processos separados, medindo o pico de RSS (``ru_maxrss``) de
+cada um: em streaming (``ReportGenerator``) e, como linha de base, com
+todas as linhas materializadas antes de escrever (como o DataFrame único).
+
+Uso:
+    python benchmarks/report_export.py
+    python benchmarks/report_export.py --rows 1000000 --formats csv parquet
+"""
+
+import argparse
+import csv
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.analytics.engagement_store import METRICS, EngagementStore
+from src.analytics.report_generator import DETAIL_COLUMNS, ReportGenerator
+
+DAY = 86400
+PLATFORMS = ("twitter", "instagram", "linkedin")
+
+
+def peak_rss_mib() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def populate(root: Path, rows: int, posts: int, days: int, batch: int) -> None:
+    rng = np.random.default_rng(42)
+    store = EngagementStore(str(root))
+    start_ts = 19_700 * DAY
+    for i in range(posts):
+        store.register_post(str(i), PLATFORMS[i % 3], account=f"conta{i % 50}", created_at=start_ts)
+
+    totals = np.zeros((posts, len(METRICS)), dtype=np.int64)
+    batches = rows // batch
+    window = days * DAY // batches
+    for index in range(batches):
+        codes = rng.permutation(posts)[:batch]
+        totals[codes] += rng.integers(1, 4, (batch, len(METRICS)))
+        timestamps = start_ts + index * window + rng.integers(0, window, batch)
+        store.record_batch(codes, totals[codes], timestamps)
+    store.flush()
+
+
+def export(root: Path, fmt: str, mode: str, output: Path, days: int) -> None:
+    """Roda num processo novo: imprime linhas, segundos e pico de RSS"""
+    store = EngagementStore(str(root))
+    reports = ReportGenerator(store)
+    start_ts = 19_700 * DAY
+    end_ts = start_ts + days * DAY
+    base_rss = peak_rss_mib()
+    started = time.perf_counter()
+
+    if mode == "streaming":
+        rows = reports.export(fmt, output, start_ts, end_ts)
+    else:
+        # Linha de base: o período inteiro em memória antes de escrever
+        chunks = list(reports.chunks(start_ts, end_ts))
+        table = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in DETAIL_COLUMNS}
+        del chunks
+        table["timestamp"] = np.datetime_as_string(table["timestamp"].astype("datetime64[s]"), unit="s", timezone="UTC")
+        records = list(zip(*(table[name].tolist() for name in DETAIL_COLUMNS)))
+        with open(output, "w", newline="", encoding="utf-8") as sink:
+            writer = csv.writer(sink)
+            writer.writerow(DETAIL_COLUMNS)
+            writer.writerows(records)
+        rows = len(records)
+
+    print(rows, time.perf_counter() - started, base_rss, peak_rss_mib())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark da exportação de relatórios")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--posts", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--batch", type=int, default=100_000)
+    parser.add_argument("--formats", nargs="+", default=["csv", "parquet", "xlsx"])
+    parser.add_argument("--no-baseline", action="store_true", help="Não mede a exportação materializada")
+    parser.add_argument("--child", nargs=4, metavar=("ROOT", "FORMAT", "MODE", "OUTPUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        root, fmt, mode, output = args.child
+        export(Path(root), fmt, mode, Path(output), args.days)
+        return 0
+
+    workdir = Path(tempfile.mkdtemp(prefix="report_bench_"))
+    root = workdir / "store"
+    print(f"📊 {args.rows:,} linhas, {args.posts:,} posts, {args.days} dias")
+    started = time.perf_counter()
+    populate(root, args.rows, args.posts, args.days, args.batch)
+    print(f"   {'gravar o store':<36} {time.perf_counter() - started:8.1f} s")
+
+    runs = [(fmt, "streaming") for fmt in args.formats]
+    if not args.no_baseline:
+        runs.append(("csv", "materializado"))
+
+    print("\n📄 Exportação (processo novo por execução)")
+    print(f"   {'formato':<22} {'linhas':>10} {'tempo':>8} {'RSS base':>10} {'RSS pico':>10} {'arquivo':>10}")
+    for fmt, mode in runs:
+        output = workdir / f"relatorio_{mode}.{fmt}"
+        completed = subprocess.run(
+            [sys.executable, __file__, "--days", str(args.days), "--child", str(root), fmt, mode, str(output)],
+            capture_output=True, text=True
+        )
+        label = f"{fmt} ({mode})"
+        if completed.returncode != 0:
+            error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "falhou"
+            print(f"   {label:<22} ⚠️ {error}")
+            continue
+        rows, seconds, base_rss, peak_rss = completed.stdout.split()
+        size = output.stat().st_size / 2 ** 20
+        print(
+            f"   {label:<22} {int(rows):>10,} {float(seconds):>7.1f}s {float(base_rss):>7.0f} MiB"
+            f" {float(peak_rss):>7.0f} MiB {size:>6.0f} MiB"
+        )
+
+    shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark do ScheduleStore: agenda e drena 1M de posts
+
+Mede inserção em lote, restart (recarga do banco), cancelamento e a
+drenagem em ticks, que só deve tocar os posts vencidos.
+
+Uso:
+    python benchmarks/schedule_store.py
+    python benchmarks/schedule_store.py --posts 200000 --database sqlite:///tmp/bench.db
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.bot.schedule_store import ScheduledPost, ScheduleStore
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<28} {elapsed:8.2f} s")
+    return result, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do ScheduleStore")
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--accounts", type=int, default=100)
+    parser.add_argument("--database", default="sqlite:///schedule_bench.db")
+    parser.add_argument("--batch", type=int, default=50_000)
+    parser.add_argument("--cancel-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+
+    random.seed(42)
+    base = datetime.now()
+    posts = [
+        ScheduledPost(
+            content=f"Post {i}",
+            platforms=["twitter"],
+            schedule_time=base + timedelta(seconds=random.randint(0, 30 * 86400)),
+            priority=random.randint(0, 3),
+            account_id=f"account-{i % args.accounts}"
+        )
+        for i in range(args.posts)
+    ]
+
+    print(f"📅 {args.posts:,} posts em {args.accounts} contas ({args.database})")
+    store = ScheduleStore(args.database)
+
+    def insert():
+        for start in range(0, len(posts), args.batch):
+            store.add_many(posts[start:start + args.batch])
+
+    _, insert_time = timed("agendar (add_many)", insert)
+
+    cancelled = random.sample(posts, int(len(posts) * args.cancel_ratio))
+    _, cancel_time = timed(f"cancelar {len(cancelled):,}", lambda: store.cancel_many(p.schedule_id for p in cancelled))
+
+    restarted = ScheduleStore(args.database)
+    loaded, _ = timed("restart (load)", restarted.load)
+
+    # Drena em ticks de 1 hora simulada
+    def drain():
+        drained = 0
+        ticks = 0
+        now = base
+        while restarted.next_due_time() is not None:
+            now += timedelta(hours=1)
+            drained += len(restarted.pop_due(now))
+            ticks += 1
+        return drained, ticks
+
+    (drained, ticks), drain_time = timed("drenar (pop_due)", drain)
+
+    print(f"\n   carregados: {loaded:,} | drenados: {drained:,} em {ticks} ticks")
+    print(f"   inserção: {args.posts / insert_time:,.0f} posts/s")
+    print(f"   cancelamento: {len(cancelled) / cancel_time:,.0f} posts/s")
+    print(f"   drenagem: {drained / drain_time:,.0f} posts/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
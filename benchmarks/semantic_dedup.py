@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark do índice de deduplicação semântica
+
+Preenche um ``EmbeddingIndex`` com N vetores aleatórios (o custo do modelo
+de embeddings fica de fora) e mede appends, consultas individuais, consultas
+em lote e compactação.
+
+Uso:
+    python benchmarks/semantic_dedup.py --posts 1000000 --dim 384
+    python benchmarks/semantic_dedup.py --posts 100000 --queries 64
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ai.semantic_dedup import EmbeddingIndex
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<28} {elapsed * 1000:10.1f} ms")
+    return result, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do índice de deduplicação")
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--batch", type=int, default=10_000, help="Posts por append")
+    parser.add_argument("--queries", type=int, default=32, help="Consultas do lote")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    size_mb = args.posts * args.dim * 2 / 1024 ** 2
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"🧬 {args.posts:,} posts x {args.dim} dims (float16, {size_mb:,.0f} MB em disco)\n")
+        index = EmbeddingIndex(directory, args.dim)
+
+        def fill():
+            for start in range(0, args.posts, args.batch):
+                count = min(args.batch, args.posts - start)
+                vectors = rng.standard_normal((count, args.dim), dtype=np.float32)
+                index.append([f"post-{start + i}" for i in range(count)], vectors)
+
+        _, fill_time = timed("append", fill)
+
+        # Consulta quase idêntica a um post existente
+        target = 123 % args.posts
+        query = np.asarray(index._vectors[target], dtype=np.float32)
+        query += rng.standard_normal(args.dim).astype(np.float32) * 0.01
+
+        (scores, ids), single_time = timed("consulta individual", lambda: index.search(query, args.k))
+        assert ids[0][0] == f"post-{target}", "vizinho mais próximo incorreto"
+
+        queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+        _, batch_time = timed(f"lote de {args.queries} consultas", lambda: index.search(queries, args.k))
+
+        index.remove(f"post-{i}" for i in range(0, args.posts, 10))
+        removed, compact_time = timed("compactar (10% removidos)", index.compact)
+
+        reopened, reopen_time = timed("reabrir", lambda: EmbeddingIndex(directory, args.dim))
+
+        print(f"\n   appends: {args.posts / fill_time:,.0f} posts/s")
+        print(f"   top-1 score: {scores[0][0]:.4f} ({ids[0][0]})")
+        print(f"   consulta em lote: {batch_time / args.queries * 1000:.2f} ms/consulta")
+        print(f"   compactação: {removed:,} linhas descartadas, {reopened.count:,} restantes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark da análise de sentimento em lote
+
+Mede textos/segundo do ``SentimentAnalyzer.analyze_batch`` para cada
+combinação de tamanho máximo de lote e número de threads do pool. Lote 1 com
+1 thread equivale ao comportamento anterior (uma chamada de modelo por texto).
+
+O backend ``synthetic`` é um encoder numpy (embeddings + camadas densas +
+pooling) com custo proporcional a lote x tokens; serve para medir o
+agendamento sem baixar o modelo real.
+
+Uso:
+    python benchmarks/sentiment_batching.py --texts 1000
+    python benchmarks/sentiment_batching.py --backend transformers --batch-sizes 1 16 64
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ai.sentiment_analyzer import SentimentAnalyzer, TransformersSentimentBackend
+
+WORDS = (
+    "adorei amei péssimo ótimo produto atendimento entrega demorou rápido bug "
+    "obrigado valeu nunca sempre funciona quebrou suporte incrível ruim bom "
+    "app update lançamento preço caro barato recomendo evitem parabéns equipe"
+).split()
+
+
+class SyntheticBackend:
+    """Encoder numpy com atenção: custo por operador e por token, como um transformer"""
+
+    labels = ["negative", "neutral", "positive"]
+    pad_token_id = 0
+
+    def __init__(self, hidden: int = 256, layers: int = 6, vocab: int = 30_000, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        scale = 1 / np.sqrt(hidden)
+        self.vocab = vocab
+        self.scale = np.float32(scale)
+        self.embeddings = rng.standard_normal((vocab, hidden), dtype=np.float32) * 0.1
+        self.layers = [
+            [rng.standard_normal((hidden, hidden), dtype=np.float32) * scale for _ in range(4)]
+            for _ in range(layers)
+        ]
+        self.classifier = rng.standard_normal((hidden, len(self.labels)), dtype=np.float32)
+
+    def tokenize(self, texts):
+        return [[1] + [zlib.crc32(word.encode()) % (self.vocab - 2) + 2 for word in text.split()] + [1] for text in texts]
+
+    def predict(self, input_ids, attention_mask):
+        hidden = self.embeddings[input_ids]
+        mask_bias = np.where(attention_mask[:, None, :] > 0, 0.0, -1e9).astype(np.float32)
+        for wq, wk, wv, wo in self.layers:
+            q, k, v = hidden @ wq, hidden @ wk, hidden @ wv
+            scores = q @ k.transpose(0, 2, 1) * self.scale + mask_bias
+            scores = np.exp(scores - scores.max(axis=-1, keepdims=True))
+            scores /= scores.sum(axis=-1, keepdims=True)
+            hidden = np.tanh((scores @ v) @ wo + hidden)
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / mask.sum(axis=1)
+        return pooled @ self.classifier
+
+
+def make_texts(count: int, seed: int) -> list:
+    """Menções com 3 a 50 palavras"""
+    rng = np.random.default_rng(seed)
+    return [" ".join(rng.choice(WORDS, size=rng.integers(3, 51))) for _ in range(count)]
+
+
+async def run_round(backend, texts, batch_size: int, threads: int) -> float:
+    """Executa uma rodada e retorna textos/segundo"""
+    analyzer = SentimentAnalyzer(backend=backend, max_batch_size=batch_size, threads=threads)
+    try:
+        start = time.perf_counter()
+        await analyzer.analyze_batch(texts)
+        return len(texts) / (time.perf_counter() - start)
+    finally:
+        analyzer.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark da análise de sentimento em lote")
+    parser.add_argument("--backend", choices=["synthetic", "transformers"], default="synthetic")
+    parser.add_argument("--model", default=None, help="Modelo do backend transformers")
+    parser.add_argument("--texts", type=int, default=1000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.backend == "transformers":
+        backend = TransformersSentimentBackend(args.model) if args.model else TransformersSentimentBackend()
+    else:
+        backend = SyntheticBackend(seed=args.seed)
+    texts = make_texts(args.texts, args.seed)
+    asyncio.run(run_round(backend, texts[:64], 8, 1))  # Aquecimento / carga do modelo
+
+    print(f"🧠 {args.texts} menções, backend {args.backend}\n")
+    print("   lote " + "".join(f"{f'{t} thr':>12}" for t in args.threads))
+    baseline, best = None, 0.0
+    for batch_size in args.batch_sizes:
+        row = []
+        for threads in args.threads:
+            throughput = asyncio.run(run_round(backend, texts, batch_size, threads))
+            baseline = baseline or throughput
+            best = max(best, throughput)
+            row.append(throughput)
+        print(f"   {batch_size:>4} " + "".join(f"{value:>10,.0f}/s" for value in row))
+
+    print(f"\n   melhor: {best / baseline:.1f}x sobre lote {args.batch_sizes[0]} / {args.threads[0]} thread(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
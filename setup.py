@@ -50,6 +50,7 @@ setup(
             "pytest>=7.4.3",
             "pytest-asyncio>=0.21.1",
             "pytest-cov>=4.1.0",
+            "fakeredis[lua]>=2.20.1",
             "black>=23.11.0",
             "flake8>=6.1.0",
             "mypy>=1.7.1",
@@ -14,11 +14,45 @@ __author__ = "Seu Nome"
 __email__ = "seu.email@exemplo.com"
 __description__ = "Bot de automação inteligente para redes sociais com IA"
 
-# Importações principais
-from .bot import SocialBot
-from .ai import ContentGenerator, SentimentAnalyzer
-from .analytics import EngagementTracker, ReportGenerator
-from .utils import Config, Logger
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+# Importações principais (carregadas sob demanda para não puxar
+# torch/transformers em um simples `import src`)
+if TYPE_CHECKING:
+    from .bot.social_bot import SocialBot
+    from .ai.content_generator import ContentGenerator
+    from .ai.sentiment_analyzer import SentimentAnalyzer
+    from .analytics.engagement_tracker import EngagementTracker
+    from .analytics.report_generator import ReportGenerator
+    from .utils.config import Config
+    from .utils.logger import Logger
+
+_LAZY_ATTRIBUTES = {
+    "SocialBot": ".bot.social_bot",
+    "ContentGenerator": ".ai.content_generator",
+    "SentimentAnalyzer": ".ai.sentiment_analyzer",
+    "EngagementTracker": ".analytics.engagement_tracker",
+    "ReportGenerator": ".analytics.report_generator",
+    "Config": ".utils.config",
+    "Logger": ".utils.logger",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Importa o atributo público sob demanda (PEP 562)"""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # Próximos acessos não passam por __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     "SocialBot",
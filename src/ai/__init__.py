@@ -8,14 +8,47 @@ Contém funcionalidades avançadas de IA para:
 - Detecção de tendências
 """
 
-from .content_generator import ContentGenerator
-from .sentiment_analyzer import SentimentAnalyzer
-from .hashtag_generator import HashtagGenerator
-from .response_generator import ResponseGenerator
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .content_generator import ContentGenerator
+    from .sentiment_analyzer import SentimentAnalyzer
+    from .hashtag_generator import HashtagGenerator
+    from .response_generator import ResponseGenerator
+    from .semantic_dedup import SemanticDeduplicator
+    from .content_stream import ContentStreamer
+
+_LAZY_ATTRIBUTES = {
+    "ContentGenerator": ".content_generator",
+    "SentimentAnalyzer": ".sentiment_analyzer",
+    "HashtagGenerator": ".hashtag_generator",
+    "ResponseGenerator": ".response_generator",
+    "SemanticDeduplicator": ".semantic_dedup",
+    "ContentStreamer": ".content_stream",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Importa o atributo público sob demanda (PEP 562)"""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # Próximos acessos não passam por __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     "ContentGenerator",
     "SentimentAnalyzer",
     "HashtagGenerator", 
-    "ResponseGenerator"
+    "ResponseGenerator",
+    "SemanticDeduplicator",
+    "ContentStreamer"
 ]
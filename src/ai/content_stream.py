@@ -0,0 +1,649 @@
+"""
+Streaming de conteúdo gerado do SocialBot AI
+
+``ContentStreamer.stream_content(request)`` entrega o texto à medida que os
+tokens chegam, em vez de esperar a geração completa:
+
+- OpenAI: endpoint de chat com ``stream=True``;
+- Hugging Face: ``model.generate`` em uma thread dedicada com um streamer
+  que repassa o texto decodificado ao event loop.
+
+O limite de caracteres da plataforma é aplicado incrementalmente por
+``PlatformLengthGuard``: o texto só é liberado até a última palavra completa
+que cabe antes das reticências, e a geração é interrompida assim que o limite
+é ultrapassado. A concatenação dos pedaços é idêntica a
+``truncate_for_platform(texto_completo)``.
+
+O tempo até o primeiro token (TTFT) e a duração total são registrados por
+provedor em ``StreamMetrics`` (exportáveis para o Prometheus). Para o
+dashboard/API, ``create_stream_router`` expõe o stream como Server-Sent Events.
+
+Example:
+    >>> streamer = ContentStreamer.from_config(config)
+    >>> async for delta in streamer.stream_content(request):
+    ...     print(delta, end="", flush=True)
+"""
+
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from .hedging import LatencyHistogram
+
+# Limites de caracteres por plataforma
+PLATFORM_LIMITS = {
+    "twitter": 280,
+    "instagram": 2200,
+    "linkedin": 3000,
+    "facebook": 63206,
+    "tiktok": 2200
+}
+
+ELLIPSIS = "..."
+
+
+class ContentStreamError(RuntimeError):
+    """Nenhum provedor conseguiu iniciar o stream"""
+
+
+def _last_space(text: str, start: int, end: int) -> int:
+    return max(text.rfind(" ", start, end), text.rfind("\n", start, end))
+
+
+def truncate_for_platform(text: str, limit: int, ellipsis: str = ELLIPSIS) -> str:
+    """
+    Corta o texto no limite da plataforma, na última palavra completa
+
+    Args:
+        text: Texto completo
+        limit: Máximo de caracteres (incluindo as reticências)
+        ellipsis: Sufixo indicando o corte
+
+    Returns:
+        O próprio texto se couber; senão o corte terminado em ``ellipsis``
+    """
+    if len(text) <= limit:
+        return text
+    safe = text[:limit - len(ellipsis)]
+    cut = _last_space(safe, 0, len(safe))
+    if cut > 0:
+        safe = safe[:cut]
+    return safe.rstrip() + ellipsis
+
+
+def platform_limit(platform: str, max_length: Optional[int] = None) -> int:
+    """Limite efetivo: o menor entre o da plataforma e o da requisição"""
+    limit = PLATFORM_LIMITS.get((platform or "").lower(), max_length or PLATFORM_LIMITS["twitter"])
+    return min(limit, max_length) if max_length else limit
+
+
+class PlatformLengthGuard:
+    """
+    Aplica ``truncate_for_platform`` a um texto que chega em pedaços
+
+    ``feed()`` devolve a parte que já é garantidamente um prefixo do
+    resultado final (até a última palavra completa antes de
+    ``limit - len(ellipsis)``); o restante fica retido até o fim do stream
+    ou até o limite ser ultrapassado, quando ``done`` passa a ser verdadeiro.
+    """
+
+    def __init__(self, limit: int, ellipsis: str = ELLIPSIS):
+        self.limit = limit
+        self.ellipsis = ellipsis
+        self.done = False
+        self.truncated = False
+        self._text = ""
+        self._emitted = 0
+
+    @classmethod
+    def for_platform(cls, platform: str, max_length: Optional[int] = None) -> "PlatformLengthGuard":
+        return cls(platform_limit(platform, max_length))
+
+    @property
+    def text(self) -> str:
+        """Texto liberado até agora"""
+        return self._text[:self._emitted]
+
+    def _emit_until(self, final: str) -> str:
+        delta = final[self._emitted:]
+        self._text = final
+        self._emitted = len(final)
+        return delta
+
+    def feed(self, chunk: str) -> str:
+        """Acrescenta um pedaço e devolve o texto que pode ser liberado"""
+        if self.done or not chunk:
+            return ""
+        self._text += chunk
+
+        if len(self._text) > self.limit:
+            self.done = self.truncated = True
+            return self._emit_until(truncate_for_platform(self._text, self.limit, self.ellipsis))
+
+        safe_end = min(len(self._text), self.limit - len(self.ellipsis))
+        cut = _last_space(self._text, self._emitted, safe_end)
+        if cut <= 0:
+            return ""
+        while cut > self._emitted and self._text[cut - 1].isspace():
+            cut -= 1
+        delta = self._text[self._emitted:cut]
+        self._emitted = cut
+        return delta
+
+    def finish(self) -> str:
+        """Fim do stream: libera o que estava retido"""
+        if self.done:
+            return ""
+        self.done = True
+        return self._emit_until(self._text)
+
+
+class StreamMetrics:
+    """TTFT e duração dos streams por provedor"""
+
+    def __init__(self):
+        self.ttft: Dict[str, LatencyHistogram] = {}
+        self.duration: Dict[str, LatencyHistogram] = {}
+        self.streams: Dict[str, int] = {}
+        self.truncated = 0
+        self.fallbacks = 0
+
+    def _histogram(self, table: Dict[str, LatencyHistogram], provider: str) -> LatencyHistogram:
+        if provider not in table:
+            table[provider] = LatencyHistogram()
+        return table[provider]
+
+    def record_first_token(self, provider: str, seconds: float) -> None:
+        self._histogram(self.ttft, provider).record(seconds)
+
+    def record_stream(self, provider: str, seconds: float, truncated: bool) -> None:
+        self._histogram(self.duration, provider).record(seconds)
+        self.streams[provider] = self.streams.get(provider, 0) + 1
+        self.truncated += truncated
+
+    def snapshot(self) -> Dict[str, Any]:
+        """TTFT p50/p95 e contadores por provedor"""
+        return {
+            "providers": {
+                provider: {
+                    "streams": self.streams.get(provider, 0),
+                    "ttft_p50": histogram.quantile(0.5),
+                    "ttft_p95": histogram.quantile(0.95),
+                    "duration_p50": self._histogram(self.duration, provider).quantile(0.5)
+                }
+                for provider, histogram in self.ttft.items()
+            },
+            "truncated": self.truncated,
+            "fallbacks": self.fallbacks
+        }
+
+    def register_prometheus_collector(self, registry: Any = None) -> None:
+        """Exporta o TTFT como métricas Prometheus (se instalado)"""
+        try:
+            from prometheus_client import REGISTRY
+            from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+        except ImportError:
+            return
+
+        metrics = self
+
+        class StreamCollector:
+            def collect(self):
+                ttft = GaugeMetricFamily(
+                    "socialbot_stream_ttft_seconds",
+                    "Tempo até o primeiro token do stream de conteúdo",
+                    labels=["provider", "quantile"]
+                )
+                streams = CounterMetricFamily(
+                    "socialbot_stream_total",
+                    "Streams de conteúdo concluídos",
+                    labels=["provider"]
+                )
+                for provider, histogram in metrics.ttft.items():
+                    for quantile in (0.5, 0.95, 0.99):
+                        value = histogram.quantile(quantile)
+                        if value is not None:
+                            ttft.add_metric([provider, str(quantile)], value)
+                    streams.add_metric([provider], metrics.streams.get(provider, 0))
+                yield ttft
+                yield streams
+
+        (registry or REGISTRY).register(StreamCollector())
+
+
+@dataclass
+class StreamStats:
+    """Resultado de um stream (preenchido durante ``stream_content``)"""
+    provider: Optional[str] = None
+    ttft: Optional[float] = None
+    duration: Optional[float] = None
+    truncated: bool = False
+    text: str = ""
+    failures: List[str] = field(default_factory=list)
+
+
+class AsyncTokenStreamer:
+    """
+    Streamer para ``model.generate(streamer=...)`` que entrega texto ao event loop
+
+    Segue o protocolo ``put``/``end`` do transformers: os ids são acumulados
+    e decodificados juntos, liberando o texto até o último espaço (ou quebra de
+    linha) para não cortar palavras nem caracteres multibyte. ``cancel()``
+    faz o ``stopping_criteria`` encerrar a geração no próximo token.
+    """
+
+    _END = object()
+
+    def __init__(self, tokenizer: Any, loop: asyncio.AbstractEventLoop, skip_prompt: bool = True, **decode_kwargs):
+        self.tokenizer = tokenizer
+        self.loop = loop
+        self.skip_prompt = skip_prompt
+        self.decode_kwargs = {"skip_special_tokens": True, **decode_kwargs}
+        self.cancelled = False
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._tokens: List[int] = []
+        self._printed = 0
+        self._prompt_pending = skip_prompt
+
+    def _push(self, item: Any) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, item)
+        except RuntimeError:
+            self.cancelled = True  # Loop encerrado: não há mais consumidor
+
+    def put(self, value: Any) -> None:
+        if self._prompt_pending:
+            self._prompt_pending = False
+            return
+        ids = value.tolist()
+        if ids and isinstance(ids[0], list):
+            ids = ids[0]  # Lote de 1
+        self._tokens.extend(ids)
+
+        text = self.tokenizer.decode(self._tokens, **self.decode_kwargs)
+        if text.endswith("\n"):
+            printable = text[self._printed:]
+            self._tokens, self._printed = [], 0
+        else:
+            printable = text[self._printed:text.rfind(" ") + 1]
+            self._printed += len(printable)
+        if printable:
+            self._push(printable)
+
+    def end(self) -> None:
+        if self._tokens:
+            text = self.tokenizer.decode(self._tokens, **self.decode_kwargs)
+            if text[self._printed:]:
+                self._push(text[self._printed:])
+            self._tokens, self._printed = [], 0
+        self._push(self._END)
+
+    def fail(self, error: BaseException) -> None:
+        self._push(error)
+        self._push(self._END)
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def stop_criterion(self, input_ids: Any, scores: Any, **kwargs) -> bool:
+        """Usado em ``stopping_criteria`` para interromper a geração"""
+        return self.cancelled
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        while True:
+            item = await self.queue.get()
+            if item is self._END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+
+async def openai_token_stream(
+    client: Any,
+    model: str,
+    prompt: str,
+    max_tokens: int,
+    temperature: float,
+    top_p: float
+) -> AsyncIterator[str]:
+    """Deltas de texto do chat da OpenAI (``AsyncOpenAI``) com ``stream=True``"""
+    stream = await client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=max_tokens,
+        temperature=temperature,
+        top_p=top_p,
+        stream=True
+    )
+    try:
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        # Fechar a resposta HTTP interrompe a geração no servidor
+        response = getattr(stream, "response", None)
+        if response is not None:
+            await response.aclose()
+        elif hasattr(stream, "aclose"):
+            await stream.aclose()
+
+
+async def huggingface_token_stream(
+    pipeline: Any,
+    prompt: str,
+    executor: ThreadPoolExecutor,
+    max_new_tokens: int,
+    temperature: float,
+    top_p: float
+) -> AsyncIterator[str]:
+    """Texto de ``pipeline.model.generate`` rodando no ``executor``"""
+    loop = asyncio.get_running_loop()
+    tokenizer = pipeline.tokenizer
+    streamer = AsyncTokenStreamer(tokenizer, loop)
+
+    def generate() -> None:
+        try:
+            inputs = tokenizer(prompt, return_tensors="pt")
+            pipeline.model.generate(
+                **inputs,
+                streamer=streamer,
+                stopping_criteria=[streamer.stop_criterion],
+                max_new_tokens=max_new_tokens,
+                do_sample=True,
+                temperature=temperature,
+                top_p=top_p,
+                pad_token_id=tokenizer.eos_token_id
+            )
+        except Exception as e:
+            streamer.fail(e)
+
+    future = loop.run_in_executor(executor, generate)
+    try:
+        async for text in streamer:
+            yield text
+    finally:
+        streamer.cancel()
+        try:
+            await future
+        except Exception:
+            pass
+
+
+def build_prompt(request: Any) -> str:
+    """Prompt padrão a partir dos campos de uma ``ContentRequest``"""
+    tone = getattr(request, "tone", None)
+    tone = tone.value if isinstance(tone, Enum) else tone or "casual"
+    limit = platform_limit(request.platform, getattr(request, "max_length", None))
+    parts = [
+        f"Escreva um post para {request.platform} sobre: {request.topic}.",
+        f"Tom: {tone}. Máximo de {limit} caracteres."
+    ]
+    if getattr(request, "include_hashtags", True):
+        parts.append("Inclua hashtags relevantes.")
+    if getattr(request, "include_emojis", True):
+        parts.append("Use emojis com moderação.")
+    keywords = getattr(request, "keywords", None)
+    if keywords:
+        parts.append(f"Palavras-chave: {', '.join(keywords)}.")
+    return " ".join(parts)
+
+
+class ContentStreamer:
+    """
+    Geração de conteúdo em streaming com fallback entre provedores
+
+    A OpenAI é tentada primeiro; se falhar ou não entregar o primeiro token
+    em ``first_token_timeout`` segundos, o pipeline Hugging Face assume. Depois
+    que o primeiro texto foi entregue ao cliente não há troca de provedor.
+
+    O TTFT registrado em ``metrics`` é medido do início da requisição (inclui
+    a tentativa do provedor que falhou), como o usuário percebe.
+    """
+
+    def __init__(
+        self,
+        ai_config: Any,
+        openai_client: Any = None,
+        hf_pipeline: Any = None,
+        pipeline_loader: Optional[Callable[[], Any]] = None,
+        prompt_builder: Callable[[Any], str] = build_prompt,
+        first_token_timeout: float = 10.0,
+        metrics: Optional[StreamMetrics] = None,
+        threads: int = 1
+    ):
+        """
+        Inicializa o streamer
+
+        Args:
+            ai_config: ``AIConfig`` (modelos, temperatura, top_p, max_length)
+            openai_client: ``AsyncOpenAI`` (None desativa a OpenAI)
+            hf_pipeline: Pipeline ``text-generation`` já carregado
+            pipeline_loader: Carrega o pipeline no primeiro uso (se ``hf_pipeline`` for None)
+            prompt_builder: Monta o prompt a partir da requisição
+            first_token_timeout: Espera máxima pelo primeiro token de cada provedor
+            metrics: Métricas compartilhadas (uma nova por padrão)
+            threads: Gerações Hugging Face simultâneas
+        """
+        self.config = ai_config
+        self.openai_client = openai_client
+        self.hf_pipeline = hf_pipeline
+        self.pipeline_loader = pipeline_loader
+        self.prompt_builder = prompt_builder
+        self.first_token_timeout = first_token_timeout
+        self.metrics = metrics or StreamMetrics()
+        self.threads = threads
+        self.logger = logging.getLogger(__name__)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pipeline_lock = asyncio.Lock()
+
+    @classmethod
+    def from_config(cls, config: Any) -> "ContentStreamer":
+        """Cria o streamer a partir do ``Config`` principal"""
+        ai = config.ai
+        client = None
+        if ai.openai_api_key:
+            try:
+                from openai import AsyncOpenAI
+                client = AsyncOpenAI(api_key=ai.openai_api_key)
+            except ImportError:
+                logging.getLogger(__name__).warning("⚠️ openai não instalado; streaming só via Hugging Face")
+
+        def load_pipeline() -> Any:
+            from .inference_backends import load_text_generation_pipeline
+            return load_text_generation_pipeline(
+                ai.model_name, backend=ai.inference_backend, cache_dir=ai.model_cache_dir, warmup=False
+            )
+
+        return cls(
+            ai,
+            openai_client=client,
+            pipeline_loader=load_pipeline,
+            first_token_timeout=ai.stream_first_token_timeout
+        )
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Pool dedicado às gerações Hugging Face (uma thread ocupada por stream)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="hf-stream")
+        return self._executor
+
+    async def _pipeline(self) -> Any:
+        async with self._pipeline_lock:
+            if self.hf_pipeline is None:
+                if self.pipeline_loader is None:
+                    raise ContentStreamError("Pipeline Hugging Face não configurado")
+                loop = asyncio.get_running_loop()
+                self.hf_pipeline = await loop.run_in_executor(self.executor, self.pipeline_loader)
+            return self.hf_pipeline
+
+    async def _huggingface(self, prompt: str, limit: int) -> AsyncIterator[str]:
+        pipeline = await self._pipeline()
+        async for text in huggingface_token_stream(
+            pipeline, prompt, self.executor, limit + 1, self.config.temperature, self.config.top_p
+        ):
+            yield text
+
+    def _sources(self, prompt: str, limit: int) -> List[Tuple[str, Callable[[], AsyncIterator[str]]]]:
+        # Orçamento de ``limit + 1`` tokens (cada um tem ao menos 1 caractere):
+        # o texto sempre passa do limite se for longo, e aí a guarda encerra a geração
+        sources = []
+        if self.openai_client is not None:
+            sources.append(("openai", lambda: openai_token_stream(
+                self.openai_client, self.config.openai_model, prompt,
+                limit + 1, self.config.temperature, self.config.top_p
+            )))
+        if self.hf_pipeline is not None or self.pipeline_loader is not None:
+            sources.append(("huggingface", lambda: self._huggingface(prompt, limit)))
+        return sources
+
+    async def stream_content(self, request: Any, stats: Optional[StreamStats] = None) -> AsyncIterator[str]:
+        """
+        Gera o conteúdo da requisição em pedaços de texto
+
+        Args:
+            request: ``ContentRequest`` (topic, platform, tone, max_length...)
+            stats: Preenchido com provedor, TTFT, duração e texto final
+
+        Yields:
+            Deltas de texto já dentro do limite da plataforma
+
+        Raises:
+            ContentStreamError: Se nenhum provedor entregar o primeiro token
+        """
+        stats = stats if stats is not None else StreamStats()
+        guard = PlatformLengthGuard.for_platform(request.platform, getattr(request, "max_length", None))
+        prompt = self.prompt_builder(request)
+        start = time.perf_counter()
+
+        sources = self._sources(prompt, guard.limit)
+        for position, (provider, source) in enumerate(sources):
+            # O último provedor não tem para quem passar a vez: espera sem limite
+            timeout = self.first_token_timeout if position < len(sources) - 1 else None
+            tokens = source()
+            try:
+                first = await asyncio.wait_for(tokens.__anext__(), timeout)
+            except Exception as e:
+                await tokens.aclose()
+                detail = str(e) or f"sem primeiro token em {timeout}s"
+                reason = f"{provider}: {e.__class__.__name__}: {detail}"
+                stats.failures.append(reason)
+                self.metrics.fallbacks += 1
+                self.logger.warning(f"⚠️ Stream falhou antes do primeiro token ({reason})")
+                continue
+
+            stats.provider = provider
+            self.metrics.record_first_token(provider, time.perf_counter() - start)
+            try:
+                pending = [first]
+                while not guard.done:
+                    for piece in pending:
+                        delta = guard.feed(piece)
+                        if delta:
+                            if stats.ttft is None:
+                                stats.ttft = time.perf_counter() - start
+                            yield delta
+                    try:
+                        pending = [await tokens.__anext__()]
+                    except StopAsyncIteration:
+                        break
+            finally:
+                await tokens.aclose()
+
+            tail = guard.finish()
+            if tail:
+                if stats.ttft is None:
+                    stats.ttft = time.perf_counter() - start
+                yield tail
+
+            stats.duration = time.perf_counter() - start
+            stats.truncated = guard.truncated
+            stats.text = guard.text
+            self.metrics.record_stream(provider, stats.duration, guard.truncated)
+            return
+
+        raise ContentStreamError(
+            "Nenhum provedor de IA iniciou o stream" + (f" ({'; '.join(stats.failures)})" if stats.failures else "")
+        )
+
+    async def stream_events(self, request: Any) -> AsyncIterator[str]:
+        """
+        O stream no formato Server-Sent Events
+
+        Eventos: ``token`` (``{"text": delta}``) a cada pedaço, ``done`` com o
+        texto final, provedor, TTFT e se houve corte, ou ``error``.
+        """
+        stats = StreamStats()
+        try:
+            async for delta in self.stream_content(request, stats):
+                yield format_sse({"text": delta}, event="token")
+        except ContentStreamError as e:
+            yield format_sse({"error": str(e)}, event="error")
+            return
+        yield format_sse({
+            "text": stats.text,
+            "provider": stats.provider,
+            "ttft_ms": round(stats.ttft * 1000, 1) if stats.ttft is not None else None,
+            "truncated": stats.truncated
+        }, event="done")
+
+    def close(self) -> None:
+        """Libera o pool de threads (gerações em andamento terminam antes)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    """Codifica um evento Server-Sent Events (``data`` em JSON)"""
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in json.dumps(data, ensure_ascii=False).splitlines())
+    return "\n".join(lines) + "\n\n"
+
+
+def create_stream_router(streamer: ContentStreamer, request_factory: Callable[..., Any]) -> Any:
+    """
+    Rotas FastAPI do streaming de conteúdo
+
+    ``GET /api/content/stream?topic=...&platform=twitter`` responde com
+    ``text/event-stream`` (compatível com ``EventSource`` no navegador).
+
+    Args:
+        streamer: ``ContentStreamer`` compartilhado
+        request_factory: Cria a requisição a partir de ``topic``, ``platform``,
+            ``tone`` e ``max_length`` (ex: ``ContentRequest``)
+    """
+    from fastapi import APIRouter
+    from fastapi.responses import StreamingResponse
+
+    router = APIRouter()
+
+    @router.get("/api/content/stream")
+    async def stream_content(
+        topic: str,
+        platform: str = "twitter",
+        tone: Optional[str] = None,
+        max_length: Optional[int] = None
+    ):
+        params = {"topic": topic, "platform": platform}
+        if tone is not None:
+            params["tone"] = tone
+        if max_length is not None:
+            params["max_length"] = max_length
+        return StreamingResponse(
+            streamer.stream_events(request_factory(**params)),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    @router.get("/api/content/stream/metrics")
+    async def stream_metrics():
+        return streamer.metrics.snapshot()
+
+    return router
@@ -0,0 +1,349 @@
+"""
+Cache de conteúdo gerado do SocialBot AI
+
+Evita regerar conteúdo para requisições idênticas. A chave é um hash
+canônico da ``ContentRequest`` mais os parâmetros do modelo em ``AIConfig``
+(modelo, temperatura, top_p), de modo que mudar a configuração de IA
+invalida naturalmente as entradas antigas.
+
+Camadas:
+- Memória: LRU com limite de tamanho e TTL (por processo)
+- Redis (opcional): compartilhado entre réplicas via ``DatabaseConfig.redis_url``
+"""
+
+import hashlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Campos da ContentRequest que influenciam o texto gerado
+REQUEST_KEY_FIELDS = (
+    "topic",
+    "tone",
+    "content_type",
+    "platform",
+    "max_length",
+    "include_hashtags",
+    "include_emojis",
+    "target_audience",
+    "keywords",
+    "context"
+)
+
+# Campos do AIConfig que influenciam o texto gerado
+CONFIG_KEY_FIELDS = ("openai_model", "model_name", "temperature", "top_p")
+
+
+def _canonical(value: Any) -> Any:
+    """Normaliza valores para uma representação JSON estável"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items())}
+    return value
+
+
+def request_cache_key(request: Any, ai_config: Any, namespace: str = "content") -> str:
+    """
+    Calcula a chave de cache de uma requisição
+
+    Args:
+        request: ``ContentRequest`` (ou objeto com os mesmos campos)
+        ai_config: ``AIConfig`` usado na geração
+        namespace: Prefixo para separar tipos de conteúdo no cache
+
+    Returns:
+        Chave no formato ``<namespace>:<sha256>``
+    """
+    payload = {
+        "request": {f: _canonical(getattr(request, f, None)) for f in REQUEST_KEY_FIELDS},
+        "model": {f: _canonical(getattr(ai_config, f, None)) for f in CONFIG_KEY_FIELDS}
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    digest = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+@dataclass
+class CacheStats:
+    """Contadores do cache de geração"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    memory_hits: int = 0
+    redis_hits: int = 0
+    redis_errors: int = 0
+    bypassed: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Taxa de acerto (0.0 a 1.0)"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte estatísticas para dicionário (métricas/dashboard)"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "redis_errors": self.redis_errors,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hit_rate, 4)
+        }
+
+
+class CacheTier(ABC):
+    """Interface de uma camada de cache"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Retorna o valor ou None se ausente/expirado"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None:
+        """Armazena um valor"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove um valor"""
+
+
+class MemoryCacheTier(CacheTier):
+    """Camada LRU em memória com TTL"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600,
+        stats: Optional[CacheStats] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Inicializa a camada em memória
+
+        Args:
+            max_entries: Número máximo de entradas antes de despejar a menos usada
+            ttl_seconds: Tempo de vida de cada entrada
+            stats: Contadores compartilhados com o ``GenerationCache``
+            clock: Relógio monotônico (injetável para testes)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = stats or CacheStats()
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheTier(CacheTier):
+    """
+    Camada compartilhada em Redis
+
+    Os valores são serializados com ``encode``/``decode`` (JSON por padrão);
+    o ``GenerationCache`` do ContentGenerator deve passar funções que
+    convertem ``GeneratedContent`` de/para dicionário.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        ttl_seconds: float = 86400,
+        encode: Callable[[Any], str] = json.dumps,
+        decode: Callable[[str], Any] = json.loads,
+        client: Any = None
+    ):
+        """
+        Inicializa a camada Redis
+
+        Args:
+            redis_url: URL do Redis (``DatabaseConfig.redis_url``)
+            ttl_seconds: Tempo de vida das entradas
+            encode: Serializa o valor para string
+            decode: Desserializa a string para o valor
+            client: Cliente ``redis.asyncio`` já criado (opcional)
+        """
+        self.redis_url = redis_url
+        self.ttl_seconds = ttl_seconds
+        self.encode = encode
+        self.decode = decode
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        """Cliente Redis criado sob demanda"""
+        if self._client is None:
+            import redis.asyncio as aioredis
+            self._client = aioredis.from_url(self.redis_url, decode_responses=True)
+        return self._client
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(key)
+        return self.decode(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any) -> None:
+        await self.client.set(key, self.encode(value), ex=max(1, int(self.ttl_seconds)))
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(key)
+
+
+class GenerationCache:
+    """
+    Cache em camadas para conteúdo gerado
+
+    Lê primeiro da memória, depois do Redis (promovendo o valor para a
+    memória). Falhas do Redis nunca derrubam a geração: são contadas e o
+    cache passa a se comportar como miss.
+    """
+
+    def __init__(
+        self,
+        memory: Optional[MemoryCacheTier] = None,
+        redis: Optional[CacheTier] = None
+    ):
+        self.stats = CacheStats()
+        self.memory = memory or MemoryCacheTier()
+        self.memory.stats = self.stats
+        self.redis = redis
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, config: Any, **redis_kwargs: Any) -> "GenerationCache":
+        """
+        Cria o cache a partir do ``Config`` principal
+
+        Args:
+            config: Instância de ``Config`` (usa ``config.ai`` e ``config.database``)
+            **redis_kwargs: Argumentos extras para ``RedisCacheTier`` (ex: encode/decode)
+        """
+        memory = MemoryCacheTier(
+            max_entries=config.ai.cache_max_entries,
+            ttl_seconds=config.ai.cache_ttl_seconds
+        )
+        redis = None
+        if config.ai.cache_use_redis:
+            redis = RedisCacheTier(
+                config.database.redis_url,
+                ttl_seconds=config.ai.cache_ttl_seconds,
+                **redis_kwargs
+            )
+        return cls(memory=memory, redis=redis)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Busca um valor nas camadas do cache"""
+        value = await self.memory.get(key)
+        if value is not None:
+            self.stats.hits += 1
+            self.stats.memory_hits += 1
+            return value
+
+        if self.redis is not None:
+            try:
+                value = await self.redis.get(key)
+            except Exception as e:
+                self.stats.redis_errors += 1
+                self.logger.warning(f"⚠️ Cache Redis indisponível: {e}")
+                value = None
+
+            if value is not None:
+                self.stats.hits += 1
+                self.stats.redis_hits += 1
+                await self.memory.set(key, value)
+                return value
+
+        self.stats.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        """Armazena um valor em todas as camadas"""
+        await self.memory.set(key, value)
+
+        if self.redis is not None:
+            try:
+                await self.redis.set(key, value)
+            except Exception as e:
+                self.stats.redis_errors += 1
+                self.logger.warning(f"⚠️ Falha ao gravar no cache Redis: {e}")
+
+    async def invalidate(self, key: str) -> None:
+        """Remove um valor de todas as camadas"""
+        await self.memory.delete(key)
+
+        if self.redis is not None:
+            try:
+                await self.redis.delete(key)
+            except Exception as e:
+                self.stats.redis_errors += 1
+                self.logger.warning(f"⚠️ Falha ao invalidar cache Redis: {e}")
+
+    async def get_or_generate(
+        self,
+        request: Any,
+        ai_config: Any,
+        generate: Callable[[], Awaitable[Optional[Any]]],
+        force_fresh: bool = False
+    ) -> Optional[Any]:
+        """
+        Retorna o conteúdo em cache ou gera e armazena um novo
+
+        Args:
+            request: ``ContentRequest`` da geração
+            ai_config: ``AIConfig`` usado na geração
+            generate: Corrotina sem argumentos que gera o conteúdo
+            force_fresh: Ignora o cache na leitura (o resultado novo é armazenado)
+
+        Returns:
+            Conteúdo gerado ou None se a geração falhou (falhas não são cacheadas)
+        """
+        key = request_cache_key(request, ai_config)
+
+        if force_fresh:
+            self.stats.bypassed += 1
+        else:
+            cached = await self.get(key)
+            if cached is not None:
+                return cached
+
+        value = await generate()
+        if value is not None:
+            await self.set(key, value)
+        return value
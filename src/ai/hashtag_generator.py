@@ -0,0 +1,555 @@
+"""
+Geração de hashtags por ranking sobre um índice de co-ocorrência
+
+Em vez de chamar um modelo a cada pedido, o ``HashtagGenerator`` mantém um
+índice das hashtags observadas nos nossos posts e nos dados de engajamento:
+
+- matriz esparsa (CSR em arrays numpy) de co-ocorrência entre hashtags;
+- uso e engajamento por hashtag com decaimento exponencial (meia-vida
+  longa) e uso recente (meia-vida curta), cuja razão mede a tendência.
+
+Observações novas ficam pendentes e entram no índice a cada ``refresh()``
+(periódico, em background e fora do event loop). Cada refresh publica um
+``HashtagIndex`` imutável com uma troca de referência; consultas usam o
+snapshot atual sem lock.
+
+Uma sugestão para um tema é uma única passada vetorizada: as hashtags do
+tema (sementes) selecionam suas linhas da matriz, os vizinhos são somados
+com ``np.bincount`` e pontuados por relevância x qualidade x tendência. As
+linhas são podadas aos K vizinhos mais fortes, então o custo não depende do
+tamanho do vocabulário.
+
+Example:
+    >>> generator = HashtagGenerator.from_config(config)
+    >>> generator.observe_post(["#Python", "#IA"], engagement=42)
+    >>> await generator.refresh()
+    >>> generator.generate("novidades do python", count=3)
+    ['#Python', '#IA', '#DataScience']
+"""
+
+import asyncio
+import bisect
+import logging
+import math
+import re
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+HASHTAG_PATTERN = re.compile(r"#(\w+)")
+_CAMEL_PARTS = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+# Máximo de hashtags de um post consideradas na co-ocorrência
+MAX_TAGS_PER_POST = 30
+
+# Hashtags por palavra usadas como sementes parciais (as mais usadas)
+MAX_PARTIAL_SEEDS = 16
+
+# Peso da própria semente na relevância (vizinhos chegam no máximo a 1)
+SEED_SELF_WEIGHT = 2.0
+
+# Quantidade padrão por plataforma (quando ``count`` não é informado)
+PLATFORM_COUNTS = {"twitter": 3, "instagram": 15, "linkedin": 5, "tiktok": 5}
+
+
+def normalize_tag(tag: str) -> str:
+    """Chave de identidade: sem ``#``, minúscula e sem acentos"""
+    decomposed = unicodedata.normalize("NFKD", tag.lstrip("#"))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tag_words(tag: str) -> List[str]:
+    """Palavras de uma hashtag em camelCase (``#MachineLearning`` -> machine, learning)"""
+    parts = _CAMEL_PARTS.findall(tag.lstrip("#"))
+    return [normalize_tag(part) for part in parts if len(part) > 1]
+
+
+def extract_hashtags(text: str) -> List[str]:
+    """Hashtags de um texto, na ordem, sem repetição"""
+    seen, tags = set(), []
+    for match in HASHTAG_PATTERN.findall(text):
+        key = normalize_tag(match)
+        if key not in seen:
+            seen.add(key)
+            tags.append(f"#{match}")
+    return tags
+
+
+def _gather_rows(indptr: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Posições das entradas CSR das linhas pedidas e a linha de origem de cada uma"""
+    starts, ends = indptr[rows], indptr[rows + 1]
+    lengths = ends - starts
+    total = int(lengths.sum())
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(total), np.repeat(np.arange(len(rows)), lengths)
+
+
+@dataclass(frozen=True)
+class HashtagIndex:
+    """
+    Snapshot imutável do índice
+
+    ``tags``, ``ids`` e ``word_index`` são compartilhados com o gerador (só
+    recebem inserções); ids ``>= size`` ainda não existem neste snapshot.
+    ``partial`` guarda, para palavras comuns, as hashtags mais usadas que a
+    contêm, e ``inv_norm`` é ``1 / sqrt(uso)``, ambos pré-calculados.
+    """
+    version: int
+    size: int
+    tags: Sequence[str]
+    ids: Dict[str, int]
+    word_index: Dict[str, List[int]]
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+    usage: np.ndarray
+    inv_norm: np.ndarray
+    boost: np.ndarray
+    partial: Dict[str, np.ndarray]
+    trending: np.ndarray
+    built_at: float = field(default_factory=time.time)
+
+    @property
+    def nnz(self) -> int:
+        """Entradas não nulas da matriz de consulta"""
+        return int(self.indptr[-1]) if len(self.indptr) else 0
+
+    def seeds(self, topic: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Hashtags conhecidas que correspondem ao tema
+
+        Correspondências exatas (palavra, par de palavras ou tema inteiro
+        colado) pesam 1; hashtags que só contêm uma palavra do tema pesam 0,3
+        (limitadas às ``MAX_PARTIAL_SEEDS`` mais usadas por palavra).
+        """
+        words = [normalize_tag(word) for word in re.findall(r"\w+", topic)]
+        keys = set(words) | {a + b for a, b in zip(words, words[1:])} | {"".join(words)}
+
+        weights: Dict[int, float] = {}
+        for key in keys:
+            tag_id = self.ids.get(key)
+            if tag_id is not None and tag_id < self.size:
+                weights[tag_id] = 1.0
+        for word in words:
+            partial = self.partial.get(word)
+            if partial is None:
+                ids = self.word_index.get(word, [])
+                partial = ids[:min(bisect.bisect_left(ids, self.size), MAX_PARTIAL_SEEDS)]
+            for tag_id in partial:
+                weights.setdefault(int(tag_id), 0.3)
+
+        seeds = np.fromiter(weights.keys(), dtype=np.int64, count=len(weights))
+        return seeds, np.fromiter(weights.values(), dtype=np.float64, count=len(weights))
+
+    def rank(
+        self,
+        seeds: np.ndarray,
+        seed_weights: np.ndarray,
+        limit: int,
+        exclude: Iterable[int] = ()
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pontua vizinhos das sementes em uma passada vetorizada
+
+        relevância(c) = Σ_s w_s · C[s, c] / sqrt(uso_s · uso_c), com as próprias
+        sementes valendo ``SEED_SELF_WEIGHT`` · w_s; pontuação = relevância x
+        boost (qualidade e tendência pré-calculadas no refresh).
+
+        Returns:
+            (ids, pontuações) dos ``limit`` melhores, em ordem decrescente
+        """
+        if len(seeds) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        positions, origin = _gather_rows(self.indptr, seeds)
+        inv_norm = self.inv_norm
+        columns = np.concatenate([self.indices[positions], seeds])
+        contributions = np.concatenate([
+            self.weights[positions] * (seed_weights * inv_norm[seeds])[origin] * inv_norm[self.indices[positions]],
+            seed_weights * SEED_SELF_WEIGHT
+        ])
+
+        candidates, inverse = np.unique(columns, return_inverse=True)
+        scores = np.bincount(inverse, weights=contributions) * self.boost[candidates]
+
+        excluded = np.fromiter(exclude, dtype=np.int64)
+        if len(excluded):
+            scores[np.isin(candidates, excluded)] = -np.inf
+        if len(scores) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        top = top[np.isfinite(scores[top])]
+        return candidates[top], scores[top]
+
+
+class HashtagGenerator:
+    """
+    Motor de ranking de hashtags com índice atualizado em background
+
+    Observações (``observe_post``/``observe_engagement``) são baratas: só
+    registram ids. O trabalho pesado acontece no ``refresh()``.
+    """
+
+    def __init__(
+        self,
+        default_hashtags: Sequence[str] = (),
+        half_life_hours: float = 72.0,
+        trend_half_life_hours: float = 6.0,
+        trend_weight: float = 0.5,
+        neighbors_per_tag: int = 64,
+        min_weight: float = 0.05,
+        index_path: Optional[str] = None,
+        clock=time.time
+    ):
+        """
+        Inicializa o gerador
+
+        Args:
+            default_hashtags: Fallback quando o índice não conhece o tema
+            half_life_hours: Meia-vida do uso, engajamento e co-ocorrência
+            trend_half_life_hours: Meia-vida do uso recente (tendência)
+            trend_weight: Peso da tendência na pontuação
+            neighbors_per_tag: Vizinhos mantidos por hashtag no índice de consulta
+            min_weight: Co-ocorrências decaídas abaixo disso são descartadas
+            index_path: Arquivo ``.npz`` do índice (salvo a cada refresh)
+            clock: Fonte de tempo (injetável para testes)
+        """
+        self.default_hashtags = list(default_hashtags)
+        self.half_life = half_life_hours * 3600
+        self.trend_half_life = trend_half_life_hours * 3600
+        self.trend_weight = trend_weight
+        self.neighbors_per_tag = neighbors_per_tag
+        self.min_weight = min_weight
+        self.index_path = Path(index_path) if index_path else None
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        # Registro de hashtags (só cresce; compartilhado com os snapshots)
+        self._tags: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._words: Dict[str, List[int]] = {}
+
+        # Observações desde o último refresh
+        self._pending_posts: List[Tuple[List[int], float]] = []
+        self._pending_engagement: List[Tuple[List[int], float]] = []
+
+        # Estado acumulado (matriz completa, antes da poda)
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.empty(0, dtype=np.int32)
+        self._data = np.empty(0, dtype=np.float32)
+        self._usage = np.empty(0)
+        self._recent = np.empty(0)
+        self._engagement = np.empty(0)
+        self._updated_at = clock()
+
+        self._refresh_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._index = self._empty_index()
+
+        if self.index_path is not None and self.index_path.exists():
+            self.load(self.index_path)
+
+    @classmethod
+    def from_config(cls, config: Any) -> "HashtagGenerator":
+        """Cria o gerador a partir do ``Config`` principal"""
+        return cls(
+            default_hashtags=config.default_hashtags,
+            half_life_hours=config.ai.hashtag_half_life_hours,
+            index_path=config.ai.hashtag_index_path or None
+        )
+
+    @property
+    def index(self) -> HashtagIndex:
+        """Snapshot publicado mais recente"""
+        return self._index
+
+    def _empty_index(self) -> HashtagIndex:
+        return HashtagIndex(
+            version=0, size=0, tags=self._tags, ids=self._ids, word_index=self._words,
+            indptr=np.zeros(1, dtype=np.int64), indices=np.empty(0, dtype=np.int32),
+            weights=np.empty(0, dtype=np.float32), usage=np.empty(0), inv_norm=np.empty(0),
+            boost=np.empty(0), partial={}, trending=np.empty(0, dtype=np.int64)
+        )
+
+    # ------------------------------------------------------------------ #
+    # Observações
+    # ------------------------------------------------------------------ #
+
+    def _tag_ids(self, hashtags: Iterable[str]) -> List[int]:
+        ids: List[int] = []
+        for tag in hashtags:
+            key = normalize_tag(tag)
+            if not key:
+                continue
+            tag_id = self._ids.get(key)
+            if tag_id is None:
+                tag_id = len(self._tags)
+                self._tags.append(f"#{tag.lstrip('#')}")
+                self._ids[key] = tag_id
+                for word in set(tag_words(tag)) - {key}:
+                    self._words.setdefault(word, []).append(tag_id)
+            if tag_id not in ids:
+                ids.append(tag_id)
+        return ids[:MAX_TAGS_PER_POST]
+
+    def observe_post(self, hashtags: Iterable[str], engagement: float = 0.0) -> None:
+        """
+        Registra um post (nosso ou coletado) com suas hashtags
+
+        Args:
+            hashtags: Hashtags do post (com ou sem ``#``)
+            engagement: Engajamento do post (curtidas + compartilhamentos...)
+        """
+        ids = self._tag_ids(hashtags)
+        if ids:
+            self._pending_posts.append((ids, float(engagement)))
+
+    def observe_text(self, text: str, engagement: float = 0.0) -> None:
+        """Registra um post a partir do texto (extrai as hashtags)"""
+        self.observe_post(extract_hashtags(text), engagement)
+
+    def observe_engagement(self, hashtags: Iterable[str], engagement: float) -> None:
+        """
+        Soma engajamento novo de um post já observado (ex: dados do
+        ``EngagementTracker``), sem contar co-ocorrência de novo
+        """
+        ids = self._tag_ids(hashtags)
+        if ids and engagement:
+            self._pending_engagement.append((ids, float(engagement)))
+
+    # ------------------------------------------------------------------ #
+    # Refresh
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _post_pairs(posts: List[Tuple[List[int], float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Pares (i, j), i != j, de todas as hashtags de cada post (vetorizado por tamanho)"""
+        by_length: Dict[int, List[List[int]]] = {}
+        for ids, _ in posts:
+            if len(ids) > 1:
+                by_length.setdefault(len(ids), []).append(ids)
+
+        rows, cols = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+        for length, groups in by_length.items():
+            matrix = np.asarray(groups, dtype=np.int64)
+            a, b = np.nonzero(~np.eye(length, dtype=bool))
+            rows.append(matrix[:, a].ravel())
+            cols.append(matrix[:, b].ravel())
+        return np.concatenate(rows), np.concatenate(cols)
+
+    def _build(
+        self,
+        size: int,
+        posts: List[Tuple[List[int], float]],
+        engagement: List[Tuple[List[int], float]],
+        now: float,
+        version: int
+    ) -> HashtagIndex:
+        """Aplica decaimento + observações pendentes e monta o snapshot (roda no executor)"""
+        elapsed = max(now - self._updated_at, 0.0)
+        decay = 0.5 ** (elapsed / self.half_life)
+        trend_decay = 0.5 ** (elapsed / self.trend_half_life)
+
+        def grown(values: np.ndarray, factor: float) -> np.ndarray:
+            result = np.zeros(size)
+            result[:len(values)] = values * factor
+            return result
+
+        usage, recent, engaged = grown(self._usage, decay), grown(self._recent, trend_decay), grown(self._engagement, decay)
+        for observations, counts in ((posts, (usage, recent)), (engagement, ())):
+            if observations:
+                flat = np.fromiter(chain.from_iterable(ids for ids, _ in observations), dtype=np.int64)
+                lengths = np.fromiter((len(ids) for ids, _ in observations), dtype=np.int64, count=len(observations))
+                values = np.fromiter((value for _, value in observations), dtype=np.float64, count=len(observations))
+                for target in counts:
+                    target += np.bincount(flat, minlength=size)
+                engaged += np.bincount(flat, weights=np.repeat(values, lengths), minlength=size)
+
+        # Co-ocorrência: CSR antigo (decaído) + pares novos, agregados por chave
+        old_rows = np.repeat(np.arange(len(self._indptr) - 1, dtype=np.int64), np.diff(self._indptr))
+        new_rows, new_cols = self._post_pairs(posts)
+        keys = np.concatenate([old_rows * size + self._indices, new_rows * size + new_cols])
+        values = np.concatenate([self._data.astype(np.float64) * decay, np.ones(len(new_rows))])
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        totals = np.bincount(inverse, weights=values) if len(keys) else np.empty(0)
+        keep = totals >= self.min_weight
+        unique_keys, totals = unique_keys[keep], totals[keep]
+
+        rows = unique_keys // size
+        self._indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=size))]).astype(np.int64)
+        self._indices = (unique_keys % size).astype(np.int32)
+        self._data = totals.astype(np.float32)
+        self._usage, self._recent, self._engagement = usage, recent, engaged
+        self._updated_at = now
+
+        # Índice de consulta: só os K vizinhos mais fortes de cada linha
+        order = np.lexsort((-self._data, rows))
+        rank = np.arange(len(order)) - self._indptr[rows[order]]
+        pruned = np.sort(order[rank < self.neighbors_per_tag])
+        query_indptr = np.concatenate([[0], np.cumsum(np.bincount(rows[pruned], minlength=size))]).astype(np.int64)
+
+        # Qualidade (engajamento médio) e tendência (uso recente vs. longo prazo)
+        quality = np.log1p(engaged / (usage + 1.0))
+        expected_recent = usage * (self.trend_half_life / self.half_life)
+        trend = np.clip((recent + 1.0) / (expected_recent + 1.0) - 1.0, 0.0, 4.0)
+        boost = (1.0 + quality) * (1.0 + self.trend_weight * trend)
+        heat = recent * boost
+        top = min(100, size)
+        trending = np.argpartition(-heat, top - 1)[:top] if size else np.empty(0, dtype=np.int64)
+        trending = trending[np.argsort(-heat[trending], kind="stable")]
+
+        # Sementes parciais: só palavras com mais hashtags que o limite
+        partial = {}
+        for word, ids in list(self._words.items()):  # Cópia: o loop pode inserir palavras
+            if len(ids) > MAX_PARTIAL_SEEDS:
+                candidates = np.asarray(ids[:bisect.bisect_left(ids, size)], dtype=np.int64)
+                if len(candidates) > MAX_PARTIAL_SEEDS:
+                    candidates = candidates[np.argpartition(-usage[candidates], MAX_PARTIAL_SEEDS)[:MAX_PARTIAL_SEEDS]]
+                partial[word] = candidates
+
+        return HashtagIndex(
+            version=version, size=size, tags=self._tags, ids=self._ids, word_index=self._words,
+            indptr=query_indptr, indices=self._indices[pruned], weights=self._data[pruned],
+            usage=usage, inv_norm=1.0 / np.sqrt(np.maximum(usage, 1e-9)), boost=boost,
+            partial=partial, trending=trending, built_at=now
+        )
+
+    async def refresh(self) -> HashtagIndex:
+        """Incorpora as observações pendentes e publica um novo snapshot"""
+        async with self._refresh_lock:
+            posts, self._pending_posts = self._pending_posts, []
+            engagement, self._pending_engagement = self._pending_engagement, []
+            size = len(self._tags)
+
+            start = time.perf_counter()
+            index = await asyncio.get_running_loop().run_in_executor(
+                None, self._build, size, posts, engagement, self.clock(), self._index.version + 1
+            )
+            self._index = index  # Troca atômica da referência
+            self.logger.debug(
+                f"#️⃣ Índice de hashtags v{index.version}: {size} tags, {index.nnz} arestas, "
+                f"{len(posts)} posts novos em {(time.perf_counter() - start) * 1000:.0f} ms"
+            )
+
+            if self.index_path is not None:
+                await asyncio.get_running_loop().run_in_executor(None, self.save, self.index_path)
+            return index
+
+    async def _refresh_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.logger.error(f"❌ Erro ao atualizar o índice de hashtags: {e}")
+
+    def start(self, interval: float = 300.0) -> None:
+        """Atualiza o índice periodicamente em background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop(interval))
+
+    async def stop(self) -> None:
+        """Para o refresh periódico"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ------------------------------------------------------------------ #
+    # Persistência
+    # ------------------------------------------------------------------ #
+
+    def save(self, path: Path) -> None:
+        """Grava o estado acumulado em ``.npz`` (escrita atômica)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = len(self._usage)
+        temp_path = path.with_suffix(".tmp.npz")
+        np.savez(
+            temp_path,
+            tags=np.array(self._tags[:size], dtype=str),
+            indptr=self._indptr, indices=self._indices, data=self._data,
+            usage=self._usage, recent=self._recent, engagement=self._engagement,
+            updated_at=np.array(self._updated_at)
+        )
+        temp_path.replace(path)
+
+    def load(self, path: Path) -> None:
+        """Restaura o estado salvo e publica o snapshot correspondente"""
+        with np.load(path) as saved:
+            for tag in saved["tags"].tolist():
+                self._tag_ids([tag])
+            self._indptr, self._indices, self._data = saved["indptr"], saved["indices"], saved["data"]
+            self._usage, self._recent, self._engagement = saved["usage"], saved["recent"], saved["engagement"]
+            self._updated_at = float(saved["updated_at"])
+        self._index = self._build(len(self._tags), [], [], self._updated_at, 1)
+        self.logger.info(f"#️⃣ Índice de hashtags carregado: {len(self._tags)} tags")
+
+    # ------------------------------------------------------------------ #
+    # Sugestões
+    # ------------------------------------------------------------------ #
+
+    def suggest(
+        self,
+        topic: str,
+        count: int = 5,
+        exclude: Iterable[str] = ()
+    ) -> List[Tuple[str, float]]:
+        """
+        Hashtags mais relevantes para o tema, com pontuação
+
+        Args:
+            topic: Tema ou texto do post
+            count: Quantidade máxima
+            exclude: Hashtags a evitar (ex: já presentes no texto)
+
+        Returns:
+            Lista de (hashtag, pontuação), da maior para a menor
+        """
+        index = self._index
+        excluded = [index.ids[key] for key in map(normalize_tag, exclude) if key in index.ids]
+        seeds, weights = index.seeds(topic)
+        if count <= 0:
+            return []
+        ids, scores = index.rank(seeds, weights, count, exclude=excluded)
+        return [(index.tags[i], float(s)) for i, s in zip(ids.tolist(), scores.tolist())]
+
+    def generate(
+        self,
+        topic: str,
+        count: Optional[int] = None,
+        platform: Optional[str] = None,
+        exclude: Iterable[str] = ()
+    ) -> List[str]:
+        """
+        Lista de hashtags para o tema (ex: ``["#Python", "#IA"]``)
+
+        Completa com as hashtags em alta e, por fim, com as hashtags padrão
+        da configuração quando o índice não conhece o tema.
+        """
+        if count is None:
+            count = PLATFORM_COUNTS.get((platform or "").lower(), 5)
+        exclude = list(exclude)
+        result = [tag for tag, _ in self.suggest(topic, count, exclude)]
+
+        taken = {normalize_tag(tag) for tag in result + exclude}
+        index = self._index
+        fallback = [index.tags[i] for i in index.trending.tolist()] + self.default_hashtags
+        for tag in fallback:
+            if len(result) >= count:
+                break
+            key = normalize_tag(tag)
+            if key not in taken:
+                taken.add(key)
+                result.append(tag)
+        return result
@@ -0,0 +1,230 @@
+"""
+Corrida de provedores de IA (hedged requests) do SocialBot AI
+
+Por padrão a geração é sequencial: OpenAI primeiro e Hugging Face apenas
+se o primeiro falhar. No modo ``hedged`` o segundo provedor é disparado em
+paralelo quando o primeiro passa do seu p95 de latência observado; o
+primeiro resultado válido vence e o perdedor é cancelado. Assim uma falha
+lenta da OpenAI não soma todo o timeout à latência de cauda.
+"""
+
+import asyncio
+import bisect
+import logging
+import math
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+ProviderCall = Callable[[], Awaitable[Any]]
+
+
+class ProviderPolicy(Enum):
+    """Políticas de uso dos provedores de IA"""
+    SEQUENTIAL = "sequential"
+    HEDGED = "hedged"
+
+
+class LatencyHistogram:
+    """
+    Histograma online de latências com buckets logarítmicos
+
+    Memória constante independente do número de amostras. Quando o total de
+    amostras passa de ``max_samples`` os contadores são divididos por dois,
+    o que faz o histograma acompanhar mudanças recentes de latência.
+    """
+
+    def __init__(
+        self,
+        min_seconds: float = 0.005,
+        max_seconds: float = 120.0,
+        buckets_per_decade: int = 20,
+        max_samples: int = 10_000
+    ):
+        decades = math.log10(max_seconds / min_seconds)
+        count = int(math.ceil(decades * buckets_per_decade)) + 1
+        ratio = (max_seconds / min_seconds) ** (1 / (count - 1))
+
+        self.bounds: List[float] = [min_seconds * ratio ** i for i in range(count)]
+        self.counts: List[float] = [0.0] * (count + 1)  # último bucket = overflow
+        self.total = 0.0
+        self.max_samples = max_samples
+
+    def record(self, seconds: float) -> None:
+        """Registra uma latência em segundos"""
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.total += 1
+
+        if self.total > self.max_samples:
+            self.counts = [c / 2 for c in self.counts]
+            self.total /= 2
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estima o quantil ``q`` (0-1) pelo limite superior do bucket
+
+        Returns:
+            Latência em segundos ou None se não houver amostras
+        """
+        if self.total == 0:
+            return None
+
+        target = q * self.total
+        cumulative = 0.0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return self.bounds[min(index, len(self.bounds) - 1)]
+        return self.bounds[-1]
+
+
+@dataclass
+class HedgeSettings:
+    """Parâmetros do modo hedged"""
+    policy: ProviderPolicy = ProviderPolicy.SEQUENTIAL
+    quantile: float = 0.95
+    min_delay: float = 0.05
+    max_delay: float = 10.0
+    default_delay: float = 2.0
+    min_samples: int = 20
+
+    @classmethod
+    def from_ai_config(cls, ai_config: Any) -> "HedgeSettings":
+        """Cria as configurações a partir do ``AIConfig``"""
+        return cls(
+            policy=ProviderPolicy(ai_config.provider_policy),
+            quantile=ai_config.hedge_quantile,
+            min_delay=ai_config.hedge_min_delay_ms / 1000,
+            max_delay=ai_config.hedge_max_delay_ms / 1000
+        )
+
+
+class ProviderRacer:
+    """
+    Executa provedores de IA segundo a política configurada
+
+    Mantém um ``LatencyHistogram`` por provedor, alimentado apenas por
+    respostas bem-sucedidas, usado para calcular o atraso do hedge.
+    """
+
+    def __init__(self, settings: Optional[HedgeSettings] = None):
+        self.settings = settings or HedgeSettings()
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.stats = {"hedges_started": 0, "hedge_wins": 0, "fallbacks": 0}
+        self.logger = logging.getLogger(__name__)
+
+    def hedge_delay(self, provider: str) -> float:
+        """Atraso antes de disparar o provedor secundário"""
+        histogram = self.histograms.get(provider)
+        if histogram is None or histogram.total < self.settings.min_samples:
+            delay = self.settings.default_delay
+        else:
+            delay = histogram.quantile(self.settings.quantile) or self.settings.default_delay
+
+        return min(max(delay, self.settings.min_delay), self.settings.max_delay)
+
+    def _record(self, provider: str, seconds: float) -> None:
+        self.histograms.setdefault(provider, LatencyHistogram()).record(seconds)
+
+    async def _timed(self, provider: str, call: ProviderCall) -> Any:
+        """Executa um provedor registrando a latência em caso de sucesso"""
+        start = time.monotonic()
+        result = await call()
+        if result is not None:
+            self._record(provider, time.monotonic() - start)
+        return result
+
+    async def run(
+        self,
+        primary: Tuple[str, ProviderCall],
+        secondary: Tuple[str, ProviderCall]
+    ) -> Tuple[Optional[str], Any]:
+        """
+        Executa os provedores e retorna o primeiro resultado válido
+
+        Args:
+            primary: ``(nome, corrotina sem argumentos)`` do provedor preferido
+            secondary: ``(nome, corrotina sem argumentos)`` do provedor reserva
+
+        Returns:
+            Tupla ``(nome do provedor vencedor, resultado)``
+
+        Raises:
+            Exception: Erro do último provedor quando ambos falham
+        """
+        if self.settings.policy == ProviderPolicy.HEDGED:
+            return await self._run_hedged(primary, secondary)
+        return await self._run_sequential(primary, secondary)
+
+    async def _run_sequential(
+        self,
+        primary: Tuple[str, ProviderCall],
+        secondary: Tuple[str, ProviderCall]
+    ) -> Tuple[Optional[str], Any]:
+        primary_name, primary_call = primary
+        secondary_name, secondary_call = secondary
+
+        try:
+            result = await self._timed(primary_name, primary_call)
+            if result is not None:
+                return primary_name, result
+        except Exception as e:
+            self.logger.warning(f"⚠️ {primary_name} falhou, usando {secondary_name}: {e}")
+
+        self.stats["fallbacks"] += 1
+        return secondary_name, await self._timed(secondary_name, secondary_call)
+
+    async def _run_hedged(
+        self,
+        primary: Tuple[str, ProviderCall],
+        secondary: Tuple[str, ProviderCall]
+    ) -> Tuple[Optional[str], Any]:
+        primary_name, primary_call = primary
+        secondary_name, secondary_call = secondary
+
+        tasks: Dict[asyncio.Task, str] = {}
+        primary_task = asyncio.ensure_future(self._timed(primary_name, primary_call))
+        tasks[primary_task] = primary_name
+
+        try:
+            # Espera o primário até o atraso do hedge; se falhar antes, dispara
+            # o secundário imediatamente (equivale ao fallback sequencial)
+            await asyncio.wait({primary_task}, timeout=self.hedge_delay(primary_name))
+            if not primary_task.done():
+                self.stats["hedges_started"] += 1
+                self.logger.debug(f"⏱️ {primary_name} lento, iniciando hedge com {secondary_name}")
+            elif primary_task.exception() is None and primary_task.result() is not None:
+                return primary_name, primary_task.result()
+            else:
+                self.stats["fallbacks"] += 1
+
+            secondary_task = asyncio.ensure_future(self._timed(secondary_name, secondary_call))
+            tasks[secondary_task] = secondary_name
+
+            pending = {secondary_task}
+            last_error: Optional[BaseException] = None
+            if primary_task.done():
+                last_error = primary_task.exception()
+            else:
+                pending.add(primary_task)
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+                    if task.result() is not None:
+                        if task is secondary_task and not primary_task.done():
+                            self.stats["hedge_wins"] += 1
+                        return tasks[task], task.result()
+        finally:
+            # O perdedor (ou ambos, se o chamador cancelar) é cancelado
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        if last_error is not None:
+            raise last_error
+        return None, None
@@ -0,0 +1,207 @@
+"""
+Backends de inferência em CPU para os modelos locais do Hugging Face
+
+Os modelos locais (geração com DialoGPT e classificação de sentimento) são
+carregados por ``load_model`` com um dos backends abaixo, escolhido por
+``AI_INFERENCE_BACKEND``:
+
+- ``torch``: PyTorch fp32 (comportamento original);
+- ``quantized``: quantização dinâmica int8 das camadas ``Linear`` do PyTorch
+  (pesos ~4x menores, aritmética int8 nos kernels FBGEMM);
+- ``onnx``: modelo exportado para ONNX e executado no ONNX Runtime;
+- ``onnx-int8``: exportação ONNX com quantização dinâmica int8.
+
+A exportação ONNX é lenta (dezenas de segundos para o DialoGPT-medium), então
+fica em cache no disco (``AI_MODEL_CACHE_DIR``), em um diretório por modelo,
+tarefa, backend e versões das bibliotecas; a partir da segunda partida só o
+``.onnx`` é carregado. A quantização dinâmica do PyTorch leva poucos segundos
+e é refeita a cada carga.
+
+Example:
+    >>> model = load_model("cardiffnlp/twitter-xlm-roberta-base-sentiment",
+    ...                    task="sequence-classification", backend="onnx")
+    >>> generator = load_text_generation_pipeline("microsoft/DialoGPT-medium", backend="quantized")
+"""
+
+import hashlib
+import logging
+import re
+import shutil
+import time
+from importlib import import_module
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Optional
+
+INFERENCE_BACKENDS = ("torch", "quantized", "onnx", "onnx-int8")
+
+# Tarefa -> (classe do transformers, classe do optimum.onnxruntime)
+_TASK_CLASSES = {
+    "sequence-classification": ("AutoModelForSequenceClassification", "ORTModelForSequenceClassification"),
+    "text-generation": ("AutoModelForCausalLM", "ORTModelForCausalLM"),
+}
+
+_ONNX_FILE = "model.onnx"
+_ONNX_INT8_FILE = "model_quantized.onnx"
+
+logger = logging.getLogger(__name__)
+
+
+def validate_backend(backend: str) -> str:
+    """Normaliza e valida o nome do backend"""
+    backend = backend.strip().lower()
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"Backend de inferência inválido: {backend!r} (use {', '.join(INFERENCE_BACKENDS)})")
+    return backend
+
+
+def _library_fingerprint() -> str:
+    """Versões que afetam o grafo exportado (muda o cache ao atualizar)"""
+    versions = []
+    for package in ("transformers", "torch", "optimum", "onnxruntime"):
+        try:
+            versions.append(f"{package}={version(package)}")
+        except PackageNotFoundError:
+            versions.append(f"{package}=none")
+    return hashlib.sha1(";".join(versions).encode()).hexdigest()[:10]
+
+
+def export_dir(cache_dir: str, model_name: str, task: str, backend: str) -> Path:
+    """Diretório do modelo exportado no cache em disco"""
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "--", model_name).strip("-")
+    return Path(cache_dir) / f"{safe_name}__{task}__{backend}__{_library_fingerprint()}"
+
+
+def _transformers_class(task: str) -> Any:
+    if task not in _TASK_CLASSES:
+        raise ValueError(f"Tarefa não suportada: {task!r}")
+    return getattr(import_module("transformers"), _TASK_CLASSES[task][0])
+
+
+def _ort_class(task: str) -> Any:
+    if task not in _TASK_CLASSES:
+        raise ValueError(f"Tarefa não suportada: {task!r}")
+    return getattr(import_module("optimum.onnxruntime"), _TASK_CLASSES[task][1])
+
+
+def _session_options(threads: Optional[int]) -> Any:
+    import onnxruntime
+
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if threads:
+        options.intra_op_num_threads = threads
+    return options
+
+
+def _export_onnx(model_name: str, task: str, backend: str, target: Path) -> None:
+    """Exporta (e opcionalmente quantiza) para um diretório temporário e publica"""
+    ort_class = _ort_class(task)
+    staging = target.with_name(target.name + ".tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+
+    start = time.perf_counter()
+    model = ort_class.from_pretrained(model_name, export=True)
+    model.save_pretrained(staging)
+
+    if backend == "onnx-int8":
+        from optimum.onnxruntime import ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+        quantizer = ORTQuantizer.from_pretrained(staging, file_name=_ONNX_FILE)
+        quantizer.quantize(
+            save_dir=staging,
+            quantization_config=AutoQuantizationConfig.avx2(is_static=False, per_channel=True)
+        )
+
+    # Publicação atômica: um processo concorrente nunca vê export pela metade
+    try:
+        staging.rename(target)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        if not target.exists():
+            raise
+    logger.info(f"📦 {model_name} exportado para ONNX ({backend}) em {time.perf_counter() - start:.1f}s: {target}")
+
+
+def load_model(
+    model_name: str,
+    task: str = "sequence-classification",
+    backend: str = "torch",
+    cache_dir: str = "data/models",
+    threads: Optional[int] = None
+) -> Any:
+    """
+    Carrega o modelo com o backend escolhido
+
+    Todos os backends devolvem um objeto com a interface dos modelos do
+    transformers (``model(**inputs).logits``, ``generate``, ``config``),
+    utilizável diretamente em ``transformers.pipeline``.
+
+    Args:
+        model_name: Nome do modelo no Hugging Face Hub (ou diretório local)
+        task: ``sequence-classification`` ou ``text-generation``
+        backend: Um de ``INFERENCE_BACKENDS``
+        cache_dir: Raiz do cache das exportações ONNX
+        threads: Threads intra-op (PyTorch ou ONNX Runtime)
+
+    Returns:
+        Modelo pronto para inferência
+    """
+    backend = validate_backend(backend)
+
+    if backend in ("torch", "quantized"):
+        import torch
+
+        if threads:
+            torch.set_num_threads(threads)
+        model = _transformers_class(task).from_pretrained(model_name)
+        model.eval()
+        if backend == "quantized":
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+
+    target = export_dir(cache_dir, model_name, task, backend)
+    file_name = _ONNX_INT8_FILE if backend == "onnx-int8" else _ONNX_FILE
+    if not (target / file_name).exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        _export_onnx(model_name, task, backend, target)
+
+    return _ort_class(task).from_pretrained(
+        target,
+        file_name=file_name,
+        provider="CPUExecutionProvider",
+        session_options=_session_options(threads)
+    )
+
+
+def load_text_generation_pipeline(
+    model_name: str,
+    backend: str = "torch",
+    cache_dir: str = "data/models",
+    threads: Optional[int] = None,
+    warmup: bool = True
+) -> Any:
+    """
+    Pipeline ``text-generation`` com o backend escolhido
+
+    O resultado pode ser passado para ``build_huggingface_batch_fn``.
+
+    Args:
+        model_name: Modelo causal (ex: ``microsoft/DialoGPT-medium``)
+        backend: Um de ``INFERENCE_BACKENDS``
+        cache_dir: Raiz do cache das exportações ONNX
+        threads: Threads intra-op
+        warmup: Gera um token antes de devolver (aloca buffers e compila kernels)
+    """
+    from transformers import AutoTokenizer, pipeline
+
+    model = load_model(model_name, "text-generation", backend, cache_dir, threads)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    generator = pipeline("text-generation", model=model, tokenizer=tokenizer)
+
+    if warmup:
+        start = time.perf_counter()
+        generator("Hello", max_new_tokens=1, pad_token_id=tokenizer.eos_token_id)
+        logger.info(f"🔥 {model_name} ({backend}) aquecido em {(time.perf_counter() - start) * 1000:.0f} ms")
+    return generator
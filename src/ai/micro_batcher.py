@@ -0,0 +1,223 @@
+"""
+Micro-batching de inferência para os modelos locais do SocialBot AI
+
+Agrupa chamadas concorrentes de geração em lotes únicos para o pipeline do
+Hugging Face. Chamadores aguardam um ``Future`` individual enquanto o lote é
+montado dentro de uma janela curta (ex: 20 ms) ou até atingir N itens; o lote
+roda uma única vez no pipeline (com padding) e cada Future é resolvido com
+o seu resultado.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class BatchStats:
+    """Estatísticas acumuladas do micro-batcher"""
+    submitted: int = 0
+    batches: int = 0
+    items_processed: int = 0
+    failures: int = 0
+    batch_sizes: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def average_batch_size(self) -> float:
+        """Tamanho médio dos lotes executados"""
+        return self.items_processed / self.batches if self.batches else 0.0
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Fila de micro-batching assíncrona
+
+    Itens com a mesma chave (ex: plataforma/tom/tamanho máximo) são agrupados
+    e processados juntos por ``process_batch``, que recebe a lista de itens e
+    deve devolver uma lista de resultados na mesma ordem. A função roda em um
+    executor para não bloquear o event loop.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[T]], List[R]],
+        key_func: Callable[[T], Hashable] = lambda item: None,
+        window_ms: float = 20.0,
+        max_batch_size: int = 8,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Inicializa o micro-batcher
+
+        Args:
+            process_batch: Função síncrona que processa um lote
+            key_func: Função que define o grupo de cada item
+            window_ms: Tempo máximo de espera para completar um lote
+            max_batch_size: Tamanho que dispara o lote imediatamente
+            executor: Executor onde os lotes rodam (padrão do loop se None)
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size deve ser >= 1")
+
+        self.process_batch = process_batch
+        self.key_func = key_func
+        self.window = max(window_ms, 0.0) / 1000
+        self.max_batch_size = max_batch_size
+        self.executor = executor
+        self.stats = BatchStats()
+        self.logger = logging.getLogger(__name__)
+
+        self._pending: Dict[Hashable, List[Tuple[T, asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._running: set = set()
+        self._closed = False
+
+    async def submit(self, item: T) -> R:
+        """
+        Enfileira um item e aguarda seu resultado
+
+        Args:
+            item: Item a processar (ex: ``ContentRequest``)
+
+        Returns:
+            Resultado correspondente ao item
+        """
+        if self._closed:
+            raise RuntimeError("MicroBatcher está fechado")
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        key = self.key_func(item)
+
+        bucket = self._pending.setdefault(key, [])
+        bucket.append((item, future))
+        self.stats.submitted += 1
+
+        if len(bucket) >= self.max_batch_size:
+            self._flush(key)
+        elif len(bucket) == 1:
+            self._timers[key] = loop.call_later(self.window, self._flush, key)
+
+        return await future
+
+    def _flush(self, key: Hashable) -> None:
+        """Tira o lote pendente da fila e agenda sua execução"""
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        """Executa um lote no executor e resolve os futures um a um"""
+        # Itens cujo chamador já desistiu não precisam ir ao modelo
+        batch = [(item, future) for item, future in batch if not future.done()]
+        if not batch:
+            return
+
+        items = [item for item, _ in batch]
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+
+        try:
+            results = await loop.run_in_executor(self.executor, self.process_batch, items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"process_batch retornou {len(results)} resultados para {len(items)} itens"
+                )
+        except Exception as e:
+            self.stats.failures += 1
+            self.logger.error(f"❌ Erro ao processar lote de {len(items)} itens: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.stats.batches += 1
+        self.stats.items_processed += len(items)
+        self.stats.batch_sizes[len(items)] = self.stats.batch_sizes.get(len(items), 0) + 1
+        self.logger.debug(
+            f"Lote de {len(items)} itens processado em {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Processa os lotes pendentes e impede novas submissões"""
+        self._closed = True
+        for key in list(self._pending):
+            self._flush(key)
+
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+
+def request_batch_key(request: Any) -> Hashable:
+    """
+    Chave de agrupamento de uma ``ContentRequest``
+
+    Requisições só compartilham lote quando têm a mesma plataforma, tom e
+    tamanho máximo, pois esses parâmetros definem os argumentos de geração.
+    """
+    tone = getattr(request.tone, "value", request.tone)
+    return (request.platform, tone, request.max_length)
+
+
+def build_huggingface_batch_fn(
+    pipeline: Any,
+    build_prompt: Callable[[Any], str],
+    temperature: float = 0.7,
+    top_p: float = 0.9
+) -> Callable[[List[Any]], List[str]]:
+    """
+    Cria a função de lote para um pipeline ``text-generation`` do Hugging Face
+
+    Modelos causais como o DialoGPT não possuem token de padding; o token de
+    fim de sequência é reaproveitado e o padding é feito à esquerda para que
+    todas as sequências do lote terminem alinhadas no ponto de geração.
+
+    Args:
+        pipeline: Pipeline ``transformers`` de geração de texto
+        build_prompt: Função que transforma uma requisição em prompt
+        temperature: Temperatura de amostragem
+        top_p: Nucleus sampling
+
+    Returns:
+        Função que recebe requisições e devolve os textos gerados (sem o prompt)
+    """
+    tokenizer = pipeline.tokenizer
+    if tokenizer.pad_token_id is None:
+        tokenizer.pad_token_id = pipeline.model.config.eos_token_id
+    tokenizer.padding_side = "left"
+
+    def process(requests: List[Any]) -> List[str]:
+        prompts = [build_prompt(request) for request in requests]
+        # Todas as requisições do lote compartilham max_length (ver
+        # request_batch_key); ~4 caracteres por token em média
+        outputs = pipeline(
+            prompts,
+            batch_size=len(prompts),
+            max_new_tokens=max(16, requests[0].max_length // 4),
+            do_sample=True,
+            temperature=temperature,
+            top_p=top_p,
+            pad_token_id=tokenizer.pad_token_id,
+            return_full_text=False
+        )
+        return [output[0]["generated_text"].strip() for output in outputs]
+
+    return process
@@ -0,0 +1,473 @@
+"""
+Processo hospedeiro dos modelos locais (um único conjunto de pesos)
+
+Cada processo que cria um ``SentimentAnalyzer`` ou um pipeline de geração
+carrega a própria cópia dos pesos; com o bot, os workers do uvicorn e os do
+Celery isso multiplica a memória. O ``ModelHost`` carrega os modelos uma vez
+e atende os demais processos por um socket Unix. Os clientes
+(``RemoteSentimentAnalyzer`` e ``RemoteTextGenerator``) expõem os mesmos
+métodos das versões locais.
+
+Protocolo: quadros ``[tamanho u32 big-endian][JSON UTF-8]``. Requisições
+``{"id", "method", "params"}`` e respostas ``{"id", "result"}`` ou
+``{"id", "error": {"type", "message"}}``; uma conexão pode ter várias
+requisições em andamento (respostas fora de ordem, casadas pelo ``id``).
+Textos de requisições concorrentes, de qualquer worker, entram no mesmo
+``MicroBatcher``, então o host forma lotes maiores que cada worker sozinho.
+
+Uso:
+    python -m src.ai.model_host --socket /run/socialbot/models.sock
+    # nos workers: AI_MODEL_HOST_SOCKET=/run/socialbot/models.sock
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import signal
+import socket
+import struct
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .micro_batcher import MicroBatcher
+
+_FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+
+class ModelHostError(ConnectionError):
+    """Falha de comunicação com o host ou erro devolvido por ele"""
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Any:
+    """Lê um quadro JSON (levanta ``IncompleteReadError`` no fim da conexão)"""
+    (length,) = _FRAME_HEADER.unpack(await reader.readexactly(_FRAME_HEADER.size))
+    if length > MAX_FRAME_BYTES:
+        raise ModelHostError(f"Quadro de {length} bytes excede o limite de {MAX_FRAME_BYTES}")
+    return json.loads(await reader.readexactly(length))
+
+
+def encode_frame(message: Any) -> bytes:
+    """Serializa uma mensagem como quadro"""
+    payload = json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return _FRAME_HEADER.pack(len(payload)) + payload
+
+
+Handler = Callable[..., Awaitable[Any]]
+
+
+class ModelHost:
+    """
+    Servidor de inferência em socket Unix
+
+    Example:
+        >>> host = ModelHost("/run/socialbot/models.sock", sentiment=SentimentAnalyzer.from_config(config))
+        >>> await host.start()
+        >>> await host.serve_forever()
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        sentiment: Any = None,
+        generator: Any = None,
+        batch_window_ms: float = 5.0,
+        generation_batch_size: int = 8
+    ):
+        """
+        Inicializa o host
+
+        Args:
+            socket_path: Caminho do socket Unix
+            sentiment: ``SentimentAnalyzer`` local (opcional)
+            generator: Pipeline ``text-generation`` (opcional)
+            batch_window_ms: Janela para juntar requisições de vários clientes
+            generation_batch_size: Prompts máximos por lote de geração
+        """
+        self.socket_path = Path(socket_path)
+        self.sentiment = sentiment
+        self.generator = generator
+        self.logger = logging.getLogger(__name__)
+        self.started_at = time.time()
+        self.requests = 0
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._handlers: Dict[str, Handler] = {"ping": self._ping}
+        self._batchers: List[MicroBatcher] = []
+
+        if sentiment is not None:
+            self._sentiment_batcher = MicroBatcher(
+                sentiment.analyze_batch_sync,
+                window_ms=batch_window_ms,
+                max_batch_size=sentiment.max_batch_size * sentiment.threads,
+                executor=sentiment.executor
+            )
+            self._batchers.append(self._sentiment_batcher)
+            self._handlers["analyze_batch"] = self._analyze_batch
+
+        if generator is not None:
+            # Mesmo preparo de build_huggingface_batch_fn: padding à esquerda
+            # com o token de fim de sequência (modelos causais não têm pad)
+            tokenizer = generator.tokenizer
+            if tokenizer.pad_token_id is None:
+                tokenizer.pad_token_id = generator.model.config.eos_token_id
+            tokenizer.padding_side = "left"
+            self._generation_batcher = MicroBatcher(
+                self._generate_batch_sync,
+                key_func=lambda item: item[1],  # Mesmos parâmetros de geração
+                window_ms=batch_window_ms,
+                max_batch_size=generation_batch_size
+            )
+            self._batchers.append(self._generation_batcher)
+            self._handlers["generate_batch"] = self._generate
+
+    async def _ping(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "methods": sorted(self._handlers),
+            "uptime": time.time() - self.started_at,
+            "requests": self.requests
+        }
+
+    async def _analyze_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        return list(await asyncio.gather(*(self._sentiment_batcher.submit(text) for text in texts)))
+
+    def _generate_batch_sync(self, items: List[Tuple[str, Tuple[int, float, float]]]) -> List[str]:
+        prompts = [prompt for prompt, _ in items]
+        max_new_tokens, temperature, top_p = items[0][1]
+        outputs = self.generator(
+            prompts,
+            batch_size=len(prompts),
+            max_new_tokens=max_new_tokens,
+            do_sample=True,
+            temperature=temperature,
+            top_p=top_p,
+            pad_token_id=self.generator.tokenizer.pad_token_id,
+            return_full_text=False
+        )
+        return [output[0]["generated_text"].strip() for output in outputs]
+
+    async def _generate(
+        self,
+        prompts: List[str],
+        max_new_tokens: int = 64,
+        temperature: float = 0.7,
+        top_p: float = 0.9
+    ) -> List[str]:
+        params = (int(max_new_tokens), float(temperature), float(top_p))
+        return list(await asyncio.gather(*(
+            self._generation_batcher.submit((prompt, params)) for prompt in prompts
+        )))
+
+    async def _dispatch(self, request: Dict[str, Any], writer: asyncio.StreamWriter, lock: asyncio.Lock) -> None:
+        request_id = request.get("id")
+        handler = self._handlers.get(request.get("method"))
+        try:
+            if handler is None:
+                raise ValueError(f"Método desconhecido: {request.get('method')!r}")
+            response = {"id": request_id, "result": await handler(**(request.get("params") or {}))}
+        except Exception as e:
+            response = {"id": request_id, "error": {"type": e.__class__.__name__, "message": str(e)}}
+
+        async with lock:
+            if not writer.is_closing():
+                writer.write(encode_frame(response))
+                await writer.drain()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        lock = asyncio.Lock()
+        tasks = set()
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request = await read_frame(reader)
+                self.requests += 1
+                task = asyncio.create_task(self._dispatch(request, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            self.logger.warning(f"⚠️ Conexão encerrada por quadro inválido: {e}")
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._connections.pop(writer, None)
+            writer.close()
+
+    def _remove_stale_socket(self) -> None:
+        """Remove o socket de um host anterior que não está mais ouvindo"""
+        if not self.socket_path.exists():
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_path))
+        except OSError:
+            self.socket_path.unlink()
+        else:
+            raise ModelHostError(f"Já existe um host ouvindo em {self.socket_path}")
+        finally:
+            probe.close()
+
+    async def start(self) -> None:
+        """Abre o socket (acessível só ao usuário do processo)"""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self._remove_stale_socket()
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        self.logger.info(f"🧠 Host de modelos ouvindo em {self.socket_path} ({', '.join(sorted(self._handlers))})")
+
+    async def serve_forever(self) -> None:
+        """Atende até ser cancelado"""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Fecha o socket e as conexões e processa os lotes pendentes"""
+        if self._server is not None:
+            self._server.close()
+            handlers = list(self._connections.values())
+            for writer in list(self._connections):
+                writer.close()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        for batcher in self._batchers:
+            await batcher.close()
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+
+class ModelHostClient:
+    """
+    Conexão multiplexada com o ``ModelHost``
+
+    Reconecta na próxima chamada se a conexão cair; chamadas em andamento
+    na queda falham com ``ModelHostError``.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 60.0):
+        """
+        Inicializa o cliente
+
+        Args:
+            socket_path: Caminho do socket Unix do host
+            timeout: Tempo máximo de uma chamada em segundos
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+
+    async def _ensure_connected(self) -> None:
+        if self._connect_lock is None:
+            self._connect_lock, self._write_lock = asyncio.Lock(), asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer is not None and not self._writer.is_closing():
+                return
+            try:
+                self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+            except OSError as e:
+                raise ModelHostError(f"Host de modelos indisponível em {self.socket_path}: {e}") from e
+            self._reader_task = asyncio.create_task(self._read_responses(self._reader, self._writer))
+
+    async def _read_responses(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        error: Exception = ModelHostError("Conexão com o host de modelos encerrada")
+        try:
+            while True:
+                response = await read_frame(reader)
+                future = self._pending.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in response:
+                    remote = response["error"]
+                    future.set_exception(ModelHostError(f"{remote.get('type')}: {remote.get('message')}"))
+                else:
+                    future.set_result(response.get("result"))
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            error = ModelHostError(f"Conexão com o host de modelos perdida: {e}")
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if not writer.is_closing():
+                writer.close()
+            if self._writer is writer:
+                self._writer = None
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+    async def call(self, method: str, **params: Any) -> Any:
+        """
+        Chama um método do host
+
+        Raises:
+            ModelHostError: Host indisponível, conexão perdida ou erro remoto
+        """
+        await self._ensure_connected()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        try:
+            async with self._write_lock:
+                # A conexão pode ter caído entre _ensure_connected e a escrita
+                writer = self._writer
+                if writer is None or writer.is_closing():
+                    raise ModelHostError("Conexão com o host de modelos perdida")
+                try:
+                    writer.write(encode_frame({"id": request_id, "method": method, "params": params}))
+                    await writer.drain()
+                except (ConnectionError, OSError) as e:
+                    raise ModelHostError(f"Conexão com o host de modelos perdida: {e}") from e
+
+            try:
+                return await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                raise ModelHostError(f"Host de modelos não respondeu a {method} em {self.timeout:.0f}s")
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def ping(self) -> Dict[str, Any]:
+        """Estado do host (pid, métodos disponíveis, requisições atendidas)"""
+        return await self.call("ping")
+
+    def close(self) -> None:
+        """Fecha a conexão"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+
+
+class RemoteSentimentAnalyzer:
+    """Mesma interface do ``SentimentAnalyzer``, executada no host"""
+
+    def __init__(self, client: ModelHostClient):
+        self.client = client
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def connect(cls, socket_path: str, timeout: float = 60.0) -> "RemoteSentimentAnalyzer":
+        """Cria o analisador remoto (a conexão abre na primeira chamada)"""
+        return cls(ModelHostClient(socket_path, timeout))
+
+    async def analyze_batch(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """Analisa vários textos no host, na mesma ordem"""
+        if not texts:
+            return []
+        return await self.client.call("analyze_batch", texts=list(texts))
+
+    async def analyze(self, text: str) -> Dict[str, Any]:
+        """Analisa um único texto"""
+        return (await self.analyze_batch([text]))[0]
+
+    async def warmup(self) -> float:
+        """Confirma que o host está de pé e com o modelo carregado"""
+        start = time.perf_counter()
+        info = await self.client.ping()
+        if "analyze_batch" not in info["methods"]:
+            raise ModelHostError("Host de modelos sem análise de sentimento carregada")
+        await self.analyze("warmup")
+        elapsed = time.perf_counter() - start
+        self.logger.info(f"🔗 Usando host de modelos (pid {info['pid']}) em {self.client.socket_path}")
+        return elapsed
+
+    def close(self) -> None:
+        """Fecha a conexão com o host"""
+        self.client.close()
+
+
+class RemoteTextGenerator:
+    """Geração de texto executada no host"""
+
+    def __init__(self, client: ModelHostClient, max_new_tokens: int = 64, temperature: float = 0.7, top_p: float = 0.9):
+        self.client = client
+        self.max_new_tokens = max_new_tokens
+        self.temperature = temperature
+        self.top_p = top_p
+
+    async def generate_batch(self, prompts: Sequence[str], **kwargs: Any) -> List[str]:
+        """Gera um texto por prompt (sem o prompt)"""
+        params = {
+            "max_new_tokens": self.max_new_tokens,
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            **kwargs
+        }
+        return await self.client.call("generate_batch", prompts=list(prompts), **params)
+
+    async def generate(self, prompt: str, **kwargs: Any) -> str:
+        """Gera o texto de um único prompt"""
+        return (await self.generate_batch([prompt], **kwargs))[0]
+
+
+async def run_host(socket_path: str, models: Sequence[str] = ("sentiment", "generation")) -> None:
+    """Carrega os modelos do ``Config`` e atende até SIGINT/SIGTERM"""
+    from ..utils.config import Config
+    from .inference_backends import load_text_generation_pipeline
+    from .sentiment_analyzer import SentimentAnalyzer
+
+    config = Config()
+    sentiment = generator = None
+    if "sentiment" in models:
+        sentiment = SentimentAnalyzer.from_config(config)
+        await sentiment.warmup()
+    if "generation" in models:
+        generator = await asyncio.get_running_loop().run_in_executor(
+            None,
+            lambda: load_text_generation_pipeline(
+                config.ai.model_name,
+                backend=config.ai.inference_backend,
+                cache_dir=config.ai.model_cache_dir
+            )
+        )
+
+    host = ModelHost(
+        socket_path,
+        sentiment=sentiment,
+        generator=generator,
+        generation_batch_size=config.ai.batch_max_size
+    )
+    await host.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    await stop.wait()
+
+    await host.close()
+    if sentiment is not None:
+        sentiment.close()
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Host compartilhado dos modelos locais")
+    parser.add_argument("--socket", default=os.getenv("AI_MODEL_HOST_SOCKET") or "/run/socialbot/models.sock")
+    parser.add_argument("--models", nargs="+", choices=["sentiment", "generation"], default=["sentiment", "generation"])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(run_host(args.socket, args.models))
+
+
+if __name__ == "__main__":
+    main()
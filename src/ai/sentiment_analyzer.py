@@ -0,0 +1,327 @@
+"""
+Análise de sentimento de menções e respostas
+
+O ``SentimentAnalyzer`` classifica textos com um modelo de classificação de
+sequência do Hugging Face e devolve, para cada texto::
+
+    {"sentiment": "positive", "confidence": 0.91,
+     "scores": {"negative": 0.02, "neutral": 0.07, "positive": 0.91}}
+
+Para fluxos de menções (milhares por minuto), ``analyze_batch`` evita uma
+chamada de modelo por item:
+
+- os textos são tokenizados de uma vez e ordenados por número de tokens;
+- lotes são montados dentro de baldes de comprimento (por padrão, comprimento
+  exato), então o padding é dinâmico e, no balde exato, inexistente;
+- cada lote roda sob ``torch.inference_mode`` em um pool de threads dedicado
+  (o PyTorch libera o GIL), sem bloquear o event loop.
+
+Como nenhum lote de comprimento exato contém padding e o softmax é feito por
+linha, o resultado de um texto não depende de com quem ele foi agrupado:
+``analyze(texto)`` e ``analyze_batch([..., texto, ...])`` produzem os mesmos
+floats (desde que os kernels do backend sejam determinísticos por linha).
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+
+import numpy as np
+
+from .inference_backends import load_model, validate_backend
+
+DEFAULT_MODEL = "cardiffnlp/twitter-xlm-roberta-base-sentiment"
+
+# Rótulos usados quando o modelo só expõe LABEL_0..LABEL_2
+_DEFAULT_LABELS = ("negative", "neutral", "positive")
+
+
+class SentimentBackend(Protocol):
+    """Tokenizador + forward de um modelo de classificação"""
+
+    labels: Sequence[str]
+    pad_token_id: int
+
+    def tokenize(self, texts: List[str]) -> List[List[int]]:
+        """Ids de tokens de cada texto (sem padding)"""
+
+    def predict(self, input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """Logits (lote x rótulos) para um lote já preenchido"""
+
+
+def _normalize_labels(id2label: Dict[int, str]) -> List[str]:
+    labels = [str(id2label[i]).lower() for i in range(len(id2label))]
+    if len(labels) == len(_DEFAULT_LABELS) and all(label.startswith("label_") for label in labels):
+        return list(_DEFAULT_LABELS)
+    return labels
+
+
+class TransformersSentimentBackend:
+    """Backend transformers (PyTorch, int8 ou ONNX Runtime; carregado no primeiro uso)"""
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        max_length: int = 128,
+        torch_threads: Optional[int] = None,
+        inference_backend: str = "torch",
+        cache_dir: str = "data/models"
+    ):
+        """
+        Inicializa o backend
+
+        Args:
+            model_name: Modelo de classificação de sequência do Hugging Face
+            max_length: Tokens máximos por texto (o excesso é truncado)
+            torch_threads: Threads intra-op (None mantém o padrão)
+            inference_backend: Um de ``INFERENCE_BACKENDS``
+            cache_dir: Cache das exportações ONNX
+        """
+        self.model_name = model_name
+        self.max_length = max_length
+        self.torch_threads = torch_threads
+        self.inference_backend = validate_backend(inference_backend)
+        self.cache_dir = cache_dir
+        self._tokenizer = None
+        self._model = None
+        self._load_lock = threading.Lock()
+        self.labels: List[str] = []
+        self.pad_token_id = 0
+
+    def _load(self) -> None:
+        if self._model is not None:
+            return
+        # Os lotes rodam em várias threads do pool: só uma carrega o modelo
+        with self._load_lock:
+            if self._model is not None:
+                return
+            from transformers import AutoTokenizer
+
+            self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            model = load_model(
+                self.model_name,
+                task="sequence-classification",
+                backend=self.inference_backend,
+                cache_dir=self.cache_dir,
+                threads=self.torch_threads
+            )
+            self.labels = _normalize_labels(model.config.id2label)
+            self.pad_token_id = self._tokenizer.pad_token_id or 0
+            self._model = model  # Publicado por último: quem vê o modelo vê o resto
+
+    def tokenize(self, texts: List[str]) -> List[List[int]]:
+        self._load()
+        return self._tokenizer(texts, truncation=True, max_length=self.max_length)["input_ids"]
+
+    def predict(self, input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        self._load()
+        import torch
+
+        with torch.inference_mode():
+            output = self._model(
+                input_ids=torch.from_numpy(input_ids),
+                attention_mask=torch.from_numpy(attention_mask)
+            )
+        return output.logits.float().numpy()
+
+
+def plan_batches(
+    lengths: Sequence[int],
+    max_batch_size: int = 32,
+    max_batch_tokens: int = 8192,
+    bucket_width: int = 1
+) -> List[List[int]]:
+    """
+    Agrupa índices de textos em lotes por comprimento
+
+    Args:
+        lengths: Número de tokens de cada texto
+        max_batch_size: Textos máximos por lote
+        max_batch_tokens: Limite de lote x comprimento preenchido
+        bucket_width: Largura do balde de comprimento; 1 agrupa só textos de
+            mesmo comprimento (sem padding, resultados idênticos aos
+            individuais), valores maiores trocam um pouco de padding por lotes
+            maiores
+
+    Returns:
+        Lista de lotes (índices na ordem original dos textos)
+    """
+    order = sorted(range(len(lengths)), key=lambda i: (lengths[i], i))
+    batches: List[List[int]] = []
+    for _, bucket in groupby(order, key=lambda i: lengths[i] // bucket_width):
+        batch: List[int] = []
+        for index in bucket:
+            # Lengths crescem dentro do balde: o item atual define o padding
+            padded = lengths[index] * (len(batch) + 1)
+            if batch and (len(batch) >= max_batch_size or padded > max_batch_tokens):
+                batches.append(batch)
+                batch = []
+            batch.append(index)
+        batches.append(batch)
+    return batches
+
+
+def _softmax_rows(logits: np.ndarray) -> np.ndarray:
+    """Softmax independente por linha (não depende do tamanho do lote)"""
+    logits = np.asarray(logits, dtype=np.float32)
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class SentimentAnalyzer:
+    """
+    Classificador de sentimento com inferência em lote
+
+    Example:
+        >>> analyzer = SentimentAnalyzer.from_config(config)
+        >>> results = await analyzer.analyze_batch([m.text for m in mentions])
+        >>> results[0]["sentiment"]
+        'positive'
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        backend: Optional[SentimentBackend] = None,
+        max_batch_size: int = 32,
+        max_batch_tokens: int = 8192,
+        bucket_width: int = 1,
+        threads: int = 2
+    ):
+        """
+        Inicializa o analisador
+
+        Args:
+            model_name: Modelo do Hugging Face (ignorado se ``backend`` for dado)
+            backend: Backend de inferência (padrão: PyTorch/transformers)
+            max_batch_size: Textos máximos por lote
+            max_batch_tokens: Limite de tokens preenchidos por lote
+            bucket_width: Largura dos baldes de comprimento (ver ``plan_batches``)
+            threads: Threads do pool dedicado de inferência
+        """
+        if max_batch_size < 1 or bucket_width < 1 or threads < 1:
+            raise ValueError("max_batch_size, bucket_width e threads devem ser >= 1")
+
+        self.backend = backend or TransformersSentimentBackend(model_name)
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.bucket_width = bucket_width
+        self.threads = threads
+        self.logger = logging.getLogger(__name__)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_config(cls, config: Any) -> "SentimentAnalyzer":
+        """Cria o analisador a partir do ``Config`` principal"""
+        backend = TransformersSentimentBackend(
+            config.ai.sentiment_model,
+            inference_backend=config.ai.inference_backend,
+            cache_dir=config.ai.model_cache_dir
+        )
+        return cls(
+            backend=backend,
+            max_batch_size=config.ai.sentiment_batch_size,
+            threads=config.ai.sentiment_threads
+        )
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Pool dedicado (não disputa o executor padrão do loop)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="sentiment")
+        return self._executor
+
+    def _run_batch(self, token_ids: List[List[int]]) -> np.ndarray:
+        """Preenche um lote até o maior comprimento e devolve probabilidades"""
+        width = max(len(ids) for ids in token_ids)
+        input_ids = np.full((len(token_ids), width), self.backend.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(token_ids), width), dtype=np.int64)
+        for row, ids in enumerate(token_ids):
+            input_ids[row, :len(ids)] = ids
+            attention_mask[row, :len(ids)] = 1
+        return _softmax_rows(self.backend.predict(input_ids, attention_mask))
+
+    def _result(self, probabilities: np.ndarray) -> Dict[str, Any]:
+        labels = self.backend.labels
+        best = int(np.argmax(probabilities))
+        return {
+            "sentiment": labels[best],
+            "confidence": float(probabilities[best]),
+            "scores": {label: float(score) for label, score in zip(labels, probabilities)}
+        }
+
+    def _plan(self, token_ids: List[List[int]]) -> List[List[int]]:
+        return plan_batches(
+            [len(ids) for ids in token_ids],
+            max_batch_size=self.max_batch_size,
+            max_batch_tokens=self.max_batch_tokens,
+            bucket_width=self.bucket_width
+        )
+
+    def analyze_batch_sync(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """Versão síncrona de ``analyze_batch`` (roda na thread atual)"""
+        if not texts:
+            return []
+        token_ids = self.backend.tokenize(list(texts))
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        for batch in self._plan(token_ids):
+            probabilities = self._run_batch([token_ids[i] for i in batch])
+            for index, row in zip(batch, probabilities):
+                results[index] = self._result(row)
+        return results
+
+    async def analyze_batch(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Analisa vários textos, distribuindo os lotes pelo pool dedicado
+
+        Args:
+            texts: Textos (ex: menções recebidas)
+
+        Returns:
+            Um resultado por texto, na mesma ordem
+        """
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        token_ids = await loop.run_in_executor(self.executor, self.backend.tokenize, list(texts))
+        batches = self._plan(token_ids)
+
+        outputs = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, self._run_batch, [token_ids[i] for i in batch])
+            for batch in batches
+        ))
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        for batch, probabilities in zip(batches, outputs):
+            for index, row in zip(batch, probabilities):
+                results[index] = self._result(row)
+        self.logger.debug(f"🧠 {len(texts)} textos analisados em {len(batches)} lotes")
+        return results
+
+    async def warmup(self) -> float:
+        """
+        Carrega o modelo e roda um lote de aquecimento no pool
+
+        Returns:
+            Duração do aquecimento em segundos
+        """
+        start = time.perf_counter()
+        await self.analyze_batch(["warmup"])
+        elapsed = time.perf_counter() - start
+        self.logger.info(f"🔥 Análise de sentimento aquecida em {elapsed * 1000:.0f} ms")
+        return elapsed
+
+    async def analyze(self, text: str) -> Dict[str, Any]:
+        """Analisa um único texto"""
+        return (await self.analyze_batch([text]))[0]
+
+    def close(self) -> None:
+        """Encerra o pool de inferência"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
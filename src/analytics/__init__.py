@@ -0,0 +1,48 @@
+"""
+Módulo de Analytics do SocialBot AI
+
+Contém funcionalidades para:
+- Rastreamento de engajamento dos posts
+- Geração de relatórios
+- Armazenamento colunar de métricas com agregações por período
+- Melhor horário para postar e hashtags em destaque (agregados incrementais)
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .engagement_model import EngagementModel
+    from .engagement_store import EngagementStore
+    from .engagement_tracker import EngagementTracker
+    from .report_generator import ReportGenerator
+
+_LAZY_ATTRIBUTES = {
+    "EngagementModel": ".engagement_model",
+    "EngagementStore": ".engagement_store",
+    "EngagementTracker": ".engagement_tracker",
+    "ReportGenerator": ".report_generator",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Importa o atributo público sob demanda (PEP 562)"""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # Próximos acessos não passam por __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+__all__ = [
+    "EngagementModel",
+    "EngagementStore",
+    "EngagementTracker",
+    "ReportGenerator"
+]
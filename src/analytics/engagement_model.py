@@ -0,0 +1,447 @@
+"""
+Agregados incrementais de engajamento: melhor horário, hashtags e taxa
+
+Em vez de recalcular ``best_time``, ``top_hashtags`` e ``engagement_rate``
+a partir do histórico a cada atualização do dashboard, o ``EngagementModel``
+mantém histogramas com decaimento exponencial atualizados em O(1) por
+chamada de ``update_metrics``:
+
+- por plataforma, uma grade dia da semana x hora (7 x 24) com engajamento,
+  impressões e quantidade de posts publicados em cada horário;
+- por hashtag, engajamento e quantidade de posts.
+
+O decaimento é preguiçoso: cada valor é gravado multiplicado por
+``exp(taxa * (t - referência))`` e nada é percorrido a cada evento; quando
+o expoente fica grande a referência é movida (custo amortizado). As
+leituras percorrem só os buckets (168 horários ou as hashtags).
+
+O engajamento é atribuído ao horário em que o post foi publicado (no fuso
+``TIMEZONE``) e decai a partir do momento em que foi observado. O estado é
+salvo em JSON periodicamente e no ``stop()``.
+
+Example:
+    >>> model = EngagementModel.from_config(config)
+    >>> model.track_post("1790", "twitter", posted_at, ["#IA"])
+    >>> model.update_metrics("1790", {"likes": 10, "impressions": 400})
+    >>> model.next_best_time("twitter", datetime.now())
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, tzinfo
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+
+# Métricas somadas no engajamento (impressões ficam à parte, para a taxa)
+ENGAGEMENT_METRICS = ("likes", "shares", "comments", "clicks")
+TRACKED_METRICS = ENGAGEMENT_METRICS + ("impressions",)
+
+# Linhas da grade de cada plataforma
+ENGAGEMENT, IMPRESSIONS, POSTS = 0, 1, 2
+SLOTS = 7 * 24
+
+# Posts "virtuais" com a média geral somados a cada horário/hashtag, para
+# que um único post com muito engajamento não domine o ranking
+PRIOR_POSTS = 2.0
+
+# Expoente a partir do qual a referência do decaimento é movida
+MAX_EXPONENT = 40.0
+
+WEEKDAYS = ("segunda", "terça", "quarta", "quinta", "sexta", "sábado", "domingo")
+
+TimeLike = Union[datetime, int, float]
+
+
+def _resolve_timezone(name: str) -> Optional[tzinfo]:
+    if ZoneInfo is None or not name:
+        return None
+    try:
+        return ZoneInfo(name)
+    except Exception:
+        logging.getLogger(__name__).warning(f"⚠️ Fuso horário desconhecido: {name}; usando o horário local")
+        return None
+
+
+class EngagementModel:
+    """
+    Histogramas de engajamento com decaimento exponencial
+
+    Não é thread-safe; deve ser usado a partir do event loop.
+    """
+
+    def __init__(
+        self,
+        half_life_hours: float = 168.0,
+        timezone: str = "",
+        state_path: Optional[str] = None,
+        fallback_times: Iterable[str] = ("09:00", "12:00", "15:00", "18:00", "21:00"),
+        min_posts: float = 10.0,
+        max_posts: int = 100_000,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Inicializa o modelo
+
+        Args:
+            half_life_hours: Meia-vida do decaimento
+            timezone: Fuso dos horários (vazio = horário local do processo)
+            state_path: Arquivo JSON do checkpoint (carregado se existir)
+            fallback_times: Horários usados enquanto há poucos dados
+            min_posts: Posts (com decaimento) necessários para confiar na grade
+            max_posts: Posts acompanhados para calcular deltas (os mais antigos saem)
+            clock: Fonte de tempo (epoch em segundos)
+        """
+        self.rate = math.log(2) / (half_life_hours * 3600)
+        self.timezone = _resolve_timezone(timezone)
+        self.state_path = Path(state_path) if state_path else None
+        self.fallback_times = list(fallback_times)
+        self.min_posts = min_posts
+        self.max_posts = max_posts
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        self._reference = clock()
+        self._grids: Dict[str, np.ndarray] = {}
+        self._hashtags: Dict[str, List[float]] = {}  # tag -> [engajamento, posts]
+        # post -> [plataforma, horário, hashtags, últimos valores de TRACKED_METRICS]
+        self._posts: "OrderedDict[str, list]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+        if self.state_path is not None and self.state_path.exists():
+            self.load(self.state_path)
+
+    @classmethod
+    def from_config(cls, config: Any) -> "EngagementModel":
+        """Cria o modelo a partir do ``Config`` principal"""
+        return cls(
+            half_life_hours=config.analytics_half_life_hours,
+            timezone=config.timezone,
+            state_path=config.analytics_state_path or None,
+            fallback_times=config.preferred_post_times
+        )
+
+    # ------------------------------------------------------------------ #
+    # Tempo e decaimento
+    # ------------------------------------------------------------------ #
+
+    def _local(self, value: TimeLike) -> datetime:
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                return value.replace(tzinfo=self.timezone) if self.timezone else value
+            return value.astimezone(self.timezone) if self.timezone else value.astimezone().replace(tzinfo=None)
+        return datetime.fromtimestamp(value, self.timezone)
+
+    def slot(self, value: TimeLike) -> int:
+        """Índice ``dia_da_semana * 24 + hora`` (segunda = 0) no fuso do modelo"""
+        local = self._local(value)
+        return local.weekday() * 24 + local.hour
+
+    def _weight(self, timestamp: float) -> float:
+        """Peso de um evento em ``timestamp`` na escala da referência atual"""
+        exponent = self.rate * (timestamp - self._reference)
+        if exponent > MAX_EXPONENT:
+            self._rebase(timestamp)
+            exponent = 0.0
+        return math.exp(exponent)
+
+    def _rebase(self, timestamp: float) -> None:
+        factor = math.exp(-self.rate * (timestamp - self._reference))
+        for grid in self._grids.values():
+            grid *= factor
+        for values in self._hashtags.values():
+            values[0] *= factor
+            values[1] *= factor
+        self._reference = timestamp
+
+    def _decay(self, now: Optional[float] = None) -> float:
+        """Fator que converte os valores gravados para o instante ``now``"""
+        now = self.clock() if now is None else now
+        return math.exp(-self.rate * (now - self._reference))
+
+    # ------------------------------------------------------------------ #
+    # Atualizações (O(1) + hashtags do post)
+    # ------------------------------------------------------------------ #
+
+    def _grid(self, platform: str) -> np.ndarray:
+        grid = self._grids.get(platform)
+        if grid is None:
+            grid = self._grids[platform] = np.zeros((3, SLOTS))
+        return grid
+
+    def track_post(
+        self,
+        post_id: str,
+        platform: str,
+        posted_at: Optional[TimeLike] = None,
+        hashtags: Iterable[str] = ()
+    ) -> None:
+        """Registra a publicação de um post (conta um post no horário e nas hashtags)"""
+        post_id = str(post_id)
+        if post_id in self._posts:
+            return
+        posted_at = self.clock() if posted_at is None else posted_at
+        timestamp = posted_at.timestamp() if isinstance(posted_at, datetime) else float(posted_at)
+        slot = self.slot(posted_at)
+        tags = tuple(sorted({"#" + tag.lstrip("#").lower() for tag in hashtags if tag.lstrip("#")}))
+
+        weight = self._weight(timestamp)
+        self._grid(platform)[POSTS, slot] += weight
+        for tag in tags:
+            self._hashtags.setdefault(tag, [0.0, 0.0])[1] += weight
+
+        self._posts[post_id] = [platform, slot, tags, [0.0] * len(TRACKED_METRICS)]
+        if len(self._posts) > self.max_posts:
+            self._posts.popitem(last=False)
+
+    def update_metrics(self, post_id: str, metrics: Dict[str, float], timestamp: Optional[float] = None) -> bool:
+        """
+        Soma o engajamento novo de um post (métricas acumuladas da plataforma)
+
+        Métricas ausentes mantêm o último valor. Retorna False para posts
+        não acompanhados (nunca registrados ou já descartados).
+        """
+        entry = self._posts.get(str(post_id))
+        if entry is None:
+            return False
+        platform, slot, tags, last = entry
+        engagement = impressions = 0.0
+        for index, name in enumerate(TRACKED_METRICS):
+            value = metrics.get(name)
+            if value is None:
+                continue
+            delta = float(value) - last[index]
+            last[index] = float(value)
+            if name == "impressions":
+                impressions += delta
+            else:
+                engagement += delta
+        if not engagement and not impressions:
+            return True
+
+        weight = self._weight(self.clock() if timestamp is None else timestamp)
+        grid = self._grid(platform)
+        grid[ENGAGEMENT, slot] += engagement * weight
+        grid[IMPRESSIONS, slot] += impressions * weight
+        for tag in tags:
+            self._hashtags[tag][0] += engagement * weight
+        return True
+
+    # ------------------------------------------------------------------ #
+    # Consultas (O(buckets))
+    # ------------------------------------------------------------------ #
+
+    def _combined(self, platform: Optional[str]) -> np.ndarray:
+        if platform is not None:
+            return self._grids.get(platform, np.zeros((3, SLOTS)))
+        return sum(self._grids.values(), np.zeros((3, SLOTS)))
+
+    @staticmethod
+    def _scores(engagement: np.ndarray, posts: np.ndarray) -> np.ndarray:
+        """Engajamento médio por post, suavizado em direção à média geral"""
+        total_posts = posts.sum()
+        mean = engagement.sum() / total_posts if total_posts > 0 else 0.0
+        return (engagement + PRIOR_POSTS * mean) / (posts + PRIOR_POSTS)
+
+    def posts(self, platform: Optional[str] = None, now: Optional[float] = None) -> float:
+        """Quantidade de posts com decaimento (peso 1 = publicado agora)"""
+        return float(self._combined(platform)[POSTS].sum() * self._decay(now))
+
+    def has_data(self, platform: Optional[str] = None, now: Optional[float] = None) -> bool:
+        """Se há posts suficientes para usar a grade no lugar dos horários fixos"""
+        return self.posts(platform, now) >= self.min_posts
+
+    def best_times(self, platform: Optional[str] = None, count: int = 3) -> List[Dict[str, Any]]:
+        """
+        Melhores horários da semana, do maior para o menor engajamento por post
+
+        Returns:
+            Lista de dicts com ``weekday`` (0 = segunda), ``hour``, ``label`` e ``score``
+        """
+        grid = self._combined(platform)
+        if not grid[POSTS].any():
+            return []
+        scores = self._scores(grid[ENGAGEMENT], grid[POSTS])
+        scores[grid[POSTS] == 0] = -np.inf  # Só horários com posts
+        best = np.argsort(-scores, kind="stable")[:count]
+        return [
+            {
+                "weekday": int(slot // 24),
+                "hour": int(slot % 24),
+                "label": f"{WEEKDAYS[slot // 24]} {slot % 24:02d}:00",
+                "score": float(scores[slot])
+            }
+            for slot in best if np.isfinite(scores[slot])
+        ]
+
+    def preferred_post_times(self, platform: Optional[str] = None, count: int = 5) -> List[str]:
+        """
+        Horários do dia (``HH:MM``) com maior engajamento por post, em ordem
+
+        Substitui ``Config.preferred_post_times`` quando há dados suficientes.
+        """
+        if not self.has_data(platform):
+            return list(self.fallback_times)
+        grid = self._combined(platform)
+        engagement = grid[ENGAGEMENT].reshape(7, 24).sum(axis=0)
+        posts = grid[POSTS].reshape(7, 24).sum(axis=0)
+        scores = self._scores(engagement, posts)
+        scores[posts == 0] = -np.inf
+        hours = [int(hour) for hour in np.argsort(-scores, kind="stable")[:count] if np.isfinite(scores[hour])]
+        return [f"{hour:02d}:00" for hour in sorted(hours)]
+
+    def next_best_time(
+        self,
+        platform: Optional[str],
+        after: datetime,
+        horizon_hours: int = 24
+    ) -> datetime:
+        """
+        Melhor horário para publicar nas próximas ``horizon_hours`` horas
+
+        Usado pelo agendador para escolher o slot dinamicamente. Sem dados
+        suficientes, usa o próximo dos horários fixos. O resultado tem o
+        mesmo tipo (com ou sem fuso) de ``after``.
+        """
+        local = self._local(after)
+        if self.has_data(platform):
+            grid = self._combined(platform)
+            scores = self._scores(grid[ENGAGEMENT], grid[POSTS])
+            start = local.replace(minute=0, second=0, microsecond=0)
+            first = local.weekday() * 24 + local.hour
+            upcoming = (first + np.arange(horizon_hours)) % SLOTS
+            offset = int(np.argmax(scores[upcoming]))
+            candidate = max(local, start + timedelta(hours=offset))
+        else:
+            candidate = self._next_fallback(local)
+        if after.tzinfo is None:
+            return candidate.replace(tzinfo=None)
+        return candidate.astimezone(after.tzinfo)
+
+    def _next_fallback(self, local: datetime) -> datetime:
+        options = []
+        for value in self.fallback_times:
+            try:
+                hour, minute = (int(part) for part in value.split(":"))
+            except ValueError:
+                continue
+            for days in (0, 1):
+                moment = local.replace(hour=hour, minute=minute, second=0, microsecond=0) + timedelta(days=days)
+                if moment >= local:
+                    options.append(moment)
+        return min(options) if options else local
+
+    def top_hashtags(self, count: int = 10, min_posts: float = 0.5) -> List[Tuple[str, float]]:
+        """Hashtags com maior engajamento por post (suavizado), com pontuação"""
+        decay = self._decay()
+        total_engagement = sum(values[0] for values in self._hashtags.values())
+        total_posts = sum(values[1] for values in self._hashtags.values())
+        mean = total_engagement / total_posts if total_posts > 0 else 0.0
+        threshold = min_posts / decay
+        candidates = (
+            (tag, (engagement + PRIOR_POSTS * mean) / (posts + PRIOR_POSTS))
+            for tag, (engagement, posts) in self._hashtags.items() if posts >= threshold
+        )
+        return heapq.nlargest(count, candidates, key=lambda item: item[1])
+
+    def engagement_rate(self, platform: Optional[str] = None) -> float:
+        """Engajamento / impressões no período (com decaimento)"""
+        grid = self._combined(platform)
+        impressions = grid[IMPRESSIONS].sum()
+        return float(grid[ENGAGEMENT].sum() / impressions) if impressions > 0 else 0.0
+
+    def get_analytics(self, platform: Optional[str] = None) -> Dict[str, Any]:
+        """Resumo no formato de ``get_analytics`` (dashboard e relatórios)"""
+        best = self.best_times(platform, count=3) if self.has_data(platform) else []
+        return {
+            "best_time": f"{best[0]['hour']:02d}:00" if best else (self.fallback_times or [None])[0],
+            "best_times": best,
+            "preferred_post_times": self.preferred_post_times(platform),
+            "top_hashtags": [tag for tag, _ in self.top_hashtags()],
+            "engagement_rate": self.engagement_rate(platform),
+            "posts": self.posts(platform)
+        }
+
+    # ------------------------------------------------------------------ #
+    # Checkpoint
+    # ------------------------------------------------------------------ #
+
+    def state(self) -> Dict[str, Any]:
+        """Cópia serializável do estado"""
+        return {
+            "reference": self._reference,
+            "grids": {platform: grid.tolist() for platform, grid in self._grids.items()},
+            "hashtags": {tag: list(values) for tag, values in self._hashtags.items()},
+            "posts": [
+                [post_id, platform, slot, list(tags), list(last)]
+                for post_id, (platform, slot, tags, last) in self._posts.items()
+            ]
+        }
+
+    @staticmethod
+    def _write(path: Path, state: Dict[str, Any]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(temp_path, path)
+
+    def save(self, path: Optional[Path] = None) -> None:
+        """Grava o estado em JSON (escrita atômica)"""
+        self._write(Path(path or self.state_path), self.state())
+
+    def load(self, path: Path) -> None:
+        """Restaura um checkpoint salvo por ``save``"""
+        state = json.loads(Path(path).read_text(encoding="utf-8"))
+        self._reference = float(state["reference"])
+        self._grids = {platform: np.array(grid, dtype=float) for platform, grid in state["grids"].items()}
+        self._hashtags = {tag: list(values) for tag, values in state["hashtags"].items()}
+        self._posts = OrderedDict(
+            (post_id, [platform, slot, tuple(tags), list(last)])
+            for post_id, platform, slot, tags, last in state["posts"]
+        )
+        self.logger.info(
+            f"📈 Modelo de engajamento carregado: {len(self._grids)} plataformas, "
+            f"{len(self._hashtags)} hashtags, {len(self._posts)} posts"
+        )
+
+    async def checkpoint(self) -> None:
+        """Salva o estado sem bloquear o event loop (cópia no loop, escrita no executor)"""
+        if self.state_path is not None:
+            state = self.state()
+            await asyncio.get_running_loop().run_in_executor(None, self._write, self.state_path, state)
+
+    async def _checkpoint_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.checkpoint()
+            except Exception as e:
+                self.logger.error(f"❌ Erro ao salvar o modelo de engajamento: {e}")
+
+    def start(self, interval: float = 300.0) -> None:
+        """Salva o estado periodicamente em background"""
+        if self._task is None and self.state_path is not None:
+            self._task = asyncio.create_task(self._checkpoint_loop(interval))
+
+    async def stop(self) -> None:
+        """Para o checkpoint periódico e salva o estado final"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.checkpoint()
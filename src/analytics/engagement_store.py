@@ -0,0 +1,741 @@
+"""
+Armazenamento colunar de métricas de engajamento
+
+Backend do ``EngagementTracker`` para relatórios sobre meses de posts em
+muitas contas. Em vez de uma linha SQL por atualização, cada snapshot de
+métricas vira uma linha em colunas numpy (append-only):
+
+    ts (int64) | post (int32) | platform (int8) | likes, shares, ... (int32)
+
+As métricas são gravadas como deltas em relação ao snapshot anterior do
+mesmo post, então somar um intervalo de tempo dá o engajamento ganho nele.
+
+- Escrita: ``record_batch`` converte snapshots acumulados em deltas de forma
+  vetorizada e atualiza os rollups por hora e por dia (chave hora/dia,
+  plataforma, conta) incrementalmente.
+- Disco: ``flush()`` grava as linhas em segmentos particionados por dia e
+  plataforma (um ``.npy`` por coluna, lidos com ``mmap``) e um manifesto com
+  registro de posts, últimos valores e rollups; só segmentos do manifesto
+  são lidos, então um crash no meio do flush não duplica dados.
+- Leitura linha a linha: ``scan`` devolve as linhas de um intervalo em
+  ordem de tempo, em blocos de tamanho fixo (exportação de relatórios).
+- Consultas: ``aggregate`` agrupa por bucket de tempo, plataforma, conta,
+  post e hashtag. Intervalos alinhados sem post/hashtag são respondidos pelos
+  rollups; os demais varrem só as partições do intervalo, com ``bincount``.
+
+Os buckets são em UTC (``ts // 3600`` e ``ts // 86400``).
+
+Example:
+    >>> store = EngagementStore("data/engagement")
+    >>> store.register_post("1790", "twitter", account="acme", hashtags=["#IA"])
+    >>> store.record("1790", {"likes": 10, "shares": 2})
+    >>> store.aggregate(start, end, by=("platform",), bucket="day").to_records()
+"""
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+METRICS = ("likes", "shares", "comments", "impressions", "clicks")
+GROUP_KEYS = ("platform", "account", "post", "hashtag")
+BUCKETS = {"hour": 3600, "day": 86400}
+PENDING_ROWS = 1 << 22  # Linhas acumuladas por bincount na varredura por post
+
+TimeLike = Union[datetime, int, float]
+
+
+def _epoch(value: TimeLike) -> int:
+    return int(value.timestamp()) if isinstance(value, datetime) else int(value)
+
+
+def _group(columns: List[np.ndarray]) -> Tuple[List[np.ndarray], np.ndarray]:
+    """
+    Fatoriza colunas inteiras de chave em grupos (ordem lexicográfica)
+
+    As colunas viram uma chave composta 1-D (``ravel_multi_index`` sobre os
+    intervalos de cada coluna); com espaço de chaves pequeno os grupos saem
+    de um ``bincount`` denso, senão de ``unique`` (ordenação).
+
+    Returns:
+        (colunas dos grupos, índice do grupo de cada linha)
+    """
+    if len(columns[0]) == 0:
+        return [np.empty(0, np.int64) for _ in columns], np.empty(0, np.int64)
+    columns = [np.asarray(column, dtype=np.int64) for column in columns]
+    offsets = [int(column.min()) for column in columns]
+    dims = [int(column.max()) - offset + 1 for column, offset in zip(columns, offsets)]
+    size = 1
+    for dim in dims:
+        size *= dim
+    if size >= 2 ** 62:
+        unique, inverse = np.unique(np.stack(columns, axis=1), axis=0, return_inverse=True)
+        return list(unique.T), inverse.reshape(-1)
+
+    composite = np.ravel_multi_index([column - offset for column, offset in zip(columns, offsets)], dims)
+    if size <= 4 * len(composite) + 65536:
+        codes = np.flatnonzero(np.bincount(composite, minlength=size))
+        lookup = np.empty(size, dtype=np.int64)
+        lookup[codes] = np.arange(len(codes))
+        inverse = lookup[composite]
+    else:
+        codes, inverse = np.unique(composite, return_inverse=True)
+    unique = np.unravel_index(codes, dims)
+    return [column + offset for column, offset in zip(unique, offsets)], inverse
+
+
+class _Columns:
+    """Colunas numpy com crescimento geométrico (append amortizado O(1))"""
+
+    def __init__(self, dtypes: Dict[str, Any], capacity: int = 1024):
+        self.dtypes = dtypes
+        self.size = 0
+        self._data = {name: np.empty((capacity,) + shape, dtype) for name, (dtype, shape) in dtypes.items()}
+
+    def append(self, **columns: np.ndarray) -> None:
+        count = len(next(iter(columns.values())))
+        needed = self.size + count
+        capacity = len(next(iter(self._data.values())))
+        if needed > capacity:
+            capacity = max(needed, capacity * 2)
+            for name, array in self._data.items():
+                grown = np.empty((capacity,) + array.shape[1:], array.dtype)
+                grown[:self.size] = array[:self.size]
+                self._data[name] = grown
+        for name, values in columns.items():
+            self._data[name][self.size:needed] = values
+        self.size = needed
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._data[name][:self.size]
+
+    def clear(self) -> None:
+        self.size = 0
+
+
+class _Rollup:
+    """
+    Somas por (bucket, plataforma, conta) mantidas a cada escrita
+
+    A chave composta é ``bucket << 32 | plataforma << 24 | conta``.
+    """
+
+    def __init__(self, width: int):
+        self.width = width
+        self._rows: Dict[int, int] = {}
+        self._table = _Columns({"key": (np.int64, ()), "sums": (np.int64, (len(METRICS),))})
+
+    def add(self, timestamps: np.ndarray, platforms: np.ndarray, accounts: np.ndarray, deltas: np.ndarray) -> None:
+        keys = ((timestamps // self.width) << 32) | (platforms.astype(np.int64) << 24) | accounts
+        unique, inverse = np.unique(keys, return_inverse=True)
+        sums = np.stack([np.bincount(inverse, weights=deltas[:, m], minlength=len(unique)) for m in range(len(METRICS))], axis=1)
+
+        rows = np.empty(len(unique), dtype=np.int64)
+        new_keys = []
+        for position, key in enumerate(unique.tolist()):
+            row = self._rows.get(key)
+            if row is None:
+                row = self._rows[key] = self._table.size + len(new_keys)
+                new_keys.append(key)
+            rows[position] = row
+        if new_keys:
+            self._table.append(key=np.array(new_keys, dtype=np.int64), sums=np.zeros((len(new_keys), len(METRICS)), np.int64))
+        self._table["sums"][rows] += sums.astype(np.int64)
+
+    def columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(início do bucket em epoch, plataforma, conta, somas)"""
+        keys = self._table["key"]
+        return (keys >> 32) * self.width, (keys >> 24) & 0xFF, keys & 0xFFFFFF, self._table["sums"]
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {"key": self._table["key"], "sums": self._table["sums"]}
+
+    def restore(self, keys: np.ndarray, sums: np.ndarray) -> None:
+        self._table.clear()
+        self._table.append(key=keys, sums=sums)
+        self._rows = {key: row for row, key in enumerate(keys.tolist())}
+
+
+@dataclass
+class _Segment:
+    """Partição gravada (um dia, uma plataforma)"""
+    day: int
+    platform: int
+    path: Path
+
+    def column(self, name: str) -> np.ndarray:
+        return np.load(self.path / f"{name}.npy", mmap_mode="r")
+
+
+class AggregateResult:
+    """
+    Resultado de ``aggregate``: colunas numpy ordenadas pelas chaves
+
+    ``bucket`` é o início do intervalo em epoch (segundos); chaves de grupo
+    vêm já decodificadas (nome da plataforma, conta, post ou hashtag).
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns["likes"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def top(self, metric: str, limit: int) -> "AggregateResult":
+        """As ``limit`` linhas com maior valor de ``metric``"""
+        values = self.columns[metric]
+        order = np.argsort(-values, kind="stable")[:limit]
+        return AggregateResult({name: column[order] for name, column in self.columns.items()})
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Linhas como dicionários (formato dos relatórios)"""
+        names = list(self.columns)
+        return [dict(zip(names, row)) for row in zip(*(self.columns[name].tolist() for name in names))]
+
+
+class EngagementStore:
+    """
+    Store colunar append-only de snapshots de métricas
+
+    A classe não é thread-safe; deve ser usada pelo event loop do tracker
+    (consultas longas podem rodar em executor sobre um store só de leitura).
+    A exceção é o iterador devolvido por ``scan``, que trabalha sobre uma
+    cópia tirada na chamada.
+    """
+
+    def __init__(self, root: Optional[str] = None, segment_rows: int = 1_000_000):
+        """
+        Inicializa o store
+
+        Args:
+            root: Diretório dos segmentos e do manifesto (None = só memória)
+            segment_rows: Linhas em memória que disparam um ``flush`` automático
+        """
+        self.root = Path(root) if root else None
+        self.segment_rows = segment_rows
+        self.logger = logging.getLogger(__name__)
+
+        self._platforms: List[str] = []
+        self._accounts: List[str] = []
+        self._tags: List[str] = []
+        self._codes: Dict[str, Dict[str, int]] = {"platform": {}, "account": {}, "hashtag": {}}
+
+        self._post_ids: Dict[str, int] = {}
+        self._post_keys: List[str] = []
+        self._posts = _Columns({"platform": (np.int8, ()), "account": (np.int32, ()), "created": (np.int64, ())})
+        self._post_tag_ptr: List[int] = [0]
+        self._post_tags: List[int] = []
+        self._last = np.zeros((0, len(METRICS)), dtype=np.int64)
+
+        self._buffer = _Columns({
+            "ts": (np.int64, ()), "post": (np.int32, ()), "platform": (np.int8, ()),
+            "deltas": (np.int32, (len(METRICS),))
+        })
+        self._segments: List[_Segment] = []
+        self._segment_sequence = 0
+        self._state_sequence = 0  # Cada manifesto aponta para um arquivo de estado novo
+        self.rollups = {name: _Rollup(width) for name, width in BUCKETS.items()}
+
+        if self.root is not None and (self.root / "manifest.json").exists():
+            self._load()
+
+    @classmethod
+    def from_config(cls, config) -> "EngagementStore":
+        """Cria o store a partir de ``Config`` (``ENGAGEMENT_STORE_*``)"""
+        return cls(config.engagement_store_dir, config.engagement_segment_rows)
+
+    # ------------------------------------------------------------------
+    # Registro de posts
+    # ------------------------------------------------------------------
+
+    def _code(self, kind: str, names: List[str], name: str) -> int:
+        code = self._codes[kind].get(name)
+        if code is None:
+            code = self._codes[kind][name] = len(names)
+            names.append(name)
+        return code
+
+    def register_post(
+        self,
+        post_id: str,
+        platform: str,
+        account: str = "",
+        hashtags: Iterable[str] = (),
+        created_at: Optional[TimeLike] = None
+    ) -> int:
+        """
+        Registra um post (``track_post``) e retorna seu código interno
+
+        Registrar de novo um post existente não altera nada.
+        """
+        post_id = str(post_id)
+        code = self._post_ids.get(post_id)
+        if code is not None:
+            return code
+
+        code = self._post_ids[post_id] = len(self._post_keys)
+        self._post_keys.append(post_id)
+        self._posts.append(
+            platform=[self._code("platform", self._platforms, platform)],
+            account=[self._code("account", self._accounts, account)],
+            created=[_epoch(created_at) if created_at is not None else int(time.time())]
+        )
+        tags = {self._code("hashtag", self._tags, "#" + tag.lstrip("#").lower()) for tag in hashtags}
+        self._post_tags.extend(sorted(tags))
+        self._post_tag_ptr.append(len(self._post_tags))
+        if code >= len(self._last):
+            grown = np.zeros((max(1024, 2 * len(self._last)), len(METRICS)), dtype=np.int64)
+            grown[:len(self._last)] = self._last
+            self._last = grown
+        return code
+
+    def post_code(self, post_id: str) -> int:
+        """Código de um post registrado (``KeyError`` se não existir)"""
+        return self._post_ids[str(post_id)]
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def record(self, post_id: str, metrics: Dict[str, int], timestamp: Optional[TimeLike] = None) -> None:
+        """Registra um snapshot das métricas acumuladas de um post (``update_metrics``)"""
+        code = self.post_code(post_id)
+        values = self._last[code].copy()
+        for name, value in metrics.items():
+            values[METRICS.index(name)] = value
+        self.record_batch(
+            np.array([code]), values[None, :],
+            np.array([_epoch(timestamp) if timestamp is not None else int(time.time())])
+        )
+
+    def record_batch(self, posts: np.ndarray, values: np.ndarray, timestamps: np.ndarray) -> int:
+        """
+        Registra snapshots acumulados em lote
+
+        Os snapshots de um post devem chegar em ordem de tempo entre lotes
+        (dentro do lote a ordem é refeita aqui).
+
+        Args:
+            posts: Códigos dos posts (``register_post``)
+            values: Matriz ``(n, len(METRICS))`` com os valores acumulados
+            timestamps: Epoch (segundos) de cada snapshot
+
+        Returns:
+            Linhas gravadas (snapshots sem mudança são descartados)
+        """
+        posts = np.asarray(posts, dtype=np.int64)
+        values = np.asarray(values, dtype=np.int64)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if len(posts) == 0:
+            return 0
+
+        # Deltas em relação ao snapshot anterior do mesmo post
+        order = np.lexsort((timestamps, posts))
+        posts, values, timestamps = posts[order], values[order], timestamps[order]
+        first = np.ones(len(posts), dtype=bool)
+        first[1:] = posts[1:] != posts[:-1]
+        previous = np.empty_like(values)
+        previous[1:] = values[:-1]
+        previous[first] = self._last[posts[first]]
+        deltas = values - previous
+        last = np.flatnonzero(np.append(first[1:], True))
+        self._last[posts[last]] = values[last]
+
+        changed = deltas.any(axis=1)
+        posts, timestamps, deltas = posts[changed], timestamps[changed], deltas[changed]
+        platforms = self._posts["platform"][posts]
+        self._buffer.append(ts=timestamps, post=posts, platform=platforms, deltas=deltas)
+
+        accounts = self._posts["account"][posts].astype(np.int64)
+        for rollup in self.rollups.values():
+            rollup.add(timestamps, platforms, accounts, deltas)
+
+        if self.root is not None and self._buffer.size >= self.segment_rows:
+            self.flush()
+        return len(posts)
+
+    # ------------------------------------------------------------------
+    # Persistência
+    # ------------------------------------------------------------------
+
+    def flush(self) -> None:
+        """Grava as linhas em memória em partições dia/plataforma e o manifesto"""
+        if self.root is None:
+            return
+        if self._buffer.size:
+            days = self._buffer["ts"] // 86400
+            partition = days * 256 + self._buffer["platform"]
+            order = np.lexsort((self._buffer["ts"], partition))  # Segmentos em ordem de tempo
+            bounds = np.flatnonzero(np.diff(partition[order])) + 1
+            for rows in np.split(order, bounds):
+                day, platform = int(days[rows[0]]), int(self._buffer["platform"][rows[0]])
+                self._segment_sequence += 1
+                path = (
+                    self.root / "segments" / datetime.fromtimestamp(day * 86400, timezone.utc).strftime("%Y-%m-%d")
+                    / self._platforms[platform] / f"{self._segment_sequence:06d}"
+                )
+                path.mkdir(parents=True, exist_ok=True)
+                for name in ("ts", "post", "deltas"):
+                    np.save(path / f"{name}.npy", self._buffer[name][rows])
+                self._segments.append(_Segment(day, platform, path))
+            self._buffer.clear()
+        self._save_manifest()
+
+    def _save_manifest(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Nunca regrava o estado apontado pelo manifesto atual (flush sem linhas novas
+        # não avança a sequência de segmentos)
+        self._state_sequence += 1
+        state_path = self.root / f"state-{self._state_sequence:06d}.npz"
+        np.savez(
+            state_path,
+            last=self._last[:len(self._post_keys)],
+            post_platform=self._posts["platform"], post_account=self._posts["account"],
+            post_created=self._posts["created"],
+            post_tag_ptr=np.array(self._post_tag_ptr, dtype=np.int64),
+            post_tags=np.array(self._post_tags, dtype=np.int64),
+            **{f"{name}_{field}": array for name, rollup in self.rollups.items() for field, array in rollup.state().items()}
+        )
+        manifest = {
+            "state": state_path.name,
+            "state_sequence": self._state_sequence,
+            "sequence": self._segment_sequence,
+            "platforms": self._platforms,
+            "accounts": self._accounts,
+            "hashtags": self._tags,
+            "posts": self._post_keys,
+            "segments": [
+                {"day": s.day, "platform": s.platform, "path": str(s.path.relative_to(self.root))}
+                for s in self._segments
+            ]
+        }
+        temp_path = self.root / "manifest.json.tmp"
+        temp_path.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(temp_path, self.root / "manifest.json")  # Ponto de commit do flush
+
+        for old in self.root.glob("state-*.npz"):
+            if old != state_path:
+                old.unlink()
+
+    def _load(self) -> None:
+        manifest = json.loads((self.root / "manifest.json").read_text(encoding="utf-8"))
+        with np.load(self.root / manifest["state"]) as state:
+            for kind, names in (("platform", manifest["platforms"]), ("account", manifest["accounts"]), ("hashtag", manifest["hashtags"])):
+                for name in names:
+                    self._code(kind, {"platform": self._platforms, "account": self._accounts, "hashtag": self._tags}[kind], name)
+            self._post_keys = list(manifest["posts"])
+            self._post_ids = {key: code for code, key in enumerate(self._post_keys)}
+            self._posts.clear()
+            self._posts.append(platform=state["post_platform"], account=state["post_account"], created=state["post_created"])
+            self._post_tag_ptr = state["post_tag_ptr"].tolist()
+            self._post_tags = state["post_tags"].tolist()
+            self._last = np.zeros((max(1024, len(self._post_keys)), len(METRICS)), dtype=np.int64)
+            self._last[:len(self._post_keys)] = state["last"]
+            for name, rollup in self.rollups.items():
+                rollup.restore(state[f"{name}_key"], state[f"{name}_sums"])
+        self._segment_sequence = manifest["sequence"]
+        self._state_sequence = manifest.get("state_sequence", manifest["sequence"])
+        self._segments = [
+            _Segment(entry["day"], entry["platform"], self.root / entry["path"]) for entry in manifest["segments"]
+        ]
+        self.logger.info(f"📊 Store de engajamento: {len(self._post_keys)} posts, {len(self._segments)} segmentos")
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def _codes_of(self, kind: str, names: Optional[Iterable[str]]) -> Optional[np.ndarray]:
+        if names is None:
+            return None
+        return np.array([self._codes[kind][name] for name in names if name in self._codes[kind]], dtype=np.int64)
+
+    def _chunks(self, start: int, end: int, platforms: Optional[np.ndarray]):
+        """(ts, post, deltas, inteira) das partições que podem ter linhas em [start, end)"""
+        first_day, last_day = start // 86400, (end - 1) // 86400
+        for segment in self._segments:
+            if first_day <= segment.day <= last_day and (platforms is None or segment.platform in platforms):
+                whole = start <= segment.day * 86400 and (segment.day + 1) * 86400 <= end
+                yield segment.column("ts"), segment.column("post"), segment.column("deltas"), whole
+        if self._buffer.size:
+            yield self._buffer["ts"], self._buffer["post"], self._buffer["deltas"], False
+
+    def _rollup_for(self, start: int, end: int, by: Sequence[str], bucket: Optional[str]) -> Optional[_Rollup]:
+        if any(key in ("post", "hashtag") for key in by):
+            return None
+        candidates = [bucket] if bucket else ["day", "hour"]
+        for name in candidates:
+            width = BUCKETS[name]
+            if start % width == 0 and end % width == 0:
+                return self.rollups[name]
+        return None
+
+    def scan(
+        self,
+        start: TimeLike,
+        end: TimeLike,
+        platforms: Optional[Iterable[str]] = None,
+        accounts: Optional[Iterable[str]] = None,
+        chunk_rows: int = 65536
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Linhas de ``[start, end)`` em ordem de tempo, em blocos de até ``chunk_rows``
+
+        Cada dia é ordenado à parte (só a coluna ``ts`` do dia fica em memória)
+        e as demais colunas são lidas dos segmentos bloco a bloco, então a
+        memória depende do maior dia, não do tamanho do intervalo.
+
+        O estado do store (registro de posts, lista de segmentos e linhas em
+        memória do intervalo) é copiado na chamada, no event loop; o iterador
+        devolvido pode então ser consumido em outra thread enquanto o loop
+        continua gravando (os segmentos já gravados não mudam).
+
+        Yields:
+            Colunas ``timestamp`` (epoch), ``post``, ``platform``, ``account``
+            (decodificadas) e uma por métrica (deltas)
+        """
+        start, end = _epoch(start), _epoch(end)
+        platform_codes = self._codes_of("platform", platforms)
+        account_codes = self._codes_of("account", accounts)
+        posts = (self._posts["platform"].copy(), self._posts["account"].copy())
+        labels = {
+            "post": np.array(self._post_keys, dtype=object),
+            "platform": np.array(self._platforms, dtype=object),
+            "account": np.array(self._accounts, dtype=object)
+        }
+
+        first_day, last_day = start // 86400, (end - 1) // 86400
+        segments = [
+            segment for segment in self._segments
+            if first_day <= segment.day <= last_day and (platform_codes is None or segment.platform in platform_codes)
+        ]
+
+        # Linhas ainda em memória: copiadas (indexação por lista) e ordenadas uma vez
+        buffer = None
+        if self._buffer.size:
+            ts = self._buffer["ts"]
+            rows = np.flatnonzero((ts >= start) & (ts < end))
+            if platform_codes is not None:
+                rows = rows[np.isin(self._buffer["platform"][rows], platform_codes)]
+            rows = rows[np.argsort(ts[rows], kind="stable")]
+            buffer = [self._buffer[name][rows] for name in ("ts", "post", "deltas")]
+
+        return self._scan_rows(start, end, account_codes, posts, labels, segments, buffer, chunk_rows)
+
+    @staticmethod
+    def _scan_rows(
+        start: int,
+        end: int,
+        account_codes: Optional[np.ndarray],
+        posts: Tuple[np.ndarray, np.ndarray],
+        labels: Dict[str, np.ndarray],
+        segments: List[_Segment],
+        buffer: Optional[List[np.ndarray]],
+        chunk_rows: int
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """Parte preguiçosa do ``scan``: só lê a cópia e os segmentos imutáveis"""
+        post_platform, post_account = posts
+        days: Dict[int, List[Tuple[np.ndarray, np.ndarray, np.ndarray]]] = {}
+        for segment in segments:
+            days.setdefault(segment.day, []).append(
+                (segment.column("ts"), segment.column("post"), segment.column("deltas"))
+            )
+        if buffer is not None:
+            buffer_days = buffer[0] // 86400
+            for day in np.unique(buffer_days).tolist():
+                low, high = np.searchsorted(buffer_days, [day, day + 1])
+                days.setdefault(day, []).append(tuple(column[low:high] for column in buffer))
+
+        for day in sorted(days):
+            sources = days[day]
+            timestamps = np.concatenate([np.asarray(source[0]) for source in sources])
+            offsets = np.cumsum([0] + [len(source[0]) for source in sources])
+            order = np.argsort(timestamps, kind="stable")
+            low, high = np.searchsorted(timestamps[order], [start, end])
+            order = order[low:high]
+
+            for first in range(0, len(order), chunk_rows):
+                rows = order[first:first + chunk_rows]
+                source_of = np.searchsorted(offsets, rows, side="right") - 1
+                post = np.empty(len(rows), dtype=np.int64)
+                deltas = np.empty((len(rows), len(METRICS)), dtype=np.int64)
+                for index in np.unique(source_of).tolist():
+                    selected = source_of == index
+                    local = rows[selected] - offsets[index]
+                    post[selected] = sources[index][1][local]
+                    deltas[selected] = sources[index][2][local]
+                ts = timestamps[rows]
+                if account_codes is not None:
+                    keep = np.isin(post_account[post], account_codes)
+                    ts, post, deltas = ts[keep], post[keep], deltas[keep]
+                if len(post) == 0:
+                    continue
+
+                chunk = {
+                    "timestamp": ts,
+                    "post": labels["post"][post],
+                    "platform": labels["platform"][post_platform[post]],
+                    "account": labels["account"][post_account[post]]
+                }
+                for index, metric in enumerate(METRICS):
+                    chunk[metric] = deltas[:, index]
+                yield chunk
+
+    def aggregate(
+        self,
+        start: TimeLike,
+        end: TimeLike,
+        by: Sequence[str] = ("platform",),
+        bucket: Optional[str] = None,
+        platforms: Optional[Iterable[str]] = None,
+        accounts: Optional[Iterable[str]] = None
+    ) -> AggregateResult:
+        """
+        Soma o engajamento ganho em ``[start, end)`` agrupado
+
+        Args:
+            start: Início do intervalo (datetime ou epoch)
+            end: Fim exclusivo do intervalo
+            by: Chaves de grupo entre ``platform``, ``account``, ``post`` e ``hashtag``
+            bucket: ``"hour"``, ``"day"`` ou None (intervalo inteiro)
+            platforms: Filtra plataformas
+            accounts: Filtra contas
+
+        Returns:
+            ``AggregateResult`` com ``bucket`` (se pedido), as chaves e uma
+            coluna por métrica
+        """
+        unknown = set(by) - set(GROUP_KEYS)
+        if unknown or (bucket is not None and bucket not in BUCKETS):
+            raise ValueError(f"Agrupamento inválido: by={list(by)}, bucket={bucket}")
+        start, end = _epoch(start), _epoch(end)
+        platform_codes = self._codes_of("platform", platforms)
+        account_codes = self._codes_of("account", accounts)
+
+        rollup = self._rollup_for(start, end, by, bucket)
+        if rollup is not None:
+            bucket_start, platform, account, sums = rollup.columns()
+            mask = (bucket_start >= start) & (bucket_start < end)
+            if platform_codes is not None:
+                mask &= np.isin(platform, platform_codes)
+            if account_codes is not None:
+                mask &= np.isin(account, account_codes)
+            keys = {"platform": platform[mask], "account": account[mask]}
+            if bucket:
+                keys = {"bucket": bucket_start[mask] // rollup.width, **keys}
+            return self._reduce(keys, sums[mask], [k for k in ("bucket", *by) if k in keys], rollup.width)
+
+        width = BUCKETS[bucket] if bucket else None
+        post_platform = self._posts["platform"].astype(np.int64)
+        post_account = self._posts["account"].astype(np.int64)
+        partial_keys: List[Dict[str, np.ndarray]] = []
+        partial_sums: List[np.ndarray] = []
+        names = (["bucket"] if bucket else []) + [k for k in by if k != "hashtag"]
+        if "hashtag" in by and "post" not in names:
+            names.append("post")  # Explodido em hashtags depois
+
+        # Só por post (ranking de hashtags/posts): acumulador denso, sem agrupar por partição
+        per_post = names == ["post"]
+        if per_post:
+            post_sums = np.zeros((len(self._post_keys), len(METRICS)), dtype=np.int64)
+            post_rows = np.zeros(len(self._post_keys), dtype=np.int64)
+            pending: List[Tuple[np.ndarray, np.ndarray]] = []
+
+            def accumulate() -> None:
+                # Um bincount por métrica para várias partições juntas
+                post, deltas = (np.concatenate(columns) for columns in zip(*pending))
+                pending.clear()
+                post_rows[:] += np.bincount(post, minlength=len(post_rows))
+                for m in range(len(METRICS)):
+                    post_sums[:, m] += np.bincount(post, weights=deltas[:, m], minlength=len(post_rows)).astype(np.int64)
+
+        for ts, post, deltas, whole in self._chunks(start, end, platform_codes):
+            ts, post, deltas = np.asarray(ts), np.asarray(post), np.asarray(deltas)
+            if not whole:
+                rows = np.flatnonzero((ts >= start) & (ts < end))
+                ts, post, deltas = ts[rows], post[rows], deltas[rows]
+            for codes, lookup in ((account_codes, post_account), (platform_codes, post_platform)):
+                if codes is not None:
+                    keep = np.isin(lookup[post], codes)
+                    ts, post, deltas = ts[keep], post[keep], deltas[keep]
+            if len(post) == 0:
+                continue
+            if per_post:
+                pending.append((post, deltas))
+                if sum(len(p) for p, _ in pending) >= PENDING_ROWS:
+                    accumulate()
+                continue
+            post = post.astype(np.int64)
+            columns = {
+                "bucket": ts // width if width else None,
+                "platform": post_platform[post],
+                "account": post_account[post],
+                "post": post
+            }
+            reduced = self._reduce({name: columns[name] for name in names}, deltas, names, decode=False)
+            partial_keys.append({name: reduced[name] for name in names})
+            partial_sums.append(np.stack([reduced[m] for m in METRICS], axis=1))
+
+        if per_post:
+            if pending:
+                accumulate()
+            present = np.flatnonzero(post_rows)
+            keys, sums = {"post": present}, post_sums[present]
+        elif partial_keys:
+            keys = {name: np.concatenate([p[name] for p in partial_keys]) for name in names}
+            sums = np.concatenate(partial_sums)
+        else:
+            keys = {name: np.empty(0, dtype=np.int64) for name in names}
+            sums = np.empty((0, len(METRICS)), dtype=np.int64)
+
+        if "hashtag" in by:
+            pointers = np.array(self._post_tag_ptr, dtype=np.int64)
+            tags = np.array(self._post_tags, dtype=np.int64)
+            post = keys["post"]
+            counts = pointers[post + 1] - pointers[post]
+            rows = np.repeat(np.arange(len(post)), counts)
+            offsets = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+            keys = {name: column[rows] for name, column in keys.items()}
+            keys["hashtag"] = tags[pointers[post][rows] + offsets]
+            sums = sums[rows]
+
+        return self._reduce(keys, sums, [key for key in ("bucket", *by) if key in keys], width)
+
+    def _reduce(
+        self,
+        keys: Dict[str, np.ndarray],
+        sums: np.ndarray,
+        names: List[str],
+        width: Optional[int] = None,
+        decode: bool = True
+    ) -> Any:
+        """Agrupa ``sums`` pelas colunas ``names`` (em ordem) com chave composta + ``bincount``"""
+        sums = np.asarray(sums, dtype=np.int64)
+        if names:
+            unique, inverse = _group([keys[name] for name in names])
+            groups = len(unique[0])
+        else:
+            unique, inverse, groups = [], np.zeros(len(sums), np.int64), int(len(sums) > 0)
+        totals = np.stack(
+            [np.bincount(inverse, weights=sums[:, m], minlength=groups) for m in range(len(METRICS))], axis=1
+        ).astype(np.int64) if len(sums) else np.zeros((groups, len(METRICS)), np.int64)
+
+        columns: Dict[str, np.ndarray] = {}
+        labels = {"platform": self._platforms, "account": self._accounts, "post": self._post_keys, "hashtag": self._tags}
+        for name, column in zip(names, unique):
+            if decode and name == "bucket":
+                column = column * width
+            elif decode and name in labels:
+                column = np.array(labels[name], dtype=object)[column] if len(column) else np.empty(0, dtype=object)
+            columns[name] = column
+        for index, metric in enumerate(METRICS):
+            columns[metric] = totals[:, index]
+        return AggregateResult(columns) if decode else columns
@@ -0,0 +1,397 @@
+"""
+Exportação de relatórios de engajamento em streaming
+
+Um ano de métricas não cabe num DataFrame nos containers pequenos, então o
+relatório nunca é materializado: as linhas saem do ``EngagementStore`` em
+blocos de ``chunk_rows`` e cada bloco é escrito e descartado.
+
+- CSV: módulo ``csv`` da biblioteca padrão, bloco a bloco.
+- Parquet: ``pyarrow.parquet.ParquetWriter``, um row group por bloco.
+- XLSX: ``openpyxl`` em modo write-only (linhas vão para arquivos
+  temporários); planilhas novas a cada 1.048.576 linhas.
+
+Dois tipos de relatório:
+
+- Detalhado (``by=None``): uma linha por atualização de métricas, em ordem
+  de tempo (``EngagementStore.scan``).
+- Agregado (``by``/``bucket``): somas de ``EngagementStore.aggregate``; só os
+  grupos ficam em memória (colunas numpy), não as linhas de origem.
+
+``stream`` devolve o arquivo em pedaços de bytes para uma resposta HTTP
+chunked (``create_report_router``). O Parquet sai conforme os row groups são
+escritos; o XLSX só existe completo no final (zip), então passa por um
+arquivo temporário antes de ser enviado.
+
+Example:
+    >>> reports = ReportGenerator(store)
+    >>> reports.export("parquet", "relatorio.parquet", start, end)
+    >>> reports.export("csv", "diario.csv", start, end, by=("platform",), bucket="day")
+"""
+
+import csv
+import io
+import logging
+import os
+import tempfile
+from datetime import datetime, timezone
+from importlib import import_module
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .engagement_store import BUCKETS, GROUP_KEYS, METRICS, EngagementStore, TimeLike, _epoch
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+}
+DETAIL_COLUMNS = ("timestamp", "post", "platform", "account") + METRICS
+TIME_COLUMNS = ("timestamp", "bucket")
+XLSX_MAX_ROWS = 1_048_576  # Limite do Excel por planilha (inclui o cabeçalho)
+STREAM_CHUNK_BYTES = 1 << 20  # Pedaços lidos do arquivo temporário do XLSX
+
+
+class _Pipe(io.RawIOBase):
+    """Destino em memória esvaziado a cada bloco (não pesquisável, com ``tell``)"""
+
+    def __init__(self):
+        super().__init__()
+        self._data = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._data += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = bytes(self._data)
+        self._data.clear()
+        return data
+
+
+class _ReportWriter:
+    """Escreve blocos de colunas num arquivo binário de um formato"""
+
+    requires: Optional[str] = None
+    buffered = False  # O arquivo só fica válido no close (não dá para enviar antes)
+
+    def __init__(self, sink: BinaryIO, columns: Sequence[str]):
+        self.sink = sink
+        self.columns = list(columns)
+
+    def write(self, chunk: Dict[str, np.ndarray]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class _CsvWriter(_ReportWriter):
+    """CSV (RFC 4180) com datas em ISO 8601 UTC"""
+
+    def __init__(self, sink: BinaryIO, columns: Sequence[str]):
+        super().__init__(sink, columns)
+        self._text = io.StringIO()
+        self._csv = csv.writer(self._text)
+        self._csv.writerow(self.columns)
+        self._flush()
+
+    def write(self, chunk: Dict[str, np.ndarray]) -> None:
+        values = []
+        for name in self.columns:
+            column = chunk[name]
+            if name in TIME_COLUMNS:
+                column = np.datetime_as_string(column.astype("datetime64[s]"), unit="s", timezone="UTC")
+            values.append(column.tolist())
+        self._csv.writerows(zip(*values))
+        self._flush()
+
+    def _flush(self) -> None:
+        self.sink.write(self._text.getvalue().encode("utf-8"))
+        self._text.seek(0)
+        self._text.truncate()
+
+
+class _ParquetWriter(_ReportWriter):
+    """Parquet com um row group por bloco (snappy)"""
+
+    requires = "pyarrow"
+
+    def __init__(self, sink: BinaryIO, columns: Sequence[str]):
+        super().__init__(sink, columns)
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self.schema = pa.schema([
+            (name, pa.timestamp("s", tz="UTC") if name in TIME_COLUMNS else pa.int64() if name in METRICS else pa.string())
+            for name in self.columns
+        ])
+        self._writer = pq.ParquetWriter(sink, self.schema, compression="snappy")
+
+    def write(self, chunk: Dict[str, np.ndarray]) -> None:
+        arrays = []
+        for field in self.schema:
+            column = chunk[field.name]
+            if field.name in TIME_COLUMNS:
+                column = column.astype("datetime64[s]")
+            arrays.append(self._pa.array(column, type=field.type))
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class _XlsxWriter(_ReportWriter):
+    """XLSX em modo write-only do openpyxl (datas em UTC sem fuso)"""
+
+    requires = "openpyxl"
+    buffered = True
+
+    def __init__(self, sink: BinaryIO, columns: Sequence[str]):
+        super().__init__(sink, columns)
+        from openpyxl import Workbook
+
+        self._workbook = Workbook(write_only=True)
+        self._sheets = 0
+        self._rows = 0
+        self._new_sheet()
+
+    def _new_sheet(self) -> None:
+        self._sheets += 1
+        title = "Relatório" if self._sheets == 1 else f"Relatório {self._sheets}"
+        self._sheet = self._workbook.create_sheet(title)
+        self._sheet.append(self.columns)
+        self._rows = 1
+
+    def write(self, chunk: Dict[str, np.ndarray]) -> None:
+        values = []
+        for name in self.columns:
+            column = chunk[name]
+            if name in TIME_COLUMNS:
+                column = column.astype("datetime64[s]").astype(object)
+            values.append(column.tolist())
+        for row in zip(*values):
+            if self._rows >= XLSX_MAX_ROWS:
+                self._new_sheet()
+            self._sheet.append(row)
+            self._rows += 1
+
+    def close(self) -> None:
+        self._workbook.save(self.sink)
+
+
+_WRITERS = {"csv": _CsvWriter, "parquet": _ParquetWriter, "xlsx": _XlsxWriter}
+
+
+def _writer_class(fmt: str) -> type:
+    """Classe do formato, verificando a dependência opcional antes de começar"""
+    writer = _WRITERS.get(fmt)
+    if writer is None:
+        raise ValueError(f"Formato de relatório inválido: {fmt} (use {', '.join(FORMATS)})")
+    if writer.requires:
+        try:
+            import_module(writer.requires)
+        except ImportError as error:
+            raise ImportError(f"Exportação {fmt} requer o pacote {writer.requires}") from error
+    return writer
+
+
+class ReportGenerator:
+    """
+    Relatórios do ``EngagementStore`` em CSV, Parquet ou XLSX com memória limitada
+
+    ``chunks`` e ``stream`` leem o store na chamada (no event loop): o
+    relatório é o estado daquele momento, e o iterador devolvido pode ser
+    consumido pelo threadpool do servidor enquanto o loop continua gravando.
+    """
+
+    def __init__(self, store: EngagementStore, chunk_rows: int = 100_000):
+        """
+        Inicializa o gerador
+
+        Args:
+            store: Store de engajamento de onde as linhas são lidas
+            chunk_rows: Linhas por bloco (e por row group no Parquet)
+        """
+        self.store = store
+        self.chunk_rows = chunk_rows
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, config, store: EngagementStore) -> "ReportGenerator":
+        """Cria o gerador a partir de ``Config`` (``REPORT_CHUNK_ROWS``)"""
+        return cls(store, config.report_chunk_rows)
+
+    @staticmethod
+    def columns(by: Optional[Sequence[str]] = None, bucket: Optional[str] = None) -> List[str]:
+        """Colunas do relatório (detalhado com ``by=None``)"""
+        if by is None:
+            if bucket is not None:
+                raise ValueError("bucket exige um relatório agregado (by)")
+            return list(DETAIL_COLUMNS)
+        unknown = set(by) - set(GROUP_KEYS)
+        if unknown or (bucket is not None and bucket not in BUCKETS):
+            raise ValueError(f"Agrupamento inválido: by={list(by)}, bucket={bucket}")
+        return (["bucket"] if bucket else []) + list(by) + list(METRICS)
+
+    def chunks(
+        self,
+        start: TimeLike,
+        end: TimeLike,
+        by: Optional[Sequence[str]] = None,
+        bucket: Optional[str] = None,
+        platforms: Optional[Iterable[str]] = None,
+        accounts: Optional[Iterable[str]] = None
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Blocos de até ``chunk_rows`` linhas com as colunas de ``columns``
+
+        O store é lido aqui (cópia do ``scan`` ou resultado do ``aggregate``);
+        só a iteração fica para depois.
+        """
+        if by is None:
+            return self.store.scan(start, end, platforms, accounts, self.chunk_rows)
+
+        result = self.store.aggregate(start, end, by=by, bucket=bucket, platforms=platforms, accounts=accounts)
+        return (
+            {name: column[first:first + self.chunk_rows] for name, column in result.columns.items()}
+            for first in range(0, len(result), self.chunk_rows)
+        )
+
+    def export(
+        self,
+        fmt: str,
+        destination: Union[str, Path, BinaryIO],
+        start: TimeLike,
+        end: TimeLike,
+        **filters: Any
+    ) -> int:
+        """
+        Grava o relatório num arquivo
+
+        Args:
+            fmt: ``csv``, ``parquet`` ou ``xlsx``
+            destination: Caminho (gravado de forma atômica) ou arquivo binário aberto
+            start: Início do intervalo (datetime ou epoch)
+            end: Fim exclusivo do intervalo
+            **filters: ``by``, ``bucket``, ``platforms`` e ``accounts``
+
+        Returns:
+            Linhas escritas (sem o cabeçalho)
+        """
+        writer_class = _writer_class(fmt)
+        columns = self.columns(filters.get("by"), filters.get("bucket"))
+        chunks = self.chunks(start, end, **filters)
+        if not isinstance(destination, (str, Path)):
+            return self._write(writer_class(destination, columns), chunks)
+
+        path = Path(destination)
+        temp_path = path.with_name(path.name + ".tmp")
+        try:
+            with open(temp_path, "wb") as sink:
+                rows = self._write(writer_class(sink, columns), chunks)
+            os.replace(temp_path, path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+        self.logger.info(f"📄 Relatório {fmt} exportado: {rows} linhas em {path}")
+        return rows
+
+    def stream(self, fmt: str, start: TimeLike, end: TimeLike, **filters: Any) -> Iterator[bytes]:
+        """
+        Relatório em pedaços de bytes (corpo de uma resposta chunked)
+
+        Formato, agrupamento e dependência são validados aqui, antes do
+        primeiro pedaço, para o endpoint poder responder com erro; o store
+        também é lido aqui, então a chamada deve ser feita no event loop.
+        """
+        writer_class = _writer_class(fmt)
+        columns = self.columns(filters.get("by"), filters.get("bucket"))
+        chunks = self.chunks(start, end, **filters)
+        if writer_class.buffered:
+            return self._stream_file(writer_class, columns, chunks)
+        return self._stream_pipe(writer_class, columns, chunks)
+
+    def filename(self, fmt: str, start: TimeLike, end: TimeLike) -> str:
+        """Nome sugerido para o download (``relatorio_AAAAMMDD_AAAAMMDD.ext``)"""
+        first, last = (datetime.fromtimestamp(_epoch(value), timezone.utc) for value in (start, end))
+        return f"relatorio_{first:%Y%m%d}_{last:%Y%m%d}.{fmt}"
+
+    def _write(self, writer: _ReportWriter, chunks: Iterable[Dict[str, np.ndarray]]) -> int:
+        rows = 0
+        for chunk in chunks:
+            writer.write(chunk)
+            rows += len(chunk[METRICS[0]])
+        writer.close()
+        return rows
+
+    def _stream_pipe(self, writer_class: type, columns: List[str], chunks: Iterable[Dict[str, np.ndarray]]) -> Iterator[bytes]:
+        pipe = _Pipe()
+        writer = writer_class(pipe, columns)
+        for chunk in chunks:
+            writer.write(chunk)
+            data = pipe.drain()
+            if data:
+                yield data
+        writer.close()
+        data = pipe.drain()
+        if data:
+            yield data
+
+    def _stream_file(self, writer_class: type, columns: List[str], chunks: Iterable[Dict[str, np.ndarray]]) -> Iterator[bytes]:
+        with tempfile.TemporaryFile() as sink:
+            self._write(writer_class(sink, columns), chunks)
+            sink.seek(0)
+            while True:
+                data = sink.read(STREAM_CHUNK_BYTES)
+                if not data:
+                    break
+                yield data
+
+
+def create_report_router(reports: ReportGenerator) -> Any:
+    """
+    Rotas FastAPI da exportação de relatórios
+
+    ``GET /api/reports/export?start=...&end=...&format=csv`` responde com o
+    arquivo em streaming (``Transfer-Encoding: chunked``). ``by``, ``platform``
+    e ``account`` podem ser repetidos; ``bucket`` exige ``by``.
+    """
+    from fastapi import APIRouter, HTTPException, Query
+    from fastapi.responses import StreamingResponse
+
+    router = APIRouter()
+
+    @router.get("/api/reports/export")
+    async def export_report(
+        start: datetime,
+        end: datetime,
+        format: str = "csv",
+        by: Optional[List[str]] = Query(None),
+        bucket: Optional[str] = None,
+        platform: Optional[List[str]] = Query(None),
+        account: Optional[List[str]] = Query(None)
+    ):
+        try:
+            body = reports.stream(format, start, end, by=by, bucket=bucket, platforms=platform, accounts=account)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except ImportError as e:
+            raise HTTPException(status_code=501, detail=str(e))
+        return StreamingResponse(
+            body,
+            media_type=FORMATS[format],
+            headers={"Content-Disposition": f'attachment; filename="{reports.filename(format, start, end)}"'}
+        )
+
+    return router
@@ -4,14 +4,50 @@ Módulo principal do bot SocialBot AI
 Contém as classes e funcionalidades principais para automação de redes sociais.
 """
 
-from .social_bot import SocialBot
-from .twitter_bot import TwitterBot
-from .scheduler import PostScheduler
-from .rate_limiter import RateLimiter
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .social_bot import SocialBot
+    from .twitter_bot import TwitterBot
+    from .scheduler import PostScheduler
+    from .rate_limiter import RateLimiter
+    from .distributed_rate_limiter import RedisRateLimiter
+    from .mention_pipeline import MentionPipeline
+    from .metrics_poller import MetricsPoller
+
+_LAZY_ATTRIBUTES = {
+    "SocialBot": ".social_bot",
+    "TwitterBot": ".twitter_bot",
+    "PostScheduler": ".scheduler",
+    "RateLimiter": ".rate_limiter",
+    "RedisRateLimiter": ".distributed_rate_limiter",
+    "MentionPipeline": ".mention_pipeline",
+    "MetricsPoller": ".metrics_poller",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Importa o atributo público sob demanda (PEP 562)"""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # Próximos acessos não passam por __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     "SocialBot",
     "TwitterBot",
     "PostScheduler",
-    "RateLimiter"
+    "RateLimiter",
+    "RedisRateLimiter",
+    "MentionPipeline",
+    "MetricsPoller"
 ]
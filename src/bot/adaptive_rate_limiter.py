@@ -0,0 +1,264 @@
+"""
+Rate limiting adaptativo guiado pelos headers das plataformas
+
+As APIs informam a cota real em toda resposta (não só no 429):
+``x-rate-limit-limit/remaining/reset`` no Twitter, ``x-ratelimit-*`` na
+OpenAI e ``RateLimit-*`` (draft IETF) em outras. O ``AdaptiveRateLimiter``
+aprende essa cota por endpoint e por token e espaça as requisições de forma
+uniforme até o reset: nunca chega ao 429 e não fica ocioso com cota sobrando.
+
+O estado pode ser inspecionado (``snapshot``) e é persistido em JSON para
+sobreviver a restarts.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from ..utils.rate_limit_headers import parse_reset
+
+# Prefixos de header conhecidos, na ordem de preferência
+HEADER_PREFIXES = ("x-rate-limit-", "x-ratelimit-", "ratelimit-")
+
+# Espera de um 429 sem reset utilizável (sem headers, Retry-After inválido ou já vencido)
+DEFAULT_RETRY_AFTER = 60.0
+
+
+@dataclass
+class QuotaState:
+    """Cota conhecida de um endpoint/token"""
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: Optional[float] = None
+    last_request_at: float = 0.0
+    updated_at: float = 0.0
+
+
+def parse_rate_limit_headers(headers: Mapping[str, str], now: Optional[float] = None) -> Optional[QuotaState]:
+    """
+    Extrai limite, restante e reset dos headers de uma resposta
+
+    Args:
+        headers: Headers HTTP da resposta
+        now: Epoch atual (padrão: ``time.time()``)
+
+    Returns:
+        ``QuotaState`` ou None se a resposta não traz informação de cota
+    """
+    now = time.time() if now is None else now
+    lowered = {str(k).lower(): str(v) for k, v in headers.items()}
+
+    for prefix in HEADER_PREFIXES:
+        remaining = lowered.get(f"{prefix}remaining") or lowered.get(f"{prefix}remaining-requests")
+        if remaining is None:
+            continue
+
+        limit = lowered.get(f"{prefix}limit") or lowered.get(f"{prefix}limit-requests")
+        reset = lowered.get(f"{prefix}reset") or lowered.get(f"{prefix}reset-requests")
+        try:
+            return QuotaState(
+                limit=int(limit) if limit is not None else None,
+                remaining=int(remaining),
+                reset_at=parse_reset(reset, now) if reset is not None else None,
+                updated_at=now
+            )
+        except ValueError:
+            return None
+
+    return None
+
+
+def token_fingerprint(token: Optional[str]) -> str:
+    """Identifica um token sem armazená-lo em texto claro"""
+    if not token:
+        return "default"
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:12]
+
+
+class AdaptiveRateLimiter:
+    """
+    Rate limiter que aprende a cota real das respostas da API
+
+    Compatível com a interface do ``RateLimiter`` (a chave é o endpoint),
+    com um ``token`` opcional para separar cotas de contas diferentes.
+
+    Example:
+        >>> limiter = AdaptiveRateLimiter(state_path="data/rate_limits.json")
+        >>> await limiter.acquire("POST /2/tweets", token=bearer_token)
+        >>> response = await session.post(...)
+        >>> handle_api_response(response, "twitter", rate_limiter=limiter,
+        ...                     endpoint="POST /2/tweets", token=bearer_token)
+    """
+
+    def __init__(
+        self,
+        state_path: Optional[str] = None,
+        safety_margin: int = 1,
+        persist_interval: float = 5.0,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Inicializa o rate limiter adaptativo
+
+        Args:
+            state_path: Arquivo JSON para persistir o estado (opcional)
+            safety_margin: Requisições reservadas antes do reset
+            persist_interval: Intervalo mínimo entre gravações em disco
+            clock: Relógio em epoch (os resets das APIs são em epoch)
+        """
+        self.state_path = Path(state_path) if state_path else None
+        self.safety_margin = safety_margin
+        self.persist_interval = persist_interval
+        self.logger = logging.getLogger(__name__)
+
+        self._clock = clock
+        self._states: Dict[Tuple[str, str], QuotaState] = {}
+        self._last_persist = 0.0
+
+        if self.state_path and self.state_path.exists():
+            self.load()
+
+    def _state(self, endpoint: str, token: Optional[str]) -> QuotaState:
+        return self._states.setdefault((endpoint, token_fingerprint(token)), QuotaState())
+
+    def update_from_response(
+        self,
+        endpoint: str,
+        headers: Mapping[str, str],
+        status_code: int = 200,
+        token: Optional[str] = None
+    ) -> Optional[QuotaState]:
+        """
+        Atualiza a cota a partir de uma resposta (de sucesso ou erro)
+
+        Args:
+            endpoint: Identificador do endpoint (ex: ``POST /2/tweets``)
+            headers: Headers da resposta
+            status_code: Status HTTP
+            token: Token usado na requisição
+
+        Returns:
+            Estado atualizado ou None se a resposta não tinha cota
+        """
+        now = self._clock()
+        parsed = parse_rate_limit_headers(headers, now)
+        state = self._state(endpoint, token)
+
+        if parsed is None:
+            if status_code != 429:
+                return None
+            # 429 sem headers de cota: respeita Retry-After
+            retry_after = {k.lower(): v for k, v in headers.items()}.get("retry-after")
+            reset_at = parse_reset(str(retry_after), now) if retry_after is not None else None
+            parsed = QuotaState(remaining=0, reset_at=reset_at, updated_at=now)
+        elif status_code == 429:
+            parsed.remaining = 0
+
+        state.limit = parsed.limit if parsed.limit is not None else state.limit
+        state.remaining = parsed.remaining
+        state.reset_at = parsed.reset_at if parsed.reset_at is not None else state.reset_at
+        state.updated_at = now
+        if status_code == 429 and (state.reset_at is None or state.reset_at <= now):
+            # Sem reset utilizável o 429 liberaria a próxima requisição na hora
+            self.logger.warning(f"⚠️ 429 sem reset válido em {endpoint}; aguardando {DEFAULT_RETRY_AFTER:.0f}s")
+            state.reset_at = now + DEFAULT_RETRY_AFTER
+
+        self._maybe_persist()
+        return state
+
+    def _reset_if_expired(self, state: QuotaState, now: float) -> None:
+        if state.reset_at is not None and now >= state.reset_at:
+            # Janela nova: até a próxima resposta a cota é desconhecida
+            state.remaining = None
+            state.reset_at = None
+
+    def _wait_time(self, state: QuotaState, now: float) -> float:
+        self._reset_if_expired(state, now)
+        if state.remaining is None or state.reset_at is None:
+            return 0.0
+
+        until_reset = state.reset_at - now
+        usable = state.remaining - self.safety_margin
+        if usable <= 0:
+            return max(until_reset, 0.0)
+
+        # Espaça a cota restante uniformemente até o reset
+        interval = until_reset / usable
+        return max(state.last_request_at + interval - now, 0.0)
+
+    async def can_make_request(self, key: str = "default", token: Optional[str] = None) -> bool:
+        """Verifica se o ritmo atual permite uma requisição agora"""
+        return await self.get_wait_time(key, token) == 0
+
+    async def record_request(self, key: str = "default", token: Optional[str] = None) -> None:
+        """Registra uma requisição feita (decrementa a cota de forma otimista)"""
+        state = self._state(key, token)
+        state.last_request_at = self._clock()
+        if state.remaining is not None:
+            state.remaining = max(state.remaining - 1, 0)
+
+    async def get_wait_time(self, key: str = "default", token: Optional[str] = None) -> float:
+        """Segundos até a próxima requisição segundo o ritmo aprendido"""
+        return self._wait_time(self._state(key, token), self._clock())
+
+    async def acquire(self, key: str = "default", token: Optional[str] = None) -> None:
+        """Aguarda a vez da requisição e a registra"""
+        while True:
+            wait = await self.get_wait_time(key, token)
+            if wait == 0:
+                break
+            await asyncio.sleep(wait)
+        await self.record_request(key, token)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Estado atual de todas as cotas (para métricas e dashboard)"""
+        now = self._clock()
+        return {
+            f"{endpoint}|{token}": {
+                **asdict(state),
+                "seconds_to_reset": max(state.reset_at - now, 0.0) if state.reset_at else None,
+                "wait_time": self._wait_time(state, now)
+            }
+            for (endpoint, token), state in self._states.items()
+        }
+
+    def _maybe_persist(self) -> None:
+        if self.state_path is None:
+            return
+        if self._clock() - self._last_persist >= self.persist_interval:
+            self.save()
+
+    def save(self) -> None:
+        """Grava o estado em disco (escrita atômica via arquivo temporário)"""
+        if self.state_path is None:
+            return
+
+        payload = {
+            f"{endpoint}|{token}": asdict(state)
+            for (endpoint, token), state in self._states.items()
+        }
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.state_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(payload), encoding="utf-8")
+        temp_path.replace(self.state_path)
+        self._last_persist = self._clock()
+
+    def load(self) -> None:
+        """Carrega o estado salvo, descartando janelas já expiradas"""
+        try:
+            payload = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"⚠️ Não foi possível carregar estado de rate limit: {e}")
+            return
+
+        now = self._clock()
+        for key, data in payload.items():
+            endpoint, _, token = key.rpartition("|")
+            state = QuotaState(**data)
+            self._reset_if_expired(state, now)
+            self._states[(endpoint, token)] = state
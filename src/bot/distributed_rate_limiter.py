@@ -0,0 +1,294 @@
+"""
+Rate limiter distribuído (Redis + Lua) do SocialBot AI
+
+Várias réplicas do bot usando a mesma conta compartilham o limite através
+do Redis. Cada verificação-e-consumo é um único script Lua, executado de
+forma atômica pelo servidor, sem locks no cliente. O relógio usado é o do
+próprio Redis (``TIME``), então diferenças de relógio entre réplicas não
+afetam o limite.
+
+Modos:
+- ``sliding_window``: log de timestamps em um sorted set (limite exato)
+- ``gcra``: Generic Cell Rate Algorithm, um único valor por chave
+  (memória O(1), espaça as requisições uniformemente com rajada máxima
+  igual a ``max_requests``)
+
+Se o Redis estiver inacessível, o limiter cai para o ``RateLimiter`` local
+e volta a usar o Redis assim que ele responder novamente.
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import Any, Optional, Tuple
+
+from .rate_limiter import RateLimiter
+
+try:
+    from redis.exceptions import ConnectionError as RedisConnectionError
+    from redis.exceptions import TimeoutError as RedisTimeoutError
+    REDIS_UNAVAILABLE_ERRORS: Tuple[type, ...] = (
+        RedisConnectionError, RedisTimeoutError, ConnectionError, OSError, asyncio.TimeoutError
+    )
+except ImportError:
+    REDIS_UNAVAILABLE_ERRORS = (ConnectionError, OSError, asyncio.TimeoutError)
+
+MODE_SLIDING_WINDOW = "sliding_window"
+MODE_GCRA = "gcra"
+
+# Operações dos scripts: só verificar, verificar e consumir, registrar sempre
+OP_CHECK = 0
+OP_ACQUIRE = 1
+OP_RECORD = 2
+
+# Retorna {permitido (0/1), espera em ms}
+SLIDING_WINDOW_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local op = tonumber(ARGV[3])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+
+if op == 2 or (op == 1 and count < limit) then
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return {1, 0}
+end
+
+if count < limit then
+    return {1, 0}
+end
+
+local blocking = redis.call('ZRANGE', KEYS[1], count - limit, count - limit, 'WITHSCORES')
+return {0, math.max(tonumber(blocking[2]) + window - now, 1)}
+"""
+
+# TAT = theoretical arrival time; tolerância = intervalo * (limite - 1)
+GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local op = tonumber(ARGV[3])
+
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+    tat = now
+end
+
+local allow_at = tat - tolerance
+if op ~= 2 and now < allow_at then
+    return {0, math.max(math.ceil(allow_at - now), 1)}
+end
+
+if op ~= 0 then
+    local new_tat = tat + interval
+    redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now) + 1)
+end
+return {1, 0}
+"""
+
+
+class RedisRateLimiter:
+    """
+    Rate limiter compartilhado entre réplicas via Redis
+
+    Mantém a mesma interface do ``RateLimiter`` local.
+
+    Example:
+        >>> limiter = RedisRateLimiter(
+        ...     max_requests=config.twitter.rate_limit_posts_per_hour,
+        ...     time_window=3600,
+        ...     redis_url=config.database.redis_url
+        ... )
+        >>> await limiter.acquire("twitter_post")
+    """
+
+    def __init__(
+        self,
+        max_requests: int,
+        time_window: float,
+        redis_url: str = "redis://localhost:6379/0",
+        mode: str = MODE_SLIDING_WINDOW,
+        prefix: str = "socialbot:ratelimit",
+        client: Any = None,
+        fallback: Optional[RateLimiter] = None
+    ):
+        """
+        Inicializa o rate limiter distribuído
+
+        Args:
+            max_requests: Máximo de requisições dentro da janela
+            time_window: Tamanho da janela em segundos
+            redis_url: URL do Redis (``DatabaseConfig.redis_url``)
+            mode: ``sliding_window`` ou ``gcra``
+            prefix: Prefixo das chaves no Redis
+            client: Cliente ``redis.asyncio`` já criado (opcional)
+            fallback: Limiter local usado se o Redis cair
+        """
+        if mode not in (MODE_SLIDING_WINDOW, MODE_GCRA):
+            raise ValueError(f"Modo de rate limit inválido: {mode}")
+        if max_requests < 1:
+            raise ValueError("max_requests deve ser >= 1")
+
+        self.max_requests = max_requests
+        self.time_window = time_window
+        self.redis_url = redis_url
+        self.mode = mode
+        self.prefix = prefix
+        self.fallback = fallback or RateLimiter(max_requests, time_window)
+        self.using_fallback = False
+        self.logger = logging.getLogger(__name__)
+
+        self._client = client
+        self._script = None
+
+    @property
+    def client(self) -> Any:
+        """Cliente Redis criado sob demanda"""
+        if self._client is None:
+            import redis.asyncio as aioredis
+            self._client = aioredis.from_url(self.redis_url)
+        return self._client
+
+    def _script_args(self, op: int) -> list:
+        window_ms = int(self.time_window * 1000)
+        if self.mode == MODE_GCRA:
+            interval = window_ms / self.max_requests
+            return [interval, interval * (self.max_requests - 1), op]
+        return [window_ms, self.max_requests, op, uuid.uuid4().hex]
+
+    async def _run(self, key: str, op: int) -> Optional[Tuple[bool, float]]:
+        """
+        Executa o script no Redis
+
+        Returns:
+            ``(permitido, espera em segundos)`` ou None se o Redis falhou
+        """
+        try:
+            if self._script is None:
+                source = GCRA_SCRIPT if self.mode == MODE_GCRA else SLIDING_WINDOW_SCRIPT
+                self._script = self.client.register_script(source)
+
+            allowed, wait_ms = await self._script(
+                keys=[f"{self.prefix}:{self.mode}:{key}"],
+                args=self._script_args(op)
+            )
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            self._use_fallback(e)
+            return None
+
+        if self.using_fallback:
+            self.using_fallback = False
+            self.logger.info("✅ Redis disponível novamente para rate limiting")
+        return bool(int(allowed)), int(wait_ms) / 1000
+
+    def _use_fallback(self, error: Exception) -> None:
+        if not self.using_fallback:
+            self.logger.warning(f"⚠️ Redis inacessível, usando rate limiter local: {error}")
+        self.using_fallback = True
+
+    async def can_make_request(self, key: str = "default") -> bool:
+        """Verifica se uma requisição pode ser feita agora"""
+        result = await self._run(key, OP_CHECK)
+        if result is None:
+            return await self.fallback.can_make_request(key)
+        return result[0]
+
+    async def record_request(self, key: str = "default") -> None:
+        """Registra uma requisição feita"""
+        if await self._run(key, OP_RECORD) is None:
+            await self.fallback.record_request(key)
+
+    async def get_wait_time(self, key: str = "default") -> float:
+        """Segundos até a próxima requisição permitida (0 se já pode)"""
+        result = await self._run(key, OP_CHECK)
+        if result is None:
+            return await self.fallback.get_wait_time(key)
+        return result[1]
+
+    async def try_acquire(self, key: str = "default") -> float:
+        """
+        Verifica e consome uma requisição em uma única ida ao Redis
+
+        Returns:
+            0 se a requisição foi consumida, senão os segundos de espera
+        """
+        result = await self._run(key, OP_ACQUIRE)
+        if result is None:
+            return await self.fallback.try_acquire(key)
+        return 0.0 if result[0] else result[1]
+
+    async def acquire(self, key: str = "default", timeout: Optional[float] = None) -> None:
+        """
+        Aguarda até que uma requisição seja permitida e a consome
+
+        O script devolve o tempo exato até a liberação, então cada espera é
+        um único ``sleep`` em vez de polling.
+
+        Raises:
+            asyncio.TimeoutError: Se o timeout expirar antes da liberação
+        """
+        async def wait_for_slot() -> None:
+            while True:
+                wait = await self.try_acquire(key)
+                if wait == 0:
+                    return
+                await asyncio.sleep(wait)
+
+        await asyncio.wait_for(wait_for_slot(), timeout)
+
+    def update_limits(self, max_requests: int, time_window: Optional[float] = None) -> None:
+        """
+        Altera o limite (vale a partir da próxima chamada ao script)
+
+        O estado no Redis é mantido; o limiter local de fallback também é
+        atualizado.
+        """
+        if max_requests < 1:
+            raise ValueError("max_requests deve ser >= 1")
+        self.max_requests = max_requests
+        if time_window is not None:
+            self.time_window = time_window
+        self.fallback.update_limits(max_requests, time_window)
+
+
+def build_rate_limiter(config: Any, platform: str, time_window: float = 3600) -> Any:
+    """
+    Cria o rate limiter de publicação de uma plataforma
+
+    Usa ``RedisRateLimiter`` quando ``RATE_LIMIT_BACKEND=redis`` e o
+    ``RateLimiter`` local caso contrário.
+
+    Args:
+        config: Instância de ``Config``
+        platform: ``twitter``, ``instagram`` ou ``linkedin``
+        time_window: Janela em segundos (os limites do .env são por hora)
+    """
+    max_requests = getattr(config, platform).rate_limit_posts_per_hour
+
+    if config.rate_limit_backend == "redis":
+        return RedisRateLimiter(
+            max_requests=max_requests,
+            time_window=time_window,
+            redis_url=config.database.redis_url,
+            mode=config.rate_limit_mode,
+            prefix=f"socialbot:ratelimit:{platform}"
+        )
+    return RateLimiter(max_requests, time_window)
+
+
+def rate_limit_subscriber(limiter: Any, platform: str, time_window: Optional[float] = None):
+    """
+    Callback para o ``ConfigManager`` que aplica o novo limite da plataforma
+
+    Example:
+        >>> manager.subscribe(rate_limit_subscriber(limiter, "twitter"), sections=("twitter",))
+    """
+    def apply(snapshot: Any) -> None:
+        limiter.update_limits(getattr(snapshot.config, platform).rate_limit_posts_per_hour, time_window)
+
+    return apply
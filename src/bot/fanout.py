@@ -0,0 +1,216 @@
+"""
+Publicação paralela em múltiplas plataformas (fan-out)
+
+Motor usado por ``SocialBot.post_to_platforms`` para publicar o mesmo
+conteúdo em Twitter, Instagram e LinkedIn ao mesmo tempo, em vez de um
+loop serial. Cada plataforma tem seu próprio semáforo de concorrência, a
+chamada inteira respeita um deadline e o resultado é parcial: uma
+plataforma que falha ou estoura o prazo não derruba as demais.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+PlatformPoster = Callable[[str], Awaitable[Dict[str, Any]]]
+
+
+@dataclass
+class PlatformResult:
+    """Resultado da publicação em uma plataforma"""
+    platform: str
+    success: bool
+    data: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    latency_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Entrada de ``results`` no formato de ``post_to_platforms``"""
+        entry = dict(self.data)
+        entry["success"] = self.success
+        entry["latency_ms"] = round(self.latency_ms, 2)
+        if self.error:
+            entry["error"] = self.error
+        return entry
+
+
+class FanOutEngine:
+    """
+    Publica em várias plataformas concorrentemente
+
+    Example:
+        >>> engine = FanOutEngine({"twitter": twitter_bot.post_tweet})
+        >>> result = await engine.post("Olá mundo! 🤖", ["twitter"], deadline=10)
+    """
+
+    def __init__(
+        self,
+        posters: Dict[str, PlatformPoster],
+        concurrency: Optional[Dict[str, int]] = None,
+        default_concurrency: int = 1
+    ):
+        """
+        Inicializa o motor de fan-out
+
+        Args:
+            posters: Mapa ``plataforma -> corrotina(content) -> dict``
+            concurrency: Limite de publicações simultâneas por plataforma
+            default_concurrency: Limite para plataformas fora de ``concurrency``
+        """
+        self.posters = posters
+        self.logger = logging.getLogger(__name__)
+        concurrency = concurrency or {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {
+            platform: asyncio.Semaphore(concurrency.get(platform, default_concurrency))
+            for platform in posters
+        }
+
+    async def _post_one(self, platform: str, content: str) -> PlatformResult:
+        """Publica em uma plataforma, convertendo falhas em resultado"""
+        poster = self.posters.get(platform)
+        if poster is None:
+            return PlatformResult(platform, False, error="Plataforma não configurada")
+
+        start = time.perf_counter()
+        try:
+            async with self._semaphores[platform]:
+                data = await poster(content)
+            return PlatformResult(
+                platform,
+                True,
+                data=data or {},
+                latency_ms=(time.perf_counter() - start) * 1000
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"❌ Erro ao publicar no {platform}: {e}")
+            return PlatformResult(
+                platform,
+                False,
+                error=str(e),
+                latency_ms=(time.perf_counter() - start) * 1000
+            )
+
+    def _timeout_result(self, platform: str, start: float) -> PlatformResult:
+        return PlatformResult(
+            platform,
+            False,
+            error="Deadline excedido",
+            latency_ms=(time.perf_counter() - start) * 1000
+        )
+
+    async def _run_all(
+        self,
+        content: str,
+        platforms: List[str],
+        deadline: Optional[float],
+        on_result: Callable[[PlatformResult], None]
+    ) -> None:
+        """Publica em todas as plataformas (TaskGroup) e entrega cada resultado ao terminar"""
+        async def run(platform: str) -> None:
+            on_result(await self._post_one(platform, content))
+
+        try:
+            async with asyncio.timeout(deadline):
+                async with asyncio.TaskGroup() as group:
+                    for platform in platforms:
+                        group.create_task(run(platform))
+        except TimeoutError:
+            self.logger.warning(f"⏱️ Deadline de {deadline}s excedido no fan-out")
+
+    async def post(
+        self,
+        content: str,
+        platforms: List[str],
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Publica em todas as plataformas e agrega os resultados
+
+        Args:
+            content: Texto a publicar
+            platforms: Plataformas de destino
+            deadline: Tempo máximo (segundos) da chamada inteira
+
+        Returns:
+            ``{"success", "partial", "results", "failed"}`` onde ``success``
+            indica que todas as plataformas publicaram e ``partial`` que
+            apenas algumas publicaram
+        """
+        platforms = list(dict.fromkeys(platforms))
+        results: Dict[str, PlatformResult] = {}
+        start = time.perf_counter()
+
+        def collect(result: PlatformResult) -> None:
+            results[result.platform] = result
+
+        await self._run_all(content, platforms, deadline, collect)
+
+        for platform in platforms:
+            if platform not in results:
+                results[platform] = self._timeout_result(platform, start)
+
+        return self._aggregate(platforms, results)
+
+    async def stream(
+        self,
+        content: str,
+        platforms: List[str],
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[PlatformResult]:
+        """
+        Publica em todas as plataformas entregando cada resultado ao terminar
+
+        Plataformas que não terminam dentro do deadline são canceladas e
+        entregues por último como falha. Se o consumidor parar antes do fim
+        (``break``, ``aclose`` ou cancelamento), as publicações em andamento
+        são canceladas e aguardadas.
+
+        Args:
+            content: Texto a publicar
+            platforms: Plataformas de destino
+            deadline: Tempo máximo (segundos) da chamada inteira
+
+        Yields:
+            ``PlatformResult`` na ordem de conclusão
+        """
+        platforms = list(dict.fromkeys(platforms))
+        start = time.perf_counter()
+        finished: "asyncio.Queue[Optional[PlatformResult]]" = asyncio.Queue()
+
+        async def run_all() -> None:
+            try:
+                await self._run_all(content, platforms, deadline, finished.put_nowait)
+            finally:
+                finished.put_nowait(None)  # Fim: o que faltou estourou o deadline
+
+        # O TaskGroup roda numa task própria: um yield dentro dele quebraria
+        # o aclose do gerador
+        runner = asyncio.ensure_future(run_all())
+        delivered = set()
+        try:
+            while (result := await finished.get()) is not None:
+                delivered.add(result.platform)
+                yield result
+        finally:
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+
+        for platform in platforms:
+            if platform not in delivered:
+                yield self._timeout_result(platform, start)
+
+    @staticmethod
+    def _aggregate(platforms: List[str], results: Dict[str, PlatformResult]) -> Dict[str, Any]:
+        succeeded = [p for p in platforms if results[p].success]
+        failed = [p for p in platforms if not results[p].success]
+
+        return {
+            "success": bool(platforms) and not failed,
+            "partial": bool(succeeded) and bool(failed),
+            "results": {p: results[p].to_dict() for p in platforms},
+            "failed": failed
+        }
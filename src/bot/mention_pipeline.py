@@ -0,0 +1,661 @@
+"""
+Pipeline contínuo de ingestão e resposta de menções
+
+Substitui o laço serial "busca menções -> gera resposta -> publica" por
+estágios ligados por filas ``asyncio.Queue`` limitadas:
+
+    fetch -> dedupe -> sentimento (lote) -> geração da resposta -> publicação
+
+Cada estágio tem sua concorrência e suas métricas. Como as filas são
+limitadas, um estágio de IA lento faz os anteriores esperarem
+(``blocked_seconds``) em vez de acumular menções na memória; o fetch só
+volta a paginar quando há espaço.
+
+Respostas exatamente uma vez, mesmo com restarts, vêm do ``MentionLedger``
+(tabelas no ``DatabaseConfig.url``):
+
+- cada menção recebida ganha uma linha ``received``;
+- antes de publicar, a linha passa atomicamente para ``posting`` (com o texto
+  da resposta) e só depois da publicação para ``replied``;
+- o ``since_id`` salvo só avança até a menção mais antiga ainda não resolvida,
+  então um restart busca de novo tudo que estava no meio do caminho, e o
+  dedupe descarta o que já tinha sido resolvido;
+- uma linha presa em ``posting`` (crash durante a publicação) é conferida na
+  plataforma pelo ``verifier``; sem ele vira ``unknown`` e não é republicada.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import (
+    Column,
+    Float,
+    MetaData,
+    String,
+    Table,
+    Text,
+    create_engine,
+    select,
+    update
+)
+from sqlalchemy.engine import Engine
+
+STATUS_RECEIVED = "received"
+STATUS_POSTING = "posting"
+STATUS_REPLIED = "replied"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+STATUS_UNKNOWN = "unknown"
+
+metadata = MetaData()
+
+mention_checkpoints_table = Table(
+    "mention_checkpoints",
+    metadata,
+    Column("source", String(128), primary_key=True),
+    Column("since_id", String(64), nullable=False),
+    Column("updated_ts", Float, nullable=False)
+)
+
+mention_replies_table = Table(
+    "mention_replies",
+    metadata,
+    Column("source", String(128), primary_key=True),
+    Column("mention_id", String(64), primary_key=True),
+    Column("status", String(16), nullable=False, default=STATUS_RECEIVED),
+    Column("reply_text", Text, nullable=True),
+    Column("reply_id", String(64), nullable=True),
+    Column("updated_ts", Float, nullable=False)
+)
+
+# (since_id, pagination_token) -> (menções da página, próximo token)
+MentionFetcher = Callable[[Optional[str], Optional[str]], Awaitable[Tuple[List[Any], Optional[str]]]]
+# Menção -> texto da resposta (None para não responder)
+ReplyGenerator = Callable[["Mention"], Awaitable[Optional[str]]]
+# (menção, texto) -> id da resposta publicada
+ReplyPoster = Callable[["Mention", str], Awaitable[Optional[str]]]
+# Menção -> id de uma resposta nossa já publicada (None se não houver)
+ReplyVerifier = Callable[["Mention"], Awaitable[Optional[str]]]
+
+
+def mention_sort_key(mention_id: str) -> Tuple[int, Any]:
+    """Ordem cronológica dos ids (numérica para snowflakes do Twitter)"""
+    return (0, int(mention_id)) if mention_id.isdigit() else (1, mention_id)
+
+
+@dataclass
+class Mention:
+    """Menção em processamento"""
+    id: str
+    text: str
+    author: str = ""
+    platform: str = "twitter"
+    raw: Dict[str, Any] = field(default_factory=dict)
+    sentiment: Optional[Dict[str, Any]] = None
+    reply: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Any, platform: str = "twitter") -> "Mention":
+        """Converte o dict retornado por ``get_mentions`` (ou devolve a própria ``Mention``)"""
+        if isinstance(data, Mention):
+            return data
+        author = data.get("author_id") or data.get("username") or data.get("author") or ""
+        return cls(id=str(data["id"]), text=data.get("text", ""), author=str(author), platform=platform, raw=data)
+
+
+class MentionLedger:
+    """
+    Checkpoint de ``since_id`` e estado de resposta de cada menção
+
+    Example:
+        >>> ledger = MentionLedger(config.database.url)
+        >>> ledger.claim("twitter", "1790", "Obrigado!")
+        True
+        >>> ledger.complete("twitter", "1790", STATUS_REPLIED, reply_id="1791")
+    """
+
+    def __init__(self, database_url: str = "sqlite:///socialbot.db", engine: Optional[Engine] = None):
+        """
+        Inicializa o ledger
+
+        Args:
+            database_url: URL do banco (``DatabaseConfig.url``)
+            engine: Engine SQLAlchemy já criada (opcional)
+        """
+        self.engine = engine or create_engine(database_url)
+        metadata.create_all(self.engine)
+
+    def checkpoint(self, source: str) -> Optional[str]:
+        """``since_id`` salvo para a fonte (None se nunca salvo)"""
+        query = select(mention_checkpoints_table.c.since_id).where(mention_checkpoints_table.c.source == source)
+        with self.engine.connect() as connection:
+            return connection.execute(query).scalar()
+
+    def save_checkpoint(self, source: str, since_id: str) -> None:
+        table = mention_checkpoints_table
+        with self.engine.begin() as connection:
+            result = connection.execute(
+                update(table).where(table.c.source == source).values(since_id=since_id, updated_ts=time.time())
+            )
+            if result.rowcount == 0:
+                connection.execute(table.insert(), {"source": source, "since_id": since_id, "updated_ts": time.time()})
+
+    def statuses(self, source: str, mention_ids: List[str]) -> Dict[str, str]:
+        """Estado das menções já registradas (ausentes não aparecem)"""
+        table = mention_replies_table
+        found: Dict[str, str] = {}
+        with self.engine.connect() as connection:
+            # Lotes limitados para não estourar o máximo de parâmetros do SQLite
+            for start in range(0, len(mention_ids), 500):
+                query = select(table.c.mention_id, table.c.status).where(
+                    table.c.source == source, table.c.mention_id.in_(mention_ids[start:start + 500])
+                )
+                found.update({row.mention_id: row.status for row in connection.execute(query)})
+        return found
+
+    def record_received(self, source: str, mention_ids: Iterable[str]) -> None:
+        """Registra menções novas como ``received``"""
+        now = time.time()
+        rows = [
+            {"source": source, "mention_id": mention_id, "status": STATUS_RECEIVED, "updated_ts": now}
+            for mention_id in mention_ids
+        ]
+        if rows:
+            with self.engine.begin() as connection:
+                connection.execute(mention_replies_table.insert(), rows)
+
+    def reply_text(self, source: str, mention_id: str) -> Optional[str]:
+        table = mention_replies_table
+        query = select(table.c.reply_text).where(table.c.source == source, table.c.mention_id == mention_id)
+        with self.engine.connect() as connection:
+            return connection.execute(query).scalar()
+
+    def _transition(self, source: str, mention_id: str, expected: Optional[str], **values: Any) -> bool:
+        table = mention_replies_table
+        condition = [table.c.source == source, table.c.mention_id == mention_id]
+        if expected is not None:
+            condition.append(table.c.status == expected)
+        with self.engine.begin() as connection:
+            result = connection.execute(update(table).where(*condition).values(updated_ts=time.time(), **values))
+        return result.rowcount == 1
+
+    def claim(self, source: str, mention_id: str, reply_text: str) -> bool:
+        """
+        Reserva a publicação da resposta (``received`` -> ``posting``)
+
+        Returns:
+            False se a menção não estava ``received`` (já publicada ou em publicação)
+        """
+        return self._transition(source, mention_id, STATUS_RECEIVED, status=STATUS_POSTING, reply_text=reply_text)
+
+    def release(self, source: str, mention_id: str) -> bool:
+        """Devolve uma menção ``posting`` sem resposta publicada para ``received``"""
+        return self._transition(source, mention_id, STATUS_POSTING, status=STATUS_RECEIVED)
+
+    def complete(self, source: str, mention_id: str, status: str, reply_id: Optional[str] = None) -> None:
+        """Registra o estado final da menção"""
+        self._transition(source, mention_id, None, status=status, reply_id=reply_id)
+
+
+@dataclass
+class StageMetrics:
+    """Contadores de um estágio"""
+    name: str
+    concurrency: int
+    processed: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    busy_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+    queue: Optional[asyncio.Queue] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "processed": self.processed,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "avg_ms": round(self.busy_seconds / self.processed * 1000, 2) if self.processed else 0.0,
+            "blocked_seconds": round(self.blocked_seconds, 3)
+        }
+
+
+class MentionPipeline:
+    """
+    Ingestão contínua de menções com filas limitadas e checkpoint
+
+    Example:
+        >>> pipeline = MentionPipeline(
+        ...     "twitter", fetcher=fetch_page, reply_generator=make_reply,
+        ...     poster=post_reply, ledger=MentionLedger(config.database.url),
+        ...     analyzer=sentiment_analyzer
+        ... )
+        >>> await pipeline.start()
+        >>> ...
+        >>> await pipeline.stop()
+    """
+
+    def __init__(
+        self,
+        source: str,
+        fetcher: MentionFetcher,
+        reply_generator: ReplyGenerator,
+        poster: ReplyPoster,
+        ledger: MentionLedger,
+        analyzer: Any = None,
+        verifier: Optional[ReplyVerifier] = None,
+        poll_interval: float = 60.0,
+        queue_size: int = 100,
+        batch_size: int = 32,
+        reply_concurrency: int = 4,
+        post_concurrency: int = 2,
+        checkpoint_interval: float = 1.0
+    ):
+        """
+        Inicializa o pipeline
+
+        Args:
+            source: Nome da fonte no ledger (ex: ``"twitter:minha_conta"``)
+            fetcher: Busca uma página de menções mais novas que ``since_id``
+            reply_generator: Gera a resposta (None = não responder)
+            poster: Publica a resposta e devolve o id dela
+            ledger: Checkpoint e estado das respostas
+            analyzer: ``SentimentAnalyzer`` (ou remoto) com ``analyze_batch``
+            verifier: Confere na plataforma se a menção já foi respondida
+            poll_interval: Intervalo entre buscas, em segundos
+            queue_size: Capacidade de cada fila entre estágios
+            batch_size: Menções por lote no dedupe e no sentimento
+            reply_concurrency: Gerações de resposta simultâneas
+            post_concurrency: Publicações simultâneas
+            checkpoint_interval: Intervalo mínimo entre gravações do ``since_id``
+        """
+        self.source = source
+        self.fetcher = fetcher
+        self.reply_generator = reply_generator
+        self.poster = poster
+        self.ledger = ledger
+        self.analyzer = analyzer
+        self.verifier = verifier
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.checkpoint_interval = checkpoint_interval
+        self.logger = logging.getLogger(__name__)
+
+        self._dedupe_queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self._sentiment_queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self._reply_queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self._post_queue: asyncio.Queue = asyncio.Queue(queue_size)
+
+        self.stages: Dict[str, StageMetrics] = {
+            "fetch": StageMetrics("fetch", 1),
+            "dedupe": StageMetrics("dedupe", 1, queue=self._dedupe_queue),
+            "sentiment": StageMetrics("sentiment", 1, queue=self._sentiment_queue),
+            "reply": StageMetrics("reply", reply_concurrency, queue=self._reply_queue),
+            "post": StageMetrics("post", post_concurrency, queue=self._post_queue)
+        }
+
+        # Menções buscadas e ainda não resolvidas, na ordem cronológica
+        self._outstanding: Dict[str, bool] = {}
+        self._fetch_cursor: Optional[str] = None
+        self._refetch_ids: set = set()  # Pendentes que falharam e devem voltar na próxima busca
+        self._checkpoint: Optional[str] = None
+        self._saved_checkpoint: Optional[str] = None
+        self._last_save = 0.0
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Any,
+        source: str,
+        fetcher: MentionFetcher,
+        reply_generator: ReplyGenerator,
+        poster: ReplyPoster,
+        **kwargs: Any
+    ) -> "MentionPipeline":
+        """Cria o pipeline com o ledger no banco e os limites do ``Config``"""
+        options = {
+            "poll_interval": config.mention_poll_interval,
+            "queue_size": config.mention_queue_size,
+            "reply_concurrency": config.mention_reply_concurrency,
+            "post_concurrency": config.mention_post_concurrency
+        }
+        options.update(kwargs)
+        return cls(
+            source, fetcher, reply_generator, poster,
+            ledger=MentionLedger(config.database.url),
+            **options
+        )
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Carrega o checkpoint e inicia todos os estágios"""
+        self._checkpoint = self._saved_checkpoint = self._fetch_cursor = self.ledger.checkpoint(self.source)
+        if self._checkpoint:
+            self.logger.info(f"📥 Retomando menções de {self.source} após {self._checkpoint}")
+
+        workers = [
+            ("fetch", self._fetch_loop, 1),
+            ("dedupe", self._dedupe_worker, 1),
+            ("sentiment", self._sentiment_worker, 1),
+            ("reply", self._reply_worker, self.stages["reply"].concurrency),
+            ("post", self._post_worker, self.stages["post"].concurrency)
+        ]
+        for name, worker, count in workers:
+            for index in range(count):
+                self._tasks.append(asyncio.create_task(worker(), name=f"mentions-{name}-{index}"))
+
+    async def join(self) -> None:
+        """Espera as filas esvaziarem, estágio por estágio"""
+        for queue in (self._dedupe_queue, self._sentiment_queue, self._reply_queue, self._post_queue):
+            await queue.join()
+
+    async def stop(self, drain: bool = True, timeout: float = 30.0) -> None:
+        """
+        Para o pipeline
+
+        Args:
+            drain: Termina de processar as menções já buscadas antes de parar
+            timeout: Espera máxima pelo dreno, em segundos
+        """
+        fetch = self._tasks[0] if self._tasks else None
+        if fetch is not None:
+            fetch.cancel()
+        if drain:
+            try:
+                await asyncio.wait_for(self.join(), timeout)
+            except asyncio.TimeoutError:
+                self.logger.warning(f"⚠️ Pipeline de menções parado com itens pendentes ({self.source})")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._save_checkpoint(force=True)
+
+    def poll_now(self) -> None:
+        """Antecipa a próxima busca"""
+        self._wakeup.set()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Métricas por estágio e checkpoint atual"""
+        return {
+            "source": self.source,
+            "checkpoint": self._checkpoint,
+            "outstanding": len(self._outstanding),
+            "stages": {name: stage.to_dict() for name, stage in self.stages.items()}
+        }
+
+    # ------------------------------------------------------------------
+    # Checkpoint
+    # ------------------------------------------------------------------
+
+    def _resolve(self, mention: Mention) -> None:
+        """Marca a menção como resolvida e avança o ``since_id`` se possível"""
+        if mention.id in self._outstanding:
+            self._outstanding[mention.id] = True
+        while self._outstanding:
+            oldest = next(iter(self._outstanding))
+            if not self._outstanding[oldest]:
+                break
+            del self._outstanding[oldest]
+            self._checkpoint = oldest
+        self._save_checkpoint()
+
+    def _refetch(self, stage: StageMetrics, mentions: List[Mention], error: Exception) -> None:
+        """
+        Falha transitória (ex: banco travado): busca as menções de novo
+
+        Elas continuam pendentes (o ``since_id`` não passa delas) e o cursor
+        de busca volta para antes da mais antiga, então a próxima busca as
+        traz de novo e o dedupe decide pelo estado no ledger (``posting``
+        passa pela verificação). Sem isso ficariam pendentes para sempre e o
+        ``since_id`` pararia de avançar.
+        """
+        stage.failed += len(mentions)
+        self.logger.error(f"❌ Erro no ledger de menções ({stage.name}): {error}; serão buscadas de novo")
+        oldest = min(mention_sort_key(mention.id) for mention in mentions)
+        self._refetch_ids.update(mention.id for mention in mentions)
+
+        cursor = self._checkpoint
+        for mention_id in self._outstanding:  # Ordem cronológica
+            if mention_sort_key(mention_id) >= oldest:
+                break
+            cursor = mention_id
+        if self._fetch_cursor is not None and (cursor is None or mention_sort_key(cursor) < mention_sort_key(self._fetch_cursor)):
+            self._fetch_cursor = cursor
+
+    def _save_checkpoint(self, force: bool = False) -> None:
+        if self._checkpoint is None or self._checkpoint == self._saved_checkpoint:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_save < self.checkpoint_interval:
+            return
+        try:
+            self.ledger.save_checkpoint(self.source, self._checkpoint)
+        except Exception as e:
+            # Tentado de novo na próxima resolução (ou no stop)
+            self.logger.warning(f"⚠️ Erro ao salvar o checkpoint de menções ({self.source}): {e}")
+            return
+        self._saved_checkpoint = self._checkpoint
+        self._last_save = now
+
+    # ------------------------------------------------------------------
+    # Estágios
+    # ------------------------------------------------------------------
+
+    async def _forward(self, stage: StageMetrics, queue: asyncio.Queue, mention: Mention) -> None:
+        """Entrega ao próximo estágio; o tempo esperando por espaço é a pressão de volta"""
+        if queue.full():
+            start = time.perf_counter()
+            await queue.put(mention)
+            stage.blocked_seconds += time.perf_counter() - start
+        else:
+            queue.put_nowait(mention)
+
+    @staticmethod
+    async def _take_batch(queue: asyncio.Queue, size: int) -> List[Mention]:
+        batch = [await queue.get()]
+        while len(batch) < size and not queue.empty():
+            batch.append(queue.get_nowait())
+        return batch
+
+    async def poll_once(self) -> int:
+        """
+        Busca todas as páginas de menções novas e as envia ao pipeline
+
+        Returns:
+            Quantidade de menções buscadas
+        """
+        stage = self.stages["fetch"]
+        start = time.perf_counter()
+        mentions: List[Mention] = []
+        token: Optional[str] = None
+        try:
+            while True:
+                page, token = await self.fetcher(self._fetch_cursor, token)
+                mentions.extend(Mention.from_dict(item) for item in page)
+                if not token:
+                    break
+        except Exception as e:
+            # Páginas parciais são descartadas: o cursor não pode pular as mais antigas
+            stage.failed += 1
+            self.logger.error(f"❌ Erro ao buscar menções de {self.source}: {e}")
+            return 0
+        finally:
+            stage.busy_seconds += time.perf_counter() - start
+
+        cursor_key = mention_sort_key(self._fetch_cursor) if self._fetch_cursor else None
+        fresh = {
+            mention.id: mention for mention in mentions
+            if (mention.id not in self._outstanding or mention.id in self._refetch_ids)
+            and (cursor_key is None or mention_sort_key(mention.id) > cursor_key)
+        }
+        for mention in sorted(fresh.values(), key=lambda m: mention_sort_key(m.id)):
+            self._outstanding[mention.id] = False
+            self._refetch_ids.discard(mention.id)
+            self._fetch_cursor = mention.id
+            stage.processed += 1
+            await self._forward(stage, self._dedupe_queue, mention)
+        if mentions:
+            # Após voltar o cursor, as pendentes re-buscadas não precisam vir de novo
+            newest = max((mention.id for mention in mentions), key=mention_sort_key)
+            if self._fetch_cursor is None or mention_sort_key(newest) > mention_sort_key(self._fetch_cursor):
+                self._fetch_cursor = newest
+        return len(fresh)
+
+    async def _fetch_loop(self) -> None:
+        while True:
+            await self.poll_once()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _dedupe_worker(self) -> None:
+        stage = self.stages["dedupe"]
+        while True:
+            batch = await self._take_batch(self._dedupe_queue, self.batch_size)
+            stage.in_flight = len(batch)
+            start = time.perf_counter()
+            try:
+                try:
+                    known = self.ledger.statuses(self.source, [m.id for m in batch])
+                    self.ledger.record_received(self.source, [m.id for m in batch if m.id not in known])
+                except Exception as e:
+                    self._refetch(stage, batch, e)
+                    continue
+                for mention in batch:
+                    status = known.get(mention.id, STATUS_RECEIVED)
+                    if status == STATUS_RECEIVED:
+                        await self._forward(stage, self._sentiment_queue, mention)
+                    elif status == STATUS_POSTING:
+                        try:
+                            await self._recover(stage, mention)
+                        except Exception as e:
+                            self._refetch(stage, [mention], e)
+                            continue
+                    else:
+                        self._resolve(mention)  # Já resolvida antes do restart
+                    stage.processed += 1
+            finally:
+                stage.busy_seconds += time.perf_counter() - start
+                stage.in_flight = 0
+                for _ in batch:
+                    self._dedupe_queue.task_done()
+
+    async def _recover(self, stage: StageMetrics, mention: Mention) -> None:
+        """Menção presa em ``posting``: confere na plataforma antes de republicar"""
+        if self.verifier is None:
+            self.ledger.complete(self.source, mention.id, STATUS_UNKNOWN)
+            self.logger.warning(f"⚠️ Resposta à menção {mention.id} em estado incerto; não será republicada")
+            self._resolve(mention)
+            return
+
+        reply_id = await self.verifier(mention)
+        if reply_id:
+            self.ledger.complete(self.source, mention.id, STATUS_REPLIED, reply_id=reply_id)
+            self._resolve(mention)
+            return
+
+        mention.reply = self.ledger.reply_text(self.source, mention.id)
+        self.ledger.release(self.source, mention.id)
+        await self._forward(stage, self._post_queue, mention)
+
+    async def _sentiment_worker(self) -> None:
+        stage = self.stages["sentiment"]
+        while True:
+            batch = await self._take_batch(self._sentiment_queue, self.batch_size)
+            stage.in_flight = len(batch)
+            start = time.perf_counter()
+            try:
+                if self.analyzer is not None:
+                    results = await self.analyzer.analyze_batch([m.text for m in batch])
+                    for mention, result in zip(batch, results):
+                        mention.sentiment = result
+                stage.processed += len(batch)
+            except Exception as e:
+                # Sem sentimento as respostas ainda podem ser geradas
+                stage.failed += len(batch)
+                self.logger.error(f"❌ Erro na análise de sentimento das menções: {e}")
+            finally:
+                stage.busy_seconds += time.perf_counter() - start
+                stage.in_flight = 0
+            try:
+                for mention in batch:
+                    await self._forward(stage, self._reply_queue, mention)
+            finally:
+                for _ in batch:
+                    self._sentiment_queue.task_done()
+
+    async def _reply_worker(self) -> None:
+        stage = self.stages["reply"]
+        while True:
+            mention = await self._reply_queue.get()
+            stage.in_flight += 1
+            start = time.perf_counter()
+            try:
+                mention.reply = await self.reply_generator(mention)
+                stage.processed += 1
+            except Exception as e:
+                stage.failed += 1
+                self.logger.error(f"❌ Erro ao gerar resposta para a menção {mention.id}: {e}")
+                self._finish(stage, mention, STATUS_FAILED)
+                continue
+            finally:
+                stage.busy_seconds += time.perf_counter() - start
+                stage.in_flight -= 1
+                self._reply_queue.task_done()
+
+            if mention.reply:
+                await self._forward(stage, self._post_queue, mention)
+            else:
+                self._finish(stage, mention, STATUS_SKIPPED)
+
+    def _finish(self, stage: StageMetrics, mention: Mention, status: str, reply_id: Optional[str] = None) -> None:
+        """Grava o estado final e resolve a menção (ou a busca de novo se o ledger falhar)"""
+        try:
+            self.ledger.complete(self.source, mention.id, status, reply_id=reply_id)
+        except Exception as e:
+            self._refetch(stage, [mention], e)
+            return
+        self._resolve(mention)
+
+    async def _post_worker(self) -> None:
+        stage = self.stages["post"]
+        while True:
+            mention = await self._post_queue.get()
+            stage.in_flight += 1
+            start = time.perf_counter()
+            try:
+                try:
+                    claimed = self.ledger.claim(self.source, mention.id, mention.reply)
+                except Exception as e:
+                    self._refetch(stage, [mention], e)  # Nada publicado: seguro tentar de novo
+                    continue
+                if not claimed:
+                    self._resolve(mention)  # Outra instância já publicou ou está publicando
+                    continue
+                try:
+                    reply_id = await self.poster(mention, mention.reply)
+                except Exception as e:
+                    stage.failed += 1
+                    self.logger.error(f"❌ Erro ao publicar resposta à menção {mention.id}: {e}")
+                    self._finish(stage, mention, STATUS_FAILED)
+                else:
+                    stage.processed += 1
+                    # Se o ledger falhar aqui a linha fica em posting: a nova busca passa pela verificação
+                    self._finish(stage, mention, STATUS_REPLIED, str(reply_id) if reply_id is not None else None)
+            finally:
+                stage.busy_seconds += time.perf_counter() - start
+                stage.in_flight -= 1
+                self._post_queue.task_done()
@@ -0,0 +1,505 @@
+"""
+Atualização em lote das métricas dos posts acompanhados
+
+Em vez de consultar as métricas de cada post com uma requisição, o
+``MetricsPoller`` agrupa os ids nos endpoints de consulta múltipla das
+plataformas (ex: até 100 ids por ``GET /2/tweets?ids=`` no Twitter):
+
+- cada post tem uma próxima atualização; o intervalo dobra a cada
+  ``doubling_hours`` de idade (posts novos são atualizados com frequência,
+  antigos raramente) e também a cada atualização sem mudança nas métricas;
+  posts com mais de ``max_age_days`` saem do acompanhamento;
+- a cada ciclo os posts vencidos são ordenados por urgência (atraso em
+  relação ao próprio intervalo), agrupados por plataforma e divididos em
+  lotes do tamanho máximo da consulta;
+- cada lote consome uma requisição do ``RateLimiter`` compartilhado
+  (chave ``<plataforma>_lookup``); sem cota, o restante do ciclo é adiado
+  para quando a janela liberar, em vez de bloquear;
+- atualizações repetidas são unidas: um post que já está em uma consulta
+  em andamento (ciclo ou ``refresh`` sob demanda) aguarda o mesmo resultado.
+
+Cada ciclo gera um ``CycleReport`` com as requisições (cota) usadas por
+plataforma, posts atualizados, adiados e unidos.
+"""
+
+import asyncio
+import heapq
+import inspect
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from .rate_limiter import RateLimiter
+
+# Ids por consulta múltipla de cada plataforma
+LOOKUP_BATCH_SIZES = {"twitter": 100, "instagram": 50, "linkedin": 20, "tiktok": 20}
+DEFAULT_BATCH_SIZE = 20
+
+# Dobras máximas do intervalo por métricas paradas
+MAX_STALE_DOUBLINGS = 4
+
+# Consultas seguidas sem o post na resposta até parar de acompanhá-lo (apagado)
+MAX_MISSES = 3
+
+# (plataforma, ids) -> {id: métricas} (ids ausentes = não encontrados)
+MetricsFetcher = Callable[[str, List[str]], Awaitable[Dict[str, Dict[str, Any]]]]
+# (post_id, métricas) -> None (pode ser coroutine); ex: ``EngagementModel.update_metrics``
+MetricsConsumer = Callable[[str, Dict[str, Any]], Any]
+
+
+@dataclass
+class TrackedPost:
+    """Post acompanhado e seu agendamento"""
+    post_id: str
+    platform: str
+    created_at: float
+    interval: float = 0.0
+    due: Optional[float] = None
+    since: Optional[float] = None  # Primeiro vencimento ainda não atendido
+    entry: int = 0  # Sequência da entrada válida no heap
+    metrics: Optional[Dict[str, Any]] = None
+    unchanged: int = 0
+    misses: int = 0
+    refreshes: int = 0
+
+
+@dataclass
+class CycleReport:
+    """Resultado de um ciclo de atualização"""
+    started_at: float
+    duration: float = 0.0
+    due: int = 0
+    refreshed: int = 0
+    missing: int = 0
+    failed: int = 0
+    deferred: int = 0
+    coalesced: int = 0
+    requests: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def quota_used(self) -> int:
+        """Requisições consumidas do rate limiter no ciclo"""
+        return sum(self.requests.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at,
+            "duration": round(self.duration, 3),
+            "due": self.due,
+            "refreshed": self.refreshed,
+            "missing": self.missing,
+            "failed": self.failed,
+            "deferred": self.deferred,
+            "coalesced": self.coalesced,
+            "requests": dict(self.requests),
+            "quota_used": self.quota_used,
+            "posts_per_request": round(self.refreshed / self.quota_used, 1) if self.quota_used else 0.0
+        }
+
+
+class MetricsPoller:
+    """
+    Motor de atualização de métricas em lote, sob o rate limiter
+
+    Example:
+        >>> poller = MetricsPoller(fetch_metrics, limiter, consumers=[model.update_metrics, store.record])
+        >>> poller.track("1790", "twitter", created_at=time.time())
+        >>> await poller.start()
+        >>> await poller.refresh(["1790"])  # Sob demanda (ex: botão do dashboard)
+    """
+
+    def __init__(
+        self,
+        fetcher: MetricsFetcher,
+        limiter: RateLimiter,
+        consumers: Iterable[MetricsConsumer] = (),
+        min_interval: float = 300.0,
+        max_interval: float = 86400.0,
+        doubling_hours: float = 12.0,
+        max_age_days: float = 30.0,
+        batch_sizes: Optional[Dict[str, int]] = None,
+        history: int = 100,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Inicializa o poller
+
+        Args:
+            fetcher: Consulta múltipla de métricas da plataforma
+            limiter: Rate limiter compartilhado (uma requisição por lote)
+            consumers: Recebem as métricas de cada post atualizado
+            min_interval: Intervalo de um post recém-publicado (segundos)
+            max_interval: Intervalo máximo entre atualizações
+            doubling_hours: Idade em que o intervalo dobra
+            max_age_days: Idade a partir da qual o post deixa de ser acompanhado
+            batch_sizes: Ids por consulta, por plataforma
+            history: Relatórios de ciclo mantidos em ``reports``
+            clock: Fonte de tempo (epoch em segundos)
+        """
+        self.fetcher = fetcher
+        self.limiter = limiter
+        self.consumers = list(consumers)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.doubling = doubling_hours * 3600
+        self.max_age = max_age_days * 86400
+        self.batch_sizes = {**LOOKUP_BATCH_SIZES, **(batch_sizes or {})}
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        self._posts: Dict[str, TrackedPost] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._next_wakeup = float("inf")
+        self._task: Optional[asyncio.Task] = None
+
+        self.reports: Deque[CycleReport] = deque(maxlen=history)
+        self.totals = CycleReport(started_at=clock())
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Any,
+        fetcher: MetricsFetcher,
+        limiter: RateLimiter,
+        **kwargs: Any
+    ) -> "MetricsPoller":
+        """Cria o poller com os intervalos do ``Config``"""
+        options = {
+            "min_interval": config.metrics_poll_min_interval,
+            "max_interval": config.metrics_poll_max_interval,
+            "doubling_hours": config.metrics_poll_doubling_hours,
+            "max_age_days": config.metrics_poll_max_age_days
+        }
+        options.update(kwargs)
+        return cls(fetcher, limiter, **options)
+
+    # ------------------------------------------------------------------
+    # Posts acompanhados
+    # ------------------------------------------------------------------
+
+    def track(self, post_id: str, platform: str, created_at: Optional[float] = None) -> None:
+        """Passa a acompanhar um post (primeira atualização após ``min_interval``)"""
+        post_id = str(post_id)
+        if post_id in self._posts:
+            return
+        now = self.clock()
+        post = self._posts[post_id] = TrackedPost(post_id, platform, now if created_at is None else created_at)
+        self._schedule(post, now)
+
+    def untrack(self, post_id: str) -> None:
+        """Deixa de acompanhar um post (a entrada no heap é descartada depois)"""
+        self._posts.pop(str(post_id), None)
+
+    def __len__(self) -> int:
+        return len(self._posts)
+
+    def refresh_interval(self, post: TrackedPost, now: float) -> float:
+        """Intervalo até a próxima atualização: dobra com a idade e com métricas paradas"""
+        age = max(now - post.created_at, 0.0)
+        interval = self.min_interval * 2 ** (age / self.doubling) * 2 ** min(post.unchanged, MAX_STALE_DOUBLINGS)
+        return min(interval, self.max_interval)
+
+    def _schedule(self, post: TrackedPost, now: float, due: Optional[float] = None) -> None:
+        post.interval = self.refresh_interval(post, now)
+        post.due = now + post.interval if due is None else due
+        self._sequence += 1
+        post.entry = self._sequence
+        heapq.heappush(self._heap, (post.due, self._sequence, post.post_id))
+        if post.due < self._next_wakeup and self._wakeup is not None:
+            self._wakeup.set()
+
+    def next_due(self) -> Optional[float]:
+        """Horário (epoch) da próxima atualização agendada"""
+        while self._heap:
+            due, sequence, post_id = self._heap[0]
+            post = self._posts.get(post_id)
+            if post is not None and post.entry == sequence:
+                return due
+            heapq.heappop(self._heap)  # Entrada obsoleta
+        return None
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def _begin(self, posts: List[TrackedPost]) -> asyncio.Future:
+        """Registra o lote como em andamento (antes de qualquer await)"""
+        future = asyncio.get_running_loop().create_future()
+        for post in posts:
+            self._in_flight[post.post_id] = future
+        return future
+
+    def _abandon(self, posts: List[TrackedPost], future: asyncio.Future, due: Optional[float] = None) -> None:
+        """Lote que não chegou a ser consultado: libera o in-flight, responde ``{}`` e reagenda"""
+        now = self.clock()
+        for post in posts:
+            if self._in_flight.get(post.post_id) is future:
+                del self._in_flight[post.post_id]
+            if self._posts.get(post.post_id) is post:
+                self._schedule(post, now, due)
+        if not future.done():
+            future.set_result({})
+
+    def _release(self, begun: List[Tuple[List[TrackedPost], asyncio.Future]], popped: List[Tuple[TrackedPost, int]]) -> None:
+        """
+        Rede de segurança de um ciclo interrompido (cancelamento, erro inesperado)
+
+        Lotes registrados cuja consulta nunca rodou são abandonados, e posts
+        tirados do heap que não foram reagendados voltam em ``min_interval``;
+        sem isso sairiam do agendamento para sempre e quem espera pelo
+        in-flight num ``refresh`` ficaria preso.
+        """
+        now = self.clock()
+        for batch, future in begun:
+            if not future.done():
+                self._abandon(batch, future, now + self.min_interval)
+        for post, entry in popped:
+            if post.entry == entry and self._posts.get(post.post_id) is post and post.post_id not in self._in_flight:
+                self._schedule(post, now, now + self.min_interval)
+
+    async def _lookup(self, platform: str, posts: List[TrackedPost], future: asyncio.Future, report: CycleReport) -> None:
+        """Executa uma consulta múltipla e aplica o resultado"""
+        entries = [(post, post.entry) for post in posts]
+        try:
+            await self._apply_lookup(platform, posts, future, report)
+        finally:
+            # Cancelado no meio (ex: stop durante a consulta): quem não foi reagendado volta logo
+            now = self.clock()
+            for post, entry in entries:
+                if post.entry == entry and self._posts.get(post.post_id) is post:
+                    self._schedule(post, now, now + self.min_interval)
+
+    async def _apply_lookup(self, platform: str, posts: List[TrackedPost], future: asyncio.Future, report: CycleReport) -> None:
+        ids = [post.post_id for post in posts]
+        result: Dict[str, Dict[str, Any]] = {}
+        failed = False
+        try:
+            result = await self.fetcher(platform, ids) or {}
+        except Exception as e:
+            failed = True
+            report.failed += len(posts)
+            self.logger.error(f"❌ Erro ao consultar métricas de {len(ids)} posts ({platform}): {e}")
+        finally:
+            for post_id in ids:
+                if self._in_flight.get(post_id) is future:
+                    del self._in_flight[post_id]
+            if not future.done():
+                future.set_result(result)
+
+        now = self.clock()
+        for post in posts:
+            if post.post_id not in self._posts:
+                continue
+            if failed:
+                self._schedule(post, now, now + self.min_interval)  # Tenta de novo em breve
+                continue
+            post.since = None
+            metrics = result.get(post.post_id)
+            if metrics is None:
+                report.missing += 1
+                post.misses += 1
+                if post.misses >= MAX_MISSES:
+                    self.untrack(post.post_id)
+                else:
+                    self._schedule(post, now)
+                continue
+
+            report.refreshed += 1
+            post.misses = 0
+            post.refreshes += 1
+            post.unchanged = post.unchanged + 1 if metrics == post.metrics else 0
+            post.metrics = metrics
+            await self._deliver(post, metrics)
+            if now - post.created_at >= self.max_age:
+                self.untrack(post.post_id)  # Última atualização
+            else:
+                self._schedule(post, now)
+
+    async def _deliver(self, post: TrackedPost, metrics: Dict[str, Any]) -> None:
+        for consumer in self.consumers:
+            try:
+                result = consumer(post.post_id, metrics)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                self.logger.error(f"❌ Erro ao entregar métricas do post {post.post_id}: {e}")
+
+    def _batches(self, platform: str, posts: List[TrackedPost]) -> List[List[TrackedPost]]:
+        size = self.batch_sizes.get(platform, DEFAULT_BATCH_SIZE)
+        return [posts[start:start + size] for start in range(0, len(posts), size)]
+
+    def _account(self, report: CycleReport) -> None:
+        totals = self.totals
+        for name in ("due", "refreshed", "missing", "failed", "deferred", "coalesced"):
+            setattr(totals, name, getattr(totals, name) + getattr(report, name))
+        for platform, count in report.requests.items():
+            totals.requests[platform] = totals.requests.get(platform, 0) + count
+
+    async def run_cycle(self) -> CycleReport:
+        """
+        Atualiza os posts vencidos em lotes, dentro da cota disponível
+
+        Returns:
+            Relatório do ciclo (também guardado em ``reports``)
+        """
+        now = self.clock()
+        started = time.perf_counter()
+        report = CycleReport(started_at=now)
+
+        due: Dict[str, List[TrackedPost]] = {}
+        popped: List[Tuple[TrackedPost, int]] = []
+        begun: List[Tuple[List[TrackedPost], asyncio.Future]] = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, sequence, post_id = heapq.heappop(self._heap)
+            post = self._posts.get(post_id)
+            if post is None or post.entry != sequence:
+                continue
+            if post_id in self._in_flight:
+                report.coalesced += 1  # Já está numa consulta sob demanda; ela reagenda
+                continue
+            if post.since is None:
+                post.since = due_at
+            popped.append((post, sequence))
+            due.setdefault(post.platform, []).append(post)
+            report.due += 1
+
+        async def run_platform(platform: str, posts: List[TrackedPost]) -> None:
+            # Mais urgentes primeiro: atraso em intervalos do próprio post (posts novos
+            # ficam urgentes logo; os adiados continuam acumulando atraso)
+            posts.sort(key=lambda post: (now - post.since) / post.interval, reverse=True)
+            batches = self._batches(platform, posts)
+            lookups = []
+            for index, batch in enumerate(batches):
+                try:
+                    wait = await self.limiter.try_acquire(f"{platform}_lookup")
+                except Exception as e:
+                    # Limiter indisponível (ex: Redis): trata como sem cota
+                    self.logger.error(f"❌ Erro no rate limiter de {platform}_lookup: {e}")
+                    wait = self.min_interval
+                if wait > 0:
+                    # Sem cota: adia o resto para quando a janela liberar
+                    for post in (p for rest in batches[index:] for p in rest):
+                        self._schedule(post, now, now + wait)
+                        report.deferred += 1
+                    break
+                report.requests[platform] = report.requests.get(platform, 0) + 1
+                future = self._begin(batch)
+                begun.append((batch, future))
+                lookups.append((batch, future))
+            await asyncio.gather(*(self._lookup(platform, batch, future, report) for batch, future in lookups))
+
+        try:
+            results = await asyncio.gather(
+                *(run_platform(platform, posts) for platform, posts in due.items()), return_exceptions=True
+            )
+        finally:
+            self._release(begun, popped)
+        for error in results:
+            if isinstance(error, Exception):
+                self.logger.error(f"❌ Erro no ciclo de métricas: {error}")
+
+        report.duration = time.perf_counter() - started
+        self.reports.append(report)
+        self._account(report)
+        if report.due or report.coalesced:
+            self.logger.info(
+                f"📈 Ciclo de métricas: {report.refreshed} posts em {report.quota_used} requisições "
+                f"{report.requests}, {report.deferred} adiados, {report.coalesced} unidos"
+            )
+        return report
+
+    async def refresh(self, post_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Atualiza posts agora (fora do agendamento), unindo consultas em andamento
+
+        Espera pela cota do rate limiter. Posts não acompanhados são ignorados.
+
+        Returns:
+            {post_id: métricas} dos posts encontrados
+        """
+        report = CycleReport(started_at=self.clock())
+        waiting: Dict[str, asyncio.Future] = {}
+        new: Dict[str, List[TrackedPost]] = {}
+        for post_id in dict.fromkeys(map(str, post_ids)):
+            if post_id in self._in_flight:
+                waiting[post_id] = self._in_flight[post_id]
+                report.coalesced += 1
+            elif post_id in self._posts:
+                post = self._posts[post_id]
+                new.setdefault(post.platform, []).append(post)
+
+        async def run(platform: str, batch: List[TrackedPost], future: asyncio.Future) -> None:
+            try:
+                await self.limiter.acquire(f"{platform}_lookup")
+            except BaseException:
+                self._abandon(batch, future)
+                raise
+            report.requests[platform] = report.requests.get(platform, 0) + 1
+            await self._lookup(platform, batch, future, report)
+
+        begun: List[Tuple[List[TrackedPost], asyncio.Future]] = []
+        for platform, posts in new.items():
+            for batch in self._batches(platform, posts):
+                future = self._begin(batch)  # Registrado antes de esperar pela cota
+                begun.append((batch, future))
+                waiting.update((post.post_id, future) for post in batch)
+        try:
+            await asyncio.gather(*(run(batch[0].platform, batch, future) for batch, future in begun))
+        finally:
+            self._release(begun, [])
+        results = {post_id: (await future).get(post_id) for post_id, future in waiting.items()}
+
+        self._account(report)
+        return {post_id: metrics for post_id, metrics in results.items() if metrics is not None}
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            next_due = self.next_due()
+            self._next_wakeup = next_due if next_due is not None else float("inf")
+            delay = max(self._next_wakeup - self.clock(), 0.0) if next_due is not None else self.min_interval
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                self.logger.error(f"❌ Erro no ciclo de métricas: {e}")
+
+    async def start(self) -> None:
+        """Inicia os ciclos em background (acordando no próximo vencimento)"""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+            self.logger.info(f"📈 Atualização de métricas iniciada: {len(self._posts)} posts acompanhados")
+
+    async def stop(self) -> None:
+        """Para os ciclos (consultas em andamento são canceladas)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado para o dashboard/métricas: totais, último ciclo e próximo vencimento"""
+        return {
+            "tracked": len(self._posts),
+            "in_flight": len(self._in_flight),
+            "next_due": self.next_due(),
+            "last_cycle": self.reports[-1].to_dict() if self.reports else None,
+            "totals": self.totals.to_dict()
+        }
@@ -0,0 +1,128 @@
+"""
+Rate limiter local do SocialBot AI
+
+Controla a taxa de requisições por chave (ex: ``twitter_post``) com janela
+deslizante: no máximo ``max_requests`` registros dentro de ``time_window``
+segundos. É a implementação por processo; para várias réplicas usando a
+mesma conta veja ``RedisRateLimiter`` em ``distributed_rate_limiter``.
+"""
+
+import asyncio
+import time
+from collections import defaultdict, deque
+from typing import Callable, Deque, Dict, Optional
+
+
+class RateLimiter:
+    """
+    Rate limiter de janela deslizante em memória
+
+    Example:
+        >>> limiter = RateLimiter(max_requests=50, time_window=3600)
+        >>> if await limiter.can_make_request("twitter_post"):
+        ...     await limiter.record_request("twitter_post")
+    """
+
+    def __init__(
+        self,
+        max_requests: int,
+        time_window: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Inicializa o rate limiter
+
+        Args:
+            max_requests: Máximo de requisições dentro da janela
+            time_window: Tamanho da janela em segundos
+            clock: Relógio monotônico (injetável para testes)
+        """
+        if max_requests < 1:
+            raise ValueError("max_requests deve ser >= 1")
+
+        self.max_requests = max_requests
+        self.time_window = time_window
+        self._clock = clock
+        self._requests: Dict[str, Deque[float]] = defaultdict(deque)
+
+    def _window(self, key: str) -> Deque[float]:
+        """Retorna os registros da chave descartando os expirados"""
+        requests = self._requests[key]
+        cutoff = self._clock() - self.time_window
+        while requests and requests[0] <= cutoff:
+            requests.popleft()
+        return requests
+
+    def _wait_time(self, requests: Deque[float]) -> float:
+        if len(requests) < self.max_requests:
+            return 0.0
+        # Libera quando o registro que excede o limite sair da janela
+        oldest = requests[len(requests) - self.max_requests]
+        return max(oldest + self.time_window - self._clock(), 0.0)
+
+    async def can_make_request(self, key: str = "default") -> bool:
+        """Verifica se uma requisição pode ser feita agora"""
+        return len(self._window(key)) < self.max_requests
+
+    async def record_request(self, key: str = "default") -> None:
+        """Registra uma requisição feita"""
+        self._window(key).append(self._clock())
+
+    async def get_wait_time(self, key: str = "default") -> float:
+        """Segundos até a próxima requisição permitida (0 se já pode)"""
+        return self._wait_time(self._window(key))
+
+    async def try_acquire(self, key: str = "default") -> float:
+        """
+        Verifica e consome uma requisição de forma atômica
+
+        Returns:
+            0 se a requisição foi consumida, senão os segundos de espera
+        """
+        requests = self._window(key)
+        wait = self._wait_time(requests)
+        if wait == 0:
+            requests.append(self._clock())
+        return wait
+
+    async def acquire(self, key: str = "default", timeout: Optional[float] = None) -> None:
+        """
+        Aguarda até que uma requisição seja permitida e a consome
+
+        Dorme exatamente o tempo até a liberação, sem polling.
+
+        Args:
+            key: Chave do limite
+            timeout: Tempo máximo de espera em segundos
+
+        Raises:
+            asyncio.TimeoutError: Se o timeout expirar antes da liberação
+        """
+        async def wait_for_slot() -> None:
+            while True:
+                wait = await self.try_acquire(key)
+                if wait == 0:
+                    return
+                await asyncio.sleep(wait)
+
+        await asyncio.wait_for(wait_for_slot(), timeout)
+
+    def update_limits(self, max_requests: int, time_window: Optional[float] = None) -> None:
+        """
+        Altera o limite sem perder os registros já feitos na janela
+
+        Usado pela recarga de configuração: as requisições em andamento
+        continuam contando para o novo limite.
+        """
+        if max_requests < 1:
+            raise ValueError("max_requests deve ser >= 1")
+        self.max_requests = max_requests
+        if time_window is not None:
+            self.time_window = time_window
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """Limpa os registros de uma chave (ou de todas)"""
+        if key is None:
+            self._requests.clear()
+        else:
+            self._requests.pop(key, None)
@@ -0,0 +1,351 @@
+"""
+Armazenamento persistente e indexado de posts agendados
+
+Backend do ``PostScheduler`` para centenas de milhares de posts em várias
+contas. Em memória, um heap ordenado por ``(horário, prioridade)`` responde
+"qual o próximo post vencido" em O(log n); no banco (``DatabaseConfig.url``,
+SQLite ou PostgreSQL) uma tabela com índice no horário garante que um
+restart recarregue apenas os posts pendentes.
+
+O cancelamento é O(1): o post sai do dicionário de posts vivos e sua
+entrada no heap vira uma lápide (tombstone), descartada quando chega ao
+topo ou na próxima compactação.
+
+Horários são guardados e devolvidos com fuso (UTC); ``datetime`` sem fuso
+recebido em ``add`` é interpretado como hora local, como em ``timestamp()``.
+
+A classe não é thread-safe; deve ser usada pelo event loop do scheduler.
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from sqlalchemy import (
+    Column,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    create_engine,
+    select,
+    update
+)
+from sqlalchemy.engine import Engine
+
+# Ordem de despacho quando dois posts vencem no mesmo horário
+# (menor rank sai primeiro)
+PRIORITY_RANKS = {"URGENT": 0, "HIGH": 1, "NORMAL": 2, "LOW": 3}
+
+STATUS_PENDING = "pending"
+STATUS_PUBLISHED = "published"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+metadata = MetaData()
+
+scheduled_posts_table = Table(
+    "scheduled_posts",
+    metadata,
+    Column("schedule_id", String(36), primary_key=True),
+    Column("account_id", String(128), nullable=False, default=""),
+    Column("content", Text, nullable=False),
+    Column("platforms", Text, nullable=False),
+    Column("schedule_ts", Float, nullable=False),
+    Column("priority", Integer, nullable=False),
+    Column("status", String(16), nullable=False, default=STATUS_PENDING),
+    Column("extra", Text, nullable=False, default="{}"),
+    Index("ix_scheduled_posts_due", "status", "schedule_ts", "priority")
+)
+
+
+def priority_rank(priority: Union[Enum, str, int]) -> int:
+    """
+    Converte uma ``PostPriority`` (ou nome/rank) para rank numérico
+
+    Args:
+        priority: Enum ``PostPriority``, nome (``"HIGH"``) ou rank inteiro
+
+    Returns:
+        Rank onde 0 é o mais urgente
+    """
+    if isinstance(priority, Enum):
+        priority = priority.name
+    if isinstance(priority, str):
+        return PRIORITY_RANKS[priority.upper()]
+    return int(priority)
+
+
+def _as_utc(moment: datetime) -> datetime:
+    """Mesmo instante com fuso UTC (sem fuso = hora local)"""
+    return moment.astimezone(timezone.utc)
+
+
+@dataclass
+class ScheduledPost:
+    """Post agendado"""
+    content: str
+    platforms: List[str]
+    schedule_time: datetime
+    priority: int = PRIORITY_RANKS["NORMAL"]
+    account_id: str = ""
+    schedule_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Formato retornado por ``get_scheduled_posts``"""
+        return {
+            "schedule_id": self.schedule_id,
+            "content": self.content,
+            "platforms": self.platforms,
+            "schedule_time": self.schedule_time.isoformat(),
+            "priority": self.priority,
+            "account_id": self.account_id,
+            "extra": self.extra
+        }
+
+
+class ScheduleStore:
+    """
+    Fila de posts agendados com heap em memória e tabela indexada
+
+    Example:
+        >>> store = ScheduleStore(config.database.url)
+        >>> store.load()
+        >>> store.add(ScheduledPost("Post", ["twitter"], datetime.now(timezone.utc)))
+        >>> for post in store.pop_due():
+        ...     await publish(post)
+        >>> store.mark_done([post.schedule_id])
+    """
+
+    def __init__(self, database_url: str = "sqlite:///socialbot.db", engine: Optional[Engine] = None):
+        """
+        Inicializa o store
+
+        Args:
+            database_url: URL do banco (``DatabaseConfig.url``)
+            engine: Engine SQLAlchemy já criada (opcional)
+        """
+        self.engine = engine or create_engine(database_url)
+        self.logger = logging.getLogger(__name__)
+
+        self._heap: List[Tuple[float, int, int, str]] = []
+        self._posts: Dict[str, ScheduledPost] = {}
+        self._sequence = itertools.count()
+        self._tombstones = 0
+
+        metadata.create_all(self.engine)
+
+    # ------------------------------------------------------------------
+    # Carga e persistência
+    # ------------------------------------------------------------------
+
+    def load(self) -> int:
+        """
+        Recarrega os posts pendentes do banco
+
+        Apenas linhas ``pending`` são lidas (via índice) e o heap é montado
+        com ``heapify`` em O(n).
+
+        Returns:
+            Quantidade de posts carregados
+        """
+        self._heap.clear()
+        self._posts.clear()
+        self._tombstones = 0
+
+        query = (
+            select(scheduled_posts_table)
+            .where(scheduled_posts_table.c.status == STATUS_PENDING)
+        )
+        with self.engine.connect() as connection:
+            for row in connection.execute(query):
+                post = ScheduledPost(
+                    content=row.content,
+                    platforms=json.loads(row.platforms),
+                    schedule_time=datetime.fromtimestamp(row.schedule_ts, timezone.utc),
+                    priority=row.priority,
+                    account_id=row.account_id,
+                    schedule_id=row.schedule_id,
+                    extra=json.loads(row.extra)
+                )
+                self._posts[post.schedule_id] = post
+                self._heap.append(self._heap_entry(post, row.schedule_ts))
+
+        heapq.heapify(self._heap)
+        self.logger.info(f"📅 {len(self._posts)} posts agendados carregados")
+        return len(self._posts)
+
+    def _heap_entry(self, post: ScheduledPost, timestamp: Optional[float] = None) -> Tuple[float, int, int, str]:
+        if timestamp is None:
+            timestamp = post.schedule_time.timestamp()
+        return (timestamp, post.priority, next(self._sequence), post.schedule_id)
+
+    @staticmethod
+    def _row(post: ScheduledPost) -> Dict[str, Any]:
+        return {
+            "schedule_id": post.schedule_id,
+            "account_id": post.account_id,
+            "content": post.content,
+            "platforms": json.dumps(post.platforms),
+            "schedule_ts": post.schedule_time.timestamp(),
+            "priority": post.priority,
+            "status": STATUS_PENDING,
+            "extra": json.dumps(post.extra)
+        }
+
+    def add(self, post: ScheduledPost) -> str:
+        """Agenda um post e retorna seu ``schedule_id``"""
+        return self.add_many([post])[0]
+
+    def add_many(self, posts: Iterable[ScheduledPost]) -> List[str]:
+        """
+        Agenda vários posts em uma única transação
+
+        Returns:
+            Lista de ``schedule_id`` na ordem recebida
+        """
+        posts = list(posts)
+        if not posts:
+            return []
+        for post in posts:
+            # Horários com e sem fuso misturados quebrariam list_pending após um restart
+            post.schedule_time = _as_utc(post.schedule_time)
+
+        with self.engine.begin() as connection:
+            connection.execute(scheduled_posts_table.insert(), [self._row(p) for p in posts])
+
+        for post in posts:
+            self._posts[post.schedule_id] = post
+            heapq.heappush(self._heap, self._heap_entry(post))
+
+        return [post.schedule_id for post in posts]
+
+    def cancel(self, schedule_id: str) -> bool:
+        """
+        Cancela um post agendado
+
+        Em memória é O(1): a entrada do heap vira lápide. No banco é um
+        UPDATE pela chave primária.
+
+        Returns:
+            True se o post estava pendente
+        """
+        return self.cancel_many([schedule_id]) == 1
+
+    def cancel_many(self, schedule_ids: Iterable[str]) -> int:
+        """
+        Cancela vários posts em uma única transação
+
+        Returns:
+            Quantidade de posts que estavam pendentes
+        """
+        cancelled = [sid for sid in schedule_ids if self._posts.pop(sid, None) is not None]
+        if not cancelled:
+            return 0
+
+        self._tombstones += len(cancelled)
+        self._set_status(cancelled, STATUS_CANCELLED)
+
+        if self._tombstones > len(self._posts) and self._tombstones > 1024:
+            self.compact()
+        return len(cancelled)
+
+    def mark_done(self, schedule_ids: List[str], status: str = STATUS_PUBLISHED) -> None:
+        """
+        Registra o resultado de posts despachados por ``pop_due``
+
+        Até esta chamada o post continua ``pending`` no banco, então um
+        crash entre o despacho e a confirmação o recarrega no próximo
+        ``load()`` (entrega pelo menos uma vez).
+        """
+        self._set_status(schedule_ids, status)
+
+    def _set_status(self, schedule_ids: List[str], status: str) -> None:
+        if not schedule_ids:
+            return
+
+        # Lotes limitados para não estourar o máximo de parâmetros do SQLite
+        with self.engine.begin() as connection:
+            for start in range(0, len(schedule_ids), 500):
+                connection.execute(
+                    update(scheduled_posts_table)
+                    .where(scheduled_posts_table.c.schedule_id.in_(schedule_ids[start:start + 500]))
+                    .values(status=status)
+                )
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def _discard_tombstones(self) -> None:
+        while self._heap and self._heap[0][3] not in self._posts:
+            heapq.heappop(self._heap)
+            self._tombstones -= 1
+
+    def next_due_time(self) -> Optional[datetime]:
+        """Horário (UTC) do próximo post pendente (O(1) amortizado)"""
+        self._discard_tombstones()
+        if not self._heap:
+            return None
+        return datetime.fromtimestamp(self._heap[0][0], timezone.utc)
+
+    def pop_due(self, now: Optional[datetime] = None, limit: Optional[int] = None) -> List[ScheduledPost]:
+        """
+        Remove e retorna os posts vencidos, por horário e prioridade
+
+        Só toca o topo do heap: O(k log n) para k posts vencidos.
+
+        Args:
+            now: Horário de referência (padrão: agora)
+            limit: Máximo de posts retornados neste tick
+
+        Returns:
+            Posts vencidos (continuam ``pending`` no banco até ``mark_done``)
+        """
+        cutoff = (now or datetime.now(timezone.utc)).timestamp()
+        due: List[ScheduledPost] = []
+
+        while self._heap and (limit is None or len(due) < limit):
+            timestamp, _, _, schedule_id = self._heap[0]
+            if timestamp > cutoff:
+                break
+
+            heapq.heappop(self._heap)
+            post = self._posts.pop(schedule_id, None)
+            if post is None:
+                self._tombstones -= 1
+                continue
+            due.append(post)
+
+        return due
+
+    def get(self, schedule_id: str) -> Optional[ScheduledPost]:
+        """Retorna um post pendente pelo id"""
+        return self._posts.get(schedule_id)
+
+    def list_pending(self, account_id: Optional[str] = None) -> List[ScheduledPost]:
+        """Lista posts pendentes em ordem de despacho"""
+        posts = [
+            post for post in self._posts.values()
+            if account_id is None or post.account_id == account_id
+        ]
+        return sorted(posts, key=lambda p: (p.schedule_time, p.priority))
+
+    def compact(self) -> None:
+        """Reconstrói o heap sem lápides (O(n))"""
+        self._heap = [entry for entry in self._heap if entry[3] in self._posts]
+        heapq.heapify(self._heap)
+        self._tombstones = 0
+
+    def __len__(self) -> int:
+        return len(self._posts)
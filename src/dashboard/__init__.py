@@ -0,0 +1,37 @@
+"""
+Módulo do Dashboard do SocialBot AI
+
+Contém funcionalidades para:
+- Camada de dados das páginas (cache por widget, snapshots em background e
+  invalidação por eventos de escrita)
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .data import DashboardData
+
+_LAZY_ATTRIBUTES = {
+    "DashboardData": ".data",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Importa o atributo público sob demanda (PEP 562)"""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # Próximos acessos não passam por __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+__all__ = [
+    "DashboardData"
+]
@@ -0,0 +1,352 @@
+"""
+Camada de dados do dashboard
+
+As páginas do Streamlit rodam de novo a cada interação, e cada operador
+conectado tem sua própria sessão; chamar ``bot.get_statistics()`` e
+``get_analytics()`` direto de cada rerun multiplica as consultas ao banco e
+às APIs. Aqui cada widget tem um cache próprio:
+
+- TTL por widget: leituras dentro do TTL não chamam o backend.
+- Coalescência: leitores simultâneos de um widget expirado aguardam a mesma
+  computação (N operadores = 1 consulta).
+- Snapshots: widgets caros são recalculados em background; o leitor recebe
+  o último valor na hora, mesmo expirado, e só espera na primeira carga.
+- Falha do loader: quem já tem um valor anterior o recebe (stale); o erro
+  só chega ao leitor na primeira carga.
+- Invalidação por eventos de escrita (``notify("post")``,
+  ``notify("metrics")``): o widget expira sem esperar o TTL. Para uma rajada
+  de métricas não virar uma recomputação por evento, o valor invalidado
+  ainda vale por ``min_interval`` segundos após ter sido calculado.
+
+O cache vive no event loop do bot. As threads do Streamlit leem com
+``read`` (agenda ``get`` no loop e espera o resultado).
+
+Example:
+    >>> data = DashboardData.from_config(config)
+    >>> data.register_bot(bot)
+    >>> data.start()
+    >>> poller.consumers.append(data.on_metrics)  # Atualização de métricas invalida
+    >>> data.read("statistics")  # Numa página do Streamlit
+"""
+
+import asyncio
+import concurrent.futures
+import inspect
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, Optional, Union
+
+WRITE_EVENTS = ("post", "metrics")
+
+Loader = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+@dataclass
+class WidgetStats:
+    """Contadores de um widget"""
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    refreshes: int = 0
+    errors: int = 0
+    invalidations: int = 0
+    last_duration: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte estatísticas para dicionário"""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "invalidations": self.invalidations,
+            "last_duration": round(self.last_duration, 4)
+        }
+
+
+@dataclass
+class _Widget:
+    """Estado do cache de um widget"""
+    name: str
+    loader: Loader
+    ttl: float
+    events: FrozenSet[str]
+    snapshot: bool
+    value: Any = None
+    has_value: bool = False
+    computed_at: float = 0.0
+    version: int = 0  # Incrementado a cada invalidação
+    computed_version: int = -1  # Versão vista quando o valor começou a ser calculado
+    retry_at: float = 0.0
+    task: Optional[asyncio.Task] = None
+    stats: WidgetStats = field(default_factory=WidgetStats)
+
+    def expires_at(self, min_interval: float) -> float:
+        if not self.has_value:
+            return self.retry_at  # Primeira carga: já (ou após a espera de um erro)
+        ttl = self.ttl if self.computed_version == self.version else min(self.ttl, min_interval)
+        return max(self.computed_at + ttl, self.retry_at)
+
+
+class DashboardData:
+    """Cache por widget com coalescência, snapshots e invalidação por eventos"""
+
+    def __init__(
+        self,
+        ttl: float = 30.0,
+        snapshot_ttl: float = 300.0,
+        min_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Inicializa a camada de dados
+
+        Args:
+            ttl: TTL padrão dos widgets comuns (segundos)
+            snapshot_ttl: TTL padrão dos snapshots recalculados em background
+            min_interval: Tempo mínimo entre recomputações de um widget
+                invalidado (também é o intervalo de nova tentativa após erro)
+            clock: Relógio monotônico (substituível nos testes)
+        """
+        self.ttl = ttl
+        self.snapshot_ttl = snapshot_ttl
+        self.min_interval = min_interval
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        self._widgets: Dict[str, _Widget] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, config: Any) -> "DashboardData":
+        """Cria a camada a partir de ``Config`` (``DASHBOARD_CACHE_*``)"""
+        dashboard = config.dashboard
+        return cls(dashboard.cache_ttl, dashboard.snapshot_ttl, dashboard.invalidation_interval)
+
+    def register(
+        self,
+        name: str,
+        loader: Loader,
+        ttl: Optional[float] = None,
+        events: Iterable[str] = WRITE_EVENTS,
+        snapshot: bool = False
+    ) -> None:
+        """
+        Registra (ou substitui) um widget
+
+        Args:
+            name: Nome usado em ``get``/``read``
+            loader: Função ou corrotina sem argumentos que calcula o valor
+            ttl: Validade do valor (padrão: ``ttl`` ou ``snapshot_ttl``)
+            events: Eventos de escrita que invalidam o widget
+            snapshot: Recalcula em background e nunca faz o leitor esperar
+                depois da primeira carga
+        """
+        if ttl is None:
+            ttl = self.snapshot_ttl if snapshot else self.ttl
+        self._widgets[name] = _Widget(name, loader, ttl, frozenset(events), snapshot)
+        if snapshot and self._wakeup is not None:
+            self._wakeup.set()
+
+    def register_bot(self, bot: Any) -> None:
+        """Registra as estatísticas e analytics do bot como snapshots"""
+        for name in ("get_statistics", "get_analytics"):
+            loader = getattr(bot, name, None)
+            if loader is not None:
+                self.register(name[len("get_"):], loader, snapshot=True)
+
+    def _widget(self, name: str) -> _Widget:
+        widget = self._widgets.get(name)
+        if widget is None:
+            raise KeyError(f"Widget não registrado: {name}")
+        return widget
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    async def get(self, name: str) -> Any:
+        """
+        Valor do widget (do cache, de uma computação em andamento ou novo)
+
+        Raises:
+            KeyError: Widget não registrado
+            Exception: Erro do loader quando não há valor anterior para servir
+                (com valor anterior, ele é servido mesmo expirado)
+        """
+        widget = self._widget(name)
+        if widget.has_value and self.clock() < widget.expires_at(self.min_interval):
+            widget.stats.hits += 1
+            return widget.value
+
+        if widget.snapshot and widget.has_value:
+            # Serve o último snapshot e recalcula em background
+            widget.stats.stale_hits += 1
+            self._refresh(widget)
+            return widget.value
+
+        if widget.task is not None and not widget.task.done():
+            widget.stats.coalesced += 1
+        else:
+            widget.stats.misses += 1
+        try:
+            # shield: um leitor cancelado não cancela a computação dos outros
+            return await asyncio.shield(self._refresh(widget))
+        except Exception:
+            if not widget.has_value:
+                raise
+            # Como nos snapshots, a falha do loader serve o último valor
+            widget.stats.stale_hits += 1
+            return widget.value
+
+    async def get_many(self, names: Iterable[str]) -> Dict[str, Any]:
+        """Vários widgets de uma página em paralelo"""
+        names = list(names)
+        values = await asyncio.gather(*(self.get(name) for name in names))
+        return dict(zip(names, values))
+
+    def read(self, name: str, timeout: Optional[float] = 30.0) -> Any:
+        """
+        Versão síncrona de ``get`` para as threads do Streamlit
+
+        Raises:
+            RuntimeError: Chamado antes de ``start`` ou de dentro do event loop
+            TimeoutError: ``get`` não terminou em ``timeout`` (e é cancelado)
+        """
+        if self._loop is None:
+            raise RuntimeError("DashboardData não iniciado (chame start no event loop)")
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            raise RuntimeError("read bloquearia o event loop; use await get()")
+        future = asyncio.run_coroutine_threadsafe(self.get(name), self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()  # Não deixa o get órfão rodando no loop
+            raise
+
+    def _refresh(self, widget: _Widget) -> "asyncio.Task":
+        """Inicia a computação do widget ou devolve a que já está em andamento"""
+        if widget.task is None or widget.task.done():
+            widget.task = asyncio.ensure_future(self._compute(widget))
+            widget.task.add_done_callback(_consume_exception)
+        return widget.task
+
+    async def _compute(self, widget: _Widget) -> Any:
+        version = widget.version
+        started = self.clock()
+        widget.stats.refreshes += 1
+        try:
+            value = widget.loader()
+            if inspect.isawaitable(value):
+                value = await value
+        except Exception as e:
+            widget.stats.errors += 1
+            widget.retry_at = self.clock() + self.min_interval
+            self.logger.warning(f"⚠️ Falha ao atualizar o widget {widget.name}: {e}")
+            raise
+
+        widget.value, widget.has_value = value, True
+        widget.computed_at, widget.computed_version = started, version
+        widget.stats.last_duration = self.clock() - started
+        return value
+
+    # ------------------------------------------------------------------
+    # Invalidação
+    # ------------------------------------------------------------------
+
+    def notify(self, event: str) -> int:
+        """
+        Evento de escrita: invalida os widgets que dependem dele
+
+        Deve ser chamado no event loop (ex: após publicar um post).
+
+        Returns:
+            Widgets invalidados
+        """
+        invalidated = 0
+        for widget in self._widgets.values():
+            if event in widget.events:
+                widget.version += 1
+                widget.stats.invalidations += 1
+                invalidated += 1
+        if invalidated and self._wakeup is not None:
+            self._wakeup.set()
+        return invalidated
+
+    def on_post(self, *args: Any, **kwargs: Any) -> None:
+        """Post novo publicado (aceita qualquer assinatura de callback)"""
+        self.notify("post")
+
+    def on_metrics(self, post_id: str, metrics: Dict[str, Any]) -> None:
+        """Métricas atualizadas (compatível com ``MetricsConsumer``)"""
+        self.notify("metrics")
+
+    # ------------------------------------------------------------------
+    # Snapshots em background
+    # ------------------------------------------------------------------
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            self._wakeup.clear()
+            now = self.clock()
+            snapshots = [widget for widget in self._widgets.values() if widget.snapshot]
+            due = [widget for widget in snapshots if now >= widget.expires_at(self.min_interval)]
+            if due:
+                await asyncio.gather(*(self._refresh(widget) for widget in due), return_exceptions=True)
+                continue
+
+            wait = min((widget.expires_at(self.min_interval) for widget in snapshots), default=math.inf) - now
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=None if math.isinf(wait) else wait)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Liga a atualização dos snapshots e o acesso pelas threads do Streamlit"""
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Para a atualização em background"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._loop = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado dos caches (idade, validade e contadores por widget)"""
+        now = self.clock()
+        return {
+            name: {
+                "snapshot": widget.snapshot,
+                "ttl": widget.ttl,
+                "age": round(now - widget.computed_at, 3) if widget.has_value else None,
+                "fresh": widget.has_value and now < widget.expires_at(self.min_interval),
+                "refreshing": widget.task is not None and not widget.task.done(),
+                **widget.stats.to_dict()
+            }
+            for name, widget in self._widgets.items()
+        }
+
+
+def _consume_exception(task: "asyncio.Task") -> None:
+    # Erros de refresh em background já foram logados; evita o aviso do asyncio
+    if not task.cancelled():
+        task.exception()
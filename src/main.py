@@ -9,23 +9,49 @@ import asyncio
 import sys
 import signal
 from pathlib import Path
+from datetime import datetime, timezone
 from typing import Optional
 
 # Adiciona o diretório src ao path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils.config import Config
+from utils.config_reload import ConfigManager, ConfigSnapshot
 from utils.logger import Logger
+from utils.http_session import HTTPSessionManager
+from utils.circuit_breaker import ResilienceEngine
+from ai.sentiment_analyzer import SentimentAnalyzer
+from ai.model_host import RemoteSentimentAnalyzer
+from ai.hashtag_generator import HashtagGenerator
+from ai.content_stream import ContentStreamer
+from analytics.engagement_model import EngagementModel
 from bot.social_bot import SocialBot
+from bot.distributed_rate_limiter import build_rate_limiter, rate_limit_subscriber
 from dashboard.app import DashboardApp
+from dashboard.data import DashboardData
 
 
 class SocialBotAI:
     """Classe principal do SocialBot AI"""
     
     def __init__(self):
-        self.config = Config()
+        self.config_manager = ConfigManager()
+        self.config = self.config_manager.current.config
         self.logger = Logger().get_logger(__name__)
+        self.http = HTTPSessionManager.from_config(self.config.http)
+        self.resilience = ResilienceEngine.from_config(self.config.resilience)
+        if self.config.ai.model_host_socket:
+            # Pesos carregados uma única vez no host compartilhado
+            self.sentiment = RemoteSentimentAnalyzer.connect(self.config.ai.model_host_socket)
+        else:
+            self.sentiment = SentimentAnalyzer.from_config(self.config)
+        self.hashtags = HashtagGenerator.from_config(self.config)
+        self.streamer = ContentStreamer.from_config(self.config)
+        self.engagement = EngagementModel.from_config(self.config)
+        self.dashboard_data = DashboardData.from_config(self.config)
+        self.rate_limiters = {
+            platform: build_rate_limiter(self.config, platform)
+            for platform in ("twitter", "instagram", "linkedin")
+        }
         self.bot: Optional[SocialBot] = None
         self.dashboard: Optional[DashboardApp] = None
         self.running = False
@@ -35,12 +61,49 @@ class SocialBotAI:
         try:
             self.logger.info("🚀 Inicializando SocialBot AI...")
             
+            # Sessão HTTP compartilhada por todos os clientes de plataforma
+            await self.http.start()
+            self.http.register_prometheus_collector()
+            self.resilience.register_prometheus_collector()
+            self.streamer.metrics.register_prometheus_collector()
+            
+            # Carrega/exporta os modelos locais antes do primeiro evento
+            if self.config.ai.warmup_models:
+                await self._warmup_models()
+            
             # Inicializa o bot principal
             self.bot = SocialBot(self.config)
+            self.bot.http = self.http
+            self.bot.resilience = self.resilience
+            self.bot.sentiment = self.sentiment
+            self.bot.hashtags = self.hashtags
+            self.bot.streamer = self.streamer
+            self.bot.engagement = self.engagement
+            self.bot.dashboard_data = self.dashboard_data  # notify("post"/"metrics") nas escritas
+            self.bot.rate_limiters = self.rate_limiters
             await self.bot.initialize()
             
+            # Índice de hashtags atualizado em background
+            self.hashtags.start(self.config.ai.hashtag_refresh_interval)
+            
+            # Melhor horário/hashtags atualizados a cada métrica; checkpoint periódico
+            self.engagement.start(self.config.analytics_checkpoint_interval)
+            
+            # Estatísticas/analytics do bot em cache, recalculadas em background
+            self.dashboard_data.register_bot(self.bot)
+            self.dashboard_data.start()
+            
             # Inicializa o dashboard
             self.dashboard = DashboardApp(self.config, self.bot)
+            self.dashboard.data = self.dashboard_data
+            
+            # Novas versões do .env são aplicadas sem restart
+            self.config_manager.subscribe(self._apply_config)
+            for platform, limiter in self.rate_limiters.items():
+                # *_RATE_LIMIT_POSTS_PER_HOUR alterado no .env vale sem restart
+                self.config_manager.subscribe(rate_limit_subscriber(limiter, platform), sections=(platform,))
+            if self.config.config_watch:
+                await self.config_manager.start_watching(self.config.config_poll_interval)
             
             self.logger.info("✅ SocialBot AI inicializado com sucesso!")
             
@@ -85,17 +148,62 @@ class SocialBotAI:
         self.running = False
         
         try:
+            await self.config_manager.stop_watching()
+            
             if self.bot:
                 await self.bot.stop()
                 
             if self.dashboard:
                 await self.dashboard.stop()
                 
+            await self.dashboard_data.stop()
+            await self.hashtags.stop()
+            await self.engagement.stop()
+            self.sentiment.close()
+            self.streamer.close()
+            
+            # Fecha o pool de conexões por último, depois dos clientes
+            await self.http.close()
+                
             self.logger.info("✅ SocialBot AI parado com sucesso!")
             
         except Exception as e:
             self.logger.error(f"❌ Erro ao parar SocialBot AI: {e}")
-    
+
+    async def _warmup_models(self) -> None:
+        """Aquece o modelo de sentimento (uma falha não impede a partida)"""
+        try:
+            await self.sentiment.warmup()
+        except Exception as e:
+            self.logger.warning(
+                f"⚠️ Falha ao aquecer o modelo de sentimento ({self.config.ai.inference_backend}): {e}"
+            )
+
+    def _apply_config(self, snapshot: ConfigSnapshot) -> None:
+        """Troca a configuração dos componentes pela nova versão"""
+        self.config = snapshot.config
+        if self.bot:
+            self.bot.config = snapshot.config
+        if self.dashboard:
+            self.dashboard.config = snapshot.config
+
+    def health(self) -> dict:
+        """Dados do endpoint /health (inclui o estado dos circuit breakers)"""
+        components = self.resilience.health_components()
+        if "unhealthy" in components.values():
+            status = "unhealthy"
+        elif "degraded" in components.values():
+            status = "degraded"
+        else:
+            status = "healthy"
+
+        return {
+            "status": status,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "version": self.config.bot_version,
+            "components": components
+        }
+
     def _signal_handler(self, signum, frame):
         """Handler para sinais de sistema"""
         self.logger.info(f"📡 Sinal recebido: {signum}")
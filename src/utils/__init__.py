@@ -5,14 +5,57 @@ Contém classes e funções auxiliares para configuração, logging,
 validação e outras funcionalidades de suporte.
 """
 
-from .config import Config
-from .logger import Logger
-from .validators import validate_social_media_config, validate_ai_config
-from .helpers import format_datetime, sanitize_text, generate_uuid
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .config import Config
+    from .config_reload import ConfigManager, ConfigSnapshot
+    from .logger import Logger
+    from .http_session import HTTPSessionManager
+    from .circuit_breaker import CircuitBreaker, ResilienceEngine
+    from .validators import validate_social_media_config, validate_ai_config
+    from .helpers import format_datetime, sanitize_text, generate_uuid
+
+_LAZY_ATTRIBUTES = {
+    "Config": ".config",
+    "ConfigManager": ".config_reload",
+    "ConfigSnapshot": ".config_reload",
+    "Logger": ".logger",
+    "HTTPSessionManager": ".http_session",
+    "CircuitBreaker": ".circuit_breaker",
+    "ResilienceEngine": ".circuit_breaker",
+    "validate_social_media_config": ".validators",
+    "validate_ai_config": ".validators",
+    "format_datetime": ".helpers",
+    "sanitize_text": ".helpers",
+    "generate_uuid": ".helpers",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Importa o atributo público sob demanda (PEP 562)"""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # Próximos acessos não passam por __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     "Config",
+    "ConfigManager",
+    "ConfigSnapshot",
     "Logger", 
+    "HTTPSessionManager",
+    "CircuitBreaker",
+    "ResilienceEngine",
     "validate_social_media_config",
     "validate_ai_config",
     "format_datetime",
@@ -0,0 +1,490 @@
+"""
+Motor de resiliência do SocialBot AI
+
+Combina três mecanismos para chamadas a APIs externas:
+
+- **Circuit breaker por endpoint** (fechado / aberto / meio-aberto): após
+  falhas consecutivas o circuito abre e as chamadas são rejeitadas na hora,
+  sem esperar timeouts; depois do ``recovery_timeout`` algumas chamadas de
+  teste decidem se ele fecha de novo.
+- **Orçamento de retries**: os retries ficam limitados a uma fração do
+  tráfego recente, para que uma API instável não receba uma avalanche de
+  novas tentativas.
+- **Backoff com full jitter**: espera aleatória entre 0 e
+  ``get_retry_delay()``, respeitando ``retry_after`` de rate limits.
+
+Example:
+    >>> resilience = ResilienceEngine()
+    >>> @resilience.protect("twitter:POST /2/tweets")
+    ... async def post_tweet(text):
+    ...     ...
+    >>> async with resilience.guard("instagram:media"):
+    ...     await upload()
+"""
+
+import asyncio
+import functools
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from .exceptions import (
+    ErrorCode,
+    RateLimitError,
+    SocialBotError,
+    get_retry_delay,
+    is_retryable_error
+)
+
+T = TypeVar("T")
+
+
+class CircuitState(Enum):
+    """Estados do circuit breaker"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# Estado do circuito -> status no mapa ``components`` do /health
+HEALTH_STATUS = {
+    CircuitState.CLOSED: "healthy",
+    CircuitState.HALF_OPEN: "degraded",
+    CircuitState.OPEN: "unhealthy"
+}
+
+
+class CircuitOpenError(SocialBotError):
+    """Chamada rejeitada porque o circuito do endpoint está aberto"""
+
+    __slots__ = ()
+
+    def __init__(self, endpoint: str, retry_after: int, **kwargs):
+        kwargs.setdefault("details", {})["endpoint"] = endpoint
+        super().__init__(
+            message=f"Circuit breaker aberto para {endpoint}",
+            error_code=ErrorCode.SYSTEM_DEPENDENCY_UNAVAILABLE,
+            retry_after=retry_after,
+            user_message="Serviço temporariamente indisponível. Tente novamente em instantes.",
+            **kwargs
+        )
+
+
+class RetryBudgetExceeded(SocialBotError):
+    """Retry negado porque o orçamento de retries acabou"""
+
+    __slots__ = ()
+
+    def __init__(self, endpoint: str, cause: Exception, **kwargs):
+        kwargs.setdefault("details", {})["endpoint"] = endpoint
+        super().__init__(
+            message=f"Orçamento de retries esgotado para {endpoint}",
+            error_code=ErrorCode.SYSTEM_RESOURCE_EXHAUSTED,
+            cause=cause,
+            **kwargs
+        )
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker de um endpoint
+
+    Example:
+        >>> breaker = CircuitBreaker("twitter:POST /2/tweets")
+        >>> breaker.before_call()  # levanta CircuitOpenError se aberto
+        >>> breaker.record_success()
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Inicializa o circuit breaker
+
+        Args:
+            name: Identificador do endpoint
+            failure_threshold: Falhas consecutivas que abrem o circuito
+            recovery_timeout: Segundos em aberto antes de testar de novo
+            half_open_max_calls: Chamadas de teste simultâneas no meio-aberto
+            clock: Relógio monotônico (injetável para testes)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self.total_failures = 0
+        self.total_rejections = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Estado atual (passa de aberto para meio-aberto após o timeout)"""
+        if (
+            self._state is CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def before_call(self) -> None:
+        """
+        Autoriza uma chamada
+
+        Raises:
+            CircuitOpenError: Se o circuito está aberto ou sem vagas de teste
+        """
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return
+        if state is CircuitState.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return
+
+        self.total_rejections += 1
+        remaining = self.recovery_timeout - (self._clock() - self._opened_at)
+        raise CircuitOpenError(self.name, retry_after=max(int(remaining + 0.999), 1))
+
+    def release(self) -> None:
+        """
+        Devolve a vaga de teste de uma chamada interrompida sem resultado
+
+        Cancelamentos (``CancelledError`` de um timeout do chamador) não dizem
+        nada sobre o serviço: não contam como falha nem como sucesso, mas a
+        vaga precisa voltar, senão o meio-aberto rejeita tudo para sempre.
+        """
+        if self._state is CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def record_success(self) -> None:
+        """Registra sucesso (fecha o circuito se estava em teste)"""
+        self._consecutive_failures = 0
+        if self._state is CircuitState.HALF_OPEN:
+            self._state = CircuitState.CLOSED
+            self._half_open_calls = 0
+
+    def record_failure(self) -> None:
+        """Registra falha (abre o circuito no limite ou se falhou em teste)"""
+        self.total_failures += 1
+        self._consecutive_failures += 1
+        if (
+            self._state is CircuitState.HALF_OPEN
+            or self._consecutive_failures >= self.failure_threshold
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        if self._state is not CircuitState.OPEN:
+            self.times_opened += 1
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self._half_open_calls = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado do circuito para métricas e dashboard"""
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._consecutive_failures,
+            "total_failures": self.total_failures,
+            "total_rejections": self.total_rejections,
+            "times_opened": self.times_opened
+        }
+
+
+class RetryBudget:
+    """
+    Limita retries a uma fração das requisições recentes
+
+    Sempre permite ``min_retries`` por janela, para que endpoints com pouco
+    tráfego ainda possam tentar de novo.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_retries: int = 10,
+        window: float = 10.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Inicializa o orçamento
+
+        Args:
+            ratio: Fração máxima de retries sobre as requisições na janela
+            min_retries: Retries sempre permitidos por janela
+            window: Tamanho da janela em segundos
+            clock: Relógio monotônico (injetável para testes)
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._clock = clock
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+
+    def _trim(self) -> None:
+        cutoff = self._clock() - self.window
+        for events in (self._requests, self._retries):
+            while events and events[0] <= cutoff:
+                events.popleft()
+
+    def record_request(self) -> None:
+        """Registra uma requisição original (não retry)"""
+        self._requests.append(self._clock())
+
+    def try_spend(self) -> bool:
+        """Consome um retry do orçamento se houver saldo"""
+        self._trim()
+        allowed = max(self.min_retries, int(len(self._requests) * self.ratio))
+        if len(self._retries) >= allowed:
+            return False
+        self._retries.append(self._clock())
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Uso atual do orçamento"""
+        self._trim()
+        return {
+            "requests": len(self._requests),
+            "retries": len(self._retries),
+            "allowed": max(self.min_retries, int(len(self._requests) * self.ratio))
+        }
+
+
+def full_jitter_delay(exception: Exception, attempt: int, max_delay: float = 300.0) -> float:
+    """
+    Espera antes de um retry com full jitter
+
+    ``retry_after`` de um rate limit é respeitado sem redução; nos demais
+    casos a espera é sorteada entre 0 e ``get_retry_delay()``, o que evita
+    que vários clientes tentem de novo ao mesmo tempo.
+
+    Args:
+        exception: Exceção que causou a falha
+        attempt: Número da tentativa (1-based)
+        max_delay: Espera máxima em segundos
+    """
+    if isinstance(exception, RateLimitError) and exception.retry_after:
+        return float(exception.retry_after)
+    return random.uniform(0, min(get_retry_delay(exception, attempt), max_delay))
+
+
+class ResilienceEngine:
+    """
+    Circuit breakers por endpoint + orçamento de retries compartilhado
+
+    Example:
+        >>> engine = ResilienceEngine.from_config(config.resilience)
+        >>> result = await engine.call("openai:chat", client.create, prompt)
+        >>> engine.health_components()
+        {'circuit:openai:chat': 'healthy'}
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        max_attempts: int = 3,
+        retry_budget: Optional[RetryBudget] = None,
+        max_delay: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep
+    ):
+        """
+        Inicializa o motor
+
+        Args:
+            failure_threshold: Falhas consecutivas que abrem um circuito
+            recovery_timeout: Segundos em aberto antes do meio-aberto
+            half_open_max_calls: Chamadas de teste no meio-aberto
+            max_attempts: Tentativas por chamada (incluindo a primeira)
+            retry_budget: Orçamento de retries (padrão: 20% do tráfego)
+            max_delay: Espera máxima entre tentativas
+            clock: Relógio monotônico (injetável para testes)
+            sleep: Função de espera (injetável para testes)
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.max_attempts = max_attempts
+        self.retry_budget = retry_budget or RetryBudget(clock=clock)
+        self.max_delay = max_delay
+        self._clock = clock
+        self._sleep = sleep
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    @classmethod
+    def from_config(cls, resilience_config: Any) -> "ResilienceEngine":
+        """Cria o motor a partir do ``ResilienceConfig``"""
+        return cls(
+            failure_threshold=resilience_config.failure_threshold,
+            recovery_timeout=resilience_config.recovery_timeout,
+            max_attempts=resilience_config.max_attempts,
+            retry_budget=RetryBudget(
+                ratio=resilience_config.retry_budget_ratio,
+                min_retries=resilience_config.retry_budget_min
+            ),
+            max_delay=resilience_config.max_delay
+        )
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """Circuit breaker do endpoint (criado sob demanda)"""
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                endpoint,
+                failure_threshold=self.failure_threshold,
+                recovery_timeout=self.recovery_timeout,
+                half_open_max_calls=self.half_open_max_calls,
+                clock=self._clock
+            )
+            self._breakers[endpoint] = breaker
+        return breaker
+
+    @staticmethod
+    def _record_outcome(breaker: CircuitBreaker, error: Optional[Exception]) -> None:
+        # Só falhas do serviço (timeout, 5xx, conexão) contam para o circuito;
+        # erros do cliente (401, 400...) provam que o serviço está respondendo
+        if error is not None and is_retryable_error(error):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    @asynccontextmanager
+    async def guard(self, endpoint: str):
+        """
+        Protege um bloco com o circuit breaker do endpoint (sem retry)
+
+        Raises:
+            CircuitOpenError: Se o circuito está aberto
+        """
+        breaker = self.breaker(endpoint)
+        breaker.before_call()
+        try:
+            yield breaker
+        except Exception as e:
+            self._record_outcome(breaker, e)
+            raise
+        except BaseException:
+            breaker.release()  # Cancelado: libera a vaga de teste sem contar falha
+            raise
+        self._record_outcome(breaker, None)
+
+    async def call(
+        self,
+        endpoint: str,
+        func: Callable[..., Awaitable[T]],
+        *args: Any,
+        max_attempts: Optional[int] = None,
+        **kwargs: Any
+    ) -> T:
+        """
+        Executa ``func`` com circuit breaker, retries e backoff
+
+        Args:
+            endpoint: Identificador do endpoint (chave do circuito)
+            func: Corrotina a executar
+            max_attempts: Sobrescreve o número de tentativas
+
+        Raises:
+            CircuitOpenError: Se o circuito está aberto
+            RetryBudgetExceeded: Se o erro é retryable mas o orçamento acabou
+        """
+        attempts = max_attempts or self.max_attempts
+        breaker = self.breaker(endpoint)
+        self.retry_budget.record_request()
+
+        attempt = 1
+        while True:
+            breaker.before_call()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                self._record_outcome(breaker, e)
+                retryable = is_retryable_error(e) or isinstance(e, RateLimitError)
+                if not retryable or attempt >= attempts:
+                    raise
+                if not self.retry_budget.try_spend():
+                    raise RetryBudgetExceeded(endpoint, cause=e) from e
+                await self._sleep(full_jitter_delay(e, attempt, self.max_delay))
+                attempt += 1
+                continue
+            except BaseException:
+                breaker.release()  # Cancelado: libera a vaga de teste sem contar falha
+                raise
+
+            breaker.record_success()
+            return result
+
+    def protect(
+        self,
+        endpoint: str,
+        max_attempts: Optional[int] = None
+    ) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+        """Decorator que aplica ``call()`` a uma corrotina"""
+        def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> T:
+                return await self.call(endpoint, func, *args, max_attempts=max_attempts, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado de todos os circuitos e do orçamento de retries"""
+        return {
+            "circuits": {name: breaker.snapshot() for name, breaker in self._breakers.items()},
+            "retry_budget": self.retry_budget.snapshot()
+        }
+
+    def health_components(self) -> Dict[str, str]:
+        """Entradas do mapa ``components`` do endpoint /health"""
+        return {
+            f"circuit:{name}": HEALTH_STATUS[breaker.state]
+            for name, breaker in self._breakers.items()
+        }
+
+    def register_prometheus_collector(self, registry: Any = None) -> None:
+        """Exporta o estado dos circuitos como métricas Prometheus (se instalado)"""
+        try:
+            from prometheus_client import REGISTRY
+            from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+        except ImportError:
+            return
+
+        engine = self
+
+        class CircuitCollector:
+            def collect(self):
+                state = GaugeMetricFamily(
+                    "socialbot_circuit_state",
+                    "Estado do circuit breaker (0 fechado, 1 meio-aberto, 2 aberto)",
+                    labels=["endpoint"]
+                )
+                rejections = CounterMetricFamily(
+                    "socialbot_circuit_rejections",
+                    "Chamadas rejeitadas com o circuito aberto",
+                    labels=["endpoint"]
+                )
+                levels = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+                for name, breaker in engine._breakers.items():
+                    state.add_metric([name], levels[breaker.state])
+                    rejections.add_metric([name], breaker.total_rejections)
+                yield state
+                yield rejections
+
+        (registry or REGISTRY).register(CircuitCollector())
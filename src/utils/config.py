@@ -6,11 +6,43 @@ Carrega e valida todas as configurações do arquivo .env e variáveis de ambien
 
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from dotenv import load_dotenv
 
 
+def find_env_file(start_dir: str) -> Optional[Path]:
+    """
+    Procura o .env no diretório e nos pais
+
+    Sem cache: um ``.env`` criado depois da partida é encontrado no próximo
+    reload (a busca custa alguns ``stat`` e só roda ao carregar a config).
+    """
+    current_dir = Path(start_dir)
+    for parent in [current_dir] + list(current_dir.parents):
+        env_path = parent / ".env"
+        if env_path.exists():
+            return env_path
+    return None
+
+
+# (caminho, mtime) dos .env já carregados no processo
+_loaded_env_files: Dict[str, Tuple[int, int]] = {}
+
+
+def load_env_file(env_path: Path) -> None:
+    """Carrega o .env uma única vez enquanto o arquivo não mudar"""
+    try:
+        stat = env_path.stat()
+    except OSError:
+        return
+    signature = (stat.st_mtime_ns, stat.st_size)
+    if _loaded_env_files.get(str(env_path)) == signature:
+        return
+    load_dotenv(env_path)
+    _loaded_env_files[str(env_path)] = signature
+
+
 @dataclass
 class TwitterConfig:
     """Configurações do Twitter/X"""
@@ -51,6 +83,30 @@ class AIConfig:
     max_length: int = 280
     temperature: float = 0.7
     top_p: float = 0.9
+    batch_window_ms: float = 20.0
+    batch_max_size: int = 8
+    cache_max_entries: int = 1024
+    cache_ttl_seconds: int = 3600
+    cache_use_redis: bool = False
+    provider_policy: str = "sequential"
+    hedge_quantile: float = 0.95
+    hedge_min_delay_ms: float = 50.0
+    hedge_max_delay_ms: float = 10000.0
+    dedup_enabled: bool = True
+    dedup_threshold: float = 0.92
+    dedup_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    dedup_index_dir: str = "data/dedup"
+    sentiment_model: str = "cardiffnlp/twitter-xlm-roberta-base-sentiment"
+    sentiment_batch_size: int = 32
+    sentiment_threads: int = 2
+    inference_backend: str = "torch"
+    model_cache_dir: str = "data/models"
+    warmup_models: bool = True
+    model_host_socket: str = ""
+    hashtag_refresh_interval: float = 300.0
+    hashtag_half_life_hours: float = 72.0
+    hashtag_index_path: str = "data/hashtags.npz"
+    stream_first_token_timeout: float = 10.0
 
 
 @dataclass
@@ -60,6 +116,28 @@ class DatabaseConfig:
     redis_url: str = "redis://localhost:6379/0"
 
 
+@dataclass
+class HTTPConfig:
+    """Configurações da sessão HTTP compartilhada"""
+    max_connections: int = 100
+    max_connections_per_host: int = 20
+    max_in_flight: int = 64
+    dns_cache_ttl: int = 300
+    keepalive_timeout: float = 30.0
+    timeout: float = 30.0
+
+
+@dataclass
+class ResilienceConfig:
+    """Configurações de circuit breaker e retries"""
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+    max_attempts: int = 3
+    retry_budget_ratio: float = 0.2
+    retry_budget_min: int = 10
+    max_delay: float = 300.0
+
+
 @dataclass
 class DashboardConfig:
     """Configurações do dashboard"""
@@ -70,6 +148,9 @@ class DashboardConfig:
     secret_key: str = "change-this-secret-key"
     admin_username: str = "admin"
     admin_password: str = "change-this-password"
+    cache_ttl: float = 30.0
+    snapshot_ttl: float = 300.0
+    invalidation_interval: float = 5.0
 
 
 @dataclass
@@ -91,17 +172,10 @@ class Config:
         Args:
             env_file: Caminho para o arquivo .env (opcional)
         """
-        # Carrega variáveis de ambiente
-        if env_file:
-            load_dotenv(env_file)
-        else:
-            # Procura por .env no diretório atual e nos pais
-            current_dir = Path.cwd()
-            for parent in [current_dir] + list(current_dir.parents):
-                env_path = parent / ".env"
-                if env_path.exists():
-                    load_dotenv(env_path)
-                    break
+        # Carrega variáveis de ambiente (.env do diretório atual ou dos pais)
+        self.env_file = Path(env_file) if env_file else find_env_file(str(Path.cwd()))
+        if self.env_file:
+            load_env_file(self.env_file)
         
         # Inicializa configurações
         self.twitter = self._load_twitter_config()
@@ -109,6 +183,8 @@ class Config:
         self.linkedin = self._load_linkedin_config()
         self.ai = self._load_ai_config()
         self.database = self._load_database_config()
+        self.http = self._load_http_config()
+        self.resilience = self._load_resilience_config()
         self.dashboard = self._load_dashboard_config()
         self.google = self._load_google_config()
         
@@ -119,6 +195,38 @@ class Config:
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
         self.timezone = os.getenv("TIMEZONE", "America/Sao_Paulo")
         
+        # Rate limiting (local por processo ou compartilhado via Redis)
+        self.rate_limit_backend = os.getenv("RATE_LIMIT_BACKEND", "local")
+        self.rate_limit_mode = os.getenv("RATE_LIMIT_MODE", "sliding_window")
+        
+        # Pipeline de menções (filas limitadas entre os estágios)
+        self.mention_poll_interval = float(os.getenv("MENTION_POLL_INTERVAL", "60"))
+        self.mention_queue_size = int(os.getenv("MENTION_QUEUE_SIZE", "100"))
+        self.mention_reply_concurrency = int(os.getenv("MENTION_REPLY_CONCURRENCY", "4"))
+        self.mention_post_concurrency = int(os.getenv("MENTION_POST_CONCURRENCY", "2"))
+        
+        # Atualização de métricas em lote (intervalo dobra com a idade do post)
+        self.metrics_poll_min_interval = float(os.getenv("METRICS_POLL_MIN_INTERVAL", "300"))
+        self.metrics_poll_max_interval = float(os.getenv("METRICS_POLL_MAX_INTERVAL", "86400"))
+        self.metrics_poll_doubling_hours = float(os.getenv("METRICS_POLL_DOUBLING_HOURS", "12"))
+        self.metrics_poll_max_age_days = float(os.getenv("METRICS_POLL_MAX_AGE_DAYS", "30"))
+        
+        # Store colunar de engajamento (segmentos por dia/plataforma)
+        self.engagement_store_dir = os.getenv("ENGAGEMENT_STORE_DIR", "data/engagement")
+        self.engagement_segment_rows = int(os.getenv("ENGAGEMENT_SEGMENT_ROWS", "1000000"))
+        
+        # Exportação de relatórios em streaming (linhas por bloco/row group)
+        self.report_chunk_rows = int(os.getenv("REPORT_CHUNK_ROWS", "100000"))
+        
+        # Melhor horário/hashtags/taxa com decaimento (atualizados a cada métrica)
+        self.analytics_half_life_hours = float(os.getenv("ANALYTICS_HALF_LIFE_HOURS", "168"))
+        self.analytics_state_path = os.getenv("ANALYTICS_STATE_PATH", "data/engagement_model.json")
+        self.analytics_checkpoint_interval = float(os.getenv("ANALYTICS_CHECKPOINT_INTERVAL", "300"))
+        
+        # Recarga a quente do .env
+        self.config_watch = os.getenv("CONFIG_WATCH", "true").lower() == "true"
+        self.config_poll_interval = float(os.getenv("CONFIG_POLL_INTERVAL", "2"))
+        
         # Configurações de conteúdo
         self.default_hashtags = os.getenv("DEFAULT_HASHTAGS", "#AI #automation #socialmedia").split()
         self.preferred_post_times = self._parse_post_times(
@@ -174,7 +282,31 @@ class Config:
             model_name=os.getenv("AI_MODEL_NAME", "microsoft/DialoGPT-medium"),
             max_length=int(os.getenv("AI_MAX_LENGTH", "280")),
             temperature=float(os.getenv("AI_TEMPERATURE", "0.7")),
-            top_p=float(os.getenv("AI_TOP_P", "0.9"))
+            top_p=float(os.getenv("AI_TOP_P", "0.9")),
+            batch_window_ms=float(os.getenv("AI_BATCH_WINDOW_MS", "20")),
+            batch_max_size=int(os.getenv("AI_BATCH_MAX_SIZE", "8")),
+            cache_max_entries=int(os.getenv("AI_CACHE_MAX_ENTRIES", "1024")),
+            cache_ttl_seconds=int(os.getenv("AI_CACHE_TTL_SECONDS", "3600")),
+            cache_use_redis=os.getenv("AI_CACHE_USE_REDIS", "false").lower() == "true",
+            provider_policy=os.getenv("AI_PROVIDER_POLICY", "sequential"),
+            hedge_quantile=float(os.getenv("AI_HEDGE_QUANTILE", "0.95")),
+            hedge_min_delay_ms=float(os.getenv("AI_HEDGE_MIN_DELAY_MS", "50")),
+            hedge_max_delay_ms=float(os.getenv("AI_HEDGE_MAX_DELAY_MS", "10000")),
+            dedup_enabled=os.getenv("AI_DEDUP_ENABLED", "true").lower() == "true",
+            dedup_threshold=float(os.getenv("AI_DEDUP_THRESHOLD", "0.92")),
+            dedup_model=os.getenv("AI_DEDUP_MODEL", "sentence-transformers/all-MiniLM-L6-v2"),
+            dedup_index_dir=os.getenv("AI_DEDUP_INDEX_DIR", "data/dedup"),
+            sentiment_model=os.getenv("AI_SENTIMENT_MODEL", "cardiffnlp/twitter-xlm-roberta-base-sentiment"),
+            sentiment_batch_size=int(os.getenv("AI_SENTIMENT_BATCH_SIZE", "32")),
+            sentiment_threads=int(os.getenv("AI_SENTIMENT_THREADS", "2")),
+            inference_backend=os.getenv("AI_INFERENCE_BACKEND", "torch"),
+            model_cache_dir=os.getenv("AI_MODEL_CACHE_DIR", "data/models"),
+            warmup_models=os.getenv("AI_WARMUP_MODELS", "true").lower() == "true",
+            model_host_socket=os.getenv("AI_MODEL_HOST_SOCKET", ""),
+            hashtag_refresh_interval=float(os.getenv("AI_HASHTAG_REFRESH_INTERVAL", "300")),
+            hashtag_half_life_hours=float(os.getenv("AI_HASHTAG_HALF_LIFE_HOURS", "72")),
+            hashtag_index_path=os.getenv("AI_HASHTAG_INDEX_PATH", "data/hashtags.npz"),
+            stream_first_token_timeout=float(os.getenv("AI_STREAM_FIRST_TOKEN_TIMEOUT", "10"))
         )
     
     def _load_database_config(self) -> DatabaseConfig:
@@ -184,6 +316,28 @@ class Config:
             redis_url=os.getenv("REDIS_URL", "redis://localhost:6379/0")
         )
     
+    def _load_http_config(self) -> HTTPConfig:
+        """Carrega configurações da sessão HTTP"""
+        return HTTPConfig(
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+            max_connections_per_host=int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20")),
+            max_in_flight=int(os.getenv("HTTP_MAX_IN_FLIGHT", "64")),
+            dns_cache_ttl=int(os.getenv("HTTP_DNS_CACHE_TTL", "300")),
+            keepalive_timeout=float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30")),
+            timeout=float(os.getenv("HTTP_TIMEOUT", "30"))
+        )
+    
+    def _load_resilience_config(self) -> ResilienceConfig:
+        """Carrega configurações de resiliência"""
+        return ResilienceConfig(
+            failure_threshold=int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5")),
+            recovery_timeout=float(os.getenv("CIRCUIT_RECOVERY_TIMEOUT", "30")),
+            max_attempts=int(os.getenv("RETRY_MAX_ATTEMPTS", "3")),
+            retry_budget_ratio=float(os.getenv("RETRY_BUDGET_RATIO", "0.2")),
+            retry_budget_min=int(os.getenv("RETRY_BUDGET_MIN", "10")),
+            max_delay=float(os.getenv("RETRY_MAX_DELAY", "300"))
+        )
+    
     def _load_dashboard_config(self) -> DashboardConfig:
         """Carrega configurações do dashboard"""
         return DashboardConfig(
@@ -193,7 +347,10 @@ class Config:
             fastapi_host=os.getenv("FASTAPI_HOST", "0.0.0.0"),
             secret_key=os.getenv("SECRET_KEY", "change-this-secret-key"),
             admin_username=os.getenv("ADMIN_USERNAME", "admin"),
-            admin_password=os.getenv("ADMIN_PASSWORD", "change-this-password")
+            admin_password=os.getenv("ADMIN_PASSWORD", "change-this-password"),
+            cache_ttl=float(os.getenv("DASHBOARD_CACHE_TTL", "30")),
+            snapshot_ttl=float(os.getenv("DASHBOARD_SNAPSHOT_TTL", "300")),
+            invalidation_interval=float(os.getenv("DASHBOARD_INVALIDATION_INTERVAL", "5"))
         )
     
     def _load_google_config(self) -> GoogleConfig:
@@ -0,0 +1,385 @@
+"""
+Recarga a quente das configurações do SocialBot AI
+
+O ``ConfigManager`` mantém um ``ConfigSnapshot`` imutável e versionado. Quando
+o ``.env`` muda (inotify no Linux, polling nos demais sistemas), uma nova
+``Config`` é montada e publicada com uma única troca de referência: quem já
+leu o snapshot anterior termina o trabalho em andamento com ele, e os
+componentes inscritos recebem o novo (rate limits, horários preferenciais,
+temperatura da IA...) sem restart.
+
+Example:
+    >>> manager = ConfigManager()
+    >>> manager.subscribe(
+    ...     rate_limit_subscriber(twitter_limiter, "twitter"),
+    ...     sections=("twitter",)
+    ... )
+    >>> await manager.start_watching()
+    >>> manager.current.config.ai.temperature
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import inspect
+import logging
+import os
+import struct
+import time
+from dataclasses import asdict, dataclass, field, is_dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple, Union
+
+from dotenv import dotenv_values
+
+from .config import Config, find_env_file
+
+# Máscaras do inotify (linux/inotify.h)
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+# Seção sem dataclass própria (BOT_NAME, PREFERRED_POST_TIMES, ...)
+GENERAL_SECTION = "general"
+
+
+def config_sections(config: Config) -> Dict[str, Any]:
+    """Valores da ``Config`` agrupados por seção, para comparação"""
+    sections: Dict[str, Any] = {GENERAL_SECTION: {}}
+    for name, value in vars(config).items():
+        if is_dataclass(value):
+            sections[name] = asdict(value)
+        elif name != "env_file":
+            sections[GENERAL_SECTION][name] = value
+    return sections
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Versão publicada das configurações"""
+    version: int
+    config: Config
+    sections: Mapping[str, Any]
+    changed: FrozenSet[str] = frozenset()
+    loaded_at: float = field(default_factory=time.time)
+
+
+Subscriber = Callable[[ConfigSnapshot], Any]
+
+
+class ConfigWatcher:
+    """
+    Observa um arquivo e chama ``on_change`` quando ele muda
+
+    Usa inotify no diretório do arquivo (cobre editores que salvam via
+    rename e arquivos criados depois) e cai para polling de mtime/tamanho se
+    o inotify não existir. Aceita vários caminhos candidatos: a mudança em
+    qualquer um deles dispara ``on_change``.
+    """
+
+    def __init__(
+        self,
+        path: Union[Path, Sequence[Path]],
+        on_change: Callable[[], Awaitable[Any]],
+        poll_interval: float = 2.0,
+        debounce: float = 0.2,
+        use_inotify: bool = True
+    ):
+        """
+        Inicializa o observador
+
+        Args:
+            path: Arquivo observado (ou lista de candidatos)
+            on_change: Corrotina chamada a cada mudança (agrupada pelo debounce)
+            poll_interval: Intervalo do polling em segundos
+            debounce: Espera para agrupar escritas em sequência
+            use_inotify: Tenta inotify antes do polling
+        """
+        if isinstance(path, (str, os.PathLike)):
+            path = [path]
+        self.paths = [Path(candidate) for candidate in path]
+        self.path = self.paths[0]
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.use_inotify = use_inotify
+        self.backend: Optional[str] = None
+        self.logger = logging.getLogger(__name__)
+
+        self._task: Optional[asyncio.Task] = None
+        self._inotify_fd: Optional[int] = None
+        self._watched: Dict[int, FrozenSet[str]] = {}  # wd -> nomes observados no diretório
+        self._changed = asyncio.Event()
+
+    def _signature(self) -> Tuple[Optional[Tuple[int, int]], ...]:
+        signatures = []
+        for path in self.paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                signatures.append(None)
+            else:
+                signatures.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(signatures)
+
+    def _open_inotify(self) -> Optional[int]:
+        """Cria o descritor do inotify via libc (None se indisponível)"""
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+            names: Dict[Path, set] = {}
+            for path in self.paths:
+                names.setdefault(path.parent, set()).add(path.name)
+            for directory, directory_names in names.items():
+                wd = libc.inotify_add_watch(fd, str(directory).encode(), mask)
+                if wd >= 0:  # Diretório inexistente fica de fora
+                    self._watched[wd] = frozenset(directory_names)
+            if not self._watched:
+                os.close(fd)
+                return None
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def _on_inotify_readable(self) -> None:
+        try:
+            data = os.read(self._inotify_fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        offset = 0
+        while offset < len(data):
+            wd, _, _, name_length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = data[offset:offset + name_length].rstrip(b"\0").decode(errors="replace")
+            offset += name_length
+            if name in self._watched.get(wd, ()):
+                self._changed.set()
+
+    async def start(self) -> None:
+        """Começa a observar o arquivo"""
+        if self._task is not None:
+            return
+
+        loop = asyncio.get_running_loop()
+        if self.use_inotify:
+            self._inotify_fd = self._open_inotify()
+        if self._inotify_fd is not None:
+            loop.add_reader(self._inotify_fd, self._on_inotify_readable)
+            self.backend = "inotify"
+            self._task = asyncio.create_task(self._run_inotify())
+        else:
+            self.backend = "polling"
+            self._task = asyncio.create_task(self._run_polling(self._signature()))
+        target = self.path if len(self.paths) == 1 else f"{self.path.name} em {len(self.paths)} diretórios"
+        self.logger.info(f"👀 Observando {target} ({self.backend})")
+
+    async def _run_inotify(self) -> None:
+        while True:
+            await self._changed.wait()
+            await asyncio.sleep(self.debounce)
+            self._changed.clear()
+            await self._notify()
+
+    async def _run_polling(self, last: Optional[Tuple[int, int]]) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            current = self._signature()
+            if current != last:
+                last = current
+                await self._notify()
+
+    async def _notify(self) -> None:
+        try:
+            await self.on_change()
+        except Exception as e:
+            self.logger.error(f"❌ Erro ao processar mudança em {self.path}: {e}")
+
+    async def stop(self) -> None:
+        """Para de observar e libera o descritor do inotify"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._inotify_fd is not None:
+            asyncio.get_running_loop().remove_reader(self._inotify_fd)
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+            self._watched.clear()
+
+
+class ConfigManager:
+    """
+    Dono do snapshot atual das configurações
+
+    Leitores usam ``manager.current`` (uma leitura de referência, sem lock).
+    ``reload()`` monta a nova ``Config`` fora do caminho dos leitores e só
+    publica se ela for válida.
+    """
+
+    def __init__(self, env_file: Optional[str] = None, config_factory: Callable[..., Config] = Config):
+        """
+        Inicializa o gerenciador e publica o snapshot inicial (versão 1)
+
+        Args:
+            env_file: Caminho do .env (padrão: procura no diretório atual e pais)
+            config_factory: Construtor da ``Config`` (injetável para testes)
+        """
+        self.env_file = Path(env_file) if env_file else find_env_file(str(Path.cwd()))
+        self._discover_env_file = not env_file  # Procura de novo a cada reload
+        self.config_factory = config_factory
+        self.logger = logging.getLogger(__name__)
+
+        self._file_values = self._read_env_file()
+        config = config_factory(str(self.env_file) if self.env_file else None)
+        self._snapshot = ConfigSnapshot(
+            version=1,
+            config=config,
+            sections=MappingProxyType(config_sections(config))
+        )
+        self._subscribers: List[Tuple[Subscriber, Optional[FrozenSet[str]]]] = []
+        self._reload_lock = asyncio.Lock()
+        self._watcher: Optional[ConfigWatcher] = None
+
+    @property
+    def current(self) -> ConfigSnapshot:
+        """Snapshot publicado mais recente"""
+        return self._snapshot
+
+    def subscribe(self, callback: Subscriber, sections: Optional[Tuple[str, ...]] = None) -> Callable[[], None]:
+        """
+        Inscreve um componente para receber novos snapshots
+
+        Args:
+            callback: Função ou corrotina que recebe o ``ConfigSnapshot``
+            sections: Seções de interesse (``twitter``, ``ai``, ``general``...);
+                None recebe qualquer mudança
+
+        Returns:
+            Função que cancela a inscrição
+        """
+        entry = (callback, frozenset(sections) if sections else None)
+        self._subscribers.append(entry)
+        return lambda: self._subscribers.remove(entry)
+
+    def _read_env_file(self) -> Dict[str, Optional[str]]:
+        if self.env_file is None or not self.env_file.exists():
+            return {}
+        return dict(dotenv_values(self.env_file))
+
+    def _apply_env_changes(self, values: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+        """
+        Aplica no ambiente só as chaves que mudaram no .env
+
+        Variáveis definidas pelo deploy continuam valendo na partida (o .env
+        não sobrescreve); uma edição do arquivo durante a execução vale.
+
+        Returns:
+            Valores anteriores das chaves alteradas (para desfazer)
+        """
+        undo: Dict[str, Optional[str]] = {}
+        for key, value in values.items():
+            if value is not None and self._file_values.get(key) != value:
+                undo[key] = os.environ.get(key)
+                os.environ[key] = value
+        for key in self._file_values.keys() - values.keys():
+            if os.environ.get(key) == self._file_values[key]:
+                undo[key] = os.environ.pop(key)
+        return undo
+
+    @staticmethod
+    def _undo_env_changes(undo: Dict[str, Optional[str]]) -> None:
+        for key, value in undo.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    async def reload(self) -> Optional[ConfigSnapshot]:
+        """
+        Relê o .env e publica um novo snapshot se algo mudou
+
+        Returns:
+            Novo snapshot, ou None se nada mudou ou a configuração é inválida
+        """
+        async with self._reload_lock:
+            if self._discover_env_file:
+                self.env_file = find_env_file(str(Path.cwd()))
+            values = self._read_env_file()
+            undo = self._apply_env_changes(values)
+            try:
+                config = self.config_factory(str(self.env_file) if self.env_file else None)
+            except Exception as e:
+                self._undo_env_changes(undo)
+                self.logger.error(f"❌ Configuração inválida, mantendo versão {self._snapshot.version}: {e}")
+                return None
+            self._file_values = values
+
+            sections = config_sections(config)
+            changed = frozenset(
+                name for name in sections.keys() | self._snapshot.sections.keys()
+                if sections.get(name) != self._snapshot.sections.get(name)
+            )
+            if not changed:
+                return None
+
+            snapshot = ConfigSnapshot(
+                version=self._snapshot.version + 1,
+                config=config,
+                sections=MappingProxyType(sections),
+                changed=changed
+            )
+            self._snapshot = snapshot  # Troca atômica da referência
+            self.logger.info(
+                f"🔄 Configuração v{snapshot.version} publicada ({', '.join(sorted(changed))})"
+            )
+
+            for callback, interests in list(self._subscribers):
+                if interests is not None and not interests & changed:
+                    continue
+                try:
+                    result = callback(snapshot)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    self.logger.error(f"❌ Erro ao aplicar configuração v{snapshot.version}: {e}")
+
+            return snapshot
+
+    def _candidate_env_files(self) -> List[Path]:
+        """Onde o .env pode estar: o caminho fixo, ou cada passo da busca do ``find_env_file``"""
+        if not self._discover_env_file:
+            return [self.env_file]
+        current_dir = Path.cwd()
+        return [directory / ".env" for directory in [current_dir] + list(current_dir.parents)]
+
+    async def start_watching(self, poll_interval: float = 2.0, use_inotify: bool = True) -> None:
+        """
+        Observa o .env e recarrega a cada mudança
+
+        Sem caminho fixo, observa todos os candidatos da busca: um .env criado
+        depois (ou mais próximo do diretório atual) é encontrado pelo reload.
+        """
+        if self._watcher is not None:
+            return
+        self._watcher = ConfigWatcher(
+            self._candidate_env_files(), self.reload, poll_interval=poll_interval, use_inotify=use_inotify
+        )
+        await self._watcher.start()
+
+    async def stop_watching(self) -> None:
+        """Para de observar o .env"""
+        if self._watcher is not None:
+            await self._watcher.stop()
+            self._watcher = None
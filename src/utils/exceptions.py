@@ -7,9 +7,14 @@ debugging e monitoramento do sistema.
 
 from typing import Dict, Any, Optional, List
 from enum import Enum
+import math
+import sys
+import time
 import traceback
 from datetime import datetime
 
+from .rate_limit_headers import parse_reset
+
 
 class ErrorCode(Enum):
     """Códigos de erro padronizados"""
@@ -65,8 +70,26 @@ class SocialBotError(Exception):
     Exceção base do SocialBot AI
     
     Fornece contexto rico para debugging e monitoramento.
+    
+    A construção é barata: traceback, timestamp e mensagem padrão só são
+    formatados quando acessados (ao logar ou serializar), já que nos
+    caminhos de retry a maioria das exceções é descartada logo depois. Do
+    traceback fica só o resumo da pilha (arquivo, linha e função), sem
+    referências aos frames e suas variáveis locais.
     """
     
+    __slots__ = (
+        "error_code",
+        "details",
+        "cause",
+        "retry_after",
+        "_user_message",
+        "_created_at",
+        "_timestamp",
+        "_traceback",
+        "_traceback_str"
+    )
+    
     def __init__(
         self,
         message: str,
@@ -92,16 +115,54 @@ class SocialBotError(Exception):
         self.error_code = error_code
         self.details = details or {}
         self.cause = cause
-        self.user_message = user_message or self._get_default_user_message()
         self.retry_after = retry_after
-        self.timestamp = datetime.utcnow()
-        self.traceback_str = traceback.format_exc()
+        self._user_message = user_message
+        self._created_at = time.time()
+        self._timestamp: Optional[datetime] = None
+        # Resumo sem frames (linhas do código lidas só em traceback_str)
+        exc_type, exc_value, exc_tb = sys.exc_info()
+        self._traceback: Optional[traceback.TracebackException] = None
+        if exc_value is not None:
+            self._traceback = traceback.TracebackException(
+                exc_type, exc_value, exc_tb, lookup_lines=False, capture_locals=False
+            )
+        del exc_type, exc_value, exc_tb
+        self._traceback_str: Optional[str] = None
         
         # Adiciona informações da exceção original
         if cause:
             self.details["original_error"] = str(cause)
             self.details["original_type"] = type(cause).__name__
     
+    @property
+    def user_message(self) -> str:
+        """Mensagem amigável (padrão da categoria se não informada)"""
+        if self._user_message is None:
+            self._user_message = self._get_default_user_message()
+        return self._user_message
+    
+    @user_message.setter
+    def user_message(self, value: str) -> None:
+        self._user_message = value
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Momento (UTC) em que a exceção foi criada"""
+        if self._timestamp is None:
+            self._timestamp = datetime.utcfromtimestamp(self._created_at)
+        return self._timestamp
+    
+    @property
+    def traceback_str(self) -> str:
+        """Traceback da exceção em tratamento quando esta foi criada"""
+        if self._traceback_str is None:
+            if self._traceback is None:
+                self._traceback_str = "".join(traceback.format_exception(None, None, None))
+            else:
+                self._traceback_str = "".join(self._traceback.format())
+                self._traceback = None
+        return self._traceback_str
+    
     def _get_default_user_message(self) -> str:
         """Gera mensagem padrão amigável para o usuário"""
         category = self.error_code.value // 1000
@@ -142,6 +203,8 @@ class SocialBotError(Exception):
 class ConfigurationError(SocialBotError):
     """Erros relacionados à configuração do sistema"""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, config_key: Optional[str] = None, **kwargs):
         if config_key:
             kwargs.setdefault("details", {})["config_key"] = config_key
@@ -156,6 +219,8 @@ class ConfigurationError(SocialBotError):
 class APIError(SocialBotError):
     """Erros relacionados a APIs externas"""
     
+    __slots__ = ()
+    
     def __init__(
         self,
         message: str,
@@ -182,6 +247,8 @@ class APIError(SocialBotError):
 class RateLimitError(APIError):
     """Erro específico de rate limiting"""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, retry_after: int = 60, **kwargs):
         super().__init__(
             message=message,
@@ -195,6 +262,8 @@ class RateLimitError(APIError):
 class AuthenticationError(APIError):
     """Erro de autenticação com APIs"""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, **kwargs):
         super().__init__(
             message=message,
@@ -207,6 +276,8 @@ class AuthenticationError(APIError):
 class ContentError(SocialBotError):
     """Erros relacionados à geração e processamento de conteúdo"""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, content_type: Optional[str] = None, **kwargs):
         if content_type:
             kwargs.setdefault("details", {})["content_type"] = content_type
@@ -221,6 +292,8 @@ class ContentError(SocialBotError):
 class SchedulingError(SocialBotError):
     """Erros relacionados ao agendamento de posts"""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, schedule_time: Optional[str] = None, **kwargs):
         if schedule_time:
             kwargs.setdefault("details", {})["schedule_time"] = schedule_time
@@ -235,6 +308,8 @@ class SchedulingError(SocialBotError):
 class DatabaseError(SocialBotError):
     """Erros relacionados ao banco de dados"""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, query: Optional[str] = None, **kwargs):
         if query:
             kwargs.setdefault("details", {})["query"] = query[:500]  # Limita tamanho
@@ -249,6 +324,8 @@ class DatabaseError(SocialBotError):
 class AIError(SocialBotError):
     """Erros relacionados aos serviços de IA"""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, model_name: Optional[str] = None, **kwargs):
         if model_name:
             kwargs.setdefault("details", {})["model_name"] = model_name
@@ -263,6 +340,8 @@ class AIError(SocialBotError):
 class SystemError(SocialBotError):
     """Erros de sistema e recursos"""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, resource: Optional[str] = None, **kwargs):
         if resource:
             kwargs.setdefault("details", {})["resource"] = resource
@@ -276,17 +355,35 @@ class SystemError(SocialBotError):
 
 # Utilitários para tratamento de exceções
 
-def handle_api_response(response, platform: str = "unknown"):
+def handle_api_response(
+    response,
+    platform: str = "unknown",
+    rate_limiter=None,
+    endpoint: Optional[str] = None,
+    token: Optional[str] = None
+):
     """
     Analisa resposta de API e levanta exceção apropriada se necessário
     
     Args:
         response: Objeto de resposta HTTP
         platform: Nome da plataforma (Twitter, Instagram, etc.)
+        rate_limiter: ``AdaptiveRateLimiter`` que aprende a cota com os headers
+            de toda resposta, inclusive as de sucesso (opcional)
+        endpoint: Endpoint chamado (chave da cota no rate limiter)
+        token: Token usado na requisição (cotas são separadas por token)
         
     Raises:
         APIError: Se a resposta indica erro
     """
+    if rate_limiter is not None:
+        rate_limiter.update_from_response(
+            endpoint or platform,
+            response.headers,
+            status_code=response.status_code,
+            token=token
+        )
+    
     if response.status_code == 200:
         return
     
@@ -305,7 +402,7 @@ def handle_api_response(response, platform: str = "unknown"):
     # Extrai retry_after do header se disponível
     retry_after = None
     if response.status_code == 429:
-        retry_after = int(response.headers.get("Retry-After", 60))
+        retry_after = _get_retry_after(response.headers)
     
     raise error_class(
         message=f"API request failed: {response.status_code} {response.reason}",
@@ -316,6 +413,29 @@ def handle_api_response(response, platform: str = "unknown"):
     )
 
 
+def _get_retry_after(headers, default: int = 60) -> int:
+    """
+    Segundos de espera de um 429 (no mínimo 1)
+    
+    Usa ``Retry-After`` (segundos ou data HTTP) e, na ausência de um valor
+    válido, o reset informado nos headers de cota (``x-rate-limit-reset`` em
+    epoch ou ``ratelimit-reset`` relativo). Os nomes não diferenciam
+    maiúsculas de minúsculas.
+    """
+    lowered = {str(name).lower(): value for name, value in headers.items()}
+    now = time.time()
+    for name in ("retry-after", "x-rate-limit-reset", "x-ratelimit-reset", "ratelimit-reset"):
+        value = lowered.get(name)
+        if value is None:
+            continue
+        reset = parse_reset(str(value), now)
+        if reset is not None:
+            # Retry-After: 0 ou negativo não pode virar retry imediato em laço
+            return max(int(math.ceil(reset - now)), 1)
+    
+    return default
+
+
 def log_exception(logger, exception: Exception, context: Optional[Dict[str, Any]] = None):
     """
     Loga exceção com contexto estruturado
@@ -327,6 +447,10 @@ def log_exception(logger, exception: Exception, context: Optional[Dict[str, Any]
     """
     if isinstance(exception, SocialBotError):
         log_data = exception.to_dict()
+        # "message" é reservado no LogRecord e "timestamp" é o do próprio log
+        log_data["error_message"] = log_data.pop("message")
+        log_data["error_timestamp"] = log_data.pop("timestamp")
+        log_data["traceback"] = exception.traceback_str
         if context:
             log_data["context"] = context
         
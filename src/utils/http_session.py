@@ -0,0 +1,284 @@
+"""
+Sessão HTTP compartilhada do SocialBot AI
+
+Um único ``aiohttp.ClientSession`` para todos os clientes de plataforma
+(Twitter, Instagram, LinkedIn, webhooks), criado em
+``SocialBotAI.initialize()`` e fechado em ``stop()``. Assim as conexões TLS
+são reaproveitadas (keep-alive), o DNS fica em cache e o número total de
+requisições simultâneas é limitado globalmente e por host.
+
+As estatísticas de pool por host (abertas, ociosas, em uso, aguardando)
+ficam disponíveis em ``pool_stats()`` e podem ser exportadas para o
+Prometheus com ``register_prometheus_collector()``.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# Coletor Prometheus do pool registrado em cada registry (por id)
+_pool_collectors: Dict[int, Any] = {}
+
+
+class HTTPSessionManager:
+    """
+    Gerencia a sessão HTTP compartilhada
+
+    Example:
+        >>> http = HTTPSessionManager.from_config(config.http)
+        >>> await http.start()
+        >>> async with http.request("GET", "https://api.twitter.com/2/tweets") as response:
+        ...     data = await response.json()
+        >>> await http.close()
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_connections_per_host: int = 20,
+        max_in_flight: int = 64,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+        timeout: float = 30.0
+    ):
+        """
+        Inicializa o gerenciador (a sessão só é criada em ``start()``)
+
+        Args:
+            max_connections: Conexões abertas no total
+            max_connections_per_host: Conexões abertas por host
+            max_in_flight: Requisições simultâneas no total (fila acima disso)
+            dns_cache_ttl: Tempo de cache do DNS em segundos
+            keepalive_timeout: Tempo que uma conexão ociosa fica no pool
+            timeout: Timeout total padrão de cada requisição
+        """
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.max_in_flight = max_in_flight
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._openai_http_client: Any = None
+        self._host_stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"in_flight": 0, "waiting": 0, "created": 0, "reused": 0, "requests": 0}
+        )
+
+    @classmethod
+    def from_config(cls, http_config: Any) -> "HTTPSessionManager":
+        """Cria o gerenciador a partir do ``HTTPConfig``"""
+        return cls(
+            max_connections=http_config.max_connections,
+            max_connections_per_host=http_config.max_connections_per_host,
+            max_in_flight=http_config.max_in_flight,
+            dns_cache_ttl=http_config.dns_cache_ttl,
+            keepalive_timeout=http_config.keepalive_timeout,
+            timeout=http_config.timeout
+        )
+
+    async def start(self) -> None:
+        """Cria o connector e a sessão compartilhados"""
+        if self._session is not None and not self._session.closed:
+            return
+
+        self._connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_connections_per_host,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout,
+            enable_cleanup_closed=True
+        )
+        self._session = aiohttp.ClientSession(
+            connector=self._connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            trace_configs=[self._build_trace_config()]
+        )
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        self.logger.info(
+            f"🌐 Sessão HTTP iniciada ({self.max_connections} conexões, "
+            f"{self.max_connections_per_host} por host)"
+        )
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """Hooks do aiohttp para contar conexões novas, reusadas e filas"""
+        trace = aiohttp.TraceConfig()
+
+        async def on_queued_start(session, context, params):
+            self._host_stats[context.host]["waiting"] += 1
+
+        async def on_queued_end(session, context, params):
+            self._host_stats[context.host]["waiting"] -= 1
+
+        async def on_create_end(session, context, params):
+            self._host_stats[context.host]["created"] += 1
+
+        async def on_reuse(session, context, params):
+            self._host_stats[context.host]["reused"] += 1
+
+        async def on_request_start(session, context, params):
+            # O host fica no contexto desta trace config: requisições feitas direto pela
+            # sessão ou com um trace_request_ctx do chamador (sem "host") também contam
+            request_ctx = context.trace_request_ctx
+            host = request_ctx.get("host") if isinstance(request_ctx, Mapping) else None
+            context.host = host if host is not None else params.url.host or ""
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_queued_start.append(on_queued_start)
+        trace.on_connection_queued_end.append(on_queued_end)
+        trace.on_connection_create_end.append(on_create_end)
+        trace.on_connection_reuseconn.append(on_reuse)
+        return trace
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Sessão compartilhada (exige ``start()``)"""
+        if self._session is None or self._session.closed:
+            raise RuntimeError("HTTPSessionManager não iniciado; chame start() primeiro")
+        return self._session
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs: Any) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Faz uma requisição respeitando o limite global de requisições em voo
+
+        Args:
+            method: Método HTTP
+            url: URL completa
+            **kwargs: Argumentos repassados para ``ClientSession.request``
+
+        Yields:
+            Resposta do aiohttp (liberada ao sair do bloco)
+        """
+        session = self.session
+        host = urlsplit(url).hostname or ""
+        stats = self._host_stats[host]
+
+        stats["waiting"] += 1
+        try:
+            await self._in_flight.acquire()
+        finally:
+            stats["waiting"] -= 1
+
+        stats["in_flight"] += 1
+        stats["requests"] += 1
+        try:
+            kwargs.setdefault("trace_request_ctx", {"host": host})
+            async with session.request(method, url, **kwargs) as response:
+                yield response
+        finally:
+            stats["in_flight"] -= 1
+            self._in_flight.release()
+
+    def pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Estatísticas do pool por host
+
+        Returns:
+            ``{host: {"open", "idle", "in_use", "in_flight", "waiting",
+            "created", "reused", "requests"}}``
+        """
+        idle: Dict[str, int] = defaultdict(int)
+        in_use: Dict[str, int] = defaultdict(int)
+
+        # O aiohttp não expõe o pool publicamente; os atributos internos são
+        # lidos de forma defensiva (versão fixada em requirements.txt)
+        connector = self._connector
+        if connector is not None and not connector.closed:
+            for key, connections in getattr(connector, "_conns", {}).items():
+                idle[key.host] += len(connections)
+            for key, connections in getattr(connector, "_acquired_per_host", {}).items():
+                in_use[key.host] += len(connections)
+
+        hosts = set(self._host_stats) | set(idle) | set(in_use)
+        return {
+            host: {
+                "open": idle[host] + in_use[host],
+                "idle": idle[host],
+                "in_use": in_use[host],
+                **self._host_stats[host]
+            }
+            for host in sorted(hosts)
+        }
+
+    def openai_http_client(self) -> Any:
+        """
+        Cliente ``httpx`` compartilhado para o SDK da OpenAI
+
+        O SDK ``openai`` usa httpx, não aiohttp; este cliente aplica os
+        mesmos limites e keep-alive e é fechado junto com a sessão.
+
+        Example:
+            >>> AsyncOpenAI(api_key=key, http_client=http.openai_http_client())
+        """
+        if self._openai_http_client is None:
+            import httpx
+            self._openai_http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections_per_host,
+                    max_keepalive_connections=self.max_connections_per_host,
+                    keepalive_expiry=self.keepalive_timeout
+                ),
+                timeout=self.timeout
+            )
+        return self._openai_http_client
+
+    def register_prometheus_collector(self, registry: Any = None) -> None:
+        """Exporta ``pool_stats()`` como métricas Prometheus (se instalado)"""
+        try:
+            from prometheus_client import REGISTRY
+            from prometheus_client.core import GaugeMetricFamily
+        except ImportError:
+            self.logger.warning("⚠️ prometheus_client não instalado; métricas HTTP desativadas")
+            return
+
+        manager = self
+
+        class PoolCollector:
+            def collect(self):
+                gauge = GaugeMetricFamily(
+                    "socialbot_http_pool_connections",
+                    "Conexões HTTP por host e estado",
+                    labels=["host", "state"]
+                )
+                for host, stats in manager.pool_stats().items():
+                    for state in ("open", "idle", "in_use", "in_flight", "waiting"):
+                        gauge.add_metric([host, state], stats[state])
+                yield gauge
+
+        # Um segundo manager (ou um novo start) substitui o coletor anterior em vez de
+        # falhar com ValueError por métricas duplicadas
+        registry = registry or REGISTRY
+        previous = _pool_collectors.pop(id(registry), None)
+        if previous is not None:
+            try:
+                registry.unregister(previous)
+            except KeyError:
+                pass
+        collector = PoolCollector()
+        registry.register(collector)
+        _pool_collectors[id(registry)] = collector
+
+    async def close(self) -> None:
+        """Fecha a sessão e todas as conexões do pool"""
+        if self._openai_http_client is not None:
+            await self._openai_http_client.aclose()
+            self._openai_http_client = None
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            # Dá tempo para o fechamento das conexões TLS subjacentes
+            await asyncio.sleep(0.25)
+            self.logger.info("🌐 Sessão HTTP encerrada")
+
+        self._session = None
+        self._connector = None
@@ -0,0 +1,299 @@
+"""
+Sistema de logging do SocialBot AI
+
+``Logger().get_logger(__name__)`` devolve um ``logging.Logger`` comum; a
+configuração dos handlers é feita uma única vez por processo.
+
+No modo fila (padrão), o código assíncrono só coloca o registro em uma fila
+limitada (``QueueHandler``) e uma thread em segundo plano
+(``QueueListener``) formata e grava em stdout/arquivo. Assim um disco lento
+ou um pipe cheio não bloqueia o event loop. Se a fila encher, os registros
+são descartados e contados, nunca bloqueiam quem loga.
+
+Eventos de alto volume podem ser amostrados por logger
+(``Logger.set_sampling("bot.mentions", 0.1)``). WARNING e acima nunca são
+amostrados.
+
+Variáveis de ambiente:
+    LOG_LEVEL, LOG_FORMAT (json/text), LOG_FILE, LOG_QUEUE (true/false),
+    LOG_QUEUE_SIZE, LOG_SAMPLING (``logger=taxa,logger=taxa``)
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Atributos padrão do LogRecord; o resto veio de ``extra=``
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
+
+
+class JSONFormatter(logging.Formatter):
+    """Formata cada registro como uma linha JSON, incluindo o ``extra=``"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    ``QueueHandler`` que nunca bloqueia
+
+    Com a fila cheia o registro é descartado e contado por nível.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Prepara o registro para outra thread sem formatá-lo
+
+        Resolve ``msg % args`` e o traceback agora (os objetos podem mudar
+        depois), mas mantém os campos de ``extra=`` para o formatter JSON.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Amostragem determinística por logger
+
+    Com taxa 0.1 passa 1 a cada 10 registros abaixo de ``min_level``;
+    registros em ``min_level`` ou acima sempre passam.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, min_level: int = logging.WARNING):
+        super().__init__()
+        self.rates: Dict[str, float] = dict(rates or {})
+        self.min_level = min_level
+        self.sampled_out: Dict[str, int] = {}
+        self._credit: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _rate_for(self, name: str) -> Optional[str]:
+        # O logger mais específico configurado vale (``bot`` cobre ``bot.x``)
+        while name:
+            if name in self.rates:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.min_level or not self.rates:
+            return True
+
+        # Sem fila o filtro roda em cada handler; a decisão é uma por registro
+        decision = getattr(record, "_sampled", None)
+        if decision is not None:
+            return decision
+
+        key = self._rate_for(record.name)
+        if key is None:
+            return True
+
+        with self._lock:
+            credit = self._credit.get(key, 1.0 - self.rates[key]) + self.rates[key]
+            decision = credit >= 1.0
+            self._credit[key] = credit - 1.0 if decision else credit
+            if not decision:
+                self.sampled_out[key] = self.sampled_out.get(key, 0) + 1
+        record._sampled = decision
+        return decision
+
+
+def _parse_sampling(value: str) -> Dict[str, float]:
+    rates = {}
+    for item in value.split(","):
+        name, _, rate = item.partition("=")
+        if name.strip() and rate.strip():
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+class Logger:
+    """
+    Gerenciador de logging do SocialBot AI
+
+    A configuração é global ao processo; criar vários ``Logger()`` é barato.
+
+    Example:
+        >>> logger = Logger().get_logger(__name__)
+        >>> logger.info("Post publicado", extra={"platform": "twitter"})
+    """
+
+    _lock = threading.Lock()
+    _configured = False
+    _handlers: List[logging.Handler] = []
+    _queue_handler: Optional[DroppingQueueHandler] = None
+    _listener: Optional[QueueListener] = None
+    _sampling = SamplingFilter()
+
+    def __init__(self):
+        if not Logger._configured:
+            self.configure()
+
+    @classmethod
+    def configure(
+        cls,
+        level: Optional[str] = None,
+        json_format: Optional[bool] = None,
+        log_file: Optional[str] = None,
+        use_queue: Optional[bool] = None,
+        queue_size: Optional[int] = None,
+        sampling: Optional[Dict[str, float]] = None,
+        stream: Any = None
+    ) -> None:
+        """
+        Configura (ou reconfigura) os handlers do logger raiz
+
+        Argumentos omitidos vêm das variáveis ``LOG_*``.
+
+        Args:
+            level: Nível mínimo (ex: ``INFO``)
+            json_format: Linhas JSON (True) ou texto (False)
+            log_file: Arquivo de log adicional (opcional)
+            use_queue: Grava em thread de fundo via fila
+            queue_size: Capacidade da fila
+            sampling: Taxas de amostragem por logger
+            stream: Stream de saída (padrão: stdout)
+        """
+        with cls._lock:
+            cls._teardown()
+
+            level = level or os.getenv("LOG_LEVEL", "INFO")
+            if json_format is None:
+                json_format = os.getenv("LOG_FORMAT", "json").lower() == "json"
+            if log_file is None:
+                log_file = os.getenv("LOG_FILE", "")
+            if use_queue is None:
+                use_queue = os.getenv("LOG_QUEUE", "true").lower() == "true"
+            if queue_size is None:
+                queue_size = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+            if sampling is None:
+                sampling = _parse_sampling(os.getenv("LOG_SAMPLING", ""))
+
+            formatter = JSONFormatter() if json_format else logging.Formatter(TEXT_FORMAT)
+            handlers: List[logging.Handler] = [logging.StreamHandler(stream or sys.stdout)]
+            if log_file:
+                Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+                handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+            for handler in handlers:
+                handler.setFormatter(formatter)
+
+            cls._sampling.rates = dict(sampling)
+            root = logging.getLogger()
+            root.setLevel(level.upper())
+
+            if use_queue:
+                cls._queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+                cls._queue_handler.addFilter(cls._sampling)
+                cls._listener = QueueListener(
+                    cls._queue_handler.queue, *handlers, respect_handler_level=True
+                )
+                cls._listener.start()
+                cls._handlers = [cls._queue_handler]
+            else:
+                for handler in handlers:
+                    handler.addFilter(cls._sampling)
+                cls._handlers = handlers
+
+            for handler in cls._handlers:
+                root.addHandler(handler)
+            cls._configured = True
+
+    @classmethod
+    def _teardown(cls) -> None:
+        root = logging.getLogger()
+        for handler in cls._handlers:
+            root.removeHandler(handler)
+        if cls._listener is not None:
+            cls._listener.stop()  # Grava o que ainda está na fila
+            for handler in cls._listener.handlers:
+                handler.close()
+        else:
+            for handler in cls._handlers:
+                handler.close()
+        cls._handlers = []
+        cls._listener = None
+        cls._queue_handler = None
+        cls._configured = False
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Esvazia a fila e fecha os handlers (chamado também no atexit)"""
+        with cls._lock:
+            cls._teardown()
+
+    def get_logger(self, name: str) -> logging.Logger:
+        """Retorna o logger com o nome informado"""
+        return logging.getLogger(name)
+
+    @classmethod
+    def set_sampling(cls, name: str, rate: Optional[float]) -> None:
+        """
+        Define a taxa de amostragem de um logger (None remove)
+
+        Args:
+            name: Nome do logger (vale também para os filhos)
+            rate: Fração dos registros abaixo de WARNING mantidos (0 a 1)
+        """
+        if rate is None or rate >= 1:
+            cls._sampling.rates.pop(name, None)
+        else:
+            cls._sampling.rates[name] = max(rate, 0.0)
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """Registros descartados (fila cheia), amostrados e tamanho da fila"""
+        handler = cls._queue_handler
+        return {
+            "dropped": dict(handler.dropped) if handler else {},
+            "sampled_out": dict(cls._sampling.sampled_out),
+            "queue_size": handler.queue.qsize() if handler else 0
+        }
+
+
+atexit.register(Logger.shutdown)
@@ -0,0 +1,55 @@
+"""
+Leitura dos headers de espera das APIs
+
+Um único parser para ``Retry-After`` e para os headers de reset de cota
+(``x-rate-limit-reset``, ``x-ratelimit-reset-requests``, ``ratelimit-reset``),
+usado pelo ``AdaptiveRateLimiter`` e por ``handle_api_response``. Os
+formatos aceitos são:
+
+- epoch (Twitter) ou segundos relativos, separados por ``EPOCH_THRESHOLD``;
+- durações da OpenAI (``6m0s``, ``1.5s``, ``20ms``);
+- data HTTP do ``Retry-After`` (``Wed, 21 Oct 2015 07:28:00 GMT``).
+"""
+
+import re
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# Resets acima deste valor são epoch (Twitter); abaixo, segundos relativos
+EPOCH_THRESHOLD = 1_000_000_000
+
+_DURATION_PATTERN = re.compile(r"(?:(\d+(?:\.\d+)?)h)?(?:(\d+(?:\.\d+)?)m(?!s))?(?:(\d+(?:\.\d+)?)s)?(?:(\d+)ms)?$")
+
+
+def parse_reset(value: str, now: float) -> Optional[float]:
+    """
+    Converte um header de reset ou ``Retry-After`` em epoch
+
+    Returns:
+        Epoch do reset, ou None se o valor não está em nenhum formato conhecido
+    """
+    value = str(value).strip()
+    try:
+        number = float(value)
+    except ValueError:
+        match = _DURATION_PATTERN.match(value.lower())
+        if match and any(match.groups()):
+            hours, minutes, seconds, millis = (float(g) if g else 0.0 for g in match.groups())
+            return now + hours * 3600 + minutes * 60 + seconds + millis / 1000
+        return parse_http_date(value)
+
+    return number if number > EPOCH_THRESHOLD else now + number
+
+
+def parse_http_date(value: str) -> Optional[float]:
+    """Data HTTP em epoch (datas sem fuso são UTC, como manda a RFC 9110)"""
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if moment is None:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
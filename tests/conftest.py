@@ -0,0 +1,18 @@
+"""
+Fixtures compartilhadas dos testes do SocialBot AI
+"""
+
+import pytest
+
+
+@pytest.fixture
+def fake_redis():
+    """
+    Fixture para Redis em memória com suporte a scripts Lua
+
+    Usa ``fakeredis[lua]``, que executa os scripts de verdade (mesma
+    semântica atômica do servidor), sem precisar de um Redis rodando.
+    """
+    fakeredis = pytest.importorskip("fakeredis.aioredis")
+    pytest.importorskip("lupa")
+    return fakeredis.FakeRedis()
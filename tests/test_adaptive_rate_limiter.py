@@ -0,0 +1,241 @@
+"""
+Testes para o módulo AdaptiveRateLimiter
+
+Testa o aprendizado de cota pelos headers e o espaçamento das requisições.
+"""
+
+import time
+from email.utils import formatdate
+
+import pytest
+from unittest.mock import Mock
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.bot.adaptive_rate_limiter import (
+    DEFAULT_RETRY_AFTER,
+    AdaptiveRateLimiter,
+    parse_rate_limit_headers,
+    token_fingerprint
+)
+from src.utils.exceptions import RateLimitError, handle_api_response
+
+NOW = 1_700_000_000.0
+
+
+class FakeClock:
+    """Relógio em epoch controlável"""
+
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_response(status_code=200, headers=None):
+    """Cria uma resposta HTTP falsa"""
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.reason = "Too Many Requests" if status_code == 429 else "OK"
+    response.text = ""
+    return response
+
+
+class TestParseRateLimitHeaders:
+    """Testes para o parser de headers de cota"""
+
+    def test_twitter_headers(self):
+        """Testa headers do Twitter (reset em epoch)"""
+        quota = parse_rate_limit_headers({
+            "x-rate-limit-limit": "300",
+            "x-rate-limit-remaining": "299",
+            "x-rate-limit-reset": str(int(NOW + 900))
+        }, NOW)
+
+        assert (quota.limit, quota.remaining, quota.reset_at) == (300, 299, NOW + 900)
+
+    def test_openai_headers(self):
+        """Testa headers da OpenAI (reset como duração)"""
+        quota = parse_rate_limit_headers({
+            "x-ratelimit-limit-requests": "60",
+            "x-ratelimit-remaining-requests": "59",
+            "x-ratelimit-reset-requests": "1m30s"
+        }, NOW)
+
+        assert quota.remaining == 59
+        assert quota.reset_at == NOW + 90
+
+    def test_ietf_headers(self):
+        """Testa headers do draft IETF (reset relativo)"""
+        quota = parse_rate_limit_headers({
+            "RateLimit-Limit": "100",
+            "RateLimit-Remaining": "10",
+            "RateLimit-Reset": "30"
+        }, NOW)
+
+        assert quota.reset_at == NOW + 30
+
+    def test_no_headers(self):
+        """Testa resposta sem informação de cota"""
+        assert parse_rate_limit_headers({"content-type": "application/json"}, NOW) is None
+
+
+class TestAdaptiveRateLimiter:
+    """Testes para a classe AdaptiveRateLimiter"""
+
+    @pytest.mark.asyncio
+    async def test_paces_remaining_quota_until_reset(self):
+        """Testa que a cota restante é distribuída até o reset"""
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(safety_margin=0, clock=clock)
+        limiter.update_from_response("POST /2/tweets", {
+            "x-rate-limit-remaining": "10",
+            "x-rate-limit-reset": str(NOW + 100)
+        })
+
+        await limiter.record_request("POST /2/tweets")
+
+        # 9 restantes em 100 s -> uma requisição a cada ~11 s
+        assert await limiter.get_wait_time("POST /2/tweets") == pytest.approx(100 / 9)
+
+    @pytest.mark.asyncio
+    async def test_exhausted_quota_waits_for_reset(self):
+        """Testa espera até o reset quando a cota acaba"""
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(clock=clock)
+        limiter.update_from_response("GET /2/users", {
+            "x-rate-limit-remaining": "0",
+            "x-rate-limit-reset": str(NOW + 60)
+        })
+
+        assert await limiter.get_wait_time("GET /2/users") == pytest.approx(60)
+
+        clock.now += 61
+
+        assert await limiter.can_make_request("GET /2/users") is True
+
+    @pytest.mark.asyncio
+    async def test_quota_is_per_token(self):
+        """Testa que tokens diferentes têm cotas separadas"""
+        limiter = AdaptiveRateLimiter(clock=FakeClock())
+        limiter.update_from_response("POST /2/tweets", {
+            "x-rate-limit-remaining": "0",
+            "x-rate-limit-reset": str(NOW + 60)
+        }, token="conta-a")
+
+        assert await limiter.can_make_request("POST /2/tweets", token="conta-a") is False
+        assert await limiter.can_make_request("POST /2/tweets", token="conta-b") is True
+
+    def test_429_without_headers_uses_retry_after(self):
+        """Testa que um 429 sem cota usa Retry-After"""
+        limiter = AdaptiveRateLimiter(clock=FakeClock())
+
+        state = limiter.update_from_response("POST /2/tweets", {"Retry-After": "30"}, status_code=429)
+
+        assert state.remaining == 0
+        assert state.reset_at == NOW + 30
+
+    def test_429_with_http_date_retry_after(self):
+        """Testa Retry-After como data HTTP e o backoff padrão sem reset válido"""
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(clock=clock)
+
+        state = limiter.update_from_response(
+            "POST /2/tweets", {"Retry-After": formatdate(NOW + 120, usegmt=True)}, status_code=429
+        )
+        assert state.reset_at == NOW + 120
+        assert limiter._wait_time(state, clock.now) == 120
+
+        for headers in ({}, {"Retry-After": "quando der"}, {"x-rate-limit-remaining": "0"}):
+            state = limiter.update_from_response("GET /2/users", headers, status_code=429)
+            assert state.reset_at == clock.now + DEFAULT_RETRY_AFTER
+            assert limiter._wait_time(state, clock.now) == DEFAULT_RETRY_AFTER
+            clock.now += DEFAULT_RETRY_AFTER
+            assert limiter._wait_time(state, clock.now) == 0
+
+    def test_state_survives_restart(self, tmp_path):
+        """Testa persistência do estado em disco"""
+        clock = FakeClock()
+        path = tmp_path / "rate_limits.json"
+        limiter = AdaptiveRateLimiter(state_path=str(path), clock=clock)
+        limiter.update_from_response("POST /2/tweets", {
+            "x-rate-limit-remaining": "5",
+            "x-rate-limit-reset": str(NOW + 600)
+        }, token="segredo")
+
+        restarted = AdaptiveRateLimiter(state_path=str(path), clock=clock)
+
+        snapshot = restarted.snapshot()
+        key = f"POST /2/tweets|{token_fingerprint('segredo')}"
+        assert snapshot[key]["remaining"] == 5
+        assert "segredo" not in path.read_text()
+
+    def test_expired_state_is_discarded_on_load(self, tmp_path):
+        """Testa que janelas expiradas não bloqueiam após restart"""
+        clock = FakeClock()
+        path = tmp_path / "rate_limits.json"
+        limiter = AdaptiveRateLimiter(state_path=str(path), clock=clock)
+        limiter.update_from_response("k", {"x-rate-limit-remaining": "0", "x-rate-limit-reset": str(NOW + 10)})
+
+        clock.now += 20
+        restarted = AdaptiveRateLimiter(state_path=str(path), clock=clock)
+
+        assert restarted.snapshot()["k|default"]["remaining"] is None
+
+
+class TestHandleApiResponse:
+    """Testes para a integração com handle_api_response"""
+
+    def test_success_response_updates_limiter(self):
+        """Testa que respostas de sucesso alimentam o limiter"""
+        limiter = AdaptiveRateLimiter(clock=FakeClock())
+        response = make_response(200, {"x-rate-limit-remaining": "42", "x-rate-limit-reset": str(NOW + 60)})
+
+        handle_api_response(response, "twitter", rate_limiter=limiter, endpoint="POST /2/tweets")
+
+        assert limiter.snapshot()["POST /2/tweets|default"]["remaining"] == 42
+
+    def test_429_uses_reset_header_without_retry_after(self):
+        """Testa retry_after derivado do reset relativo"""
+        response = make_response(429, {"ratelimit-reset": "15"})
+
+        with pytest.raises(RateLimitError) as exc_info:
+            handle_api_response(response, "linkedin")
+
+        assert exc_info.value.retry_after == 15
+
+    def test_429_prefers_retry_after(self):
+        """Testa que Retry-After continua tendo prioridade"""
+        response = make_response(429, {"Retry-After": "7", "ratelimit-reset": "15"})
+
+        with pytest.raises(RateLimitError) as exc_info:
+            handle_api_response(response, "twitter")
+
+        assert exc_info.value.retry_after == 7
+
+    def test_429_http_date_retry_after(self):
+        """Testa retry_after derivado de Retry-After em data HTTP"""
+        response = make_response(429, {"Retry-After": formatdate(time.time() + 30, usegmt=True)})
+
+        with pytest.raises(RateLimitError) as exc_info:
+            handle_api_response(response, "twitter")
+
+        assert 29 <= exc_info.value.retry_after <= 31
+
+    @pytest.mark.parametrize("headers, expected", [
+        ({"Retry-After": "0"}, 1),
+        ({"Retry-After": "-5"}, 1),
+        ({"retry-after": "12"}, 12),
+        ({"RETRY-AFTER": "quando der", "RateLimit-Reset": "9"}, 9),
+        ({"Retry-After": "quando der"}, 60)
+    ])
+    def test_429_retry_after_is_positive_and_case_insensitive(self, headers, expected):
+        """Testa o mínimo de 1s, headers em qualquer caixa e o padrão sem valor válido"""
+        with pytest.raises(RateLimitError) as exc_info:
+            handle_api_response(make_response(429, headers), "twitter")
+
+        assert exc_info.value.retry_after == expected
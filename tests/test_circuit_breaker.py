@@ -0,0 +1,304 @@
+"""
+Testes para o módulo de resiliência
+
+Testa circuit breaker, orçamento de retries e backoff com full jitter.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    ResilienceEngine,
+    RetryBudget,
+    RetryBudgetExceeded,
+    full_jitter_delay
+)
+from src.utils.exceptions import APIError, AuthenticationError, ErrorCode, RateLimitError
+
+
+class FakeClock:
+    """Relógio monotônico controlável"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def server_error():
+    return APIError("503", error_code=ErrorCode.API_SERVER_ERROR)
+
+
+class TestCircuitBreaker:
+    """Testes para a classe CircuitBreaker"""
+
+    def test_opens_after_consecutive_failures(self):
+        """Testa abertura após atingir o limite de falhas"""
+        breaker = CircuitBreaker("api", failure_threshold=3, clock=FakeClock())
+
+        for _ in range(3):
+            breaker.before_call()
+            breaker.record_failure()
+
+        assert breaker.state is CircuitState.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_success_resets_failure_count(self):
+        """Testa que um sucesso zera as falhas consecutivas"""
+        breaker = CircuitBreaker("api", failure_threshold=2, clock=FakeClock())
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_half_open_trial_closes_on_success(self):
+        """Testa o ciclo aberto -> meio-aberto -> fechado"""
+        clock = FakeClock()
+        breaker = CircuitBreaker("api", failure_threshold=1, recovery_timeout=10, clock=clock)
+        breaker.record_failure()
+
+        clock.now += 10
+        assert breaker.state is CircuitState.HALF_OPEN
+
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # Só uma chamada de teste por vez
+
+        breaker.record_success()
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_half_open_failure_reopens(self):
+        """Testa que falha no meio-aberto reabre o circuito"""
+        clock = FakeClock()
+        breaker = CircuitBreaker("api", failure_threshold=5, recovery_timeout=10, clock=clock)
+        for _ in range(5):
+            breaker.record_failure()
+
+        clock.now += 10
+        breaker.before_call()
+        breaker.record_failure()
+
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.times_opened == 2
+
+    def test_rejection_reports_retry_after(self):
+        """Testa que a rejeição informa quando tentar de novo"""
+        clock = FakeClock()
+        breaker = CircuitBreaker("api", failure_threshold=1, recovery_timeout=30, clock=clock)
+        breaker.record_failure()
+        clock.now += 12
+
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.before_call()
+
+        assert exc_info.value.retry_after == 18
+        assert exc_info.value.error_code is ErrorCode.SYSTEM_DEPENDENCY_UNAVAILABLE
+
+    def test_open_rejection_is_fast(self):
+        """Testa que a rejeição com circuito aberto leva microssegundos"""
+        breaker = CircuitBreaker("api", failure_threshold=1)
+        breaker.record_failure()
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            try:
+                breaker.before_call()
+            except CircuitOpenError:
+                pass
+        per_call = (time.perf_counter() - start) / 1000
+
+        assert per_call < 0.001
+
+
+class TestRetryBudget:
+    """Testes para a classe RetryBudget"""
+
+    def test_budget_scales_with_traffic(self):
+        """Testa o limite proporcional ao tráfego recente"""
+        budget = RetryBudget(ratio=0.1, min_retries=1, window=10, clock=FakeClock())
+        for _ in range(50):
+            budget.record_request()
+
+        spent = sum(budget.try_spend() for _ in range(10))
+
+        assert spent == 5
+
+    def test_budget_recovers_after_window(self):
+        """Testa que o orçamento volta após a janela"""
+        clock = FakeClock()
+        budget = RetryBudget(ratio=0.1, min_retries=1, window=10, clock=clock)
+
+        assert budget.try_spend() is True
+        assert budget.try_spend() is False
+
+        clock.now += 11
+        assert budget.try_spend() is True
+
+
+class TestFullJitterDelay:
+    """Testes para o backoff com full jitter"""
+
+    def test_delay_within_bounds(self):
+        """Testa que a espera fica entre 0 e o delay exponencial"""
+        delays = [full_jitter_delay(server_error(), attempt=3) for _ in range(200)]
+
+        assert min(delays) >= 0
+        assert max(delays) <= 8 * 1.1
+        assert len(set(delays)) > 1
+
+    def test_rate_limit_respects_retry_after(self):
+        """Testa que retry_after não é reduzido pelo jitter"""
+        assert full_jitter_delay(RateLimitError("429", retry_after=42), attempt=1) == 42
+
+
+class TestResilienceEngine:
+    """Testes para a classe ResilienceEngine"""
+
+    def make_engine(self, **kwargs):
+        self.sleeps = []
+
+        async def fake_sleep(seconds):
+            self.sleeps.append(seconds)
+
+        return ResilienceEngine(clock=FakeClock(), sleep=fake_sleep, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(self):
+        """Testa retry de erro transitório até o sucesso"""
+        engine = self.make_engine(max_attempts=3)
+        calls = []
+
+        async def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise server_error()
+            return "ok"
+
+        assert await engine.call("twitter:post", flaky) == "ok"
+        assert len(self.sleeps) == 2
+        assert engine.breaker("twitter:post").state is CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_is_raised_immediately(self):
+        """Testa que erros do cliente não são repetidos nem abrem o circuito"""
+        engine = self.make_engine(failure_threshold=1)
+
+        @engine.protect("twitter:post")
+        async def unauthorized():
+            raise AuthenticationError("401")
+
+        with pytest.raises(AuthenticationError):
+            await unauthorized()
+
+        assert self.sleeps == []
+        assert engine.breaker("twitter:post").state is CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_rejects_without_calling(self):
+        """Testa rejeição imediata com o circuito aberto"""
+        engine = self.make_engine(failure_threshold=2, max_attempts=2)
+        calls = []
+
+        async def down():
+            calls.append(1)
+            raise server_error()
+
+        with pytest.raises(APIError):
+            await engine.call("openai:chat", down)
+        with pytest.raises(CircuitOpenError):
+            await engine.call("openai:chat", down)
+
+        assert len(calls) == 2
+        assert engine.health_components() == {"circuit:openai:chat": "unhealthy"}
+
+    @pytest.mark.asyncio
+    async def test_retry_budget_exhaustion(self):
+        """Testa que o orçamento esgotado interrompe os retries"""
+        engine = self.make_engine(
+            max_attempts=5,
+            failure_threshold=100,
+            retry_budget=RetryBudget(ratio=0, min_retries=1, clock=FakeClock())
+        )
+
+        async def down():
+            raise server_error()
+
+        with pytest.raises(RetryBudgetExceeded):
+            await engine.call("linkedin:share", down)
+
+        assert len(self.sleeps) == 1
+
+    @pytest.mark.asyncio
+    async def test_guard_context_manager(self):
+        """Testa o context manager sem retry"""
+        engine = self.make_engine(failure_threshold=1)
+
+        with pytest.raises(ConnectionError):
+            async with engine.guard("instagram:media"):
+                raise ConnectionError("reset")
+
+        with pytest.raises(CircuitOpenError):
+            async with engine.guard("instagram:media"):
+                pass
+
+        snapshot = engine.snapshot()["circuits"]["instagram:media"]
+        assert snapshot["state"] == "open"
+        assert snapshot["total_rejections"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_releases_half_open_slot(self):
+        """Testa que um teste cancelado (timeout do chamador) não trava o meio-aberto"""
+        clock = FakeClock()
+
+        async def no_sleep(seconds):
+            pass
+
+        engine = ResilienceEngine(
+            failure_threshold=1, recovery_timeout=30, max_attempts=1, clock=clock, sleep=no_sleep
+        )
+
+        async def down():
+            raise server_error()
+
+        async def hang():
+            await asyncio.sleep(10)
+
+        async def ok():
+            return "ok"
+
+        with pytest.raises(APIError):
+            await engine.call("twitter:post", down)
+        clock.now += 30
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(engine.call("twitter:post", hang), timeout=0.01)
+        breaker = engine.breaker("twitter:post")
+        assert breaker.state is CircuitState.HALF_OPEN
+        assert breaker.total_failures == 1  # Cancelamento não conta como falha
+
+        task = asyncio.ensure_future(self._guarded(engine, hang))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert await engine.call("twitter:post", ok) == "ok"
+        assert breaker.state is CircuitState.CLOSED
+
+    @staticmethod
+    async def _guarded(engine, func):
+        async with engine.guard("twitter:post"):
+            await func()
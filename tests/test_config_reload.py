@@ -0,0 +1,218 @@
+"""
+Testes para a recarga a quente de configurações
+
+Testa o snapshot versionado, as notificações e o observador do .env.
+"""
+
+import asyncio
+import os
+from unittest.mock import patch
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.bot.rate_limiter import RateLimiter
+from src.bot.distributed_rate_limiter import rate_limit_subscriber
+from src.utils.config import Config, find_env_file, load_env_file
+from src.utils.config_reload import ConfigManager
+
+WATCHED_KEYS = ("TWITTER_RATE_LIMIT_POSTS_PER_HOUR", "AI_TEMPERATURE", "PREFERRED_POST_TIMES")
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    """Arquivo .env temporário com o ambiente restaurado ao final"""
+    saved = dict(os.environ)
+    for key in WATCHED_KEYS:
+        monkeypatch.delenv(key, raising=False)
+
+    path = tmp_path / ".env"
+    path.write_text("TWITTER_RATE_LIMIT_POSTS_PER_HOUR=50\nAI_TEMPERATURE=0.7\n")
+    yield path
+
+    os.environ.clear()
+    os.environ.update(saved)
+
+
+def rewrite(path, text):
+    """Reescreve o .env garantindo mudança de mtime/tamanho"""
+    path.write_text(text)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class TestEnvFileCache:
+    """Testes para o cache do .env"""
+
+    def test_unchanged_env_file_is_loaded_once(self, env_file):
+        """Testa que Config() repetido não relê o .env"""
+        with patch("src.utils.config.load_dotenv") as load_dotenv:
+            Config(str(env_file))
+            Config(str(env_file))
+
+            load_env_file(env_file)
+
+        assert load_dotenv.call_count <= 1
+
+    def test_env_file_created_later_is_found(self, tmp_path):
+        """Testa que a busca pelo .env não fica presa ao primeiro resultado"""
+        directory = tmp_path / "app"
+        directory.mkdir()
+        before = find_env_file(str(directory))
+
+        (directory / ".env").write_text("AI_TEMPERATURE=0.7\n")
+
+        assert before != directory / ".env"
+        assert find_env_file(str(directory)) == directory / ".env"
+
+
+class TestConfigManager:
+    """Testes para a classe ConfigManager"""
+
+    @pytest.mark.asyncio
+    async def test_reload_publishes_new_version(self, env_file):
+        """Testa publicação de nova versão com as seções alteradas"""
+        manager = ConfigManager(str(env_file))
+        first = manager.current
+
+        rewrite(env_file, "TWITTER_RATE_LIMIT_POSTS_PER_HOUR=10\nAI_TEMPERATURE=0.7\n")
+        snapshot = await manager.reload()
+
+        assert snapshot.version == first.version + 1
+        assert snapshot.changed == {"twitter"}
+        assert manager.current.config.twitter.rate_limit_posts_per_hour == 10
+        # O snapshot anterior continua íntegro para quem ainda o usa
+        assert first.config.twitter.rate_limit_posts_per_hour == 50
+
+    @pytest.mark.asyncio
+    async def test_unchanged_file_does_not_bump_version(self, env_file):
+        """Testa que recarregar sem mudanças não publica nada"""
+        manager = ConfigManager(str(env_file))
+
+        assert await manager.reload() is None
+        assert manager.current.version == 1
+
+    @pytest.mark.asyncio
+    async def test_subscribers_filtered_by_section(self, env_file):
+        """Testa que só os inscritos nas seções alteradas são chamados"""
+        manager = ConfigManager(str(env_file))
+        ai_calls, twitter_calls = [], []
+
+        async def on_ai(snapshot):
+            ai_calls.append(snapshot.config.ai.temperature)
+
+        manager.subscribe(on_ai, sections=("ai",))
+        manager.subscribe(twitter_calls.append, sections=("twitter",))
+
+        rewrite(env_file, "TWITTER_RATE_LIMIT_POSTS_PER_HOUR=50\nAI_TEMPERATURE=0.2\n")
+        await manager.reload()
+
+        assert ai_calls == [0.2]
+        assert twitter_calls == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_config_keeps_current_version(self, env_file):
+        """Testa que um valor inválido não derruba a configuração atual"""
+        manager = ConfigManager(str(env_file))
+
+        rewrite(env_file, "TWITTER_RATE_LIMIT_POSTS_PER_HOUR=muitos\n")
+
+        assert await manager.reload() is None
+        assert manager.current.version == 1
+        assert os.environ["TWITTER_RATE_LIMIT_POSTS_PER_HOUR"] == "50"
+
+    @pytest.mark.asyncio
+    async def test_rate_limiter_swap_keeps_window(self, env_file):
+        """Testa a troca do limite sem perder as requisições já registradas"""
+        manager = ConfigManager(str(env_file))
+        limiter = RateLimiter(max_requests=50, time_window=3600)
+        manager.subscribe(rate_limit_subscriber(limiter, "twitter"), sections=("twitter",))
+        for _ in range(3):
+            await limiter.record_request("twitter_post")
+
+        rewrite(env_file, "TWITTER_RATE_LIMIT_POSTS_PER_HOUR=3\nAI_TEMPERATURE=0.7\n")
+        await manager.reload()
+
+        assert limiter.max_requests == 3
+        assert await limiter.can_make_request("twitter_post") is False
+
+    @pytest.mark.asyncio
+    async def test_reload_finds_env_file_created_later(self, env_file, monkeypatch):
+        """Testa que o reload passa a usar um .env criado depois no diretório atual"""
+        directory = env_file.parent / "app"
+        directory.mkdir()
+        monkeypatch.chdir(directory)
+        manager = ConfigManager()
+        assert manager.env_file == env_file
+
+        created = directory / ".env"
+        created.write_text("TWITTER_RATE_LIMIT_POSTS_PER_HOUR=7\nAI_TEMPERATURE=0.7\n")
+        snapshot = await manager.reload()
+
+        assert manager.env_file == created
+        assert snapshot.config.twitter.rate_limit_posts_per_hour == 7
+
+
+class TestConfigWatcher:
+    """Testes para o observador do .env"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_inotify", [False, True])
+    async def test_file_change_triggers_reload(self, env_file, use_inotify):
+        """Testa que editar o .env publica uma nova versão"""
+        manager = ConfigManager(str(env_file))
+        await manager.start_watching(poll_interval=0.05, use_inotify=use_inotify)
+        if use_inotify and manager._watcher.backend != "inotify":
+            await manager.stop_watching()
+            pytest.skip("inotify indisponível neste sistema")
+
+        try:
+            rewrite(env_file, "TWITTER_RATE_LIMIT_POSTS_PER_HOUR=50\nPREFERRED_POST_TIMES=08:00,20:00\n")
+            for _ in range(50):
+                if manager.current.version > 1:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            await manager.stop_watching()
+
+        assert manager.current.config.preferred_post_times == ["08:00", "20:00"]
+        assert "general" in manager.current.changed
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_inotify", [False, True])
+    async def test_env_file_created_after_start(self, env_file, monkeypatch, use_inotify):
+        """Testa .env criado depois da partida e outro mais próximo do diretório atual"""
+        env_file.unlink()
+        directory = env_file.parent / "app"
+        directory.mkdir()
+        monkeypatch.chdir(directory)
+        manager = ConfigManager()
+        assert manager.env_file is None
+
+        async def wait_version(version):
+            for _ in range(50):
+                if manager.current.version >= version:
+                    return
+                await asyncio.sleep(0.05)
+
+        await manager.start_watching(poll_interval=0.05, use_inotify=use_inotify)
+        if use_inotify and manager._watcher.backend != "inotify":
+            await manager.stop_watching()
+            pytest.skip("inotify indisponível neste sistema")
+
+        try:
+            rewrite(env_file, "TWITTER_RATE_LIMIT_POSTS_PER_HOUR=9\n")
+            await wait_version(2)
+            assert manager.env_file == env_file
+
+            created = directory / ".env"
+            rewrite(created, "TWITTER_RATE_LIMIT_POSTS_PER_HOUR=7\n")
+            await wait_version(3)
+        finally:
+            await manager.stop_watching()
+
+        assert manager.env_file == created
+        assert manager.current.config.twitter.rate_limit_posts_per_hour == 7
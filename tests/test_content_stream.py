@@ -0,0 +1,251 @@
+"""
+Testes para o streaming de conteúdo
+
+Testa a aplicação incremental do limite da plataforma, o streamer do
+Hugging Face em thread, o stream da OpenAI, o fallback entre provedores, o
+TTFT e a codificação Server-Sent Events.
+"""
+
+import asyncio
+import json
+import random
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ai.content_stream import (
+    ContentStreamer,
+    ContentStreamError,
+    PlatformLengthGuard,
+    StreamStats,
+    format_sse,
+    truncate_for_platform
+)
+from src.utils.config import AIConfig
+
+WORDS = "python é uma linguagem incrível para automação de redes sociais com IA".split()
+
+
+def make_request(platform="twitter", max_length=None, topic="Python"):
+    return SimpleNamespace(topic=topic, platform=platform, max_length=max_length)
+
+
+def long_text(words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+class FakeOpenAI:
+    """Cliente com a interface ``chat.completions.create(stream=True)``"""
+
+    def __init__(self, pieces=(), error=None, delay=0.0):
+        self.pieces, self.error, self.delay = list(pieces), error, delay
+        self.closed = False
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        assert kwargs["stream"] is True
+        if self.error:
+            raise self.error
+        return self._stream()
+
+    async def _stream(self):
+        try:
+            for piece in self.pieces:
+                await asyncio.sleep(self.delay)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+        finally:
+            self.closed = True
+
+
+class FakeTokenizer:
+    """Um token por caractere"""
+
+    eos_token_id = 0
+
+    def __call__(self, prompt, return_tensors=None):
+        return {"input_ids": np.array([[ord(c) for c in prompt]])}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return "".join(chr(i) for i in ids)
+
+
+class FakeModel:
+    """``generate`` que emite um texto fixo token a token pelo streamer"""
+
+    def __init__(self, text):
+        self.text = text
+        self.generated = 0
+        self.thread = None
+
+    def generate(self, input_ids, streamer, stopping_criteria, max_new_tokens, **kwargs):
+        self.thread = threading.current_thread().name
+        streamer.put(input_ids)
+        for char in self.text[:max_new_tokens]:
+            if any(criterion(input_ids, None) for criterion in stopping_criteria):
+                break
+            self.generated += 1
+            streamer.put(np.array([ord(char)]))
+        streamer.end()
+
+
+def make_pipeline(text):
+    return SimpleNamespace(tokenizer=FakeTokenizer(), model=FakeModel(text))
+
+
+async def collect(streamer, request, stats=None):
+    return [delta async for delta in streamer.stream_content(request, stats)]
+
+
+class TestPlatformLengthGuard:
+    """Testes para o limite incremental"""
+
+    def test_truncate_for_platform(self):
+        """Testa corte na palavra e limite com reticências"""
+        text = "Este é um texto muito longo que excede o limite do Twitter " * 10
+        adjusted = truncate_for_platform(text, 280)
+
+        assert len(adjusted) <= 280
+        assert adjusted.endswith("...")
+        assert text.startswith(adjusted[:-3])
+        assert truncate_for_platform("curto", 280) == "curto"
+
+    @pytest.mark.parametrize("seed", range(30))
+    def test_chunks_match_full_truncation(self, seed):
+        """Testa que qualquer divisão em pedaços produz o mesmo texto final"""
+        rng = random.Random(seed)
+        text = long_text(rng.randint(1, 80), seed)
+        limit = rng.choice([20, 50, 100, 280])
+        guard = PlatformLengthGuard(limit)
+
+        deltas, position = [], 0
+        while position < len(text) and not guard.done:
+            size = rng.randint(1, 8)
+            deltas.append(guard.feed(text[position:position + size]))
+            position += size
+        deltas.append(guard.finish())
+
+        assert "".join(deltas) == truncate_for_platform(text, limit)
+        assert guard.truncated == (len(text) > limit)
+
+    def test_releases_complete_words_early(self):
+        """Testa que palavras completas saem antes do fim do stream"""
+        guard = PlatformLengthGuard(280)
+        assert guard.feed("Olá mun") == "Olá"
+        assert guard.feed("do! Tudo") == " mundo!"
+        assert guard.finish() == " Tudo"
+
+
+class TestContentStreamer:
+    """Testes para o ContentStreamer"""
+
+    @pytest.mark.asyncio
+    async def test_openai_stream_truncates_and_closes(self):
+        """Testa limite da plataforma e fechamento do stream ao atingir o limite"""
+        text = long_text(200)
+        client = FakeOpenAI(text[i:i + 4] for i in range(0, len(text), 4))
+        streamer = ContentStreamer(AIConfig(), openai_client=client)
+        stats = StreamStats()
+
+        deltas = await collect(streamer, make_request("twitter"), stats)
+
+        assert "".join(deltas) == truncate_for_platform(text, 280) == stats.text
+        assert len(deltas) > 10
+        assert stats.provider == "openai"
+        assert stats.truncated is True
+        assert client.closed is True
+        assert streamer.metrics.snapshot()["providers"]["openai"]["streams"] == 1
+
+    @pytest.mark.asyncio
+    async def test_huggingface_stream_runs_in_worker_thread(self):
+        """Testa o streamer do generate() e a interrupção ao passar do limite"""
+        text = long_text(100, seed=3)
+        pipeline = make_pipeline(text)
+        streamer = ContentStreamer(AIConfig(), hf_pipeline=pipeline)
+        stats = StreamStats()
+
+        deltas = await collect(streamer, make_request("twitter", max_length=60), stats)
+        streamer.close()
+
+        assert "".join(deltas) == truncate_for_platform(text, 60)
+        assert stats.provider == "huggingface"
+        assert pipeline.model.thread.startswith("hf-stream")
+        assert pipeline.model.generated < 100  # Parou logo depois do limite
+
+    @pytest.mark.asyncio
+    async def test_fallback_before_first_token(self):
+        """Testa troca para o Hugging Face quando a OpenAI falha ou demora"""
+        for client in (FakeOpenAI(error=ConnectionError("fora do ar")), FakeOpenAI(["tarde"], delay=1.0)):
+            streamer = ContentStreamer(
+                AIConfig(), openai_client=client, hf_pipeline=make_pipeline("Olá do modelo local"),
+                first_token_timeout=0.05
+            )
+            stats = StreamStats()
+
+            deltas = await collect(streamer, make_request(), stats)
+            streamer.close()
+
+            assert "".join(deltas) == "Olá do modelo local"
+            assert stats.provider == "huggingface"
+            assert len(stats.failures) == 1
+            assert streamer.metrics.fallbacks == 1
+
+    @pytest.mark.asyncio
+    async def test_no_provider_raises(self):
+        """Testa erro quando nenhum provedor inicia o stream"""
+        streamer = ContentStreamer(AIConfig(), openai_client=FakeOpenAI(error=RuntimeError("quota")))
+
+        with pytest.raises(ContentStreamError, match="quota"):
+            await collect(streamer, make_request())
+
+    @pytest.mark.asyncio
+    async def test_ttft_is_recorded(self):
+        """Testa TTFT menor que a duração total e exportado nas métricas"""
+        client = FakeOpenAI(["Primeiro ", "token ", "e ", "o ", "resto"], delay=0.02)
+        streamer = ContentStreamer(AIConfig(), openai_client=client)
+        stats = StreamStats()
+
+        await collect(streamer, make_request(), stats)
+        snapshot = streamer.metrics.snapshot()["providers"]["openai"]
+
+        assert 0 < stats.ttft < stats.duration
+        assert snapshot["ttft_p50"] is not None
+
+    @pytest.mark.asyncio
+    async def test_sse_events(self):
+        """Testa eventos token/done e evento de erro"""
+        streamer = ContentStreamer(AIConfig(), openai_client=FakeOpenAI(["Olá ", "mundo"]))
+        events = [event async for event in streamer.stream_events(make_request())]
+
+        assert events[0] == 'event: token\ndata: {"text": "Olá"}\n\n'
+        done = json.loads(events[-1].split("data: ", 1)[1])
+        assert events[-1].startswith("event: done\n")
+        assert done["text"] == "Olá mundo"
+        assert done["provider"] == "openai"
+
+        failing = ContentStreamer(AIConfig())
+        assert [event async for event in failing.stream_events(make_request())][0].startswith("event: error\n")
+        assert format_sse({"a": 1}) == 'data: {"a": 1}\n\n'
+
+    def test_sse_router(self):
+        """Testa o endpoint text/event-stream"""
+        pytest.importorskip("fastapi")
+        pytest.importorskip("httpx")
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from src.ai.content_stream import create_stream_router
+
+        streamer = ContentStreamer(AIConfig(), openai_client=FakeOpenAI(["Olá ", "mundo"]))
+        app = FastAPI()
+        app.include_router(create_stream_router(streamer, make_request))
+
+        response = TestClient(app).get("/api/content/stream", params={"topic": "Python"})
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "event: done" in response.text
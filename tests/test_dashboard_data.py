@@ -0,0 +1,217 @@
+"""
+Testes para a camada de dados do dashboard
+
+Testa o TTL por widget, a coalescência de leitores simultâneos, os
+snapshots servidos enquanto são recalculados, a invalidação por eventos de
+escrita e a leitura pelas threads do Streamlit.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.dashboard.data import DashboardData
+
+
+class FakeClock:
+    """Relógio controlado pelo teste"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Backend:
+    """Consulta cara que conta as chamadas"""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+        self.error = None
+
+    async def load(self):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {"posts": self.calls}
+
+
+class TestDashboardData:
+    """Testes para a classe DashboardData"""
+
+    @pytest.mark.asyncio
+    async def test_ttl_per_widget(self):
+        """Testa leituras do cache dentro do TTL de cada widget"""
+        clock, backend = FakeClock(), Backend()
+        data = DashboardData(ttl=30, clock=clock)
+        data.register("statistics", backend.load)
+        data.register("platforms", lambda: ["twitter"], ttl=300)
+
+        assert await data.get("statistics") == {"posts": 1}
+        clock.now += 29
+        assert await data.get("statistics") == {"posts": 1}
+        clock.now += 1
+        assert await data.get("statistics") == {"posts": 2}
+        assert await data.get("platforms") == ["twitter"]
+
+        stats = data.snapshot()["statistics"]
+        assert (stats["hits"], stats["misses"], stats["refreshes"]) == (1, 2, 2)
+        with pytest.raises(KeyError):
+            await data.get("desconhecido")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_viewers_coalesce(self):
+        """Testa que N leitores simultâneos causam uma computação"""
+        backend = Backend(delay=0.02)
+        data = DashboardData()
+        data.register("statistics", backend.load)
+        data.register("analytics", backend.load)
+
+        values = await asyncio.gather(*(data.get("statistics") for _ in range(20)))
+        page = await data.get_many(["statistics", "analytics"])
+
+        assert backend.calls == 2
+        assert all(value == {"posts": 1} for value in values)
+        assert page == {"statistics": {"posts": 1}, "analytics": {"posts": 2}}
+        assert data.snapshot()["statistics"]["coalesced"] == 19
+
+    @pytest.mark.asyncio
+    async def test_write_events_invalidate_with_min_interval(self):
+        """Testa invalidação por evento e o intervalo mínimo entre recomputações"""
+        clock, backend = FakeClock(), Backend()
+        data = DashboardData(ttl=300, min_interval=5, clock=clock)
+        data.register("statistics", backend.load, events=("post",))
+        data.register("analytics", backend.load)
+        await data.get_many(["statistics", "analytics"])
+
+        for _ in range(100):  # Rajada de métricas
+            data.on_metrics("1790", {"likes": 1})
+        clock.now += 4
+        assert await data.get("analytics") == {"posts": 2}
+        clock.now += 1
+        assert await data.get("analytics") == {"posts": 3}
+        assert await data.get("statistics") == {"posts": 1}  # Não depende de métricas
+
+        data.on_post("1791", "twitter")
+        clock.now += 5
+        assert await data.get("statistics") == {"posts": 4}
+        assert data.snapshot()["analytics"]["invalidations"] == 101
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_computation(self):
+        """Testa que um evento durante a consulta não deixa o valor antigo valendo o TTL"""
+        clock, backend = FakeClock(), Backend(delay=0.02)
+        data = DashboardData(ttl=300, min_interval=5, clock=clock)
+        data.register("statistics", backend.load)
+
+        pending = asyncio.ensure_future(data.get("statistics"))
+        await asyncio.sleep(0.005)
+        data.notify("post")
+        await pending
+
+        clock.now += 5
+        assert await data.get("statistics") == {"posts": 2}
+
+    @pytest.mark.asyncio
+    async def test_snapshot_served_while_refreshing(self):
+        """Testa snapshot expirado servido na hora e erro mantendo o último valor"""
+        clock, backend = FakeClock(), Backend(delay=0.02)
+        data = DashboardData(clock=clock)
+        data.register("statistics", backend.load, ttl=60, snapshot=True)
+
+        assert await data.get("statistics") == {"posts": 1}  # Primeira carga espera
+        clock.now += 60
+        assert await data.get("statistics") == {"posts": 1}  # Sem esperar
+        await asyncio.sleep(0.05)
+        assert await data.get("statistics") == {"posts": 2}
+
+        backend.error = ConnectionError("banco fora")
+        clock.now += 60
+        assert await data.get("statistics") == {"posts": 2}
+        await asyncio.sleep(0.05)
+        assert await data.get("statistics") == {"posts": 2}
+        assert data.snapshot()["statistics"]["errors"] == 1
+
+        # Sem valor anterior o erro chega ao leitor e nada é cacheado
+        data.register("analytics", lambda: 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            await data.get("analytics")
+        assert data.snapshot()["analytics"]["age"] is None
+
+    @pytest.mark.asyncio
+    async def test_error_serves_previous_value(self):
+        """Testa que widget comum com valor anterior o serve quando o loader falha"""
+        clock, backend = FakeClock(), Backend(delay=0.02)
+        data = DashboardData(ttl=60, min_interval=5, clock=clock)
+        data.register("statistics", backend.load)
+        assert await data.get("statistics") == {"posts": 1}
+
+        backend.error = ConnectionError("banco fora")
+        clock.now += 60
+        values = await asyncio.gather(*(data.get("statistics") for _ in range(3)))
+        assert values == [{"posts": 1}] * 3
+        stats = data.snapshot()["statistics"]
+        assert stats["errors"] == 1
+        assert stats["stale_hits"] == 3
+
+    @pytest.mark.asyncio
+    async def test_read_timeout_cancels_get(self):
+        """Testa que o get agendado por read é cancelado no timeout"""
+        backend = Backend(delay=0.2)
+        data = DashboardData()
+        data.register("statistics", backend.load)
+        data.start()
+        try:
+            loop = asyncio.get_running_loop()
+            with pytest.raises(TimeoutError):
+                await loop.run_in_executor(None, data.read, "statistics", 0.02)
+            await asyncio.sleep(0.01)
+            readers = [task for task in asyncio.all_tasks() if task.get_coro().__qualname__ == "DashboardData.get"]
+            assert readers == []
+            assert await data.get("statistics") == {"posts": 1}  # A computação segue
+            assert backend.calls == 1
+        finally:
+            await data.stop()
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_and_streamlit_threads(self):
+        """Testa snapshots recalculados em background e leituras de threads"""
+        backend = Backend(delay=0.05)
+
+        class Bot:
+            get_statistics = backend.load
+
+            def get_analytics(self):
+                return {"best_time": "18:00"}
+
+        data = DashboardData(snapshot_ttl=0.1, min_interval=0.01)
+        data.register_bot(Bot())
+        with pytest.raises(RuntimeError):
+            data.read("statistics")
+
+        data.start()
+        try:
+            loop = asyncio.get_running_loop()
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                values = await asyncio.gather(
+                    *(loop.run_in_executor(pool, data.read, "statistics") for _ in range(8))
+                )
+            assert all(value == {"posts": 1} for value in values)
+            assert backend.calls == 1
+
+            await asyncio.sleep(0.3)
+            assert backend.calls >= 2
+            with pytest.raises(RuntimeError):
+                data.read("analytics")  # Dentro do loop bloquearia
+            assert await data.get("analytics") == {"best_time": "18:00"}
+        finally:
+            await data.stop()
@@ -0,0 +1,149 @@
+"""
+Testes para o modelo incremental de engajamento
+
+Testa o melhor horário por dia da semana/hora, o decaimento exponencial,
+os deltas das métricas acumuladas, o ranking de hashtags e o checkpoint.
+"""
+
+import asyncio
+import math
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analytics.engagement_model import EngagementModel
+
+HOUR = 3600
+MONDAY = datetime(2024, 1, 15, tzinfo=timezone.utc)  # Segunda-feira
+
+
+class FakeClock:
+    """Relógio controlado pelo teste"""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_model(clock, **kwargs):
+    kwargs.setdefault("timezone", "UTC")
+    kwargs.setdefault("min_posts", 5)
+    kwargs.setdefault("half_life_hours", 24)
+    return EngagementModel(clock=clock, **kwargs)
+
+
+def publish(model, post_id, when, likes, platform="twitter", hashtags=(), impressions=None):
+    model.track_post(post_id, platform, when, hashtags)
+    metrics = {"likes": likes}
+    if impressions is not None:
+        metrics["impressions"] = impressions
+    assert model.update_metrics(post_id, metrics, model.clock())
+
+
+class TestEngagementModel:
+    """Testes para a classe EngagementModel"""
+
+    def test_best_time_drives_scheduler(self):
+        """Testa melhor horário, horários preferenciais e próximo slot"""
+        clock = FakeClock((MONDAY + timedelta(days=7)).timestamp())
+        model = make_model(clock, half_life_hours=30 * 24)
+        for day in range(7):
+            for hour in (9, 12, 18):
+                when = MONDAY + timedelta(days=day, hours=hour)
+                likes = 100 if (day, hour) == (1, 18) else hour
+                publish(model, f"{day}-{hour}", when, likes)
+
+        best = model.best_times("twitter", count=2)
+        assert (best[0]["weekday"], best[0]["hour"], best[0]["label"]) == (1, 18, "terça 18:00")
+        assert model.preferred_post_times("twitter", count=2) == ["12:00", "18:00"]
+
+        tuesday_morning = datetime(2024, 1, 23, 10, 30)  # Sem fuso: interpretado em UTC
+        assert model.next_best_time("twitter", tuesday_morning) == datetime(2024, 1, 23, 18, 0)
+        aware = model.next_best_time("twitter", tuesday_morning.replace(tzinfo=timezone.utc))
+        assert aware == datetime(2024, 1, 23, 18, 0, tzinfo=timezone.utc)
+
+        analytics = model.get_analytics("twitter")
+        assert analytics["best_time"] == "18:00"
+        assert analytics["posts"] > 5
+
+    def test_fallback_without_data(self):
+        """Testa uso dos horários fixos enquanto há poucos posts"""
+        clock = FakeClock(MONDAY.timestamp())
+        model = make_model(clock, fallback_times=["09:00", "21:00"])
+        publish(model, "1", MONDAY + timedelta(hours=3), 50)
+
+        assert not model.has_data("twitter")
+        assert model.preferred_post_times("twitter") == ["09:00", "21:00"]
+        assert model.next_best_time("twitter", datetime(2024, 1, 15, 10, 0)) == datetime(2024, 1, 15, 21, 0)
+        assert model.next_best_time("twitter", datetime(2024, 1, 15, 22, 0)) == datetime(2024, 1, 16, 9, 0)
+        assert model.get_analytics("instagram")["best_time"] == "09:00"
+
+    def test_decay_favors_recent_hashtags(self):
+        """Testa que engajamento antigo perde peso (meia-vida de 24h)"""
+        clock = FakeClock(MONDAY.timestamp())
+        model = make_model(clock)
+        publish(model, "old", MONDAY, 100, hashtags=["#Antiga"])
+        assert model.posts() == pytest.approx(1.0)
+
+        clock.now += 4 * 24 * HOUR  # Quatro meias-vidas
+        assert model.posts() == pytest.approx(1 / 16)
+        publish(model, "recent-a", clock.now, 0, hashtags=["antiga"])
+        publish(model, "recent-b", clock.now, 20, hashtags=["#nova"])
+
+        assert [tag for tag, _ in model.top_hashtags(2)] == ["#nova", "#antiga"]
+
+    def test_cumulative_metrics_become_deltas(self):
+        """Testa deltas de snapshots repetidos, parciais e posts desconhecidos"""
+        clock = FakeClock(MONDAY.timestamp())
+        model = make_model(clock)
+        model.track_post("1", "linkedin", MONDAY, ["#ia"])
+        model.update_metrics("1", {"likes": 10, "shares": 2, "impressions": 100})
+        model.update_metrics("1", {"likes": 10, "shares": 2, "impressions": 100})
+        model.update_metrics("1", {"comments": 3, "impressions": 200})
+
+        assert model.engagement_rate("linkedin") == pytest.approx(15 / 200)
+        assert model.engagement_rate("twitter") == 0.0
+        assert model.update_metrics("desconhecido", {"likes": 1}) is False
+
+    def test_rebase_keeps_scores(self):
+        """Testa a troca da referência do decaimento em saltos longos de tempo"""
+        clock = FakeClock(MONDAY.timestamp())
+        model = make_model(clock)
+        start = model._reference
+        for i in range(60):
+            clock.now += 24 * HOUR
+            publish(model, str(i), clock.now, 10 + (i % 7), impressions=100)
+
+        assert model._reference > start
+        assert all(math.isfinite(value) for grid in model._grids.values() for value in grid.ravel())
+        assert model.engagement_rate() == pytest.approx(
+            sum(10 + (i % 7) for i in range(60)) / 6000, rel=0.5
+        )
+        assert model.posts() == pytest.approx(sum(0.5 ** i for i in range(60)), rel=1e-6)
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_round_trip(self, tmp_path):
+        """Testa checkpoint periódico/no stop e restauração do estado"""
+        clock = FakeClock(MONDAY.timestamp())
+        path = tmp_path / "model.json"
+        model = make_model(clock, state_path=str(path))
+        for i in range(10):
+            publish(model, str(i), MONDAY + timedelta(hours=i), i * 5, hashtags=[f"#t{i % 3}"], impressions=50)
+
+        model.start(interval=0.01)
+        await asyncio.sleep(0.05)
+        assert path.exists()
+        model.update_metrics("9", {"likes": 100})
+        await model.stop()
+
+        restored = make_model(clock, state_path=str(path))
+        assert restored.get_analytics() == model.get_analytics()
+        assert restored.top_hashtags() == model.top_hashtags()
+        assert restored.update_metrics("9", {"likes": 110})  # Continua do último valor
+        assert restored.engagement_rate() > model.engagement_rate()
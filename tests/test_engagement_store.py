@@ -0,0 +1,218 @@
+"""
+Testes para o store colunar de engajamento
+
+Compara as agregações (rollups e varredura das colunas) com uma soma feita
+linha a linha, e testa os deltas, as hashtags e a persistência em disco.
+"""
+
+import json
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analytics.engagement_store import METRICS, EngagementStore
+
+DAY = 86400
+START = 19_700 * DAY  # Meia-noite UTC
+PLATFORMS = ("twitter", "instagram", "linkedin")
+TAGS = ("#ia", "#python", "#bot", "#tech")
+
+
+def populate(store: EngagementStore, posts: int = 40, updates: int = 3000, seed: int = 0):
+    """Registra posts e snapshots acumulados aleatórios; retorna os deltas esperados"""
+    rng = np.random.default_rng(seed)
+    meta = {}
+    for i in range(posts):
+        tags = [TAGS[j] for j in range(len(TAGS)) if rng.random() < 0.4]
+        meta[i] = (PLATFORMS[i % 3], f"conta{i % 4}", tags)
+        store.register_post(f"p{i}", meta[i][0], account=meta[i][1], hashtags=tags, created_at=START)
+
+    totals = np.zeros((posts, len(METRICS)), dtype=np.int64)
+    rows = []
+    batches = updates // 500
+    for batch in range(batches):
+        # Cada lote cobre uma janela de tempo (snapshots chegam em ordem)
+        codes = rng.integers(0, posts, 500)
+        timestamps = START + batch * (3 * DAY // batches) + rng.integers(0, 3 * DAY // batches, 500)
+        order = np.argsort(timestamps, kind="stable")
+        codes, timestamps = codes[order], timestamps[order]
+        values = np.empty((500, len(METRICS)), dtype=np.int64)
+        for k, (code, ts) in enumerate(zip(codes, timestamps)):
+            totals[code] += rng.integers(0, 3, len(METRICS))
+            values[k] = totals[code]
+            rows.append((int(ts), int(code), totals[code].copy()))
+        store.record_batch(codes, values, timestamps)
+
+    # Deltas por linha, na ordem de tempo de cada post
+    last = defaultdict(lambda: np.zeros(len(METRICS), dtype=np.int64))
+    deltas = []
+    for ts, code, value in sorted(rows, key=lambda row: (row[1], row[0])):
+        deltas.append((ts, code, value - last[code]))
+        last[code] = value
+    return meta, deltas
+
+
+def expected(meta, deltas, start, end, keys, width=None):
+    result = defaultdict(lambda: np.zeros(len(METRICS), dtype=np.int64))
+    for ts, code, delta in deltas:
+        if not start <= ts < end:
+            continue
+        platform, account, tags = meta[code]
+        base = ((ts // width) * width,) if width else ()
+        fields = {"platform": platform, "account": account, "post": f"p{code}"}
+        if "hashtag" in keys:
+            for tag in tags:
+                result[base + tuple(fields.get(k, tag) for k in keys)] += delta
+        else:
+            result[base + tuple(fields[k] for k in keys)] += delta
+    return {key: value.tolist() for key, value in result.items() if value.any()}
+
+
+def as_dict(result, keys, bucket=False):
+    names = (["bucket"] if bucket else []) + list(keys)
+    output = {}
+    for record in result.to_records():
+        values = [record[m] for m in METRICS]
+        if any(values):
+            output[tuple(record[name] for name in names)] = values
+    return output
+
+
+class TestEngagementStore:
+    """Testes para a classe EngagementStore"""
+
+    @pytest.mark.parametrize("keys", [("platform",), ("account",), ("platform", "account"), ("post",), ("hashtag",), ("platform", "hashtag")])
+    @pytest.mark.parametrize("bucket", [None, "hour", "day"])
+    def test_matches_reference(self, keys, bucket):
+        """Testa agregações alinhadas e desalinhadas contra a soma linha a linha"""
+        store = EngagementStore()
+        meta, deltas = populate(store)
+        width = {"hour": 3600, "day": DAY}.get(bucket)
+
+        for start, end in ((START, START + 2 * DAY), (START + 1234, START + DAY + 5678)):
+            result = store.aggregate(start, end, by=keys, bucket=bucket)
+            assert as_dict(result, keys, bool(bucket)) == expected(meta, deltas, start, end, keys, width)
+
+    def test_rollup_matches_scan(self):
+        """Testa que os rollups por hora/dia dão o mesmo resultado que a varredura"""
+        store = EngagementStore()
+        populate(store)
+        end = START + 3 * DAY
+
+        assert store._rollup_for(START, end, ("platform",), "hour") is store.rollups["hour"]
+        assert store._rollup_for(START, end, ("platform",), None) is store.rollups["day"]
+        assert store._rollup_for(START + 60, end, ("platform",), None) is None
+
+        from_rollup = store.aggregate(START, end, by=("platform", "account"), bucket="hour")
+        from_scan = store.aggregate(START, end, by=("platform", "account", "post"), bucket="hour")
+        scanned = defaultdict(lambda: [0] * len(METRICS))
+        for record in from_scan.to_records():
+            key = (record["bucket"], record["platform"], record["account"])
+            scanned[key] = [a + record[m] for a, m in zip(scanned[key], METRICS)]
+        assert as_dict(from_rollup, ("platform", "account"), True) == {k: v for k, v in scanned.items() if any(v)}
+
+    def test_filters_and_top(self):
+        """Testa filtros por plataforma/conta e o ranking de hashtags"""
+        store = EngagementStore()
+        meta, deltas = populate(store)
+        end = START + 3 * DAY
+
+        result = store.aggregate(START, end, by=("account",), platforms=["twitter"], accounts=["conta0", "conta1"])
+        reference = expected({c: m for c, m in meta.items() if m[0] == "twitter" and m[1] in ("conta0", "conta1")}, [
+            d for d in deltas if meta[d[1]][0] == "twitter" and meta[d[1]][1] in ("conta0", "conta1")
+        ], START, end, ("account",))
+        assert as_dict(result, ("account",)) == reference
+
+        top = store.aggregate(START, end, by=("hashtag",)).top("likes", 2)
+        assert len(top) == 2
+        assert top["likes"][0] >= top["likes"][1]
+        assert len(store.aggregate(START, end, by=(), platforms=["tiktok"])) == 0
+
+    def test_snapshot_deltas(self):
+        """Testa que snapshots repetidos não geram linhas e deltas somam o total"""
+        store = EngagementStore()
+        store.register_post("1", "twitter", hashtags=["#IA", "ia"])
+        store.record("1", {"likes": 5, "shares": 1}, START + 10)
+        store.record("1", {"likes": 5, "shares": 1}, START + 20)
+        store.record("1", {"likes": 9}, START + DAY + 10)
+
+        assert store._buffer.size == 2
+        per_day = store.aggregate(START, START + 2 * DAY, by=("hashtag",), bucket="day").to_records()
+        assert [(r["hashtag"], r["likes"], r["shares"]) for r in per_day] == [("#ia", 5, 1), ("#ia", 4, 0)]
+        assert store.aggregate(START, START + 2 * DAY, by=()).to_records()[0]["likes"] == 9
+
+    def test_invalid_grouping(self):
+        """Testa erro para chave de grupo desconhecida"""
+        with pytest.raises(ValueError):
+            EngagementStore().aggregate(START, START + DAY, by=("country",))
+
+    def test_persistence(self, tmp_path):
+        """Testa flush em partições, recarga e continuidade dos deltas"""
+        store = EngagementStore(str(tmp_path), segment_rows=1000)
+        meta, deltas = populate(store)
+        store.flush()
+        end = START + 3 * DAY
+
+        partitions = {p.relative_to(tmp_path / "segments").parts[:2] for p in (tmp_path / "segments").glob("*/*")}
+        assert ("2023-12-09", "twitter") in partitions
+        assert len(list(tmp_path.glob("state-*.npz"))) == 1
+
+        reloaded = EngagementStore(str(tmp_path))
+        for keys in (("platform",), ("hashtag",)):
+            reference = expected(meta, deltas, START + 1, end, keys)
+            assert as_dict(reloaded.aggregate(START + 1, end, by=keys), keys) == reference
+        assert as_dict(reloaded.aggregate(START, end, by=("platform",)), ("platform",)) == \
+            expected(meta, deltas, START, end, ("platform",))
+
+        # Continua dos últimos valores salvos
+        code = reloaded.post_code("p0")
+        likes = int(reloaded._last[code][0])
+        reloaded.record("p0", {"likes": likes + 7}, end - 1)
+        total = reloaded.aggregate(end - 1, end, by=("post",)).to_records()
+        assert total[0]["post"] == "p0" and total[0]["likes"] == 7
+
+    def test_unflushed_segments_are_ignored(self, tmp_path):
+        """Testa que segmentos fora do manifesto (crash no flush) não são lidos"""
+        store = EngagementStore(str(tmp_path))
+        store.register_post("1", "twitter")
+        store.record("1", {"likes": 3}, START + 5)
+        store.flush()
+
+        orphan = tmp_path / "segments" / "2023-12-09" / "twitter" / "999999"
+        orphan.mkdir(parents=True)
+        for name, array in (("ts", [START + 6]), ("post", [0]), ("deltas", [[100, 0, 0, 0, 0]])):
+            np.save(orphan / f"{name}.npy", np.array(array))
+
+        reloaded = EngagementStore(str(tmp_path))
+        assert reloaded.aggregate(START + 1, START + DAY, by=()).to_records()[0]["likes"] == 3
+
+    def test_empty_flush_does_not_overwrite_committed_state(self, tmp_path, monkeypatch):
+        """Testa que um flush sem linhas novas grava o estado em arquivo novo"""
+        store = EngagementStore(str(tmp_path))
+        store.register_post("1", "twitter")
+        store.record("1", {"likes": 3}, START + 5)
+        store.flush()
+        committed = json.loads((tmp_path / "manifest.json").read_text())["state"]
+
+        def crash(path, **arrays):
+            assert Path(path).name != committed
+            Path(path).write_bytes(b"truncado")
+            raise OSError("disco cheio")
+
+        store.register_post("2", "twitter")
+        monkeypatch.setattr(np, "savez", crash)
+        with pytest.raises(OSError):
+            store.flush()
+        monkeypatch.undo()
+
+        reloaded = EngagementStore(str(tmp_path))
+        assert reloaded.aggregate(START + 1, START + DAY, by=()).to_records()[0]["likes"] == 3
+        reloaded.register_post("2", "twitter")
+        reloaded.flush()
+        assert json.loads((tmp_path / "manifest.json").read_text())["state"] != committed
+        assert len(list(tmp_path.glob("state-*.npz"))) == 1
@@ -0,0 +1,98 @@
+"""
+Testes para o módulo de exceções
+
+Testa a captura preguiçosa de traceback, timestamp e mensagem padrão.
+"""
+
+import gc
+import traceback
+import weakref
+from datetime import datetime, timedelta
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.exceptions import APIError, ErrorCode, RateLimitError, SocialBotError
+
+
+class TestLazyCapture:
+    """Testes para a construção preguiçosa do SocialBotError"""
+
+    def test_to_dict_output(self):
+        """Testa que to_dict mantém o formato e os valores"""
+        before = datetime.utcnow()
+        error = RateLimitError("429", retry_after=30, platform="twitter", cause=ValueError("x"))
+
+        data = error.to_dict()
+
+        assert data == {
+            "error_code": ErrorCode.API_RATE_LIMIT_EXCEEDED.value,
+            "error_name": "API_RATE_LIMIT_EXCEEDED",
+            "message": "[API_RATE_LIMIT_EXCEEDED] 429",
+            "user_message": "Limite de requisições atingido. Tente novamente em 30 segundos.",
+            "details": {"platform": "twitter", "original_error": "x", "original_type": "ValueError"},
+            "timestamp": data["timestamp"],
+            "retry_after": 30,
+            "cause": "x"
+        }
+        timestamp = datetime.fromisoformat(data["timestamp"])
+        assert before - timedelta(seconds=1) <= timestamp <= datetime.utcnow()
+
+    def test_timestamp_is_creation_time(self):
+        """Testa que o timestamp não muda entre acessos"""
+        error = APIError("falha")
+
+        assert error.timestamp is error.timestamp
+        assert error.to_dict()["timestamp"] == error.timestamp.isoformat()
+
+    def test_traceback_matches_format_exc(self):
+        """Testa que o traceback é o mesmo que format_exc() daria"""
+        try:
+            raise ConnectionError("connection reset")
+        except ConnectionError:
+            expected = traceback.format_exc()
+            error = APIError("falha", error_code=ErrorCode.API_CONNECTION_FAILED)
+
+        assert error.traceback_str == expected
+        assert "ConnectionError: connection reset" in error.traceback_str
+
+    def test_traceback_does_not_keep_frames(self):
+        """Testa que a exceção não mantém vivos os frames (e locais) do handler"""
+        class Payload:
+            pass
+
+        refs = []
+
+        def fail():
+            payload = Payload()  # Local que o frame manteria vivo
+            refs.append(weakref.ref(payload))
+            raise ConnectionError("connection reset")
+
+        try:
+            fail()
+        except ConnectionError:
+            error = APIError("falha")
+
+        gc.collect()
+        assert refs[0]() is None
+        assert "in fail" in error.traceback_str
+        assert 'raise ConnectionError("connection reset")' in error.traceback_str
+
+    def test_traceback_outside_handler(self):
+        """Testa o traceback quando nenhuma exceção estava em tratamento"""
+        assert APIError("falha").traceback_str == "NoneType: None\n"
+
+    def test_default_user_message(self):
+        """Testa a mensagem padrão por categoria e a sobrescrita"""
+        error = SocialBotError("falha", ErrorCode.AI_GENERATION_FAILED)
+
+        assert error.user_message == "Serviço de IA temporariamente indisponível."
+
+        error.user_message = "Outra mensagem"
+        assert error.to_dict()["user_message"] == "Outra mensagem"
+
+    def test_slots_declared_across_hierarchy(self):
+        """Testa que toda a hierarquia declara __slots__"""
+        for cls in (SocialBotError, APIError, RateLimitError):
+            assert "__slots__" in cls.__dict__
@@ -0,0 +1,142 @@
+"""
+Testes para o módulo FanOutEngine
+
+Testa a publicação paralela com deadline e sucesso parcial.
+"""
+
+import pytest
+import asyncio
+import time
+from contextlib import aclosing
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.bot.fanout import FanOutEngine
+
+
+def poster(delay=0.0, error=None, post_id="123"):
+    """Cria um publicador falso"""
+    async def post(content):
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return {"id": post_id, "content": content}
+
+    return post
+
+
+class TestFanOutEngine:
+    """Testes para a classe FanOutEngine"""
+
+    @pytest.mark.asyncio
+    async def test_posts_concurrently(self):
+        """Testa que as plataformas são publicadas em paralelo"""
+        engine = FanOutEngine({
+            "twitter": poster(0.1),
+            "instagram": poster(0.1),
+            "linkedin": poster(0.1)
+        })
+
+        start = time.perf_counter()
+        result = await engine.post("Olá", ["twitter", "instagram", "linkedin"])
+        elapsed = time.perf_counter() - start
+
+        assert result["success"] is True
+        assert elapsed < 0.25
+        assert set(result["results"]) == {"twitter", "instagram", "linkedin"}
+        assert all(r["latency_ms"] > 0 for r in result["results"].values())
+
+    @pytest.mark.asyncio
+    async def test_partial_success(self):
+        """Testa que a falha de uma plataforma não afeta as outras"""
+        engine = FanOutEngine({
+            "twitter": poster(),
+            "linkedin": poster(error=RuntimeError("API Error"))
+        })
+
+        result = await engine.post("Olá", ["twitter", "linkedin"])
+
+        assert result["success"] is False
+        assert result["partial"] is True
+        assert result["failed"] == ["linkedin"]
+        assert result["results"]["twitter"]["id"] == "123"
+        assert result["results"]["linkedin"]["error"] == "API Error"
+
+    @pytest.mark.asyncio
+    async def test_deadline_cancels_slow_platforms(self):
+        """Testa que o deadline cancela plataformas lentas"""
+        engine = FanOutEngine({
+            "twitter": poster(),
+            "instagram": poster(5)
+        })
+
+        result = await engine.post("Olá", ["twitter", "instagram"], deadline=0.1)
+
+        assert result["results"]["twitter"]["success"] is True
+        assert result["results"]["instagram"]["error"] == "Deadline excedido"
+
+    @pytest.mark.asyncio
+    async def test_unknown_platform(self):
+        """Testa plataforma sem publicador configurado"""
+        engine = FanOutEngine({"twitter": poster()})
+
+        result = await engine.post("Olá", ["tiktok"])
+
+        assert result["success"] is False
+        assert result["results"]["tiktok"]["success"] is False
+
+    @pytest.mark.asyncio
+    async def test_per_platform_semaphore(self):
+        """Testa o limite de concorrência por plataforma"""
+        active = {"now": 0, "max": 0}
+
+        async def tracked(content):
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            return {}
+
+        engine = FanOutEngine({"twitter": tracked}, concurrency={"twitter": 1})
+
+        await asyncio.gather(*(engine.post(f"post {i}", ["twitter"]) for i in range(5)))
+
+        assert active["max"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_in_completion_order(self):
+        """Testa que o stream entrega resultados conforme terminam"""
+        engine = FanOutEngine({
+            "twitter": poster(0.05),
+            "instagram": poster(0),
+            "linkedin": poster(5)
+        })
+
+        results = [r async for r in engine.stream("Olá", ["twitter", "instagram", "linkedin"], deadline=0.2)]
+
+        assert [r.platform for r in results] == ["instagram", "twitter", "linkedin"]
+        assert results[-1].success is False
+
+    @pytest.mark.asyncio
+    async def test_stream_stopped_early_cancels_pending(self):
+        """Testa que parar de consumir o stream cancela as plataformas pendentes"""
+        cancelled = []
+
+        async def slow(content):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(content)
+                raise
+
+        engine = FanOutEngine({"twitter": poster(0), "linkedin": slow})
+
+        async with aclosing(engine.stream("Olá", ["twitter", "linkedin"])) as results:
+            async for result in results:
+                assert result.platform == "twitter"
+                break
+
+        assert cancelled == ["Olá"]
+        assert [t for t in asyncio.all_tasks() if t is not asyncio.current_task()] == []
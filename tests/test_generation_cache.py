@@ -0,0 +1,192 @@
+"""
+Testes para o módulo GenerationCache
+
+Testa o cache de conteúdo gerado (chave canônica, LRU, TTL e Redis).
+"""
+
+import pytest
+from enum import Enum
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ai.generation_cache import (
+    CacheTier,
+    GenerationCache,
+    MemoryCacheTier,
+    request_cache_key
+)
+
+
+class Tone(Enum):
+    CASUAL = "casual"
+    PROFESSIONAL = "professional"
+
+
+class FakeClock:
+    """Relógio controlável para testes de TTL"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class BrokenTier(CacheTier):
+    """Camada que simula Redis fora do ar"""
+
+    async def get(self, key):
+        raise ConnectionError("redis down")
+
+    async def set(self, key, value):
+        raise ConnectionError("redis down")
+
+    async def delete(self, key):
+        raise ConnectionError("redis down")
+
+
+@pytest.fixture
+def ai_config():
+    """Fixture para configuração de IA"""
+    return SimpleNamespace(
+        openai_model="gpt-3.5-turbo",
+        model_name="microsoft/DialoGPT-medium",
+        temperature=0.7,
+        top_p=0.9
+    )
+
+
+def make_request(**overrides):
+    """Cria uma requisição compatível com ContentRequest"""
+    fields = dict(
+        topic="Python",
+        tone=Tone.CASUAL,
+        content_type="post",
+        platform="twitter",
+        max_length=280,
+        include_hashtags=True,
+        include_emojis=True,
+        target_audience=None,
+        keywords=None,
+        context=None
+    )
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+class TestRequestCacheKey:
+    """Testes para a chave canônica"""
+
+    def test_same_request_same_key(self, ai_config):
+        """Testa que requisições iguais geram a mesma chave"""
+        assert request_cache_key(make_request(), ai_config) == request_cache_key(make_request(), ai_config)
+
+    def test_request_fields_change_key(self, ai_config):
+        """Testa que campos relevantes mudam a chave"""
+        base = request_cache_key(make_request(), ai_config)
+
+        assert request_cache_key(make_request(tone=Tone.PROFESSIONAL), ai_config) != base
+        assert request_cache_key(make_request(include_emojis=False), ai_config) != base
+
+    def test_model_settings_change_key(self, ai_config):
+        """Testa que temperatura/modelo mudam a chave"""
+        base = request_cache_key(make_request(), ai_config)
+        ai_config.temperature = 0.2
+
+        assert request_cache_key(make_request(), ai_config) != base
+
+
+class TestMemoryCacheTier:
+    """Testes para a camada em memória"""
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Testa despejo da entrada menos usada"""
+        tier = MemoryCacheTier(max_entries=2)
+        await tier.set("a", 1)
+        await tier.set("b", 2)
+        await tier.get("a")
+        await tier.set("c", 3)
+
+        assert await tier.get("b") is None
+        assert await tier.get("a") == 1
+        assert tier.stats.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiration(self):
+        """Testa expiração por TTL"""
+        clock = FakeClock()
+        tier = MemoryCacheTier(ttl_seconds=10, clock=clock)
+        await tier.set("a", 1)
+
+        clock.now = 11
+
+        assert await tier.get("a") is None
+        assert tier.stats.expirations == 1
+
+
+class TestGenerationCache:
+    """Testes para a classe GenerationCache"""
+
+    @pytest.mark.asyncio
+    async def test_get_or_generate_hits_cache(self, ai_config):
+        """Testa que a segunda chamada não gera novamente"""
+        cache = GenerationCache()
+        generate = AsyncMock(return_value="conteúdo")
+
+        first = await cache.get_or_generate(make_request(), ai_config, generate)
+        second = await cache.get_or_generate(make_request(), ai_config, generate)
+
+        assert first == second == "conteúdo"
+        generate.assert_awaited_once()
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_force_fresh_bypasses_cache(self, ai_config):
+        """Testa que force_fresh sempre gera"""
+        cache = GenerationCache()
+        generate = AsyncMock(side_effect=["v1", "v2"])
+
+        await cache.get_or_generate(make_request(), ai_config, generate)
+        result = await cache.get_or_generate(make_request(), ai_config, generate, force_fresh=True)
+
+        assert result == "v2"
+        assert cache.stats.bypassed == 1
+        assert await cache.get(request_cache_key(make_request(), ai_config)) == "v2"
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self, ai_config):
+        """Testa que gerações que falham não são cacheadas"""
+        cache = GenerationCache()
+        generate = AsyncMock(side_effect=[None, "ok"])
+
+        assert await cache.get_or_generate(make_request(), ai_config, generate) is None
+        assert await cache.get_or_generate(make_request(), ai_config, generate) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_promotes_to_memory(self):
+        """Testa que um acerto no Redis é promovido para a memória"""
+        redis = MemoryCacheTier()
+        await redis.set("k", "valor")
+        cache = GenerationCache(redis=redis)
+
+        assert await cache.get("k") == "valor"
+        assert await cache.get("k") == "valor"
+        assert cache.stats.redis_hits == 1
+        assert cache.stats.memory_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_degrades_to_miss(self, ai_config):
+        """Testa que falhas do Redis não interrompem a geração"""
+        cache = GenerationCache(redis=BrokenTier())
+        generate = AsyncMock(return_value="conteúdo")
+
+        result = await cache.get_or_generate(make_request(), ai_config, generate)
+
+        assert result == "conteúdo"
+        assert cache.stats.redis_errors == 2
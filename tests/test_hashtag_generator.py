@@ -0,0 +1,166 @@
+"""
+Testes para o ranking de hashtags
+
+Testa a normalização, o índice de co-ocorrência, o refresh incremental com
+decaimento, a tendência, o fallback e a persistência do índice.
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ai.hashtag_generator import HashtagGenerator, extract_hashtags, normalize_tag, tag_words
+
+
+class FakeClock:
+    """Relógio controlado pelo teste"""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, hours: float):
+        self.now += hours * 3600
+
+
+def make_generator(**kwargs) -> HashtagGenerator:
+    generator = HashtagGenerator(default_hashtags=["#AI", "#tech"], **kwargs)
+    for _ in range(5):
+        generator.observe_post(["#Python", "#DataScience", "#MachineLearning"], engagement=10)
+    generator.observe_post(["#Python", "#Django"], engagement=1)
+    generator.observe_post(["#Café", "#BomDia"], engagement=3)
+    return generator
+
+
+class TestHelpers:
+    """Testes para as funções de texto"""
+
+    def test_normalization_and_words(self):
+        """Testa chave sem acento/caixa e palavras de camelCase"""
+        assert normalize_tag("#Café") == normalize_tag("cafe") == "cafe"
+        assert tag_words("#MachineLearning") == ["machine", "learning"]
+        assert tag_words("#IAGenerativa2024") == ["ia", "generativa", "2024"]
+
+    def test_extract_hashtags(self):
+        """Testa extração na ordem e sem repetição"""
+        text = "Novidades em #Python e #IA! #python #Dados"
+        assert extract_hashtags(text) == ["#Python", "#IA", "#Dados"]
+
+
+class TestHashtagGenerator:
+    """Testes para o HashtagGenerator"""
+
+    @pytest.mark.asyncio
+    async def test_cooccurrence_ranking(self):
+        """Testa que a semente vem primeiro e vizinhos fortes antes dos fracos"""
+        generator = make_generator()
+        await generator.refresh()
+
+        suggestions = generator.suggest("python", count=4)
+        tags = [tag for tag, _ in suggestions]
+
+        assert tags[0] == "#Python"
+        assert set(tags[1:3]) == {"#DataScience", "#MachineLearning"}
+        assert tags[3] == "#Django"
+        assert generator.generate("machine learning", count=1) == ["#MachineLearning"]
+        assert [score for _, score in suggestions] == sorted((s for _, s in suggestions), reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_accents_case_and_exclusions(self):
+        """Testa tema sem acento e exclusão de hashtags já usadas"""
+        generator = make_generator()
+        await generator.refresh()
+
+        assert generator.generate("cafe", count=1) == ["#Café"]
+        assert "#BomDia" not in generator.generate("CAFÉ", count=3, exclude=["#bomdia"])
+
+    @pytest.mark.asyncio
+    async def test_fallback_to_trending_and_defaults(self):
+        """Testa tema desconhecido (em alta) e índice vazio (padrão)"""
+        empty = HashtagGenerator(default_hashtags=["#AI", "#tech"])
+        assert empty.generate("qualquer coisa", count=3) == ["#AI", "#tech"]
+
+        generator = make_generator()
+        await generator.refresh()
+        result = generator.generate("astronomia", count=3)
+
+        assert len(result) == 3
+        assert result[0] == "#Python"  # Mais usada no período recente
+
+    @pytest.mark.asyncio
+    async def test_incremental_refresh_and_decay(self):
+        """Testa que novos posts entram sem reconstruir e que o antigo decai"""
+        clock = FakeClock()
+        generator = make_generator(clock=clock, half_life_hours=24)
+        first = await generator.refresh()
+
+        clock.advance(24)
+        generator.observe_post(["#Python", "#Rust"], engagement=5)
+        second = await generator.refresh()
+
+        python = generator.index.ids["python"]
+        data_science = generator.index.ids["datascience"]
+        assert second.version == first.version + 1
+        assert second.size == first.size + 1
+        assert second.usage[python] == pytest.approx(6 * 0.5 + 1)
+        assert first.usage[python] == pytest.approx(6)  # Snapshot antigo intacto
+
+        row = slice(second.indptr[python], second.indptr[python + 1])
+        weights = dict(zip(second.indices[row].tolist(), second.weights[row].tolist()))
+        assert weights[data_science] == pytest.approx(2.5)
+        assert weights[generator.index.ids["rust"]] == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_trending_tag_gets_boost(self):
+        """Testa que uso recente acima do histórico aumenta a pontuação"""
+        clock = FakeClock()
+        generator = HashtagGenerator(clock=clock)
+        for _ in range(10):
+            generator.observe_post(["#Futebol", "#Copa"])
+            generator.observe_post(["#Futebol", "#Brasileirao"])
+        await generator.refresh()
+
+        clock.advance(48)
+        for _ in range(5):
+            generator.observe_post(["#Futebol", "#Copa"])
+        await generator.refresh()
+
+        ranked = [tag for tag, _ in generator.suggest("futebol", count=3)]
+        assert ranked.index("#Copa") < ranked.index("#Brasileirao")
+
+    @pytest.mark.asyncio
+    async def test_neighbors_are_pruned(self):
+        """Testa que cada linha de consulta guarda só os K vizinhos mais fortes"""
+        generator = HashtagGenerator(neighbors_per_tag=2)
+        for i in range(6):
+            for _ in range(i + 1):
+                generator.observe_post(["#Hub", f"#Tag{i}"])
+        index = await generator.refresh()
+
+        hub = index.ids["hub"]
+        neighbors = index.indices[index.indptr[hub]:index.indptr[hub + 1]]
+        assert sorted(index.tags[i] for i in neighbors.tolist()) == ["#Tag4", "#Tag5"]
+        assert np.all(np.diff(index.indptr) <= 2)
+
+    @pytest.mark.asyncio
+    async def test_save_and_load(self):
+        """Testa que o índice salvo é restaurado com as mesmas sugestões"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "hashtags.npz"
+            generator = make_generator(index_path=str(path))
+            await generator.refresh()
+            expected = generator.suggest("python", count=5)
+
+            restored = HashtagGenerator(index_path=str(path))
+
+        suggestions = restored.suggest("python", count=5)
+        assert [tag for tag, _ in suggestions] == [tag for tag, _ in expected]
+        assert [score for _, score in suggestions] == pytest.approx([score for _, score in expected])
+        assert restored.index.size == generator.index.size
@@ -0,0 +1,177 @@
+"""
+Testes para o módulo de hedging de provedores de IA
+
+Testa o fallback sequencial, a corrida hedged e o histograma de latência.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import AsyncMock
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ai.hedging import (
+    HedgeSettings,
+    LatencyHistogram,
+    ProviderPolicy,
+    ProviderRacer
+)
+
+
+def delayed(value, delay, error=None):
+    """Cria um provedor falso que responde após ``delay`` segundos"""
+    state = {"started": False, "cancelled": False}
+
+    async def call():
+        state["started"] = True
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+        if error:
+            raise error
+        return value
+
+    return call, state
+
+
+@pytest.fixture
+def hedged_racer():
+    """Fixture para racer no modo hedged com atraso curto"""
+    return ProviderRacer(HedgeSettings(
+        policy=ProviderPolicy.HEDGED,
+        default_delay=0.05,
+        min_delay=0.01
+    ))
+
+
+class TestSequentialPolicy:
+    """Testes para a política padrão (sequencial)"""
+
+    @pytest.mark.asyncio
+    async def test_primary_success(self):
+        """Testa que o secundário não é chamado quando o primário responde"""
+        openai = AsyncMock(return_value={"text": "ok"})
+        huggingface = AsyncMock()
+
+        provider, result = await ProviderRacer().run(("openai", openai), ("huggingface", huggingface))
+
+        assert provider == "openai"
+        assert result == {"text": "ok"}
+        huggingface.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_fallback_on_failure(self):
+        """Testa fallback para o secundário quando o primário falha"""
+        openai = AsyncMock(side_effect=Exception("OpenAI Error"))
+        huggingface = AsyncMock(return_value={"text": "hf"})
+
+        provider, result = await ProviderRacer().run(("openai", openai), ("huggingface", huggingface))
+
+        assert provider == "huggingface"
+        openai.assert_awaited_once()
+        huggingface.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_both_fail_raises(self):
+        """Testa que o erro do último provedor é propagado"""
+        openai = AsyncMock(side_effect=Exception("OpenAI Error"))
+        huggingface = AsyncMock(side_effect=Exception("HuggingFace Error"))
+
+        with pytest.raises(Exception, match="HuggingFace Error"):
+            await ProviderRacer().run(("openai", openai), ("huggingface", huggingface))
+
+
+class TestHedgedPolicy:
+    """Testes para a política hedged"""
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_does_not_hedge(self, hedged_racer):
+        """Testa que o hedge não dispara se o primário for rápido"""
+        openai, _ = delayed("openai", 0)
+        huggingface, hf_state = delayed("hf", 0)
+
+        provider, _ = await hedged_racer.run(("openai", openai), ("huggingface", huggingface))
+
+        assert provider == "openai"
+        assert hf_state["started"] is False
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_loses_and_is_cancelled(self, hedged_racer):
+        """Testa que o secundário vence e o primário lento é cancelado"""
+        openai, openai_state = delayed("openai", 5)
+        huggingface, _ = delayed("hf", 0.01)
+
+        provider, result = await asyncio.wait_for(
+            hedged_racer.run(("openai", openai), ("huggingface", huggingface)),
+            timeout=1
+        )
+        await asyncio.sleep(0)
+
+        assert (provider, result) == ("huggingface", "hf")
+        assert openai_state["cancelled"] is True
+        assert hedged_racer.stats["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_primary_still_wins_after_hedge(self, hedged_racer):
+        """Testa que o primário pode vencer mesmo após o hedge"""
+        openai, _ = delayed("openai", 0.08)
+        huggingface, hf_state = delayed("hf", 5)
+
+        provider, _ = await asyncio.wait_for(
+            hedged_racer.run(("openai", openai), ("huggingface", huggingface)),
+            timeout=1
+        )
+        await asyncio.sleep(0)
+
+        assert provider == "openai"
+        assert hf_state["cancelled"] is True
+
+    @pytest.mark.asyncio
+    async def test_slow_failure_waits_for_secondary(self, hedged_racer):
+        """Testa que a falha do primário após o hedge não encerra a corrida"""
+        openai, _ = delayed(None, 0.08, error=TimeoutError("timeout"))
+        huggingface, _ = delayed("hf", 0.1)
+
+        provider, result = await hedged_racer.run(("openai", openai), ("huggingface", huggingface))
+
+        assert (provider, result) == ("huggingface", "hf")
+
+    def test_hedge_delay_adapts_to_histogram(self, hedged_racer):
+        """Testa que o atraso do hedge segue o p95 observado"""
+        for _ in range(100):
+            hedged_racer._record("openai", 0.2)
+
+        delay = hedged_racer.hedge_delay("openai")
+
+        assert 0.2 <= delay < 0.25
+
+
+class TestLatencyHistogram:
+    """Testes para a classe LatencyHistogram"""
+
+    def test_empty_histogram(self):
+        """Testa quantil sem amostras"""
+        assert LatencyHistogram().quantile(0.95) is None
+
+    def test_quantile(self):
+        """Testa estimativa de quantil"""
+        histogram = LatencyHistogram()
+        for _ in range(95):
+            histogram.record(0.1)
+        for _ in range(5):
+            histogram.record(3.0)
+
+        assert histogram.quantile(0.5) == pytest.approx(0.1, rel=0.15)
+        assert histogram.quantile(0.99) == pytest.approx(3.0, rel=0.15)
+
+    def test_decay_keeps_memory_bounded(self):
+        """Testa que o total de amostras é limitado"""
+        histogram = LatencyHistogram(max_samples=100)
+        for _ in range(1000):
+            histogram.record(0.5)
+
+        assert histogram.total <= 100
@@ -0,0 +1,159 @@
+"""
+Testes para o módulo HTTPSessionManager
+
+Testa reuso de conexões, limite global de requisições e estatísticas do pool.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from aiohttp import web
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.config import HTTPConfig
+from src.utils.http_session import HTTPSessionManager
+
+
+@asynccontextmanager
+async def local_server():
+    """Servidor HTTP local que conta requisições simultâneas"""
+    state = {"active": 0, "peak": 0}
+
+    async def handler(request):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(float(request.query.get("delay", "0")))
+        state["active"] -= 1
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        yield f"http://127.0.0.1:{port}", state
+    finally:
+        await runner.cleanup()
+
+
+class TestHTTPSessionManager:
+    """Testes para a classe HTTPSessionManager"""
+
+    @pytest.mark.asyncio
+    async def test_reuses_connection_with_keep_alive(self):
+        """Testa que requisições sequenciais reaproveitam a conexão"""
+        async with local_server() as server:
+            url, _ = server
+            http = HTTPSessionManager()
+            await http.start()
+
+            for _ in range(3):
+                async with http.request("GET", url) as response:
+                    assert (await response.json())["ok"] is True
+
+            stats = http.pool_stats()["127.0.0.1"]
+            await http.close()
+
+            assert stats["created"] == 1
+            assert stats["reused"] == 2
+            assert stats["requests"] == 3
+            assert stats["idle"] == 1
+
+    @pytest.mark.asyncio
+    async def test_global_in_flight_limit(self):
+        """Testa que o limite global segura as requisições excedentes"""
+        async with local_server() as server:
+            url, state = server
+            http = HTTPSessionManager(max_in_flight=2)
+            await http.start()
+
+            async def fetch():
+                async with http.request("GET", f"{url}/?delay=0.05") as response:
+                    await response.read()
+
+            await asyncio.gather(*(fetch() for _ in range(6)))
+            await http.close()
+
+            assert state["peak"] == 2
+
+    @pytest.mark.asyncio
+    async def test_waiting_requests_are_reported(self):
+        """Testa a contagem de requisições aguardando vaga"""
+        async with local_server() as server:
+            url, _ = server
+            http = HTTPSessionManager(max_in_flight=1)
+            await http.start()
+
+            async def fetch():
+                async with http.request("GET", f"{url}/?delay=0.1") as response:
+                    await response.read()
+
+            tasks = [asyncio.create_task(fetch()) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            stats = http.pool_stats()["127.0.0.1"]
+            await asyncio.gather(*tasks)
+            await http.close()
+
+            assert stats["in_flight"] == 1
+            assert stats["waiting"] == 2
+            assert stats["in_use"] == 1
+
+    @pytest.mark.asyncio
+    async def test_caller_trace_ctx_without_host(self):
+        """Testa trace_request_ctx do chamador sem "host" e requisições direto pela sessão"""
+        async with local_server() as server:
+            url, _ = server
+            http = HTTPSessionManager()
+            await http.start()
+
+            async with http.request("GET", url, trace_request_ctx={"request_id": "abc"}) as response:
+                await response.read()
+            async with http.session.get(url, trace_request_ctx={"request_id": "def"}) as response:
+                await response.read()
+
+            stats = http.pool_stats()["127.0.0.1"]
+            await http.close()
+
+            assert stats["created"] + stats["reused"] == 2
+
+    def test_prometheus_collector_registered_twice(self):
+        """Testa que registrar de novo (outro manager ou re-init) não falha"""
+        prometheus_client = pytest.importorskip("prometheus_client")
+        registry = prometheus_client.CollectorRegistry()
+
+        HTTPSessionManager().register_prometheus_collector(registry)
+        http = HTTPSessionManager()
+        http.register_prometheus_collector(registry)
+        http.register_prometheus_collector(registry)
+
+        assert registry.get_sample_value(
+            "socialbot_http_pool_connections", {"host": "x", "state": "open"}
+        ) is None
+
+    @pytest.mark.asyncio
+    async def test_close_releases_session(self):
+        """Testa o encerramento limpo da sessão"""
+        http = HTTPSessionManager()
+        await http.start()
+        session = http.session
+
+        await http.close()
+
+        assert session.closed
+        with pytest.raises(RuntimeError):
+            http.session
+
+    def test_from_config(self):
+        """Testa criação a partir do HTTPConfig"""
+        http = HTTPSessionManager.from_config(HTTPConfig(max_connections_per_host=5, max_in_flight=10))
+
+        assert http.max_connections_per_host == 5
+        assert http.max_in_flight == 10
@@ -0,0 +1,95 @@
+"""
+Testes de cold start dos pacotes do SocialBot AI
+
+Garante que importar os pacotes não carrega dependências pesadas e que o
+tempo de importação fica dentro do orçamento definido.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.import_time import (
+    DEFAULT_MODULES,
+    measure_import,
+    parse_importtime
+)
+
+# Orçamento de cold start por pacote (ms); ajustável para máquinas lentas de CI
+IMPORT_BUDGET_MS = float(os.getenv("SOCIALBOT_IMPORT_BUDGET_MS", "100"))
+
+
+class TestLazyImports:
+    """Testes para o carregamento preguiçoso dos pacotes"""
+
+    @pytest.mark.parametrize("module", DEFAULT_MODULES)
+    def test_import_does_not_load_heavy_modules(self, module):
+        """Testa que importar o pacote não puxa torch/transformers"""
+        measurement = measure_import(module)
+
+        assert measurement["heavy_loaded"] == []
+
+    @pytest.mark.parametrize("module", DEFAULT_MODULES)
+    def test_import_within_budget(self, module):
+        """Testa que o cold start fica dentro do orçamento"""
+        measurement = measure_import(module)
+
+        assert measurement["total_ms"] <= IMPORT_BUDGET_MS, (
+            f"import {module} levou {measurement['total_ms']:.2f} ms "
+            f"(orçamento: {IMPORT_BUDGET_MS:.0f} ms)"
+        )
+
+    def test_public_names_listed_without_import(self):
+        """Testa que __dir__ expõe os nomes públicos sem importá-los"""
+        code = (
+            "import sys, src; "
+            "assert 'ContentGenerator' in dir(src); "
+            "assert 'src.ai.content_generator' not in sys.modules"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).parent.parent,
+            capture_output=True,
+            text=True
+        )
+
+        assert result.returncode == 0, result.stderr
+
+    def test_unknown_attribute_raises(self):
+        """Testa que atributos inexistentes levantam AttributeError"""
+        import src
+
+        with pytest.raises(AttributeError):
+            src.AtributoInexistente
+
+    def test_lazy_attribute_is_cached(self):
+        """Testa que o atributo carregado fica no namespace do pacote"""
+        pytest.importorskip("dotenv")
+        import src.utils
+
+        config_class = src.utils.Config
+
+        assert src.utils.__dict__["Config"] is config_class
+
+
+class TestParseImportTime:
+    """Testes para o parser da saída de -X importtime"""
+
+    def test_parse_importtime(self):
+        """Testa parse de linhas de -X importtime"""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   src.ai\n"
+            "import time:       300 |        420 | src\n"
+        )
+
+        records = parse_importtime(stderr)
+
+        assert [r.module for r in records] == ["src.ai", "src"]
+        assert records[0].depth == 1
+        assert records[1].cumulative_us == 420
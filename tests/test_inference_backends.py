@@ -0,0 +1,116 @@
+"""
+Testes para os backends de inferência em CPU
+
+Testa a validação e o cache das exportações, e a paridade das saídas do
+int8/ONNX com o PyTorch fp32 em um modelo minúsculo criado localmente.
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ai.inference_backends import INFERENCE_BACKENDS, export_dir, load_model, validate_backend
+from src.ai.sentiment_analyzer import SentimentAnalyzer, TransformersSentimentBackend
+
+TEXTS = [
+    "adorei o produto",
+    "péssimo atendimento hoje",
+    "ok",
+    "a entrega chegou rápido e o suporte foi ótimo",
+    "não funciona"
+]
+
+
+@pytest.fixture
+def tiny_model(tmp_path):
+    """Classificador BERT minúsculo salvo em disco (sem download)"""
+    pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+
+    words = sorted({word for text in TEXTS for word in text.split()})
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words
+    model_dir = tmp_path / "tiny-sentiment"
+    model_dir.mkdir()
+    (model_dir / "vocab.txt").write_text("\n".join(vocab), encoding="utf-8")
+
+    tokenizer = transformers.BertTokenizerFast(str(model_dir / "vocab.txt"), do_lower_case=False)
+    config = transformers.BertConfig(
+        vocab_size=len(vocab), hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+        intermediate_size=64, num_labels=3,
+        id2label={0: "negative", 1: "neutral", 2: "positive"},
+        label2id={"negative": 0, "neutral": 1, "positive": 2}
+    )
+    transformers.set_seed(0)
+    transformers.BertForSequenceClassification(config).save_pretrained(model_dir)
+    tokenizer.save_pretrained(model_dir)
+    return str(model_dir)
+
+
+def probabilities(model_dir, backend, cache_dir):
+    analyzer = SentimentAnalyzer(
+        backend=TransformersSentimentBackend(model_dir, inference_backend=backend, cache_dir=str(cache_dir)),
+        threads=1
+    )
+    try:
+        results = analyzer.analyze_batch_sync(TEXTS)
+    finally:
+        analyzer.close()
+    return np.array([[r["scores"][label] for label in ("negative", "neutral", "positive")] for r in results])
+
+
+class TestBackendSelection:
+    """Testes para a escolha do backend e o cache em disco"""
+
+    def test_validate_backend(self):
+        """Testa nomes válidos e inválidos"""
+        assert validate_backend(" ONNX ") == "onnx"
+        assert set(INFERENCE_BACKENDS) == {"torch", "quantized", "onnx", "onnx-int8"}
+
+        with pytest.raises(ValueError):
+            validate_backend("tensorrt")
+
+    def test_export_dir_separates_models_and_backends(self, tmp_path):
+        """Testa que cada modelo/tarefa/backend tem seu diretório de cache"""
+        first = export_dir(str(tmp_path), "microsoft/DialoGPT-medium", "text-generation", "onnx")
+
+        assert first == export_dir(str(tmp_path), "microsoft/DialoGPT-medium", "text-generation", "onnx")
+        assert first.parent == tmp_path
+        assert "/" not in first.name
+        assert first != export_dir(str(tmp_path), "microsoft/DialoGPT-medium", "text-generation", "onnx-int8")
+        assert first != export_dir(str(tmp_path), "microsoft/DialoGPT-small", "text-generation", "onnx")
+
+    def test_invalid_backend_fails_at_construction(self):
+        """Testa que um backend inválido falha antes de carregar o modelo"""
+        with pytest.raises(ValueError):
+            TransformersSentimentBackend(inference_backend="gpu")
+
+
+class TestOutputParity:
+    """Paridade das saídas com o PyTorch fp32"""
+
+    def test_quantized_matches_torch(self, tiny_model, tmp_path):
+        """Testa int8 dinâmico contra fp32 (tolerância da quantização)"""
+        baseline = probabilities(tiny_model, "torch", tmp_path)
+        quantized = probabilities(tiny_model, "quantized", tmp_path)
+
+        assert np.max(np.abs(quantized - baseline)) < 0.05
+
+    @pytest.mark.parametrize("backend,tolerance", [("onnx", 1e-4), ("onnx-int8", 0.05)])
+    def test_onnx_matches_torch_and_is_cached(self, tiny_model, tmp_path, backend, tolerance):
+        """Testa ONNX contra fp32 e o reuso da exportação em disco"""
+        pytest.importorskip("optimum.onnxruntime")
+        cache_dir = tmp_path / "cache"
+        baseline = probabilities(tiny_model, "torch", cache_dir)
+
+        exported = probabilities(tiny_model, backend, cache_dir)
+        with patch("src.ai.inference_backends._export_onnx", side_effect=AssertionError("reexportou")):
+            cached = probabilities(tiny_model, backend, cache_dir)
+            load_model(tiny_model, backend=backend, cache_dir=str(cache_dir))
+
+        assert np.max(np.abs(exported - baseline)) < tolerance
+        np.testing.assert_array_equal(cached, exported)
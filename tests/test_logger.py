@@ -0,0 +1,133 @@
+"""
+Testes para o módulo Logger
+
+Testa o formato JSON, o modo fila não bloqueante e a amostragem.
+"""
+
+import io
+import json
+import logging
+import queue
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.exceptions import RateLimitError, log_exception
+from src.utils.logger import DroppingQueueHandler, JSONFormatter, Logger, SamplingFilter
+
+
+@pytest.fixture
+def stream():
+    """Configura o Logger com saída em memória e restaura ao final"""
+    output = io.StringIO()
+    Logger.configure(level="DEBUG", json_format=True, log_file="", use_queue=True, sampling={}, stream=output)
+    yield output
+    Logger.shutdown()
+
+
+def read_lines(output):
+    Logger.shutdown()  # Esvazia a fila antes de ler
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+class TestLogger:
+    """Testes para a classe Logger"""
+
+    def test_json_lines_with_extra(self, stream):
+        """Testa que o extra= chega ao JSON pela fila"""
+        logger = Logger().get_logger("bot.twitter")
+
+        logger.info("Post %s publicado", "123", extra={"platform": "twitter", "post_id": "123"})
+
+        [entry] = read_lines(stream)
+        assert entry["message"] == "Post 123 publicado"
+        assert entry["logger"] == "bot.twitter"
+        assert (entry["platform"], entry["post_id"]) == ("twitter", "123")
+
+    def test_log_exception_payload_is_preserved(self, stream):
+        """Testa o payload estruturado do log_exception"""
+        logger = Logger().get_logger("bot")
+        error = RateLimitError("429", retry_after=30, platform="twitter")
+
+        log_exception(logger, error, context={"attempt": 2})
+
+        [entry] = read_lines(stream)
+        expected = error.to_dict()
+        assert entry["error_name"] == expected["error_name"]
+        assert entry["error_message"] == expected["message"]
+        assert entry["error_timestamp"] == expected["timestamp"]
+        assert entry["details"] == {"platform": "twitter"}
+        assert entry["retry_after"] == 30
+        assert entry["context"] == {"attempt": 2}
+
+    def test_exception_traceback_is_serialized(self, stream):
+        """Testa que logger.exception leva o traceback pela fila"""
+        logger = Logger().get_logger("bot")
+
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("Falhou")
+
+        [entry] = read_lines(stream)
+        assert "ZeroDivisionError" in entry["exception"]
+
+    def test_sampling_per_logger(self, stream):
+        """Testa amostragem de um logger sem afetar os demais"""
+        Logger.set_sampling("bot.mentions", 0.25)
+        noisy = Logger().get_logger("bot.mentions.poller")
+        quiet = Logger().get_logger("bot.scheduler")
+
+        for i in range(8):
+            noisy.info("mention %d", i)
+        noisy.warning("sempre passa")
+        quiet.info("sem amostragem")
+
+        messages = [entry["message"] for entry in read_lines(stream)]
+        assert sum(m.startswith("mention") for m in messages) == 2
+        assert "sempre passa" in messages and "sem amostragem" in messages
+        assert Logger.stats()["sampled_out"]["bot.mentions"] == 6
+
+
+class TestDroppingQueueHandler:
+    """Testes para a classe DroppingQueueHandler"""
+
+    def test_full_queue_drops_and_counts(self):
+        """Testa que a fila cheia descarta sem bloquear"""
+        handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+        logger = logging.getLogger("test.dropping")
+        logger.propagate = False
+        logger.addHandler(handler)
+
+        try:
+            for i in range(5):
+                logger.warning("evento %d", i)
+        finally:
+            logger.removeHandler(handler)
+
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == {"WARNING": 3}
+
+
+class TestSamplingFilter:
+    """Testes para a classe SamplingFilter"""
+
+    def test_decision_is_shared_between_handlers(self):
+        """Testa que dois handlers não consomem a amostragem duas vezes"""
+        sampling = SamplingFilter({"app": 0.5})
+        record = logging.LogRecord("app", logging.INFO, __file__, 1, "x", (), None)
+
+        first = sampling.filter(record)
+
+        assert sampling.filter(record) is first
+        assert sum(sampling.sampled_out.values()) <= 1
+
+    def test_json_formatter_handles_unserializable_extra(self):
+        """Testa que valores não serializáveis viram string"""
+        record = logging.LogRecord("app", logging.INFO, __file__, 1, "x", (), None)
+        record.when = object()
+
+        assert "object object" in json.loads(JSONFormatter().format(record))["when"]
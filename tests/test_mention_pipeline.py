@@ -0,0 +1,263 @@
+"""
+Testes para o pipeline de menções
+
+Testa o fluxo completo, a paginação com since_id, a pressão de volta das
+filas limitadas e as respostas exatamente uma vez entre restarts.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.bot.mention_pipeline import (
+    STATUS_FAILED,
+    STATUS_REPLIED,
+    STATUS_SKIPPED,
+    STATUS_UNKNOWN,
+    MentionLedger,
+    MentionPipeline
+)
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    """Fixture para banco SQLite temporário"""
+    return f"sqlite:///{tmp_path / 'mentions.db'}"
+
+
+class FakePlatform:
+    """Menções paginadas (mais novas primeiro) e respostas publicadas"""
+
+    def __init__(self, count: int, page_size: int = 10):
+        self.mentions = [{"id": str(1000 + i), "text": f"menção {i}", "author_id": f"u{i}"} for i in range(count)]
+        self.page_size = page_size
+        self.calls: List[Optional[str]] = []
+        self.replies: Dict[str, List[str]] = {}
+
+    async def fetch(self, since_id: Optional[str], token: Optional[str]):
+        self.calls.append(since_id)
+        newer = [m for m in reversed(self.mentions) if since_id is None or int(m["id"]) > int(since_id)]
+        start = int(token or 0)
+        page = newer[start:start + self.page_size]
+        next_token = str(start + self.page_size) if start + self.page_size < len(newer) else None
+        return page, next_token
+
+    async def post(self, mention, text):
+        self.replies.setdefault(mention.id, []).append(text)
+        return f"r{mention.id}"
+
+    async def verify(self, mention):
+        return f"r{mention.id}" if mention.id in self.replies else None
+
+
+class FakeAnalyzer:
+    """Analisador que registra o tamanho dos lotes"""
+
+    def __init__(self):
+        self.batches: List[int] = []
+
+    async def analyze_batch(self, texts):
+        self.batches.append(len(texts))
+        return [{"sentiment": "positive", "confidence": 0.9} for _ in texts]
+
+
+async def echo_reply(mention):
+    return f"Obrigado, {mention.author}!"
+
+
+@asynccontextmanager
+async def running(pipeline: MentionPipeline):
+    await pipeline.start()
+    try:
+        yield pipeline
+    finally:
+        await pipeline.stop()
+
+
+class TestMentionPipeline:
+    """Testes para o MentionPipeline"""
+
+    @pytest.mark.asyncio
+    async def test_replies_to_all_mentions_once(self, database_url):
+        """Testa fluxo completo com paginação, sentimento em lote e checkpoint"""
+        platform = FakePlatform(35)
+        analyzer = FakeAnalyzer()
+        ledger = MentionLedger(database_url)
+        pipeline = MentionPipeline(
+            "twitter", platform.fetch, echo_reply, platform.post, ledger,
+            analyzer=analyzer, poll_interval=3600
+        )
+
+        async with running(pipeline):
+            await asyncio.sleep(0)
+            await pipeline.join()
+            metrics = pipeline.metrics()
+
+        assert sorted(platform.replies) == [m["id"] for m in platform.mentions]
+        assert all(len(texts) == 1 for texts in platform.replies.values())
+        assert sum(analyzer.batches) == 35
+        assert ledger.checkpoint("twitter") == "1034"
+        assert metrics["stages"]["post"]["processed"] == 35
+        assert metrics["outstanding"] == 0
+
+    @pytest.mark.asyncio
+    async def test_next_poll_uses_checkpoint(self, database_url):
+        """Testa que o restart busca a partir do since_id salvo"""
+        platform = FakePlatform(5)
+        ledger = MentionLedger(database_url)
+        first = MentionPipeline("twitter", platform.fetch, echo_reply, platform.post, ledger, poll_interval=3600)
+        async with running(first):
+            await asyncio.sleep(0)
+            await first.join()
+
+        platform.mentions.append({"id": "2000", "text": "nova", "author_id": "x"})
+        second = MentionPipeline("twitter", platform.fetch, echo_reply, platform.post, ledger, poll_interval=3600)
+        async with running(second):
+            await asyncio.sleep(0)
+            await second.join()
+
+        assert platform.calls[-1] == "1004"
+        assert list(platform.replies)[-1] == "2000"
+        assert all(len(texts) == 1 for texts in platform.replies.values())
+
+    @pytest.mark.asyncio
+    async def test_slow_stage_applies_backpressure(self, database_url):
+        """Testa que a fila limitada segura o fetch em vez de crescer"""
+        platform = FakePlatform(40, page_size=40)
+        release = asyncio.Event()
+        depths: List[int] = []
+
+        async def slow_reply(mention):
+            await release.wait()
+            return "ok"
+
+        pipeline = MentionPipeline(
+            "twitter", platform.fetch, slow_reply, platform.post, MentionLedger(database_url),
+            poll_interval=3600, queue_size=2, batch_size=2, reply_concurrency=1
+        )
+        async with running(pipeline):
+            for _ in range(20):
+                await asyncio.sleep(0)
+                depths.append(max(stage["queue_depth"] for stage in pipeline.metrics()["stages"].values()))
+            in_pipeline = pipeline.metrics()["stages"]["fetch"]["processed"]
+            release.set()
+            await pipeline.join()
+
+        assert max(depths) <= 2
+        assert in_pipeline < 40  # O fetch ficou bloqueado esperando espaço
+        assert pipeline.stages["fetch"].blocked_seconds > 0
+        assert len(platform.replies) == 40
+
+    @pytest.mark.asyncio
+    async def test_skip_and_failure_do_not_block_checkpoint(self, database_url):
+        """Testa menções sem resposta e com erro de publicação"""
+        platform = FakePlatform(3)
+        ledger = MentionLedger(database_url)
+
+        async def selective_reply(mention):
+            return None if mention.id == "1000" else "ok"
+
+        async def flaky_post(mention, text):
+            if mention.id == "1001":
+                raise ConnectionError("timeout")
+            return await platform.post(mention, text)
+
+        pipeline = MentionPipeline("twitter", platform.fetch, selective_reply, flaky_post, ledger, poll_interval=3600)
+        async with running(pipeline):
+            await asyncio.sleep(0)
+            await pipeline.join()
+
+        statuses = ledger.statuses("twitter", ["1000", "1001", "1002"])
+        assert statuses == {"1000": STATUS_SKIPPED, "1001": STATUS_FAILED, "1002": STATUS_REPLIED}
+        assert ledger.checkpoint("twitter") == "1002"
+
+    @pytest.mark.asyncio
+    async def test_ledger_errors_keep_workers_and_refetch(self, database_url):
+        """Testa banco travado no dedupe e no claim: workers vivos e menções buscadas de novo"""
+        platform = FakePlatform(5)
+
+        class FlakyLedger(MentionLedger):
+            failures = {"statuses": 1, "claim": 2}
+
+            def _fail(self, name):
+                if self.failures[name]:
+                    self.failures[name] -= 1
+                    raise OperationalError("UPDATE", {}, Exception("database is locked"))
+
+            def statuses(self, source, mention_ids):
+                self._fail("statuses")
+                return super().statuses(source, mention_ids)
+
+            def claim(self, source, mention_id, reply_text):
+                self._fail("claim")
+                return super().claim(source, mention_id, reply_text)
+
+        ledger = FlakyLedger(database_url)
+        pipeline = MentionPipeline(
+            "twitter", platform.fetch, echo_reply, platform.post, ledger,
+            poll_interval=3600, batch_size=2, checkpoint_interval=0
+        )
+        async with running(pipeline):
+            await asyncio.sleep(0)
+            await asyncio.wait_for(pipeline.join(), 5)
+            assert ledger.checkpoint("twitter") != "1004"  # Pendentes seguram o since_id
+
+            for _ in range(3):
+                await pipeline.poll_once()
+                await asyncio.wait_for(pipeline.join(), 5)
+            assert all(not task.done() for task in pipeline._tasks)
+
+        assert sorted(platform.replies) == [m["id"] for m in platform.mentions]
+        assert all(len(texts) == 1 for texts in platform.replies.values())
+        assert pipeline.stages["dedupe"].failed == 2 and pipeline.stages["post"].failed == 2
+        assert ledger.checkpoint("twitter") == "1004"
+        assert pipeline.metrics()["outstanding"] == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("with_verifier", [True, False])
+    async def test_exactly_once_across_crash(self, database_url, with_verifier):
+        """Testa crash no meio das publicações sem respostas duplicadas"""
+        platform = FakePlatform(10)
+        ledger = MentionLedger(database_url)
+        hang = asyncio.Event()
+
+        async def crashing_post(mention, text):
+            reply_id = await platform.post(mention, text)
+            if int(mention.id) >= 1004:
+                await hang.wait()  # Publicou, mas o processo "morre" antes de confirmar
+            return reply_id
+
+        first = MentionPipeline(
+            "twitter", platform.fetch, echo_reply, crashing_post, ledger,
+            poll_interval=3600, post_concurrency=2, checkpoint_interval=0
+        )
+        await first.start()
+        for _ in range(50):
+            await asyncio.sleep(0)
+        await first.stop(drain=False)
+
+        assert ledger.checkpoint("twitter") == "1003"
+
+        second = MentionPipeline(
+            "twitter", platform.fetch, echo_reply, platform.post, ledger,
+            verifier=platform.verify if with_verifier else None, poll_interval=3600
+        )
+        async with running(second):
+            await asyncio.sleep(0)
+            await second.join()
+
+        statuses = ledger.statuses("twitter", [m["id"] for m in platform.mentions])
+        assert all(len(texts) == 1 for texts in platform.replies.values())
+        if with_verifier:
+            assert sorted(platform.replies) == [m["id"] for m in platform.mentions]
+            assert set(statuses.values()) == {STATUS_REPLIED}
+        else:
+            assert {"1004", "1005"} <= {i for i, status in statuses.items() if status == STATUS_UNKNOWN}
+        assert ledger.checkpoint("twitter") == "1009"
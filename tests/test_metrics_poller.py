@@ -0,0 +1,266 @@
+"""
+Testes para a atualização de métricas em lote
+
+Testa o agrupamento em consultas múltiplas, a prioridade por idade, o
+adiamento sem cota no rate limiter, a união de atualizações em andamento e
+o relatório de cota por ciclo.
+"""
+
+import asyncio
+from typing import Dict, List
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.bot.metrics_poller import MAX_MISSES, MetricsPoller
+from src.bot.rate_limiter import RateLimiter
+
+HOUR = 3600
+
+
+class FakeClock:
+    """Relógio controlado pelo teste (compartilhado com o rate limiter)"""
+
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakePlatform:
+    """Consulta múltipla que registra os lotes e devolve métricas crescentes"""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls: List[List[str]] = []
+        self.likes: Dict[str, int] = {}
+        self.deleted: set = set()
+        self.delay = delay
+        self.error = None
+
+    async def fetch(self, platform: str, ids: List[str]):
+        self.calls.append(list(ids))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {i: {"likes": self.likes.get(i, 0)} for i in ids if i not in self.deleted}
+
+
+def make_poller(platform, clock, max_requests=1000, **kwargs):
+    limiter = RateLimiter(max_requests=max_requests, time_window=900, clock=clock)
+    received = []
+    poller = MetricsPoller(
+        platform.fetch, limiter, consumers=[lambda post_id, metrics: received.append((post_id, metrics))],
+        min_interval=300, clock=clock, **kwargs
+    )
+    return poller, received
+
+
+class TestMetricsPoller:
+    """Testes para o MetricsPoller"""
+
+    @pytest.mark.asyncio
+    async def test_batches_due_posts(self):
+        """Testa lotes de até 100 ids e o relatório de cota"""
+        clock, platform = FakeClock(), FakePlatform()
+        poller, received = make_poller(platform, clock)
+        for i in range(250):
+            poller.track(str(i), "twitter", created_at=clock.now)
+        for i in range(30):
+            poller.track(f"ig{i}", "instagram", created_at=clock.now)
+
+        assert (await poller.run_cycle()).due == 0
+        clock.now += 300
+        report = await poller.run_cycle()
+
+        assert sorted(len(call) for call in platform.calls) == [30, 50, 100, 100]
+        assert report.requests == {"twitter": 3, "instagram": 1}
+        assert report.quota_used == 4
+        assert report.refreshed == len(received) == 280
+        assert report.to_dict()["posts_per_request"] == 70.0
+        assert poller.snapshot()["totals"]["quota_used"] == 4
+
+    @pytest.mark.asyncio
+    async def test_interval_grows_with_age_and_staleness(self):
+        """Testa intervalo curto para posts novos, longo para antigos e parados"""
+        clock, platform = FakeClock(), FakePlatform()
+        poller, _ = make_poller(platform, clock, doubling_hours=1)
+        poller.track("novo", "twitter", created_at=clock.now)
+        poller.track("antigo", "twitter", created_at=clock.now - 3 * HOUR)
+
+        assert poller._posts["novo"].interval == 300
+        assert poller._posts["antigo"].interval == 300 * 8
+
+        for _ in range(3):  # Métricas paradas dobram o intervalo
+            clock.now = poller._posts["novo"].due
+            await poller.run_cycle()
+        stale = poller._posts["novo"]
+        assert stale.unchanged == 2
+        assert stale.interval > 4 * poller.refresh_interval(stale, clock.now) / 2 ** stale.unchanged * 0.99
+
+        platform.likes["novo"] = 5
+        clock.now = stale.due
+        await poller.run_cycle()
+        assert poller._posts["novo"].unchanged == 0
+
+    @pytest.mark.asyncio
+    async def test_no_quota_defers_oldest_posts(self):
+        """Testa que sem cota os posts novos têm prioridade e o resto é adiado"""
+        clock, platform = FakeClock(), FakePlatform()
+        poller, received = make_poller(platform, clock, max_requests=1, doubling_hours=1)
+        for i in range(100):
+            poller.track(f"old{i}", "twitter", created_at=clock.now - 4 * HOUR)
+        for i in range(100):
+            poller.track(f"new{i}", "twitter", created_at=clock.now)
+
+        clock.now += 16 * 300
+        report = await poller.run_cycle()
+
+        assert report.requests == {"twitter": 1}
+        assert report.deferred == 100
+        assert {post_id for post_id, _ in received} == {f"new{i}" for i in range(100)}
+        assert poller.next_due() == pytest.approx(clock.now + 900)
+
+        poller.limiter.update_limits(max_requests=3)
+        clock.now += 900
+        second = await poller.run_cycle()
+        assert second.refreshed == 200 and second.deferred == 0
+
+    @pytest.mark.asyncio
+    async def test_coalesces_in_flight_refreshes(self):
+        """Testa que pedidos repetidos aguardam a mesma consulta"""
+        clock, platform = FakeClock(), FakePlatform(delay=0.02)
+        poller, _ = make_poller(platform, clock)
+        for i in range(5):
+            poller.track(str(i), "twitter", created_at=clock.now)
+        platform.likes["1"] = 7
+
+        first, second, third = await asyncio.gather(
+            poller.refresh(["0", "1", "2"]), poller.refresh(["1", "2", "3"]), poller.refresh(["1", "desconhecido"])
+        )
+
+        assert platform.calls == [["0", "1", "2"], ["3"]]
+        assert first["1"] == second["1"] == third["1"] == {"likes": 7}
+        assert set(second) == {"1", "2", "3"}
+        assert poller.totals.coalesced == 3
+        assert poller.totals.requests == {"twitter": 2}
+
+        # Um ciclo durante uma consulta sob demanda não consulta o post de novo
+        clock.now += 300
+        pending = asyncio.ensure_future(poller.refresh(["4"]))
+        await asyncio.sleep(0)
+        report = await poller.run_cycle()
+        await pending
+        assert report.coalesced == 1
+        assert platform.calls[-1] == ["0", "1", "2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_failures_and_deleted_posts(self):
+        """Testa nova tentativa após erro e remoção de posts apagados"""
+        clock, platform = FakeClock(), FakePlatform()
+        poller, _ = make_poller(platform, clock)
+        poller.track("1", "twitter", created_at=clock.now)
+        poller.track("2", "twitter", created_at=clock.now)
+
+        platform.error = ConnectionError("timeout")
+        clock.now += 300
+        report = await poller.run_cycle()
+        assert report.failed == 2
+        assert poller.next_due() == clock.now + 300
+        assert await poller.refresh(["1"]) == {}
+
+        platform.error = None
+        platform.deleted.add("2")
+        for _ in range(2 * MAX_MISSES):
+            clock.now = poller.next_due()
+            await poller.run_cycle()
+        assert len(poller) == 1 and "1" in poller._posts
+        assert poller.totals.missing == MAX_MISSES
+
+    @pytest.mark.asyncio
+    async def test_stops_tracking_old_posts(self):
+        """Testa a última atualização de posts mais velhos que max_age_days"""
+        clock, platform = FakeClock(), FakePlatform()
+        poller, received = make_poller(platform, clock, max_age_days=1)
+        poller.track("1", "twitter", created_at=clock.now - 2 * 86400)
+
+        clock.now = poller.next_due()
+        await poller.run_cycle()
+
+        assert received == [("1", {"likes": 0})]
+        assert len(poller) == 0
+
+    @pytest.mark.asyncio
+    async def test_background_loop(self):
+        """Testa que o laço acorda no vencimento e em posts novos"""
+        platform = FakePlatform()
+        limiter = RateLimiter(max_requests=100, time_window=900)
+        poller = MetricsPoller(platform.fetch, limiter, min_interval=0.05)
+        await poller.start()
+        try:
+            poller.track("1", "twitter")
+            await asyncio.sleep(0.2)
+        finally:
+            await poller.stop()
+
+        assert len(platform.calls) >= 2
+        assert poller.reports[-1].refreshed == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_cycle_keeps_posts_scheduled(self):
+        """Testa que um ciclo cancelado durante a consulta reagenda os posts"""
+        clock, platform = FakeClock(), FakePlatform(delay=0.5)
+        poller, received = make_poller(platform, clock)
+        for i in range(3):
+            poller.track(str(i), "twitter", created_at=clock.now)
+        clock.now += 300
+
+        cycle = asyncio.ensure_future(poller.run_cycle())
+        await asyncio.sleep(0.01)
+        pending = asyncio.ensure_future(poller.refresh(["0"]))  # Espera pelo in-flight
+        await asyncio.sleep(0)
+        cycle.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cycle
+
+        assert await asyncio.wait_for(pending, 1) == {}
+        assert poller.snapshot()["in_flight"] == 0
+        assert poller.next_due() == pytest.approx(clock.now + 300)
+
+        platform.delay = 0
+        clock.now += 300
+        assert (await poller.run_cycle()).refreshed == 3
+        assert len(received) == 3
+
+    @pytest.mark.asyncio
+    async def test_limiter_error_defers_posts(self):
+        """Testa que um erro no rate limiter não derruba o ciclo nem perde posts"""
+        clock, platform = FakeClock(), FakePlatform()
+        poller, received = make_poller(platform, clock)
+        for i in range(150):
+            poller.track(str(i), "twitter", created_at=clock.now)
+        clock.now += 300
+
+        calls = 0
+        try_acquire = poller.limiter.try_acquire
+
+        async def flaky(key):
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise ConnectionError("redis fora")
+            return await try_acquire(key)
+
+        poller.limiter.try_acquire = flaky
+        report = await asyncio.wait_for(poller.run_cycle(), 1)
+
+        assert report.refreshed == 100 and report.deferred == 50
+        assert poller.snapshot()["in_flight"] == 0
+        assert poller.next_due() == pytest.approx(clock.now + 300)
+        clock.now += 300
+        assert (await poller.run_cycle()).refreshed == 50
+        assert len(received) == 150
@@ -0,0 +1,114 @@
+"""
+Testes para o módulo MicroBatcher
+
+Testa o agrupamento de requisições concorrentes em lotes.
+"""
+
+import pytest
+import asyncio
+from types import SimpleNamespace
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ai.micro_batcher import MicroBatcher, request_batch_key
+
+
+def make_request(topic, platform="twitter", tone="casual", max_length=280):
+    """Cria uma requisição mínima compatível com ContentRequest"""
+    return SimpleNamespace(topic=topic, platform=platform, tone=tone, max_length=max_length)
+
+
+class TestMicroBatcher:
+    """Testes para a classe MicroBatcher"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_batch(self):
+        """Testa que chamadas concorrentes viram um único lote"""
+        calls = []
+
+        def process(items):
+            calls.append(list(items))
+            return [item.upper() for item in items]
+
+        batcher = MicroBatcher(process, window_ms=10, max_batch_size=8)
+
+        results = await asyncio.gather(*(batcher.submit(t) for t in ["a", "b", "c"]))
+
+        assert results == ["A", "B", "C"]
+        assert calls == [["a", "b", "c"]]
+        assert batcher.stats.batches == 1
+
+    @pytest.mark.asyncio
+    async def test_max_batch_size_flushes_immediately(self):
+        """Testa que o lote cheio é disparado sem esperar a janela"""
+        sizes = []
+
+        def process(items):
+            sizes.append(len(items))
+            return items
+
+        batcher = MicroBatcher(process, window_ms=10_000, max_batch_size=2)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(i) for i in range(4))),
+            timeout=2
+        )
+
+        assert results == [0, 1, 2, 3]
+        assert sizes == [2, 2]
+
+    @pytest.mark.asyncio
+    async def test_groups_by_key(self):
+        """Testa que plataformas diferentes não compartilham lote"""
+        batches = []
+
+        def process(items):
+            batches.append({item.platform for item in items})
+            return [item.topic for item in items]
+
+        batcher = MicroBatcher(process, key_func=request_batch_key, window_ms=5)
+        requests = [
+            make_request("a", platform="twitter"),
+            make_request("b", platform="linkedin"),
+            make_request("c", platform="twitter")
+        ]
+
+        results = await asyncio.gather(*(batcher.submit(r) for r in requests))
+
+        assert results == ["a", "b", "c"]
+        assert sorted(len(b) for b in batches) == [1, 1]
+        assert len(batches) == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_propagates_to_all_callers(self):
+        """Testa que a falha do lote chega a todos os chamadores"""
+        def process(items):
+            raise RuntimeError("pipeline falhou")
+
+        batcher = MicroBatcher(process, window_ms=5)
+
+        results = await asyncio.gather(
+            batcher.submit("a"),
+            batcher.submit("b"),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert batcher.stats.failures == 1
+
+    @pytest.mark.asyncio
+    async def test_close_rejects_new_items(self):
+        """Testa que o batcher fechado não aceita novos itens"""
+        batcher = MicroBatcher(lambda items: items, window_ms=5)
+        await batcher.close()
+
+        with pytest.raises(RuntimeError):
+            await batcher.submit("a")
+
+    def test_request_batch_key_uses_enum_value(self):
+        """Testa que a chave usa o valor do enum de tom"""
+        request = make_request("a", tone=SimpleNamespace(value="professional"))
+
+        assert request_batch_key(request) == ("twitter", "professional", 280)
@@ -0,0 +1,182 @@
+"""
+Testes para o host compartilhado de modelos
+
+Testa o protocolo no socket Unix, a junção de requisições de vários clientes
+em um lote e os erros de conexão.
+"""
+
+import asyncio
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ai.model_host import ModelHost, ModelHostClient, ModelHostError, RemoteSentimentAnalyzer, RemoteTextGenerator
+from src.ai.sentiment_analyzer import SentimentAnalyzer
+
+TEXTS = ["adorei o app", "péssimo suporte", "ok", "entrega rápida e produto ótimo"]
+
+
+class FakeBackend:
+    """Backend determinístico de sentimento"""
+
+    labels = ["negative", "neutral", "positive"]
+    pad_token_id = 0
+
+    def __init__(self):
+        self.embeddings = np.random.default_rng(3).standard_normal((500, 3)).astype(np.float32)
+        self.embeddings[0] = 0.0
+
+    def tokenize(self, texts):
+        return [[sum(map(ord, word)) % 499 + 1 for word in text.split()] for text in texts]
+
+    def predict(self, input_ids, attention_mask):
+        return self.embeddings[input_ids].sum(axis=1)
+
+
+class FakePipeline:
+    """Pipeline text-generation que ecoa o prompt e registra os lotes"""
+
+    def __init__(self):
+        self.tokenizer = SimpleNamespace(pad_token_id=None, padding_side="right")
+        self.model = SimpleNamespace(config=SimpleNamespace(eos_token_id=50256))
+        self.batches = []
+
+    def __call__(self, prompts, **kwargs):
+        self.batches.append((list(prompts), kwargs))
+        return [[{"generated_text": f" eco: {prompt} "}] for prompt in prompts]
+
+
+@asynccontextmanager
+async def running_host(**kwargs):
+    with tempfile.TemporaryDirectory(prefix="mh") as directory:
+        path = str(Path(directory) / "models.sock")
+        analyzer = SentimentAnalyzer(backend=FakeBackend(), max_batch_size=8, threads=1)
+        host = ModelHost(path, sentiment=analyzer, **kwargs)
+        await host.start()
+        try:
+            yield host, path
+        finally:
+            await host.close()
+            analyzer.close()
+
+
+class TestModelHost:
+    """Testes para o ModelHost e seus clientes"""
+
+    @pytest.mark.asyncio
+    async def test_remote_matches_local_analyzer(self):
+        """Testa que o cliente remoto devolve o mesmo que o analisador local"""
+        async with running_host() as (host, path):
+            remote = RemoteSentimentAnalyzer.connect(path)
+            try:
+                results = await remote.analyze_batch(TEXTS)
+                single = await remote.analyze(TEXTS[1])
+            finally:
+                remote.close()
+
+            expected = host.sentiment.analyze_batch_sync(TEXTS)
+
+        assert results == expected
+        assert single == expected[1]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_clients_share_batches(self):
+        """Testa que requisições de vários workers viram um único lote"""
+        async with running_host(batch_window_ms=50) as (host, path):
+            clients = [RemoteSentimentAnalyzer.connect(path) for _ in range(4)]
+            try:
+                results = await asyncio.gather(*(client.analyze(text) for client, text in zip(clients, TEXTS)))
+            finally:
+                for client in clients:
+                    client.close()
+            stats = host._sentiment_batcher.stats
+
+        assert [r["sentiment"] for r in results] == [r["sentiment"] for r in host.sentiment.analyze_batch_sync(TEXTS)]
+        assert stats.batches == 1
+        assert stats.items_processed == 4
+
+    @pytest.mark.asyncio
+    async def test_generation_is_batched_with_left_padding(self):
+        """Testa a geração remota e o preparo do tokenizer"""
+        pipeline = FakePipeline()
+        async with running_host(generator=pipeline, batch_window_ms=50) as (host, path):
+            generator = RemoteTextGenerator(ModelHostClient(path), max_new_tokens=16)
+            try:
+                outputs = await asyncio.gather(generator.generate("olá"), generator.generate("tudo bem?"))
+            finally:
+                generator.client.close()
+
+        assert outputs == ["eco: olá", "eco: tudo bem?"]
+        assert len(pipeline.batches) == 1
+        assert pipeline.batches[0][1]["max_new_tokens"] == 16
+        assert pipeline.tokenizer.padding_side == "left"
+        assert pipeline.batches[0][1]["pad_token_id"] == 50256
+
+    @pytest.mark.asyncio
+    async def test_remote_errors(self):
+        """Testa método inexistente e ausência do modelo de geração"""
+        async with running_host() as (host, path):
+            client = ModelHostClient(path)
+            try:
+                info = await client.ping()
+                with pytest.raises(ModelHostError, match="Método desconhecido"):
+                    await client.call("generate_batch", prompts=["oi"])
+            finally:
+                client.close()
+
+        assert info["methods"] == ["analyze_batch", "ping"]
+
+    @pytest.mark.asyncio
+    async def test_unavailable_host_and_reconnect(self):
+        """Testa erro sem host e reconexão quando o host volta"""
+        async with running_host() as (host, path):
+            client = ModelHostClient(path, timeout=5)
+            await client.ping()
+
+            await host.close()
+            with pytest.raises(ModelHostError):
+                await client.ping()
+
+            await host.start()
+            try:
+                assert (await client.ping())["requests"] >= 1
+            finally:
+                client.close()
+
+    @pytest.mark.asyncio
+    async def test_connection_lost_before_write(self):
+        """Testa conexão perdida entre _ensure_connected e a escrita"""
+        async with running_host() as (host, path):
+            client = ModelHostClient(path, timeout=5)
+            await client.ping()
+
+            async def still_connected():
+                client.close()
+
+            client._ensure_connected = still_connected
+            with pytest.raises(ModelHostError, match="perdida"):
+                await client.ping()
+
+        assert client._pending == {}
+
+    @pytest.mark.asyncio
+    async def test_stale_socket_is_replaced(self):
+        """Testa que um socket órfão de um host anterior é removido"""
+        with tempfile.TemporaryDirectory(prefix="mh") as directory:
+            path = Path(directory) / "models.sock"
+            path.write_text("")
+            host = ModelHost(str(path))
+            await host.start()
+            try:
+                second = ModelHost(str(path))
+                with pytest.raises(ModelHostError, match="Já existe"):
+                    await second.start()
+            finally:
+                await host.close()
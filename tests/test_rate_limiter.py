@@ -0,0 +1,159 @@
+"""
+Testes para os módulos RateLimiter e RedisRateLimiter
+
+Testa o limite local e o distribuído (scripts Lua em Redis falso).
+"""
+
+import pytest
+import asyncio
+import time
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.bot.rate_limiter import RateLimiter
+from src.bot.distributed_rate_limiter import RedisRateLimiter
+
+
+class FakeClock:
+    """Relógio controlável para testes"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class BrokenRedis:
+    """Cliente Redis que simula servidor fora do ar"""
+
+    def register_script(self, source):
+        async def script(keys, args):
+            raise ConnectionError("redis down")
+        return script
+
+
+class TestRateLimiter:
+    """Testes para a classe RateLimiter (local)"""
+
+    @pytest.mark.asyncio
+    async def test_limit_within_window(self):
+        """Testa bloqueio ao atingir o limite"""
+        clock = FakeClock()
+        limiter = RateLimiter(max_requests=2, time_window=60, clock=clock)
+
+        await limiter.record_request("twitter_post")
+        await limiter.record_request("twitter_post")
+
+        assert await limiter.can_make_request("twitter_post") is False
+        assert await limiter.get_wait_time("twitter_post") == pytest.approx(60)
+
+        clock.now += 61
+
+        assert await limiter.can_make_request("twitter_post") is True
+
+    @pytest.mark.asyncio
+    async def test_keys_are_independent(self):
+        """Testa que chaves diferentes têm limites separados"""
+        limiter = RateLimiter(max_requests=1, time_window=60)
+        await limiter.record_request("twitter_post")
+
+        assert await limiter.can_make_request("linkedin_post") is True
+
+    @pytest.mark.asyncio
+    async def test_try_acquire(self):
+        """Testa verificação e consumo atômicos"""
+        clock = FakeClock()
+        limiter = RateLimiter(max_requests=1, time_window=10, clock=clock)
+
+        assert await limiter.try_acquire() == 0
+        assert await limiter.try_acquire() == pytest.approx(10)
+
+    @pytest.mark.asyncio
+    async def test_acquire_sleeps_until_slot(self):
+        """Testa que acquire dorme até a liberação"""
+        limiter = RateLimiter(max_requests=1, time_window=0.1)
+        await limiter.acquire()
+
+        start = time.monotonic()
+        await limiter.acquire()
+
+        assert 0.08 <= time.monotonic() - start < 0.3
+
+    @pytest.mark.asyncio
+    async def test_acquire_timeout(self):
+        """Testa timeout de acquire"""
+        limiter = RateLimiter(max_requests=1, time_window=60)
+        await limiter.acquire()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await limiter.acquire(timeout=0.05)
+
+
+class TestRedisRateLimiter:
+    """Testes para a classe RedisRateLimiter"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["sliding_window", "gcra"])
+    async def test_replicas_share_limit(self, fake_redis, mode):
+        """Testa que réplicas diferentes compartilham o mesmo limite"""
+        replica_a = RedisRateLimiter(3, 60, mode=mode, client=fake_redis)
+        replica_b = RedisRateLimiter(3, 60, mode=mode, client=fake_redis)
+
+        results = [
+            await replica_a.try_acquire("twitter_post"),
+            await replica_b.try_acquire("twitter_post"),
+            await replica_a.try_acquire("twitter_post"),
+            await replica_b.try_acquire("twitter_post")
+        ]
+
+        assert results[:3] == [0, 0, 0]
+        assert results[3] > 0
+        assert await replica_a.can_make_request("twitter_post") is False
+
+    @pytest.mark.asyncio
+    async def test_concurrent_acquire_is_atomic(self, fake_redis):
+        """Testa que aquisições concorrentes não ultrapassam o limite"""
+        limiter = RedisRateLimiter(5, 60, client=fake_redis)
+
+        waits = await asyncio.gather(*(limiter.try_acquire("k") for _ in range(20)))
+
+        assert sum(1 for w in waits if w == 0) == 5
+
+    @pytest.mark.asyncio
+    async def test_sliding_window_wait_time(self, fake_redis):
+        """Testa que o tempo de espera reflete a janela"""
+        limiter = RedisRateLimiter(1, 60, client=fake_redis)
+        await limiter.record_request("k")
+
+        wait = await limiter.get_wait_time("k")
+
+        assert 59 <= wait <= 60
+
+    @pytest.mark.asyncio
+    async def test_gcra_spreads_requests(self, fake_redis):
+        """Testa que o GCRA libera no intervalo de emissão após a rajada"""
+        limiter = RedisRateLimiter(2, 1, mode="gcra", client=fake_redis)
+        await limiter.acquire("k")
+        await limiter.acquire("k")
+
+        start = time.monotonic()
+        await limiter.acquire("k", timeout=2)
+
+        assert 0.3 <= time.monotonic() - start < 1.0
+
+    @pytest.mark.asyncio
+    async def test_fallback_when_redis_down(self):
+        """Testa fallback para o limiter local com Redis fora do ar"""
+        limiter = RedisRateLimiter(1, 60, client=BrokenRedis())
+
+        assert await limiter.try_acquire("k") == 0
+        assert await limiter.try_acquire("k") > 0
+        assert limiter.using_fallback is True
+
+    def test_invalid_mode(self):
+        """Testa modo inválido"""
+        with pytest.raises(ValueError):
+            RedisRateLimiter(1, 60, mode="token_bucket")
@@ -0,0 +1,189 @@
+"""
+Testes para a exportação de relatórios em streaming
+
+Testa a leitura do store em blocos (ordem de tempo e filtros), o CSV
+detalhado e agregado, o streaming em pedaços, Parquet/XLSX (se instalados)
+e o endpoint FastAPI.
+"""
+
+import csv
+import io
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analytics.engagement_store import METRICS, EngagementStore
+from src.analytics import report_generator
+from src.analytics.report_generator import DETAIL_COLUMNS, ReportGenerator
+
+DAY = 86400
+START = 19_700 * DAY  # Meia-noite UTC
+END = START + 3 * DAY
+PLATFORMS = ("twitter", "instagram", "linkedin")
+
+
+def make_store(root, posts: int = 200, batches: int = 12, seed: int = 0) -> EngagementStore:
+    """Store com segmentos gravados e linhas ainda em memória"""
+    rng = np.random.default_rng(seed)
+    store = EngagementStore(str(root), segment_rows=500)
+    for i in range(posts):
+        store.register_post(f"p{i}", PLATFORMS[i % 3], account=f"conta{i % 2}", created_at=START)
+    totals = np.zeros((posts, len(METRICS)), dtype=np.int64)
+    window = 3 * DAY // batches
+    for batch in range(batches):
+        codes = rng.integers(0, posts, 200)
+        timestamps = START + batch * window + rng.integers(0, window, 200)
+        totals[codes] += rng.integers(1, 3, (200, len(METRICS)))
+        # Um snapshot por post no lote: o último valor acumulado
+        last = {code: k for k, code in enumerate(codes.tolist())}
+        rows = np.array(list(last.values()))
+        store.record_batch(codes[rows], totals[codes[rows]], timestamps[rows])
+    assert store._segments and store._buffer.size
+    return store
+
+
+def concat(chunks):
+    chunks = list(chunks)
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+
+
+def read_csv(data: bytes):
+    return list(csv.DictReader(io.StringIO(data.decode("utf-8"))))
+
+
+class TestReportGenerator:
+    """Testes para o ReportGenerator"""
+
+    def test_scan_in_time_order(self, tmp_path):
+        """Testa blocos limitados, ordem de tempo e totais iguais ao aggregate"""
+        store = make_store(tmp_path)
+        chunks = list(store.scan(START + 1000, END - 1000, chunk_rows=97))
+        assert max(len(chunk["likes"]) for chunk in chunks) == 97
+
+        rows = concat(chunks)
+        assert list(rows) == list(DETAIL_COLUMNS)
+        assert np.all(np.diff(rows["timestamp"]) >= 0)
+        assert rows["timestamp"].min() >= START + 1000 and rows["timestamp"].max() < END - 1000
+
+        totals = store.aggregate(START + 1000, END - 1000, by=("post",))
+        for post, likes in zip(totals["post"], totals["likes"]):
+            assert rows["likes"][rows["post"] == post].sum() == likes
+
+        filtered = concat(store.scan(START, END, platforms=["instagram"], accounts=["conta1"]))
+        assert set(filtered["platform"]) == {"instagram"} and set(filtered["account"]) == {"conta1"}
+
+    def test_stream_reads_store_at_call_time(self, tmp_path):
+        """Testa que gravações depois da chamada (no loop) não afetam o iterador"""
+        store = make_store(tmp_path)
+        reports = ReportGenerator(store, chunk_rows=100)
+        expected = b"".join(reports.stream("csv", START, END))
+
+        pending = reports.stream("csv", START, END)
+        detail = store.scan(START, END, chunk_rows=100)
+        aggregated = reports.chunks(START, END, by=["platform"])
+        store.register_post("novo", "twitter", account="conta9", created_at=START)
+        store.record("novo", {"likes": 5}, START + 10)
+        store.flush()  # Esvazia o buffer copiado pelo scan
+        store.record("p0", {"likes": 10 ** 6}, START + 20)
+
+        assert b"".join(pending) == expected
+        assert "novo" not in set(concat(detail)["post"])
+        assert concat(aggregated)["likes"].sum() < 10 ** 6
+
+    def test_csv_detail_export(self, tmp_path):
+        """Testa o CSV detalhado gravado em arquivo"""
+        store = make_store(tmp_path / "store")
+        reports = ReportGenerator(store, chunk_rows=100)
+        path = tmp_path / "relatorio.csv"
+
+        rows = reports.export("csv", path, START, END, platforms=["twitter"])
+
+        records = read_csv(path.read_bytes())
+        assert len(records) == rows > 100
+        assert records[0]["timestamp"].endswith("Z") and records[0]["platform"] == "twitter"
+        expected = store.aggregate(START, END, by=(), platforms=["twitter"]).to_records()[0]
+        assert sum(int(record["shares"]) for record in records) == expected["shares"]
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_csv_aggregate_stream(self, tmp_path):
+        """Testa que o streaming agregado gera os mesmos bytes do arquivo"""
+        reports = ReportGenerator(make_store(tmp_path / "store"), chunk_rows=2)
+        path = tmp_path / "diario.csv"
+        filters = {"by": ["platform"], "bucket": "day"}
+
+        rows = reports.export("csv", path, START, END, **filters)
+        pieces = list(reports.stream("csv", START, END, **filters))
+
+        assert rows == 9 and len(pieces) == 5
+        assert b"".join(pieces) == path.read_bytes()
+        records = read_csv(path.read_bytes())
+        assert list(records[0]) == ["bucket", "platform", *METRICS]
+        assert records[0]["bucket"] == "2023-12-09T00:00:00Z"
+
+    def test_invalid_requests(self, tmp_path):
+        """Testa erros antes do primeiro pedaço"""
+        reports = ReportGenerator(EngagementStore())
+        with pytest.raises(ValueError):
+            reports.stream("pdf", START, END)
+        with pytest.raises(ValueError):
+            reports.stream("csv", START, END, bucket="day")
+        with pytest.raises(ValueError):
+            reports.stream("csv", START, END, by=["pais"])
+        assert read_csv(b"".join(reports.stream("csv", START, END))) == []
+
+    def test_parquet_row_groups(self, tmp_path):
+        """Testa um row group por bloco e o streaming antes do fim"""
+        pytest.importorskip("pyarrow")
+        import pyarrow.parquet as pq
+
+        store = make_store(tmp_path)
+        reports = ReportGenerator(store, chunk_rows=250)
+        pieces = list(reports.stream("parquet", START, END))
+
+        parquet = pq.ParquetFile(io.BytesIO(b"".join(pieces)))
+        table = parquet.read()
+        assert len(pieces) > 2
+        assert parquet.num_row_groups == -(-table.num_rows // 250)
+        assert table.column("likes").to_numpy().sum() == store.aggregate(START, END, by=())["likes"][0]
+
+    def test_xlsx_write_only_sheets(self, tmp_path, monkeypatch):
+        """Testa o XLSX com troca de planilha no limite de linhas"""
+        pytest.importorskip("openpyxl")
+        from openpyxl import load_workbook
+
+        monkeypatch.setattr(report_generator, "XLSX_MAX_ROWS", 301)
+        reports = ReportGenerator(make_store(tmp_path), chunk_rows=128)
+        path = tmp_path / "relatorio.xlsx"
+        rows = reports.export("xlsx", path, START, END)
+
+        workbook = load_workbook(path, read_only=True)
+        sheets = [list(sheet.values) for sheet in workbook.worksheets]
+        assert workbook.sheetnames[:2] == ["Relatório", "Relatório 2"]
+        assert sum(len(sheet) - 1 for sheet in sheets) == rows
+        assert all(sheet[0] == DETAIL_COLUMNS for sheet in sheets)
+        assert len(b"".join(reports.stream("xlsx", START, END))) == path.stat().st_size
+
+    def test_router_streams_download(self, tmp_path):
+        """Testa o endpoint /api/reports/export"""
+        pytest.importorskip("fastapi")
+        pytest.importorskip("httpx")
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        reports = ReportGenerator(make_store(tmp_path))
+        app = FastAPI()
+        app.include_router(report_generator.create_report_router(reports))
+        client = TestClient(app)
+        params = {"start": "2023-12-09T00:00:00+00:00", "end": "2023-12-12T00:00:00+00:00"}
+
+        response = client.get("/api/reports/export", params={**params, "by": "platform"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert 'filename="relatorio_20231209_20231212.csv"' in response.headers["content-disposition"]
+        assert len(read_csv(response.content)) == 3
+
+        assert client.get("/api/reports/export", params={**params, "format": "pdf"}).status_code == 400
@@ -0,0 +1,145 @@
+"""
+Testes para o módulo ScheduleStore
+
+Testa a fila persistente de posts agendados.
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.bot.schedule_store import ScheduledPost, ScheduleStore, priority_rank
+
+
+class PostPriority(Enum):
+    """Espelho do enum documentado em src.bot.scheduler"""
+    LOW = 1
+    NORMAL = 2
+    HIGH = 3
+    URGENT = 4
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    """Fixture para banco SQLite temporário"""
+    return f"sqlite:///{tmp_path / 'schedule.db'}"
+
+
+@pytest.fixture
+def now():
+    """Fixture para horário de referência"""
+    return datetime(2024, 1, 15, 12, 0, 0)
+
+
+class TestScheduleStore:
+    """Testes para a classe ScheduleStore"""
+
+    def test_pop_due_orders_by_time_and_priority(self, database_url, now):
+        """Testa ordem de despacho por horário e prioridade"""
+        store = ScheduleStore(database_url)
+        store.add_many([
+            ScheduledPost("normal", ["twitter"], now, priority=priority_rank(PostPriority.NORMAL)),
+            ScheduledPost("urgente", ["twitter"], now, priority=priority_rank(PostPriority.URGENT)),
+            ScheduledPost("antes", ["twitter"], now - timedelta(minutes=5)),
+            ScheduledPost("futuro", ["twitter"], now + timedelta(hours=1))
+        ])
+
+        due = store.pop_due(now)
+
+        assert [p.content for p in due] == ["antes", "urgente", "normal"]
+        assert len(store) == 1
+
+    def test_cancel_is_skipped_on_pop(self, database_url, now):
+        """Testa que posts cancelados não são despachados"""
+        store = ScheduleStore(database_url)
+        schedule_id = store.add(ScheduledPost("cancelado", ["twitter"], now))
+        store.add(ScheduledPost("mantido", ["twitter"], now))
+
+        assert store.cancel(schedule_id) is True
+        assert store.cancel(schedule_id) is False
+        assert [p.content for p in store.pop_due(now)] == ["mantido"]
+
+    def test_reload_after_restart(self, database_url, now):
+        """Testa que o restart recarrega apenas pendentes"""
+        store = ScheduleStore(database_url)
+        published = store.add(ScheduledPost("publicado", ["twitter"], now))
+        cancelled = store.add(ScheduledPost("cancelado", ["twitter"], now))
+        store.add(ScheduledPost("pendente", ["twitter", "linkedin"], now, account_id="conta-1"))
+
+        store.pop_due(now, limit=1)
+        store.mark_done([published])
+        store.cancel(cancelled)
+
+        restarted = ScheduleStore(database_url)
+
+        assert restarted.load() == 1
+        post = restarted.pop_due(now)[0]
+        assert post.content == "pendente"
+        assert post.platforms == ["twitter", "linkedin"]
+        assert post.account_id == "conta-1"
+
+    def test_dispatched_without_confirmation_is_reloaded(self, database_url, now):
+        """Testa entrega pelo menos uma vez quando não há mark_done"""
+        store = ScheduleStore(database_url)
+        store.add(ScheduledPost("post", ["twitter"], now))
+        store.pop_due(now)
+
+        restarted = ScheduleStore(database_url)
+
+        assert restarted.load() == 1
+
+    def test_next_due_time_skips_tombstones(self, database_url, now):
+        """Testa que o próximo horário ignora posts cancelados"""
+        store = ScheduleStore(database_url)
+        first = store.add(ScheduledPost("primeiro", ["twitter"], now))
+        store.add(ScheduledPost("segundo", ["twitter"], now + timedelta(hours=1)))
+
+        store.cancel(first)
+
+        assert store.next_due_time() == (now + timedelta(hours=1)).astimezone(timezone.utc)
+        assert store.next_due_time().tzinfo is timezone.utc
+
+    def test_aware_and_naive_times_after_restart(self, database_url, now):
+        """Testa que horários com e sem fuso convivem depois de um restart"""
+        store = ScheduleStore(database_url)
+        store.add(ScheduledPost("local", ["twitter"], now + timedelta(minutes=1)))
+        store.add(ScheduledPost("utc", ["twitter"], now.astimezone(timezone.utc)))
+
+        restarted = ScheduleStore(database_url)
+        restarted.load()
+        restarted.add(ScheduledPost("novo", ["twitter"], now + timedelta(minutes=2)))
+
+        pending = restarted.list_pending()
+        assert [p.content for p in pending] == ["utc", "local", "novo"]
+        assert all(p.schedule_time.tzinfo is timezone.utc for p in pending)
+        assert pending[1].schedule_time == (now + timedelta(minutes=1)).astimezone(timezone.utc)
+        assert [p.content for p in restarted.pop_due(now + timedelta(minutes=1))] == ["utc", "local"]
+
+    def test_list_pending_by_account(self, database_url, now):
+        """Testa listagem por conta"""
+        store = ScheduleStore(database_url)
+        store.add(ScheduledPost("a", ["twitter"], now, account_id="a"))
+        store.add(ScheduledPost("b", ["twitter"], now, account_id="b"))
+
+        assert [p.content for p in store.list_pending("b")] == ["b"]
+
+    def test_compact_removes_tombstones(self, database_url, now):
+        """Testa compactação do heap"""
+        store = ScheduleStore(database_url)
+        ids = store.add_many([ScheduledPost(str(i), ["twitter"], now) for i in range(10)])
+        for schedule_id in ids[:5]:
+            store.cancel(schedule_id)
+
+        store.compact()
+
+        assert len(store._heap) == 5
+
+    def test_priority_rank(self):
+        """Testa conversão de prioridade"""
+        assert priority_rank(PostPriority.URGENT) < priority_rank(PostPriority.LOW)
+        assert priority_rank("high") == 1
+        assert priority_rank(2) == 2
@@ -0,0 +1,237 @@
+"""
+Testes para o módulo de deduplicação semântica
+
+Testa o índice em memória mapeada, a busca top-k e a rejeição de duplicados.
+"""
+
+import asyncio
+import hashlib
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ai.semantic_dedup import EmbeddingIndex, SemanticDeduplicator, _half_rows_as_scaled_float32
+
+DIM = 64
+
+
+def bag_of_words(texts):
+    """Encoder determinístico: soma de vetores aleatórios por palavra"""
+    vectors = np.zeros((len(texts), DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in text.lower().split():
+            seed = int(hashlib.md5(word.encode()).hexdigest()[:8], 16)
+            vectors[row] += np.random.default_rng(seed).standard_normal(DIM)
+    return vectors
+
+
+def random_vectors(n, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, DIM)).astype(np.float32)
+
+
+class TestEmbeddingIndex:
+    """Testes para a classe EmbeddingIndex"""
+
+    def test_half_conversion_is_exact(self):
+        """Testa a conversão float16 -> float32 por bits"""
+        rows = (random_vectors(10) / 50).astype(np.float16)
+        rows[0, :3] = [0.0, -0.0, 1e-6]  # zeros e subnormais
+        out = np.empty((10, DIM), dtype=np.int32)
+
+        converted = _half_rows_as_scaled_float32(rows, out) * np.float32(2.0 ** 112)
+
+        np.testing.assert_array_equal(converted, rows.astype(np.float32))
+
+    def test_search_finds_nearest_neighbors(self, tmp_path):
+        """Testa top-k contra uma busca exata em float32"""
+        index = EmbeddingIndex(str(tmp_path), DIM, initial_capacity=8)
+        vectors = random_vectors(500)
+        index.append([f"p{i}" for i in range(500)], vectors)
+
+        queries = random_vectors(3, seed=1)
+        scores, ids = index.search(queries, k=4)
+
+        stored = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        normalized = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+        expected = np.argsort(-(normalized @ stored.T), axis=1)[:, :4]
+        assert ids == [[f"p{i}" for i in row] for row in expected]
+        assert np.all(np.diff(scores, axis=1) <= 0)
+
+    def test_fewer_rows_than_k(self, tmp_path):
+        """Testa busca com menos linhas que k"""
+        index = EmbeddingIndex(str(tmp_path), DIM)
+        index.append(["a"], random_vectors(1))
+
+        scores, ids = index.search(random_vectors(1, seed=2), k=3)
+
+        assert ids[0] == ["a", None, None]
+
+    def test_reopen_and_grow(self, tmp_path):
+        """Testa persistência entre aberturas com crescimento da matriz"""
+        index = EmbeddingIndex(str(tmp_path), DIM, initial_capacity=2)
+        vectors = random_vectors(10)
+        for i in range(10):
+            index.append([f"p{i}"], vectors[i:i + 1])
+        index.close()
+
+        reopened = EmbeddingIndex(str(tmp_path), DIM)
+        _, ids = reopened.search(vectors[7], k=1)
+
+        assert reopened.count == 10
+        assert reopened.capacity >= 10
+        assert ids[0][0] == "p7"
+
+    def test_dimension_mismatch(self, tmp_path):
+        """Testa erro ao reabrir com outra dimensão"""
+        EmbeddingIndex(str(tmp_path), DIM)
+
+        with pytest.raises(ValueError):
+            EmbeddingIndex(str(tmp_path), DIM * 2)
+
+    def test_remove_and_compact(self, tmp_path):
+        """Testa remoção lógica e compactação"""
+        index = EmbeddingIndex(str(tmp_path), DIM)
+        vectors = random_vectors(20)
+        index.append([f"p{i}" for i in range(20)], vectors)
+
+        index.remove(["p3", "p4"])
+        _, ids = index.search(vectors[3], k=1)
+        assert ids[0][0] != "p3"
+
+        assert index.compact() == 2
+        assert index.count == 18
+
+        assert index.compact(retain_last=5) == 13
+        reopened = EmbeddingIndex(str(tmp_path), DIM)
+        _, ids = reopened.search(vectors[19], k=1)
+        assert reopened.count == 5
+        assert ids[0][0] == "p19"
+
+    def test_compact_commits_with_meta(self, tmp_path, monkeypatch):
+        """Testa que uma compactação interrompida deixa o índice anterior intacto"""
+        index = EmbeddingIndex(str(tmp_path), DIM)
+        vectors = random_vectors(20)
+        index.append([f"p{i}" for i in range(20)], vectors)
+        index.remove(["p3", "p4"])
+        files = sorted(path.name for path in tmp_path.iterdir())
+
+        def crash():
+            raise OSError("disco cheio")
+
+        monkeypatch.setattr(index, "_save_meta", crash)
+        with pytest.raises(OSError):
+            index.compact()
+        assert sorted(path.name for path in tmp_path.iterdir()) == files
+        reopened = EmbeddingIndex(str(tmp_path), DIM)
+        assert reopened.count == 20 and reopened.live_count == 18
+
+        # Queda depois de gravar a geração nova e antes do meta.json: sobras são apagadas
+        (tmp_path / "vectors-000001.f16").write_bytes(b"lixo")
+        reopened = EmbeddingIndex(str(tmp_path), DIM)
+        assert sorted(path.name for path in tmp_path.iterdir()) == files
+
+        assert reopened.compact() == 2
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "deleted-000001.u8", "ids-000001.txt", "meta.json", "vectors-000001.f16"
+        ]
+        _, ids = EmbeddingIndex(str(tmp_path), DIM).search(vectors[19], k=1)
+        assert ids[0][0] == "p19"
+
+
+class TestSemanticDeduplicator:
+    """Testes para a classe SemanticDeduplicator"""
+
+    def make_dedup(self, tmp_path, **kwargs):
+        return SemanticDeduplicator(index_dir=str(tmp_path), encoder=bag_of_words, threshold=0.9, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_check_and_add_rejects_near_duplicate(self, tmp_path):
+        """Testa rejeição de quase duplicado e aceitação de texto novo"""
+        dedup = self.make_dedup(tmp_path)
+        original = "Python 3.12 traz melhorias de performance para async"
+
+        first = await dedup.check_and_add("twitter:main", "1", original)
+        duplicate = await dedup.check_and_add("twitter:main", "2", original + " !")
+        different = await dedup.check_and_add("twitter:main", "3", "Dicas de fotografia para o fim de semana")
+
+        assert first.is_duplicate is False
+        assert duplicate.is_duplicate is True
+        assert duplicate.matches[0][0] == "1"
+        assert different.is_duplicate is False
+
+    @pytest.mark.asyncio
+    async def test_accounts_are_isolated(self, tmp_path):
+        """Testa que cada conta tem seu próprio histórico"""
+        dedup = self.make_dedup(tmp_path)
+        await dedup.add("twitter:main", "1", "lançamento do produto hoje")
+
+        result = await dedup.check("linkedin:empresa", "lançamento do produto hoje")
+
+        assert result.is_duplicate is False
+
+    @pytest.mark.asyncio
+    async def test_filter_unique_variations(self, tmp_path):
+        """Testa filtragem de variações contra o histórico e entre si"""
+        dedup = self.make_dedup(tmp_path)
+        await dedup.add("twitter:main", "1", "bom dia comunidade python")
+        variations = [
+            SimpleNamespace(text="bom dia comunidade python"),
+            SimpleNamespace(text="novo tutorial de fastapi publicado"),
+            SimpleNamespace(text="novo tutorial de fastapi publicado"),
+            SimpleNamespace(text="webinar sobre machine learning amanhã")
+        ]
+
+        unique = await dedup.filter_unique("twitter:main", variations)
+
+        assert [v.text for v in unique] == [
+            "novo tutorial de fastapi publicado",
+            "webinar sobre machine learning amanhã"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_remove_triggers_compaction(self, tmp_path):
+        """Testa compactação automática após muitas remoções"""
+        dedup = self.make_dedup(tmp_path, compact_ratio=0.5)
+        for i in range(4):
+            await dedup.add("twitter:main", str(i), f"post número {i} sobre tema {i * 7}")
+
+        await dedup.remove("twitter:main", ["0", "1"])
+
+        index = dedup.index_for("twitter:main", DIM)
+        assert index.count == 2
+
+    @pytest.mark.asyncio
+    async def test_search_does_not_race_grow_or_compact(self, tmp_path):
+        """Testa que check_many/filter_unique não veem o índice mudar no meio da busca"""
+        dedup = self.make_dedup(tmp_path, compact_ratio=0.001)
+        index = dedup.index_for("twitter:main", DIM)
+        index.append([f"p{i}" for i in range(index.capacity)], random_vectors(index.capacity))
+        search, changed = index.search, []
+
+        def slow_search(*args, **kwargs):
+            before = (index.count, index.generation, index._vectors)
+            time.sleep(0.05)  # Janela para add/remove rodarem no event loop
+            changed.append((index.count, index.generation, index._vectors) != before)
+            return search(*args, **kwargs)
+
+        index.search = slow_search
+        checks = [
+            asyncio.ensure_future(dedup.check_many("twitter:main", ["post novo"])),
+            asyncio.ensure_future(dedup.filter_unique("twitter:main", ["outro post"]))
+        ]
+        await asyncio.sleep(0.01)
+        await dedup.add("twitter:main", "extra", "post que força o crescimento")
+        assert index.capacity > index.count - 1 >= 1024
+        checks.append(asyncio.ensure_future(dedup.check("twitter:main", "mais um")))
+        await asyncio.sleep(0.01)
+        await dedup.remove("twitter:main", ["p0", "p1"])
+
+        await asyncio.gather(*checks)
+        assert index.generation == 1
+        assert changed == [False, False, False]
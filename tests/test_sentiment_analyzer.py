@@ -0,0 +1,166 @@
+"""
+Testes para o módulo de análise de sentimento
+
+Testa o agrupamento por comprimento, a equivalência com chamadas individuais
+e a execução no pool dedicado.
+"""
+
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ai import sentiment_analyzer
+from src.ai.sentiment_analyzer import (
+    SentimentAnalyzer,
+    TransformersSentimentBackend,
+    _normalize_labels,
+    plan_batches
+)
+
+MENTIONS = [
+    "adorei o novo recurso",
+    "péssimo atendimento",
+    "ok",
+    "a entrega demorou mas o produto é ótimo",
+    "quando sai a próxima versão do app",
+    "obrigado pelo suporte rápido de ontem à noite",
+    "bug de novo",
+    "amei"
+]
+
+
+class FakeBackend:
+    """Backend determinístico por linha (sem BLAS) que registra os lotes"""
+
+    labels = ["negative", "neutral", "positive"]
+    pad_token_id = 0
+
+    def __init__(self):
+        rng = np.random.default_rng(7)
+        self.embeddings = rng.standard_normal((1000, 3)).astype(np.float32)
+        self.embeddings[0] = 0.0
+        self.masks = []
+        self.threads = set()
+
+    def tokenize(self, texts):
+        return [[101] + [sum(map(ord, word)) % 997 + 1 for word in text.split()] + [102] for text in texts]
+
+    def predict(self, input_ids, attention_mask):
+        self.masks.append(attention_mask.copy())
+        self.threads.add(threading.current_thread().name)
+        return self.embeddings[input_ids].sum(axis=1)
+
+
+class TestPlanBatches:
+    """Testes para o agrupamento por comprimento"""
+
+    def test_exact_buckets_have_no_padding(self):
+        """Testa que o balde exato só agrupa comprimentos iguais"""
+        lengths = [5, 3, 5, 7, 3, 5, 3]
+
+        batches = plan_batches(lengths, max_batch_size=2)
+
+        assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+        assert all(len({lengths[i] for i in batch}) == 1 for batch in batches)
+        assert max(len(batch) for batch in batches) == 2
+
+    def test_token_budget_and_wide_buckets(self):
+        """Testa o limite de tokens e baldes largos com padding"""
+        lengths = [10, 12, 14, 15, 40]
+
+        batches = plan_batches(lengths, max_batch_size=10, max_batch_tokens=30, bucket_width=16)
+
+        assert batches == [[0, 1], [2, 3], [4]]
+
+
+class TestSentimentAnalyzer:
+    """Testes para a classe SentimentAnalyzer"""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_single_calls_exactly(self):
+        """Testa que o lote reproduz bit a bit as chamadas individuais"""
+        backend = FakeBackend()
+        analyzer = SentimentAnalyzer(backend=backend, max_batch_size=4, threads=2)
+        try:
+            batch = await analyzer.analyze_batch(MENTIONS)
+            singles = [await analyzer.analyze(text) for text in MENTIONS]
+        finally:
+            analyzer.close()
+
+        assert batch == singles
+        assert all(mask.all() for mask in backend.masks)  # Sem padding
+
+    @pytest.mark.asyncio
+    async def test_result_format(self):
+        """Testa o formato {"sentiment", "confidence", "scores"}"""
+        analyzer = SentimentAnalyzer(backend=FakeBackend())
+        try:
+            result = await analyzer.analyze("adorei o novo recurso")
+        finally:
+            analyzer.close()
+
+        assert set(result) == {"sentiment", "confidence", "scores"}
+        assert set(result["scores"]) == {"negative", "neutral", "positive"}
+        assert result["sentiment"] == max(result["scores"], key=result["scores"].get)
+        assert result["confidence"] == result["scores"][result["sentiment"]]
+        assert sum(result["scores"].values()) == pytest.approx(1.0, abs=1e-6)
+
+    @pytest.mark.asyncio
+    async def test_runs_on_dedicated_pool(self):
+        """Testa que a inferência roda fora do event loop, no pool próprio"""
+        backend = FakeBackend()
+        analyzer = SentimentAnalyzer(backend=backend, max_batch_size=2, threads=2)
+        try:
+            assert await analyzer.analyze_batch([]) == []
+            await analyzer.analyze_batch(MENTIONS)
+        finally:
+            analyzer.close()
+
+        assert backend.threads
+        assert all(name.startswith("sentiment") for name in backend.threads)
+
+    def test_wide_buckets_keep_labels(self):
+        """Testa baldes largos (com padding) na versão síncrona"""
+        analyzer = SentimentAnalyzer(backend=FakeBackend(), bucket_width=8)
+
+        results = analyzer.analyze_batch_sync(MENTIONS)
+
+        assert [r["sentiment"] for r in results] == [
+            analyzer.analyze_batch_sync([text])[0]["sentiment"] for text in MENTIONS
+        ]
+
+    def test_generic_labels_are_named(self):
+        """Testa a tradução de LABEL_0..2 para negative/neutral/positive"""
+        assert _normalize_labels({0: "LABEL_0", 1: "LABEL_1", 2: "LABEL_2"}) == ["negative", "neutral", "positive"]
+        assert _normalize_labels({0: "NEG", 1: "POS"}) == ["neg", "pos"]
+
+    def test_model_loaded_once_across_threads(self, monkeypatch):
+        """Testa que threads do pool carregando ao mesmo tempo fazem uma carga só"""
+        loads = []
+
+        def fake_load_model(name, **kwargs):
+            loads.append(name)
+            time.sleep(0.05)  # Janela para as outras threads entrarem
+            return types.SimpleNamespace(config=types.SimpleNamespace(id2label={0: "NEG", 1: "POS"}))
+
+        tokenizer = types.SimpleNamespace(pad_token_id=1)
+        transformers = types.SimpleNamespace(
+            AutoTokenizer=types.SimpleNamespace(from_pretrained=lambda name: tokenizer)
+        )
+        monkeypatch.setitem(sys.modules, "transformers", transformers)
+        monkeypatch.setattr(sentiment_analyzer, "load_model", fake_load_model)
+        backend = TransformersSentimentBackend()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: backend._load(), range(8)))
+
+        assert len(loads) == 1
+        assert backend.labels == ["neg", "pos"] and backend.pad_token_id == 1